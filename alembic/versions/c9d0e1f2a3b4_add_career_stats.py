@@ -0,0 +1,41 @@
+"""add career_stats ledger for jockey / trainer / sire win rates
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "career_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("surface", sa.String(length=20), nullable=False, server_default=""),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("day_runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("day_wins", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("wins", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_unique_constraint(
+        "uq_career_stats_key", "career_stats",
+        ["kind", "name", "surface", "date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_career_stats_key", "career_stats", type_="unique")
+    op.drop_table("career_stats")
@@ -0,0 +1,57 @@
+"""add evaluation_daily metrics table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evaluation_daily",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("model_version", sa.String(length=50), nullable=False, server_default=""),
+        sa.Column("races", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("top1_hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("top3_hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ranked_races", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rank_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("prob_races", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("prob_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("log_loss_races", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("log_loss_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("brier_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("random_top1_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("agf_races", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("agf_hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("roi_payout_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("calibration_counts", sa.JSON(), nullable=False),
+        sa.Column("calibration_prob_sums", sa.JSON(), nullable=False),
+        sa.Column("calibration_wins", sa.JSON(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_unique_constraint(
+        "uq_evaluation_daily_key", "evaluation_daily",
+        ["date", "model_version"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_evaluation_daily_key", "evaluation_daily", type_="unique")
+    op.drop_table("evaluation_daily")
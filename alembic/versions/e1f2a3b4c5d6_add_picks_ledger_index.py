@@ -0,0 +1,33 @@
+"""add covering index for picks ledger roll-ups
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Leads with ``graded``, so it supersedes the single-column index.
+    op.create_index(
+        "ix_picks_graded_strategy_generated_at",
+        "picks",
+        ["graded", "strategy", "generated_at"],
+        unique=False,
+        postgresql_include=["hit", "stake_tl", "payout_tl", "net_tl"],
+    )
+    op.drop_index("ix_picks_graded", table_name="picks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_picks_graded", "picks", ["graded"], unique=False)
+    op.drop_index("ix_picks_graded_strategy_generated_at", table_name="picks")
@@ -0,0 +1,34 @@
+"""add race_entry.trainer column
+
+Revision ID: f0a1b2c3d4e5
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f0a1b2c3d4e5"
+down_revision: Union[str, Sequence[str], None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "race_entries",
+        sa.Column("trainer", sa.String(length=200), nullable=True),
+    )
+    # Existing rows only know the horse's latest trainer; cards scraped
+    # from now on record the trainer of each race.
+    op.execute(
+        "UPDATE race_entries SET trainer = "
+        "(SELECT horses.trainer FROM horses WHERE horses.id = race_entries.horse_id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("race_entries", "trainer")
@@ -1,9 +1,11 @@
 """Ganyan CLI — Turkish horse racing prediction system."""
 
 import asyncio
+import functools
 import logging
 import subprocess
 from datetime import date, datetime
+from pathlib import Path
 
 import typer
 
@@ -18,6 +20,8 @@ db_app = typer.Typer(help="Database management")
 train_app = typer.Typer(help="Train the ML ranker model")
 crawl_app = typer.Typer(help="Crawl per-horse detail pages (pedigree, etc.)")
 value_app = typer.Typer(help="Find horses the value-betting model thinks are mispriced")
+features_app = typer.Typer(help="Manage the on-disk training feature store")
+matrix_app = typer.Typer(help="Cached probability matrices for back-tests")
 
 app.add_typer(scrape_app, name="scrape")
 app.add_typer(predict_app, name="predict")
@@ -27,6 +31,8 @@ app.add_typer(db_app, name="db")
 app.add_typer(train_app, name="train")
 app.add_typer(crawl_app, name="crawl")
 app.add_typer(value_app, name="value-picks")
+app.add_typer(features_app, name="features")
+app.add_typer(matrix_app, name="prob-matrix")
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +64,11 @@ def scrape(
         False, "--rescrape",
         help="Re-scrape even dates already marked complete in scrape_log.",
     ),
+    date_concurrency: int = typer.Option(
+        1, "--date-concurrency",
+        help="Dates in flight at once for --backfill / --results-range; "
+             "all requests share one SCRAPE_RATE req/s token bucket.",
+    ),
 ) -> None:
     """Scrape race data from TJK."""
     settings = get_settings()
@@ -75,7 +86,10 @@ def scrape(
         end = (
             datetime.strptime(to_date, "%Y-%m-%d").date() if to_date else None
         )
-        asyncio.run(_run_backfill(settings, start, end, rescrape=rescrape))
+        asyncio.run(_run_backfill(
+            settings, start, end, rescrape=rescrape,
+            date_concurrency=date_concurrency,
+        ))
     elif history:
         if from_date is None:
             typer.echo("Error: --from is required with --history", err=True)
@@ -96,7 +110,9 @@ def scrape(
             datetime.strptime(to_date, "%Y-%m-%d").date()
             if to_date else date.today()
         )
-        asyncio.run(_run_full_results_backfill(settings, start, end, rescrape))
+        asyncio.run(_run_full_results_backfill(
+            settings, start, end, rescrape, date_concurrency=date_concurrency,
+        ))
     else:
         typer.echo(
             "Use --today, --results, --backfill, --history, or --results-range. See --help.",
@@ -106,14 +122,16 @@ def scrape(
 async def _scrape_today(settings) -> None:
     """Fetch today's race cards, parse, and store them."""
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient, parse_race_card
+    from ganyan.scraper import TJKClient, archive_from_settings, parse_race_card
     from ganyan.scraper.backfill import store_race_card, log_scrape
     from ganyan.db.models import ScrapeStatus
 
     session = get_session()
     try:
         async with TJKClient(
-            base_url=settings.tjk_base_url, delay=settings.scrape_delay
+            base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+            archive=archive_from_settings(settings),
+            adaptive=settings.scrape_adaptive,
         ) as client:
             raw_cards = await client.get_race_card(date.today())
             if not raw_cards:
@@ -136,13 +154,16 @@ async def _scrape_today(settings) -> None:
 async def _scrape_results(settings) -> None:
     """Fetch today's results and update existing entries."""
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient, parse_race_card
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+    from ganyan.scraper import TJKClient, archive_from_settings, parse_race_card
     from ganyan.scraper.backfill import update_race_results
 
     session = get_session()
     try:
         async with TJKClient(
-            base_url=settings.tjk_base_url, delay=settings.scrape_delay
+            base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+            archive=archive_from_settings(settings),
+            adaptive=settings.scrape_adaptive,
         ) as client:
             raw_cards = await client.get_race_results(date.today())
             if not raw_cards:
@@ -154,6 +175,7 @@ async def _scrape_results(settings) -> None:
                 race = update_race_results(session, parsed)
                 if race is not None:
                     updated += 1
+            refresh_dirty_evaluation_daily(session)
             session.commit()
             typer.echo(f"Updated {updated} race(s) with results.")
     except Exception as exc:
@@ -164,27 +186,44 @@ async def _scrape_results(settings) -> None:
         session.close()
 
 
+def _backfill_client(settings, date_concurrency: int):
+    """TJK client for a backfill; concurrent runs share a token bucket."""
+    from ganyan.scraper import TJKClient, TokenBucket, archive_from_settings
+
+    rate_limiter = (
+        TokenBucket(settings.scrape_rate) if date_concurrency > 1 else None
+    )
+    return TJKClient(
+        base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+        rate_limiter=rate_limiter,
+        archive=archive_from_settings(settings),
+        adaptive=settings.scrape_adaptive,
+    )
+
+
 async def _run_backfill(
     settings,
     from_date: date,
     to_date: date | None = None,
     *,
     rescrape: bool = False,
+    date_concurrency: int = 1,
 ) -> None:
     """Run the BackfillManager for historical data."""
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
     from ganyan.scraper.backfill import BackfillManager
 
     session = get_session()
     try:
-        async with TJKClient(
-            base_url=settings.tjk_base_url, delay=settings.scrape_delay
-        ) as client:
+        async with _backfill_client(settings, date_concurrency) as client:
             manager = BackfillManager(session, client)
             await manager.backfill(
                 from_date=from_date, to_date=to_date, rescrape=rescrape,
+                date_concurrency=date_concurrency,
             )
+            refresh_dirty_evaluation_daily(session)
+            session.commit()
             typer.echo("Backfill complete.")
     except Exception as exc:
         session.rollback()
@@ -199,18 +238,23 @@ async def _run_historical_backfill(
 ) -> None:
     """Run historical backfill via the KosuSorgulama bulk query endpoint."""
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+    from ganyan.scraper import TJKClient, archive_from_settings
     from ganyan.scraper.backfill import BackfillManager
 
     session = get_session()
     try:
         async with TJKClient(
-            base_url=settings.tjk_base_url, delay=settings.scrape_delay
+            base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+            archive=archive_from_settings(settings),
+            adaptive=settings.scrape_adaptive,
         ) as client:
             manager = BackfillManager(session, client)
             count = await manager.backfill_historical(
                 from_date=from_date, to_date=to_date,
             )
+            refresh_dirty_evaluation_daily(session)
+            session.commit()
             typer.echo(
                 f"Historical backfill complete: {count} race(s) stored "
                 f"({from_date} -> {to_date})."
@@ -223,21 +267,23 @@ async def _run_historical_backfill(
 
 async def _run_full_results_backfill(
     settings, from_date: date, to_date: date, rescrape: bool,
+    *, date_concurrency: int = 1,
 ) -> None:
     """Full-field historical results via GunlukYarisSonuclari per-date."""
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
     from ganyan.scraper.backfill import BackfillManager
 
     session = get_session()
     try:
-        async with TJKClient(
-            base_url=settings.tjk_base_url, delay=settings.scrape_delay,
-        ) as client:
+        async with _backfill_client(settings, date_concurrency) as client:
             manager = BackfillManager(session, client)
             count = await manager.backfill_full_results(
                 from_date=from_date, to_date=to_date, rescrape=rescrape,
+                date_concurrency=date_concurrency,
             )
+            refresh_dirty_evaluation_daily(session)
+            session.commit()
             typer.echo(
                 f"Full-field results backfill complete: {count} race(s) stored "
                 f"({from_date} -> {to_date})."
@@ -321,9 +367,9 @@ def _predict_today(json_output: bool, model: str) -> None:
             return
 
         predictor = _build_predictor(session, model)
-        for race in races:
-            predictions = predictor.predict_and_save(race.id)
-            _display_predictions(predictions, race.id, json_output)
+        results = predictor.predict_and_save_many([race.id for race in races])
+        for race_id, predictions in results.items():
+            _display_predictions(predictions, race_id, json_output)
             typer.echo("")  # blank line separator
         session.commit()
     finally:
@@ -612,6 +658,54 @@ def db_reset() -> None:
     typer.echo("Database reset successfully.")
 
 
+@db_app.command("rebuild-career-stats")
+def db_rebuild_career_stats(
+    kind: list[str] = typer.Option(
+        None, "--kind",
+        help="Only rebuild these kinds (jockey / trainer / sire). "
+             "Repeatable; default: all.",
+    ),
+) -> None:
+    """Recompute the jockey / trainer / sire career-stats ledger."""
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+
+    from ganyan.db import get_session
+    from ganyan.db.career_stats import CAREER_KINDS, rebuild_career_stats
+
+    kinds = tuple(kind) if kind else CAREER_KINDS
+    unknown = [k for k in kinds if k not in CAREER_KINDS]
+    if unknown:
+        typer.echo(f"Unknown kind(s): {', '.join(unknown)}", err=True)
+        raise typer.Exit(code=1)
+
+    session = get_session()
+    try:
+        written = rebuild_career_stats(session, kinds)
+        session.commit()
+    finally:
+        session.close()
+    typer.echo(f"Career-stats ledger rebuilt: {written} row(s) for {', '.join(kinds)}.")
+
+
+@db_app.command("rebuild-eval-metrics")
+def db_rebuild_eval_metrics() -> None:
+    """Recompute the per-day evaluation metrics behind /history."""
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+
+    from ganyan.db import get_session
+    from ganyan.predictor.evaluation_daily import rebuild_evaluation_daily
+
+    session = get_session()
+    try:
+        written = rebuild_evaluation_daily(session)
+        session.commit()
+    finally:
+        session.close()
+    typer.echo(f"Evaluation metrics rebuilt: {written} day row(s).")
+
+
 # ---------------------------------------------------------------------------
 # train (ML ranker)
 # ---------------------------------------------------------------------------
@@ -657,6 +751,16 @@ def train(
         help="Filename stem for the saved model (default: lightgbm_ranker, "
              "or lightgbm_value when --exclude-agf).",
     ),
+    per_row: bool = typer.Option(
+        False, "--per-row",
+        help="Build features with per-row history queries instead of the "
+             "vectorized as-of path (slow; for cross-checking).",
+    ),
+    no_store: bool = typer.Option(
+        False, "--no-store",
+        help="Recompute the feature matrix instead of reading / extending "
+             "the on-disk feature store.",
+    ),
 ) -> None:
     """Fit a LightGBM LambdaRank model on resulted races and save to disk."""
     settings = get_settings()
@@ -665,6 +769,7 @@ def train(
     from datetime import timedelta
     from ganyan.db import get_session
     from ganyan.predictor.ml import train_ranker
+    from ganyan.predictor.ml.feature_store import FeatureStore
 
     if from_date is not None:
         start = datetime.strptime(from_date, "%Y-%m-%d").date()
@@ -691,6 +796,8 @@ def train(
             num_boost_round=rounds,
             exclude_features=excluded,
             model_name=model_name,
+            vectorized=not per_row,
+            feature_store=None if (per_row or no_store) else FeatureStore(),
         )
     finally:
         session.close()
@@ -715,6 +822,120 @@ def train(
         typer.echo(f"  {feat:<22} {gain:>10.1f}")
 
 
+# ---------------------------------------------------------------------------
+# features (on-disk training feature store)
+# ---------------------------------------------------------------------------
+
+
+@features_app.command("sync")
+def features_sync(
+    from_date: str = typer.Option(
+        None, "--from", help="Earliest race date to materialise (YYYY-MM-DD)."
+    ),
+    to_date: str = typer.Option(
+        None, "--to", help="Latest race date to materialise (YYYY-MM-DD)."
+    ),
+) -> None:
+    """Compute and store feature partitions for dates not yet on disk."""
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+
+    from ganyan.db import get_session
+    from ganyan.predictor.ml.feature_store import FeatureStore
+
+    start = datetime.strptime(from_date, "%Y-%m-%d").date() if from_date else None
+    end = datetime.strptime(to_date, "%Y-%m-%d").date() if to_date else None
+    store = FeatureStore()
+    session = get_session()
+    try:
+        written = store.sync(session, from_date=start, to_date=end)
+    finally:
+        session.close()
+    typer.echo(
+        f"Feature store {store.path}: {written} partition(s) written, "
+        f"{len(store.dates())} total."
+    )
+
+
+@features_app.command("clear")
+def features_clear(
+    since: str = typer.Option(
+        None, "--since",
+        help="Only drop partitions on/after this date (YYYY-MM-DD) — use "
+             "after backfilling results older than the stored range.",
+    ),
+) -> None:
+    """Delete stored feature partitions so they get recomputed."""
+    from ganyan.predictor.ml.feature_store import FeatureStore
+
+    start = datetime.strptime(since, "%Y-%m-%d").date() if since else None
+    store = FeatureStore()
+    removed = store.clear(since=start)
+    typer.echo(f"Removed {removed} partition(s) from {store.path}.")
+
+
+# ---------------------------------------------------------------------------
+# prob-matrix (cached back-test probabilities)
+# ---------------------------------------------------------------------------
+
+
+@matrix_app.command("build")
+def prob_matrix_build(
+    version: str = typer.Option(
+        ..., "--version",
+        help="Model version whose stored predictions to pack "
+             "(e.g. bayesian-v5-s20).",
+    ),
+    model: str = typer.Option(
+        "bayesian", "--model",
+        help="Predictor for races without stored rows: 'bayesian' or 'ml'.",
+    ),
+    live_fallback: bool = typer.Option(
+        True, "--live-fallback/--no-live-fallback",
+        help="Re-predict races with no stored rows (default) or leave "
+             "them unscored.",
+    ),
+    from_date: str = typer.Option(
+        None, "--from", help="Earliest race date (YYYY-MM-DD)."
+    ),
+    to_date: str = typer.Option(
+        None, "--to", help="Latest race date (YYYY-MM-DD)."
+    ),
+    out_dir: Path = typer.Option(
+        None, "--dir", help="Matrix root directory (default: data/prob_matrix)."
+    ),
+) -> None:
+    """Materialise win probabilities, finishes, AGF and payouts to disk."""
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+
+    from ganyan.db import get_session
+    from ganyan.predictor.prob_matrix import build_probability_matrix, matrix_path
+    from ganyan.predictor.replay import StoredPredictor
+
+    start = datetime.strptime(from_date, "%Y-%m-%d").date() if from_date else None
+    end = datetime.strptime(to_date, "%Y-%m-%d").date() if to_date else None
+
+    session = get_session()
+    try:
+        predictor = StoredPredictor(
+            session, version, from_date=start, to_date=end,
+            fallback=_build_predictor(session, model) if live_fallback else None,
+        )
+        matrix = build_probability_matrix(
+            session, predictor, model_version=version,
+            from_date=start, to_date=end,
+        )
+    finally:
+        session.close()
+
+    path = matrix.save(matrix_path(version, start, end, out_dir))
+    typer.echo(
+        f"Probability matrix written to {path}: {len(matrix)} races "
+        f"({predictor.replayed} replayed, {predictor.live} re-predicted)."
+    )
+
+
 # ---------------------------------------------------------------------------
 # crawl (horse detail pages)
 # ---------------------------------------------------------------------------
@@ -736,8 +957,10 @@ def crawl_horses(
     settings = get_settings()
     logging.basicConfig(level=settings.log_level)
 
-    async def _run() -> int:
+    async def _run() -> tuple[int, int]:
         from ganyan.db import get_session
+        from ganyan.predictor.ml.feature_store import FeatureStore
+        from ganyan.scraper import archive_from_settings
         from ganyan.scraper.horse_crawler import HorseCrawler
 
         session = get_session()
@@ -747,13 +970,21 @@ def crawl_horses(
                 base_url=settings.tjk_base_url,
                 delay=delay,
                 concurrency=concurrency,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as crawler:
-                return await crawler.crawl_missing_profiles(limit=limit)
+                stored = await crawler.crawl_missing_profiles(limit=limit)
+            cleared = FeatureStore().invalidate_horses(
+                session, crawler.sired_horse_ids,
+            )
+            return stored, cleared
         finally:
             session.close()
 
-    stored = asyncio.run(_run())
+    stored, cleared = asyncio.run(_run())
     typer.echo(f"Crawled {stored} horse profile(s).")
+    if cleared:
+        typer.echo(f"Cleared {cleared} stale feature-store partition(s).")
 
 
 # ---------------------------------------------------------------------------
@@ -794,10 +1025,10 @@ def value_picks(
 
     from ganyan.db import get_session
     from ganyan.db.models import Race, RaceEntry
-    from ganyan.predictor.ml import MLPredictor, load_latest_model
+    from ganyan.predictor.ml import MLPredictor, get_model
 
     try:
-        loaded = load_latest_model(model_name=model_name)
+        loaded = get_model(model_name)
     except FileNotFoundError as exc:
         typer.echo(f"Error: {exc}", err=True)
         typer.echo(
@@ -832,8 +1063,9 @@ def value_picks(
             return
 
         all_picks: list[dict] = []
+        preds_by_race = predictor.predict_many([race.id for race in races])
         for race in races:
-            preds = predictor.predict(race.id)
+            preds = preds_by_race[race.id]
             if not preds:
                 continue
             # Build AGF lookup for this race.
@@ -945,9 +1177,8 @@ def exotics_cmd(
     from ganyan.db import get_session
     from ganyan.db.models import Race
     from ganyan.predictor.exotics import (
-        Combo, cumulative_coverage, dortlu_probabilities,
-        ganyan_probabilities, ikili_probabilities, plase_probabilities,
-        sirali_ikili_probabilities, top_n as top_n_fn, uclu_probabilities,
+        cumulative_coverage, plase_probabilities, top_n as top_n_fn,
+        top_n_combos,
     )
 
     session = get_session()
@@ -969,22 +1200,10 @@ def exotics_cmd(
         }
         name_for: dict[int, str] = {p.horse_id: p.horse_name for p in preds}
 
-        if pool == "ganyan":
-            combos = ganyan_probabilities(win_probs)
-        elif pool == "plase":
-            combos = plase_probabilities(win_probs, top_k=plase_k)
-        elif pool == "ikili":
-            combos = ikili_probabilities(win_probs)
-        elif pool == "sirali-ikili":
-            combos = sirali_ikili_probabilities(win_probs)
-        elif pool == "uclu":
-            combos = uclu_probabilities(win_probs)
-        elif pool == "dortlu":
-            combos = dortlu_probabilities(win_probs)
+        if pool == "plase":
+            shown = top_n_fn(plase_probabilities(win_probs, top_k=plase_k), top_n)
         else:
-            raise AssertionError("unreachable")  # pragma: no cover
-
-        shown = top_n_fn(combos, top_n)
+            shown = top_n_combos(pool.replace("-", "_"), win_probs, top_n)
         cum = cumulative_coverage(shown)
 
         if json_output:
@@ -1051,6 +1270,32 @@ def exotics_backtest_cmd(
     stake: float = typer.Option(
         100.0, "--stake", help="Flat TL stake per ticket."
     ),
+    matrix: Path = typer.Option(
+        None, "--matrix",
+        help="Score from a cached probability matrix directory (see "
+             "'ganyan prob-matrix build') instead of the database.  "
+             "--from/--to must lie within its build window and --replay, "
+             "if given, must name its model version.",
+    ),
+    replay: str = typer.Option(
+        None, "--replay",
+        help="Replay stored predictions of this model version (e.g. "
+             "bayesian-v5-s20) instead of re-running --model.",
+    ),
+    live_fallback: bool = typer.Option(
+        True, "--live-fallback/--no-live-fallback",
+        help="With --replay, re-predict races that have no stored rows "
+             "(default) or skip them.",
+    ),
+    workers: int = typer.Option(
+        1, "--workers",
+        help="Shard the date range over this many processes, each with "
+             "its own DB connection and predictor.",
+    ),
+    bootstrap: int = typer.Option(
+        0, "--bootstrap",
+        help="Race-level bootstrap replicates for ROI bands (0 = off).",
+    ),
     json_output: bool = typer.Option(False, "--json", help="Output JSON."),
 ) -> None:
     """Back-test Harville-derived exotic-pool strategies vs real payouts."""
@@ -1059,8 +1304,10 @@ def exotics_backtest_cmd(
 
     from ganyan.db import get_session
     from ganyan.predictor.exotic_evaluate import (
-        _COMBO_FUNCS, evaluate_all_pools, evaluate_pool,
+        _COMBO_FUNCS, attach_roi_intervals, evaluate_all_pools,
+        evaluate_all_pools_parallel, evaluate_matrix_pools,
     )
+    from ganyan.predictor.prob_matrix import ProbabilityMatrix
 
     valid_pools = list(_COMBO_FUNCS.keys())
     # normalise kebab-case
@@ -1079,22 +1326,68 @@ def exotics_backtest_cmd(
     start = datetime.strptime(from_date, "%Y-%m-%d").date() if from_date else None
     end = datetime.strptime(to_date, "%Y-%m-%d").date() if to_date else None
 
-    def _factory(session):
-        return _build_predictor(session, model)
+    # A partial of a module-level function, so --workers can pickle it.
+    _factory = functools.partial(_build_predictor, model=model)
 
-    session = get_session()
-    try:
-        results = evaluate_all_pools(
-            session,
-            pools=pools,
-            top_ns=top_ns,
-            from_date=start,
-            to_date=end,
-            predictor_factory=_factory,
+    if matrix is not None:
+        try:
+            cached = ProbabilityMatrix.load(matrix)
+        except FileNotFoundError as exc:
+            typer.echo(str(exc), err=True)
+            raise typer.Exit(code=1)
+        built_version = cached.meta.get("model_version")
+        if replay is not None and replay != built_version:
+            raise typer.BadParameter(
+                f"the matrix holds {built_version!r} predictions, not {replay!r}",
+                param_hint="--replay",
+            )
+        if not cached.covers(start, end):
+            raise typer.BadParameter(
+                f"the matrix was built for {cached.meta.get('from_date') or '…'}"
+                f" → {cached.meta.get('to_date') or '…'}; rebuild it to "
+                "cover the requested window",
+                param_hint="--from/--to",
+            )
+        model = f"matrix {built_version}"
+        results = evaluate_matrix_pools(
+            cached.window(start, end), pools=pools, top_ns=top_ns,
             ticket_stake_tl=stake,
         )
-    finally:
-        session.close()
+    elif workers > 1:
+        try:
+            results = evaluate_all_pools_parallel(
+                pools=pools,
+                top_ns=top_ns,
+                database_url=settings.database_url,
+                from_date=start,
+                to_date=end,
+                predictor_factory=_factory,
+                ticket_stake_tl=stake,
+                model_version=replay,
+                live_fallback=live_fallback,
+                workers=workers,
+            )
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc))
+    else:
+        session = get_session()
+        try:
+            results = evaluate_all_pools(
+                session,
+                pools=pools,
+                top_ns=top_ns,
+                from_date=start,
+                to_date=end,
+                predictor_factory=_factory,
+                ticket_stake_tl=stake,
+                model_version=replay,
+                live_fallback=live_fallback,
+            )
+        finally:
+            session.close()
+
+    if bootstrap > 0:
+        attach_roi_intervals(results, replicates=bootstrap)
 
     if json_output:
         import json
@@ -1107,19 +1400,140 @@ def exotics_backtest_cmd(
             f"Window: {start.isoformat() if start else '…'} → "
             f"{end.isoformat() if end else 'today'}"
         )
-    typer.echo(f"Model: {model}   Ticket stake: {stake:.0f} TL")
+    source = f"replay {replay}" if replay else model
+    typer.echo(f"Model: {source}   Ticket stake: {stake:.0f} TL")
     typer.echo("")
-    typer.echo(
+    header = (
         f"{'Pool':<14} {'TopN':>5} {'Races':>6} {'Hits':>5} "
         f"{'Hit%':>6} {'Stake':>10} {'Payout':>12} {'ROI':>8}"
     )
-    typer.echo("-" * 78)
+    if bootstrap > 0:
+        header += f" {'ROI CI':>17} {'P>0':>5}"
+    typer.echo(header)
+    typer.echo("-" * len(header))
     for r in results:
-        typer.echo(
+        line = (
             f"{r.pool:<14} {r.top_n:>5} {r.races:>6} {r.hits:>5} "
             f"{r.hit_rate:>5.1f}% {r.total_stake_tl:>10,.0f} "
             f"{r.total_payout_tl:>12,.0f} {r.roi*100:>+7.1f}%"
         )
+        if r.roi_ci is not None:
+            band = f"[{r.roi_ci.lower*100:+.0f}, {r.roi_ci.upper*100:+.0f}]%"
+            line += f" {band:>17} {r.roi_ci.p_positive:>5.0%}"
+        typer.echo(line)
+
+
+# ---------------------------------------------------------------------------
+# sweep — strategy grid over a cached probability matrix
+# ---------------------------------------------------------------------------
+
+
+@app.command("sweep")
+def sweep_cmd(
+    matrix: Path = typer.Option(
+        ..., "--matrix",
+        help="Probability matrix directory (see 'ganyan prob-matrix build').",
+    ),
+    pool: list[str] = typer.Option(
+        None, "--pool",
+        help="Pools to sweep (repeatable).  Default: ganyan/ikili/sirali-ikili/uclu.",
+    ),
+    top_n: list[int] = typer.Option(
+        None, "--top-n", help="Top-N values (repeatable).  Default: 1 3 6 10."
+    ),
+    box: list[int] = typer.Option(
+        None, "--box", help="Box sizes over the top-rated runners (repeatable)."
+    ),
+    edge: list[float] = typer.Option(
+        None, "--edge",
+        help="Value-bet relative edges vs AGF, e.g. 0.22 (repeatable).",
+    ),
+    min_agf: list[float] = typer.Option(
+        None, "--min-agf", help="Value-bet minimum AGF % (repeatable).  Default: 2."
+    ),
+    floor: list[float] = typer.Option(
+        None, "--floor",
+        help="Minimum model probability (0-1) per ticket (repeatable).  Default: 0.",
+    ),
+    stake: float = typer.Option(
+        100.0, "--stake", help="Flat TL stake per ticket."
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Processes for combo ranking."
+    ),
+    bootstrap: int = typer.Option(
+        0, "--bootstrap",
+        help="Race-level bootstrap replicates for ROI bands (0 = off).",
+    ),
+    limit: int = typer.Option(
+        30, "--limit", help="Rows to print, best ROI first (0 = all)."
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Output JSON."),
+) -> None:
+    """Score a grid of top-N / box / value strategies in one pass."""
+    from ganyan.predictor.prob_matrix import ProbabilityMatrix
+    from ganyan.predictor.sweep import SweepGrid, sweep
+
+    try:
+        cached = ProbabilityMatrix.load(matrix)
+    except FileNotFoundError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+
+    defaults = SweepGrid()
+    grid = SweepGrid(
+        pools=tuple(p.replace("-", "_") for p in pool) if pool else defaults.pools,
+        top_ns=tuple(top_n) if top_n else defaults.top_ns,
+        box_sizes=tuple(box or ()),
+        edges=tuple(edge or ()),
+        min_agfs=tuple(min_agf) if min_agf else defaults.min_agfs,
+        prob_floors=tuple(floor) if floor else defaults.prob_floors,
+    )
+    try:
+        cells = sweep(
+            cached, grid, ticket_stake_tl=stake, workers=workers,
+            bootstrap=bootstrap,
+        )
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    cells.sort(key=lambda c: c.roi, reverse=True)
+    if limit:
+        cells = cells[:limit]
+
+    if json_output:
+        import json
+        typer.echo(json.dumps([c.summary_row() for c in cells], indent=2))
+        return
+
+    typer.echo(
+        f"=== Strategy sweep: {cached.meta.get('model_version')} "
+        f"({len(cached)} races) ==="
+    )
+    header = (
+        f"{'Kind':<6} {'Pool':<13} {'Param':<18} {'Races':>6} {'Hit%':>6} "
+        f"{'Stake':>10} {'ROI':>8} {'MaxDD':>10}"
+    )
+    if bootstrap > 0:
+        header += f" {'ROI CI':>17} {'P>0':>5}"
+    typer.echo(header)
+    typer.echo("-" * len(header))
+    for c in cells:
+        if c.kind == "top_n":
+            param = f"top{c.top_n} p>={c.prob_floor:g}"
+        elif c.kind == "box":
+            param = f"box{c.box}"
+        else:
+            param = f"e{c.edge:g} agf{c.min_agf:g} p{c.prob_floor:g}"
+        line = (
+            f"{c.kind:<6} {c.pool:<13} {param:<18} {c.races:>6} "
+            f"{c.hit_rate:>5.1f}% {c.stake_tl:>10,.0f} {c.roi*100:>+7.1f}% "
+            f"{c.max_drawdown_tl:>10,.0f}"
+        )
+        if c.roi_ci is not None:
+            band = f"[{c.roi_ci.lower*100:+.0f}, {c.roi_ci.upper*100:+.0f}]%"
+            line += f" {band:>17} {c.roi_ci.p_positive:>5.0%}"
+        typer.echo(line)
 
 
 # ---------------------------------------------------------------------------
@@ -1166,8 +1580,8 @@ def uclu_picks_cmd(
     )
 
     from ganyan.db import get_session
-    from ganyan.db.models import Race, RaceEntry
-    from ganyan.predictor.exotics import uclu_probabilities
+    from ganyan.db.models import Race
+    from ganyan.predictor.exotics import top_n_combos
 
     session = get_session()
     try:
@@ -1184,16 +1598,16 @@ def uclu_picks_cmd(
 
         picks: list[dict] = []
         skipped = 0
+        preds_by_race = predictor.predict_many(
+            [race.id for race in races if len(race.entries) >= 3],
+        )
         for race in races:
-            entries = {
-                e.horse_id: e for e in session.query(RaceEntry)
-                .filter(RaceEntry.race_id == race.id).all()
-            }
+            entries = {e.horse_id: e for e in race.entries}
             if len(entries) < 3:
                 skipped += 1
                 continue
 
-            preds = predictor.predict(race.id)
+            preds = preds_by_race[race.id]
             if not preds:
                 skipped += 1
                 continue
@@ -1208,7 +1622,7 @@ def uclu_picks_cmd(
             )
             agf_rank_by_id = {e.horse_id: i + 1 for i, e in enumerate(agf_ranked)}
 
-            combos = uclu_probabilities(win_probs)[:top_n]
+            combos = top_n_combos("uclu", win_probs, top_n)
             for idx, c in enumerate(combos, start=1):
                 agf_ranks = [agf_rank_by_id.get(h, "?") for h in c.horses]
                 picks.append({
@@ -1285,6 +1699,71 @@ def uclu_picks_cmd(
         session.close()
 
 
+# ---------------------------------------------------------------------------
+# reparse — rebuild results from the raw HTML archive
+# ---------------------------------------------------------------------------
+
+
+@app.command("reparse")
+def reparse_cmd(
+    from_date: str = typer.Option(
+        None, "--from", help="First race date to replay (YYYY-MM-DD, default: all)",
+    ),
+    to_date: str = typer.Option(
+        None, "--to", help="Last race date to replay (YYYY-MM-DD, default: all)",
+    ),
+    workers: int = typer.Option(
+        4, "--workers", help="Parser processes (1 = parse in-process).",
+    ),
+    archive_dir: str = typer.Option(
+        None, "--archive-dir",
+        help="Archive root (default: RAW_HTML_DIR or data/raw_html).",
+    ),
+) -> None:
+    """Re-parse archived results pages into the DB, with no network.
+
+    Replays the newest archived copy of every per-city results page
+    through the scraper's parser and ``store_historical_race``, so a
+    parser fix reaches past races without re-fetching them.
+    """
+    settings = get_settings()
+    logging.basicConfig(level=settings.log_level)
+
+    from ganyan.db import get_session
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+    from ganyan.scraper.raw_archive import DEFAULT_ARCHIVE_DIR, RawHtmlArchive
+    from ganyan.scraper.reparse import reparse_archive
+
+    if workers < 1:
+        raise typer.BadParameter("must be at least 1", param_hint="--workers")
+    start = datetime.strptime(from_date, "%Y-%m-%d").date() if from_date else None
+    end = datetime.strptime(to_date, "%Y-%m-%d").date() if to_date else None
+    root = Path(archive_dir or settings.raw_html_dir or DEFAULT_ARCHIVE_DIR)
+    if not root.is_dir():
+        typer.echo(f"Error: no raw HTML archive at {root}", err=True)
+        raise typer.Exit(code=1)
+
+    session = get_session()
+    try:
+        stats = reparse_archive(
+            session, RawHtmlArchive(root),
+            from_date=start, to_date=end, workers=workers,
+        )
+        refresh_dirty_evaluation_daily(session)
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+    finally:
+        session.close()
+
+    typer.echo(
+        f"Reparsed {stats.pages} archived page(s): {stats.races} race(s) "
+        f"stored, {stats.failed_pages} page(s) failed."
+    )
+
+
 # ---------------------------------------------------------------------------
 # daemon — standalone scheduler (no Flask)
 # ---------------------------------------------------------------------------
@@ -1336,6 +1815,13 @@ def picks_cmd(
         None, "--strategy",
         help="Filter to a single strategy (uclu_top1 / uclu_box6 / sirali_ikili_top1).",
     ),
+    ci: bool = typer.Option(
+        False, "--ci", help="Add bootstrap ROI confidence bands and P(ROI > 0).",
+    ),
+    equity: str = typer.Option(
+        None, "--equity",
+        help="Print the running equity curve bucketed by day / week / month.",
+    ),
     json_output: bool = typer.Option(False, "--json", help="Output JSON."),
 ) -> None:
     """Summarise the picks ledger — your actual running ROI per strategy."""
@@ -1344,9 +1830,16 @@ def picks_cmd(
 
     from datetime import datetime as _dt
     from ganyan.db import get_session
-    from ganyan.predictor.picks import grade_all_pending, strategy_summary
+    from ganyan.predictor.picks import (
+        EQUITY_BUCKETS, grade_all_pending, strategy_equity_curve,
+        strategy_summary,
+    )
 
     since_date = _dt.strptime(since, "%Y-%m-%d") if since else None
+    if equity is not None and equity not in EQUITY_BUCKETS:
+        raise typer.BadParameter(
+            f"must be one of {', '.join(EQUITY_BUCKETS)}", param_hint="--equity",
+        )
 
     session = get_session()
     try:
@@ -1354,13 +1847,21 @@ def picks_cmd(
             n = grade_all_pending(session)
             session.commit()
             typer.echo(f"Graded {n} pick(s).")
-        summary = strategy_summary(session, strategy=strategy, since=since_date)
+        summary = strategy_summary(
+            session, strategy=strategy, since=since_date, intervals=ci,
+        )
+        curves = strategy_equity_curve(
+            session, bucket=equity, strategy=strategy, since=since_date,
+        ) if equity else None
     finally:
         session.close()
 
     if json_output:
         import json
-        typer.echo(json.dumps(summary, indent=2, default=str))
+        payload = summary if curves is None else {
+            "summary": summary, "equity": curves,
+        }
+        typer.echo(json.dumps(payload, indent=2, default=str))
         return
 
     if not summary:
@@ -1384,13 +1885,20 @@ def picks_cmd(
         f"{'Stake':>11} {'Payout':>12} {'Net':>11} {'ROI':>8}"
     )
 
+    if ci:
+        header += f" {'ROI CI':>17} {'P>0':>5}"
+
     def _fmt(strat_key: str, row: dict) -> str:
-        return (
+        line = (
             f"{strat_key:<22} {row['n']:>5} {row['hits']:>5} "
             f"{row['hit_rate_pct']:>5.1f}% "
             f"{row['stake_tl']:>11,.0f} {row['payout_tl']:>12,.0f} "
             f"{row['net_tl']:>11,.0f} {row['roi_pct']:>+7.1f}%"
         )
+        if "roi_ci_low_pct" in row:
+            band = f"[{row['roi_ci_low_pct']:+.0f}, {row['roi_ci_high_pct']:+.0f}]%"
+            line += f" {band:>17} {row['p_roi_positive']:>5.0%}"
+        return line
 
     betting_keys = sorted(k for k in summary if k in BETTING)
     reference_keys = sorted(k for k in summary if k in REFERENCE)
@@ -1399,7 +1907,7 @@ def picks_cmd(
     if betting_keys:
         typer.echo("=== Betting strategies (real P&L) ===")
         typer.echo(header)
-        typer.echo("-" * 85)
+        typer.echo("-" * len(header))
         agg_n = agg_hits = 0
         agg_stake = agg_payout = agg_net = 0.0
         for k in betting_keys:
@@ -1422,7 +1930,7 @@ def picks_cmd(
             typer.echo("")
         typer.echo("=== Reference strategies (display only — not staked) ===")
         typer.echo(header)
-        typer.echo("-" * 85)
+        typer.echo("-" * len(header))
         for k in reference_keys:
             typer.echo(_fmt(k, summary[k]))
 
@@ -1430,6 +1938,23 @@ def picks_cmd(
         typer.echo("")
         typer.echo("=== Other ===")
         typer.echo(header)
-        typer.echo("-" * 85)
+        typer.echo("-" * len(header))
         for k in other_keys:
             typer.echo(_fmt(k, summary[k]))
+
+    if curves:
+        typer.echo("")
+        typer.echo(f"=== Equity curve ({equity}) ===")
+        curve_header = (
+            f"{'Strategy':<22} {'Period':>10} {'N':>5} {'Net':>11} "
+            f"{'Cum net':>12} {'Cum ROI':>8}"
+        )
+        typer.echo(curve_header)
+        typer.echo("-" * len(curve_header))
+        for k in sorted(curves):
+            for pt in curves[k]:
+                typer.echo(
+                    f"{k:<22} {pt['period']:>10} {pt['n']:>5} "
+                    f"{pt['net_tl']:>11,.0f} {pt['cum_net_tl']:>12,.0f} "
+                    f"{pt['cum_roi_pct']:>+7.1f}%"
+                )
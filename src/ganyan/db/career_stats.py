@@ -0,0 +1,335 @@
+"""Maintenance and lookup for the :class:`CareerStat` ledger.
+
+The jockey / trainer / sire win-rate features used to count every
+historical finisher on each call.  The ledger keeps per-day cumulative
+totals instead, so "rate as of date D" is one indexed row: the entity's
+latest ledger row strictly before D.
+
+Lifecycle:
+
+- :func:`rebuild_career_stats` recomputes the ledger from
+  ``race_entries`` (``ganyan db rebuild-career-stats``).  Until it has
+  run once the ledger is empty and readers fall back to scanning.
+- :func:`refresh_career_stats` is called whenever a race is marked
+  resulted.  It recounts that race date for the race's jockeys,
+  trainers and sires — plus every name already counted that day, so a
+  renamed entry hands its run back — and shifts every later cumulative
+  row by the difference, so re-polling the same results is a no-op.
+
+Attribution matches the scanning fallbacks and the training frame:
+trainers come from ``RaceEntry.trainer`` (the trainer on that race's
+card, so a later trainer change doesn't move past runs) and sires from
+:class:`Horse`.  When the pedigree crawl fills in a sire,
+:func:`sync_career_names` recounts that sire's rows so past days pick
+up the new offspring.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date as date_type
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session, joinedload
+
+from ganyan.db.models import CareerStat, Horse, Race, RaceEntry, RaceStatus
+
+
+CAREER_KINDS: tuple[str, ...] = ("jockey", "trainer", "sire")
+
+# ``surface`` value of the all-surfaces total rows.
+ALL_SURFACES = ""
+
+# Kinds that also get one row per surface (feeds sire_surface_rate).
+_SURFACE_KINDS = frozenset({"sire"})
+
+# ``session.info`` key caching which kinds have a built ledger.
+_BUILT_KEY = "career_stats_built"
+
+
+def _name_column(kind: str):
+    if kind == "jockey":
+        return RaceEntry.jockey
+    if kind == "trainer":
+        return RaceEntry.trainer
+    if kind == "sire":
+        return Horse.sire
+    raise ValueError(f"Unknown career-stat kind: {kind!r}")
+
+
+def _day_counts(
+    session: Session,
+    kind: str,
+    *,
+    race_date: date_type | None = None,
+    names: set[str] | None = None,
+) -> dict[tuple[str, str, date_type], list[int]]:
+    """``{(name, surface, date): [runs, wins]}`` from ``race_entries``."""
+    column = _name_column(kind)
+    q = (
+        session.query(
+            column,
+            Race.surface,
+            Race.date,
+            func.count(RaceEntry.id),
+            func.sum(case((RaceEntry.finish_position == 1, 1), else_=0)),
+        )
+        .select_from(RaceEntry)
+        .join(Race, Race.id == RaceEntry.race_id)
+        .join(Horse, Horse.id == RaceEntry.horse_id)
+        .filter(
+            Race.status == RaceStatus.resulted,
+            RaceEntry.finish_position.isnot(None),
+            column.isnot(None),
+            column != "",
+        )
+    )
+    if race_date is not None:
+        q = q.filter(Race.date == race_date)
+    if names is not None:
+        q = q.filter(column.in_(names))
+
+    counts: dict[tuple[str, str, date_type], list[int]] = defaultdict(
+        lambda: [0, 0],
+    )
+    for name, surface, day, runs, wins in q.group_by(
+        column, Race.surface, Race.date,
+    ):
+        keys = [(name, ALL_SURFACES, day)]
+        if kind in _SURFACE_KINDS and surface:
+            keys.append((name, surface, day))
+        for key in keys:
+            counts[key][0] += int(runs or 0)
+            counts[key][1] += int(wins or 0)
+    return counts
+
+
+def rebuild_career_stats(
+    session: Session, kinds: tuple[str, ...] = CAREER_KINDS,
+) -> int:
+    """Recompute the ledger for ``kinds`` from scratch.
+
+    Returns the number of ledger rows written.  Caller commits.
+    """
+    written = 0
+    for kind in kinds:
+        session.query(CareerStat).filter(CareerStat.kind == kind).delete(
+            synchronize_session=False,
+        )
+        written += _write_rows(session, kind, _day_counts(session, kind))
+    session.info.pop(_BUILT_KEY, None)
+    return written
+
+
+def sync_career_names(session: Session, kind: str, names: set[str]) -> int:
+    """Recount ``names``' ledger rows after their attribution changed.
+
+    Used when runs gain a name after they were counted (the pedigree
+    crawl filling in ``Horse.sire``).  No-op until the ledger for
+    ``kind`` is built.  Returns the number of rows written; caller
+    commits.
+    """
+    if not names or not ledger_built(session, kind):
+        return 0
+    session.query(CareerStat).filter(
+        CareerStat.kind == kind, CareerStat.name.in_(names),
+    ).delete(synchronize_session=False)
+    return _write_rows(session, kind, _day_counts(session, kind, names=names))
+
+
+def _write_rows(
+    session: Session,
+    kind: str,
+    counts: dict[tuple[str, str, date_type], list[int]],
+) -> int:
+    rows: list[dict] = []
+    running: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0, 0])
+    for (name, surface, day), (runs, wins) in sorted(counts.items()):
+        total = running[(name, surface)]
+        total[0] += runs
+        total[1] += wins
+        rows.append({
+            "kind": kind, "name": name, "surface": surface, "date": day,
+            "day_runs": runs, "day_wins": wins,
+            "runs": total[0], "wins": total[1],
+        })
+    if rows:
+        session.execute(insert(CareerStat), rows)
+    return len(rows)
+
+
+def refresh_career_stats(session: Session, race: Race) -> None:
+    """Bring the ledger in line with ``race``'s (re)stored results.
+
+    No-op for kinds whose ledger hasn't been built yet — a partial
+    ledger would under-count, so the fallback scan stays in charge
+    until :func:`rebuild_career_stats` has run.
+    """
+    entries = (
+        session.query(RaceEntry)
+        .options(joinedload(RaceEntry.horse))
+        .filter(RaceEntry.race_id == race.id)
+        .all()
+    )
+    for kind in CAREER_KINDS:
+        if not ledger_built(session, kind):
+            continue
+        # Every name already counted on this date is recounted too: a
+        # re-stored card may have renamed an entry's jockey or trainer,
+        # and the old name's day row must give that run back.
+        stored = {
+            (row.name, row.surface): row
+            for row in session.query(CareerStat).filter(
+                CareerStat.kind == kind,
+                CareerStat.date == race.date,
+            )
+        }
+        names = {
+            name for name in (_entry_name(kind, e) for e in entries) if name
+        } | {name for name, _ in stored}
+        if not names:
+            continue
+        fresh = _day_counts(session, kind, race_date=race.date, names=names)
+        keys = {(name, surface) for name, surface, _ in fresh} | set(stored)
+        for name, surface in keys:
+            runs, wins = fresh.get((name, surface, race.date), (0, 0))
+            row = stored.get((name, surface))
+            if row is not None:
+                d_runs, d_wins = runs - row.day_runs, wins - row.day_wins
+                if d_runs == 0 and d_wins == 0:
+                    continue
+                if runs == 0:
+                    session.delete(row)
+                else:
+                    row.day_runs, row.day_wins = runs, wins
+                    row.runs += d_runs
+                    row.wins += d_wins
+            else:
+                if runs == 0:
+                    continue
+                d_runs, d_wins = runs, wins
+                prev_runs, prev_wins = _cumulative_before(
+                    session, kind, name, surface, race.date,
+                )
+                session.add(CareerStat(
+                    kind=kind, name=name, surface=surface, date=race.date,
+                    day_runs=runs, day_wins=wins,
+                    runs=prev_runs + runs, wins=prev_wins + wins,
+                ))
+            session.query(CareerStat).filter(
+                CareerStat.kind == kind,
+                CareerStat.name == name,
+                CareerStat.surface == surface,
+                CareerStat.date > race.date,
+            ).update(
+                {
+                    CareerStat.runs: CareerStat.runs + d_runs,
+                    CareerStat.wins: CareerStat.wins + d_wins,
+                },
+                synchronize_session=False,
+            )
+    session.flush()
+
+
+def lookup_career_counts(
+    session: Session,
+    kind: str,
+    name: str,
+    surface: str = ALL_SURFACES,
+    before_date: date_type | None = None,
+) -> tuple[int, int] | None:
+    """``(runs, wins)`` for ``name`` strictly before ``before_date``.
+
+    Returns ``None`` when the ledger for ``kind`` hasn't been built, so
+    callers can fall back to counting ``race_entries`` directly.
+    """
+    if not ledger_built(session, kind):
+        return None
+    return _cumulative_before(session, kind, name, surface, before_date)
+
+
+def lookup_career_counts_many(
+    session: Session,
+    kind: str,
+    names: set[str],
+    surface: str = ALL_SURFACES,
+    before_date: date_type | None = None,
+) -> dict[str, tuple[int, int]] | None:
+    """:func:`lookup_career_counts` for several names in one query.
+
+    Names with no ledger row before ``before_date`` are omitted.
+    Returns ``None`` when the ledger for ``kind`` hasn't been built.
+    """
+    if not ledger_built(session, kind):
+        return None
+    if not names:
+        return {}
+    filters = [
+        CareerStat.kind == kind,
+        CareerStat.name.in_(names),
+        CareerStat.surface == surface,
+    ]
+    if before_date is not None:
+        filters.append(CareerStat.date < before_date)
+    latest = (
+        session.query(
+            CareerStat.name, func.max(CareerStat.date).label("date"),
+        )
+        .filter(*filters)
+        .group_by(CareerStat.name)
+        .subquery()
+    )
+    rows = (
+        session.query(CareerStat.name, CareerStat.runs, CareerStat.wins)
+        .join(
+            latest,
+            (CareerStat.name == latest.c.name) & (CareerStat.date == latest.c.date),
+        )
+        .filter(CareerStat.kind == kind, CareerStat.surface == surface)
+    )
+    return {name: (int(runs), int(wins)) for name, runs, wins in rows}
+
+
+def _cumulative_before(
+    session: Session,
+    kind: str,
+    name: str,
+    surface: str,
+    before_date: date_type | None,
+) -> tuple[int, int]:
+    q = session.query(CareerStat.runs, CareerStat.wins).filter(
+        CareerStat.kind == kind,
+        CareerStat.name == name,
+        CareerStat.surface == surface,
+    )
+    if before_date is not None:
+        q = q.filter(CareerStat.date < before_date)
+    row = q.order_by(CareerStat.date.desc()).limit(1).first()
+    if row is None:
+        return 0, 0
+    return int(row.runs), int(row.wins)
+
+
+def ledger_built(session: Session, kind: str) -> bool:
+    """True once :func:`rebuild_career_stats` has populated ``kind``."""
+    built: set[str] = session.info.setdefault(_BUILT_KEY, set())
+    if kind in built:
+        return True
+    exists = (
+        session.query(CareerStat.id)
+        .filter(CareerStat.kind == kind)
+        .limit(1)
+        .first()
+    )
+    if exists is not None:
+        built.add(kind)
+        return True
+    return False
+
+
+def _entry_name(kind: str, entry: RaceEntry) -> str | None:
+    if kind == "jockey":
+        return entry.jockey
+    if kind == "trainer":
+        return entry.trainer
+    return entry.horse.sire if entry.horse is not None else None
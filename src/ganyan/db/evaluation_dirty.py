@@ -0,0 +1,29 @@
+"""Per-session record of race dates whose results changed.
+
+The write paths in :mod:`ganyan.scraper.backfill` mark each race date
+they result; whoever drives them — the CLI, the web routes, the
+scheduler — later hands the dates to
+:func:`~ganyan.predictor.evaluation_daily.refresh_dirty_evaluation_daily`
+to rescore them.  Living here keeps the scraper free of any predictor
+import.
+"""
+
+from __future__ import annotations
+
+from datetime import date as date_type
+
+from sqlalchemy.orm import Session
+
+
+# ``session.info`` key of race dates written since the last refresh.
+_DIRTY_KEY = "evaluation_daily_dirty"
+
+
+def mark_evaluation_dirty(session: Session, race_date: date_type) -> None:
+    """Note that ``race_date``'s results changed in this session."""
+    session.info.setdefault(_DIRTY_KEY, set()).add(race_date)
+
+
+def take_dirty_evaluation_dates(session: Session) -> set[date_type]:
+    """Race dates marked dirty in ``session`` since the last call."""
+    return session.info.pop(_DIRTY_KEY, set())
@@ -2,7 +2,8 @@ import enum
 from datetime import date as date_type, datetime
 
 from sqlalchemy import (
-    String, SmallInteger, Integer, Numeric, Date, DateTime, Enum, JSON, Text,
+    String, SmallInteger, Integer, Float, Numeric, Date, DateTime, Enum, JSON,
+    Text,
     ForeignKey, UniqueConstraint, Index, func,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -133,6 +134,10 @@ class RaceEntry(Base):
     horse_id: Mapped[int] = mapped_column(ForeignKey("horses.id"))
     gate_number: Mapped[int | None] = mapped_column(SmallInteger)
     jockey: Mapped[str | None] = mapped_column(String(200))
+    # Trainer as printed on this race's card.  ``Horse.trainer`` only
+    # holds the latest one, so trainer features read this column to
+    # credit each run to whoever trained the horse at the time.
+    trainer: Mapped[str | None] = mapped_column(String(200))
     weight_kg: Mapped[float | None] = mapped_column(Numeric(4, 1))
     hp: Mapped[float | None] = mapped_column(Numeric(5, 1))
     kgs: Mapped[int | None] = mapped_column(SmallInteger)
@@ -218,7 +223,13 @@ class Pick(Base):
         Index("ix_picks_race_id", "race_id"),
         Index("ix_picks_strategy", "strategy"),
         Index("ix_picks_generated_at", "generated_at"),
-        Index("ix_picks_graded", "graded"),
+        # Covers the ledger roll-ups in ``predictor.picks``: on Postgres
+        # the summed columns ride along, so they never touch the heap.
+        Index(
+            "ix_picks_graded_strategy_generated_at",
+            "graded", "strategy", "generated_at",
+            postgresql_include=["hit", "stake_tl", "payout_tl", "net_tl"],
+        ),
         UniqueConstraint(
             "race_id", "strategy", name="uq_picks_race_strategy",
         ),
@@ -255,6 +266,91 @@ class Pick(Base):
     )
 
 
+class CareerStat(Base):
+    """Daily cumulative run / win ledger for jockeys, trainers and sires.
+
+    One row per (kind, name, surface, date) on which the entity had at
+    least one finisher in a resulted race.  ``day_runs`` / ``day_wins``
+    hold that day's counts; ``runs`` / ``wins`` are cumulative *through*
+    that date, so the smoothed win rate as of any date is a single
+    indexed lookup of the latest row strictly before it.  ``surface`` is
+    ``""`` for the all-surfaces total; per-surface rows are kept only
+    for sires (the sire×surface feature).
+
+    Maintained incrementally by :mod:`ganyan.db.career_stats` when races
+    are marked resulted; ``ganyan db rebuild-career-stats`` recomputes
+    it from ``race_entries``.
+    """
+
+    __tablename__ = "career_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "kind", "name", "surface", "date", name="uq_career_stats_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16))  # jockey / trainer / sire
+    name: Mapped[str] = mapped_column(String(200))
+    surface: Mapped[str] = mapped_column(String(20), default="")
+    date: Mapped[date_type] = mapped_column(Date)
+    day_runs: Mapped[int] = mapped_column(Integer, default=0)
+    day_wins: Mapped[int] = mapped_column(Integer, default=0)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class EvaluationDaily(Base):
+    """Per-day prediction-accuracy sums behind the ``/history`` summary.
+
+    One row per (date, model_version).  ``model_version`` is ``""`` for
+    the live ``RaceEntry.predicted_probability`` slot (what ``/history``
+    shows); other rows score each version's latest :class:`Prediction`
+    per entry.  Columns are additive — counts and sums, never means — so
+    any date window is rolled up with a single ``SUM`` and the summary
+    costs the same however long the archive gets.
+
+    Calibration is kept at :data:`~ganyan.predictor.evaluation_daily.CALIBRATION_RESOLUTION`
+    1-point bins so any coarser bucketing that divides it can be rebuilt.
+
+    Maintained by :mod:`ganyan.predictor.evaluation_daily` when results
+    land; ``ganyan db rebuild-eval-metrics`` recomputes it from scratch.
+    """
+
+    __tablename__ = "evaluation_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "date", "model_version", name="uq_evaluation_daily_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    date: Mapped[date_type] = mapped_column(Date)
+    model_version: Mapped[str] = mapped_column(String(50), default="")
+    races: Mapped[int] = mapped_column(Integer, default=0)  # evaluated
+    skipped: Mapped[int] = mapped_column(Integer, default=0)  # no prediction / winner
+    top1_hits: Mapped[int] = mapped_column(Integer, default=0)
+    top3_hits: Mapped[int] = mapped_column(Integer, default=0)
+    ranked_races: Mapped[int] = mapped_column(Integer, default=0)
+    rank_sum: Mapped[int] = mapped_column(Integer, default=0)
+    prob_races: Mapped[int] = mapped_column(Integer, default=0)
+    prob_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    log_loss_races: Mapped[int] = mapped_column(Integer, default=0)
+    log_loss_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    brier_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    random_top1_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    agf_races: Mapped[int] = mapped_column(Integer, default=0)
+    agf_hits: Mapped[int] = mapped_column(Integer, default=0)
+    roi_payout_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    # Per-bin lists of length CALIBRATION_RESOLUTION.
+    calibration_counts: Mapped[list] = mapped_column(JSON)
+    calibration_prob_sums: Mapped[list] = mapped_column(JSON)
+    calibration_wins: Mapped[list] = mapped_column(JSON)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False,
+    )
+
+
 class Prediction(Base):
     """Audit history of predictions.
 
@@ -1,4 +1,4 @@
-from ganyan.predictor.bayesian import BayesianPredictor, Prediction
+from ganyan.predictor.bayesian import BayesianPredictor, Prediction, save_predictions
 from ganyan.predictor.evaluate import (
     RaceEvaluation,
     EvaluationSummary,
@@ -16,4 +16,5 @@ __all__ = [
     "evaluate_all",
     "extract_features",
     "HorseFeatures",
+    "save_predictions",
 ]
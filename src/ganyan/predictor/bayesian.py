@@ -2,8 +2,11 @@
 
 import math
 from dataclasses import dataclass, field
+from datetime import date
 
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ganyan.db.models import Prediction as PredictionRow, Race, RaceEntry
 from ganyan.predictor.features import extract_features, HorseFeatures
@@ -59,6 +62,64 @@ class Prediction:
     contributing_factors: dict = field(default_factory=dict)  # feature_name -> impact
 
 
+def save_predictions(
+    session: Session,
+    results: dict[int, list[Prediction]],
+    model_version: str,
+) -> int:
+    """Persist ``{race_id: predictions}`` in bulk; returns rows written.
+
+    Appends one ``predictions`` audit row per horse (never overwrites
+    prior runs) with a single multi-row INSERT, and sets
+    ``race_entries.predicted_probability`` with one executemany UPDATE
+    keyed by entry id — one round trip each per batch instead of one
+    unit-of-work object per horse.  Caller commits.
+    """
+    if not results:
+        return 0
+    entry_ids = {
+        (race_id, horse_id): entry_id
+        for entry_id, race_id, horse_id in session.query(
+            RaceEntry.id, RaceEntry.race_id, RaceEntry.horse_id,
+        ).filter(RaceEntry.race_id.in_(list(results)))
+    }
+    audit_rows: list[dict] = []
+    probabilities: dict[int, float] = {}
+    for race_id, predictions in results.items():
+        for p in predictions:
+            entry_id = entry_ids.get((race_id, p.horse_id))
+            if entry_id is None:
+                continue
+            probabilities[entry_id] = p.probability
+            audit_rows.append({
+                "race_entry_id": entry_id,
+                "model_version": model_version,
+                "probability": p.probability,
+                "confidence": p.confidence,
+                "factors": p.contributing_factors,
+            })
+    if not audit_rows:
+        return 0
+
+    session.execute(insert(PredictionRow), audit_rows)
+    session.execute(
+        update(RaceEntry),
+        [
+            {"id": entry_id, "predicted_probability": prob}
+            for entry_id, prob in probabilities.items()
+        ],
+    )
+    # Bulk UPDATE by primary key bypasses already-loaded objects; keep
+    # them in step so callers reading ``entry.predicted_probability``
+    # in the same session (e.g. pick generation) see the new value.
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, RaceEntry) and obj.id in probabilities:
+            set_committed_value(
+                obj, "predicted_probability", probabilities[obj.id],
+            )
+    return len(audit_rows)
+
+
 class BayesianPredictor:
     """Naive-Bayesian predictor combining multiple horse-racing features."""
 
@@ -69,29 +130,35 @@ class BayesianPredictor:
         """Predict and persist to both the ``race_entries`` slot (for quick
         lookup) and the ``predictions`` audit table (keeps every run).
         """
-        predictions = self.predict(race_id)
-        entries = {
-            (e.race_id, e.horse_id): e
-            for e in self.session.query(RaceEntry)
-            .filter(RaceEntry.race_id == race_id)
-            .all()
-        }
-        for p in predictions:
-            entry = entries.get((race_id, p.horse_id))
-            if entry is None:
-                continue
-            entry.predicted_probability = p.probability
-            # Append audit row (never overwrites prior predictions).
-            self.session.add(
-                PredictionRow(
-                    race_entry_id=entry.id,
-                    model_version=MODEL_VERSION,
-                    probability=p.probability,
-                    confidence=p.confidence,
-                    factors=p.contributing_factors,
-                )
-            )
-        return predictions
+        return self.predict_and_save_many([race_id])[race_id]
+
+    def predict_and_save_many(
+        self, race_ids: list[int],
+    ) -> dict[int, list[Prediction]]:
+        """:meth:`predict_and_save` for several races, keyed by race id.
+
+        Predictions are written in one batch via :func:`save_predictions`.
+        """
+        results = self.predict_many(race_ids)
+        save_predictions(self.session, results, MODEL_VERSION)
+        return results
+
+    def predict_many(self, race_ids: list[int]) -> dict[int, list[Prediction]]:
+        """:meth:`predict` for several races, keyed by race id.
+
+        Mirrors :meth:`MLPredictor.predict_many`; the Bayesian model has
+        no batch step to share, so this simply loops.
+        """
+        return {rid: self.predict(rid) for rid in dict.fromkeys(race_ids)}
+
+    def predict_date(self, race_date: date) -> dict[int, list[Prediction]]:
+        """:meth:`predict_many` over every race on ``race_date``."""
+        race_ids = [
+            rid for (rid,) in self.session.query(Race.id)
+            .filter(Race.date == race_date)
+            .order_by(Race.race_number)
+        ]
+        return self.predict_many(race_ids)
 
     def predict(self, race_id: int) -> list[Prediction]:
         """Predict win probabilities for all entries in a race.
@@ -123,7 +190,6 @@ class BayesianPredictor:
         for entry in entries:
             eid_seconds = parse_eid_to_seconds(entry.eid)
             last_six_parsed = parse_last_six(entry.last_six)
-            trainer_name = entry.horse.trainer if entry.horse else None
             features = extract_features(
                 eid_seconds=eid_seconds,
                 distance_meters=distance,
@@ -137,7 +203,7 @@ class BayesianPredictor:
                 field_avg_s20=field_avg_s20,
                 session=self.session,
                 jockey=entry.jockey,
-                trainer=trainer_name,
+                trainer=entry.trainer,
                 horse_id=entry.horse_id,
                 gate_number=entry.gate_number,
                 surface=race.surface,
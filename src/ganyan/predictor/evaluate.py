@@ -6,9 +6,11 @@ import math
 from dataclasses import dataclass, field
 from datetime import date as date_type
 
+import numpy as np
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from ganyan.db.models import Race, RaceEntry, RaceStatus
+from ganyan.db.models import Horse, Prediction, Race, RaceEntry, RaceStatus, Track
 
 
 @dataclass
@@ -139,6 +141,9 @@ def evaluate_all(
     session: Session,
     cutoff_date: date_type | None = None,
     num_calibration_bins: int = 10,
+    *,
+    to_date: date_type | None = None,
+    model_version: str | None = None,
 ) -> tuple[EvaluationSummary, list[RaceEvaluation]]:
     """Evaluate resulted races that have predictions.
 
@@ -151,30 +156,29 @@ def evaluate_all(
     num_calibration_bins:
         Number of equal-width probability buckets for the reliability
         diagram (default 10, i.e. deciles of predicted probability).
+    to_date:
+        If provided, only evaluate races on or before this date.
+    model_version:
+        Score this version's latest audit predictions instead of the
+        live ``predicted_probability`` slot.
+
+    Runs one query for the whole window and scores every race with
+    grouped NumPy operations; per race the result is identical to
+    :func:`evaluate_race`.
     """
-    races_q = (
-        session.query(Race)
-        .filter(Race.status == RaceStatus.resulted)
-    )
-    if cutoff_date is not None:
-        races_q = races_q.filter(Race.date >= cutoff_date)
-    resulted_races = (
-        races_q.order_by(Race.date.desc(), Race.race_number.desc()).all()
+    rows = load_evaluation_rows(
+        session,
+        cutoff_date=cutoff_date,
+        to_date=to_date,
+        model_version=model_version,
     )
+    metrics = score_races(rows)
 
-    evaluations: list[RaceEvaluation] = []
+    evaluations = race_evaluations(rows, metrics)
     skipped_unresulted = 0
-    skipped_unpredicted = 0
-    for race in resulted_races:
-        ev = evaluate_race(session, race.id)
-        if ev is None:
-            # evaluate_race returns None for three reasons: race not
-            # resulted, no predictions, or no winner identified.  We
-            # conservatively classify the last two as unpredicted; the
-            # first is already filtered by the query.
-            skipped_unpredicted += 1
-            continue
-        evaluations.append(ev)
+    # Races with no predictions or no identified winner; unresulted
+    # races are already filtered by the query.
+    skipped_unpredicted = len(rows.race_ids) - len(evaluations)
 
     if not evaluations:
         return (
@@ -197,77 +201,48 @@ def evaluate_all(
             [],
         )
 
-    total = len(evaluations)
-    top1_count = sum(1 for ev in evaluations if ev.top1_correct)
-    top3_count = sum(1 for ev in evaluations if ev.top3_correct)
-
-    ranks = [
-        ev.winner_predicted_rank
-        for ev in evaluations
-        if ev.winner_predicted_rank is not None
-    ]
-    avg_rank = sum(ranks) / len(ranks) if ranks else 0.0
-
-    probs = [
-        ev.winner_predicted_prob
-        for ev in evaluations
-        if ev.winner_predicted_prob is not None
-    ]
-    avg_prob = sum(probs) / len(probs) if probs else 0.0
-
-    # Log loss: -mean(log(predicted_prob_of_winner / 100)).
-    log_losses: list[float] = []
-    for ev in evaluations:
-        if ev.winner_predicted_prob is not None and ev.winner_predicted_prob > 0:
-            log_losses.append(-math.log(ev.winner_predicted_prob / 100.0))
-    log_loss = sum(log_losses) / len(log_losses) if log_losses else 0.0
-
-    # Brier score (multi-class): mean over races of sum_i (p_i - y_i)^2,
-    # where y_i is 1 for the winner and 0 otherwise.  Lower = sharper
-    # AND more accurate.  Measured against the full predicted field per
-    # race, not only the winner's probability.
-    brier_score = _compute_brier_score(session, evaluations)
-
-    # Random-picking baseline: if a race has N horses, random top-1 hits
-    # 1/N of the time.  Averaged over all evaluated races.
-    random_baseline = (
-        sum(1.0 / ev.num_horses for ev in evaluations if ev.num_horses > 0) / total
-    ) * 100.0
-
-    # AGF market baseline.
-    agf_decisions = [
-        ev.agf_leader_correct
-        for ev in evaluations
-        if ev.agf_leader_correct is not None
-    ]
-    agf_baseline = (
-        (sum(1 for x in agf_decisions if x) / len(agf_decisions)) * 100.0
-        if agf_decisions else None
-    )
-
-    # ROI simulation.  Without real parimutuel odds we use an AGF-implied
-    # payout proxy when available: payout ≈ 1 / (AGF/100).  Falls back to
-    # 1 / (predicted_prob/100) if AGF is missing — which is the same
-    # circular estimate as before, flagged here as a known limitation.
-    roi = _simulate_roi(session, evaluations)
-
-    # Reliability diagram (calibration).
-    calibration = _compute_calibration(
-        session, evaluations, num_bins=num_calibration_bins,
-    )
+    ev = metrics.evaluated
+    total = int(ev.sum())
+    rank = metrics.winner_rank[ev]
+    ranked = rank > 0
+    prob = metrics.winner_prob[ev]
+    has_prob = ~np.isnan(prob)
+    positive = has_prob & (prob > 0)
+    agf = metrics.agf_correct[ev]
+    agf_known = agf >= 0
 
     summary = EvaluationSummary(
         total_races=total,
-        top1_accuracy=(top1_count / total) * 100.0,
-        top3_accuracy=(top3_count / total) * 100.0,
-        avg_winner_rank=avg_rank,
-        avg_winner_probability=avg_prob,
-        log_loss=log_loss,
-        brier_score=brier_score,
-        random_baseline_top1=random_baseline,
-        agf_baseline_top1=agf_baseline,
-        roi_simulation=roi,
-        calibration=calibration,
+        top1_accuracy=float((rank == 1).sum()) / total * 100.0,
+        top3_accuracy=float(((rank > 0) & (rank <= 3)).sum()) / total * 100.0,
+        avg_winner_rank=float(rank[ranked].mean()) if ranked.any() else 0.0,
+        avg_winner_probability=(
+            float(prob[has_prob].mean()) if has_prob.any() else 0.0
+        ),
+        # Log loss: -mean(log(predicted_prob_of_winner / 100)).
+        log_loss=(
+            float(-np.log(prob[positive] / 100.0).mean()) if positive.any() else 0.0
+        ),
+        # Brier score (multi-class): mean over races of sum_i (p_i - y_i)^2,
+        # where y_i is 1 for the winner and 0 otherwise.  Lower = sharper
+        # AND more accurate.  Measured against the full predicted field
+        # per race, not only the winner's probability.
+        brier_score=float(metrics.brier[ev].mean()),
+        # Random-picking baseline: if a race has N horses, random top-1
+        # hits 1/N of the time.  Averaged over all evaluated races.
+        random_baseline_top1=float((1.0 / metrics.num_horses[ev]).mean()) * 100.0,
+        agf_baseline_top1=(
+            float(agf[agf_known].mean()) * 100.0 if agf_known.any() else None
+        ),
+        # ROI simulation: flat 100 TL on the top pick.  Without real
+        # parimutuel odds the payout is AGF-implied (1 / (AGF/100)),
+        # falling back to the model-implied 1 / (p/100) — the same
+        # circular estimate as before, flagged as a known limitation.
+        roi_simulation=float(metrics.roi_payout[ev].sum() - 100.0 * total)
+        / (100.0 * total),
+        calibration=_compute_calibration(
+            rows, metrics, num_bins=num_calibration_bins,
+        ),
         cutoff_date=cutoff_date,
         skipped_unresulted=skipped_unresulted,
         skipped_unpredicted=skipped_unpredicted,
@@ -275,108 +250,284 @@ def evaluate_all(
     return summary, evaluations
 
 
-def _compute_brier_score(
-    session: Session, evaluations: list[RaceEvaluation],
-) -> float:
-    """Multi-class Brier score averaged over evaluated races."""
-    total = 0.0
-    count = 0
-    for ev in evaluations:
-        entries = (
-            session.query(RaceEntry).filter(RaceEntry.race_id == ev.race_id).all()
+# ---------------------------------------------------------------------------
+# Vectorised scoring
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class EvaluationRows:
+    """Entries of resulted races, one array slot per entry.
+
+    Races are ordered by date desc, race number desc; entries within a
+    race keep insertion (id) order, which is what per-race tie-breaking
+    relies on.  ``race_index`` maps each entry to its race (``-1`` for
+    the placeholder row of a race without entries); per-race fields are
+    indexed by race.
+    """
+
+    race_ids: np.ndarray
+    dates: list[date_type]
+    race_numbers: np.ndarray
+    tracks: list[str]
+    race_index: np.ndarray  # per entry
+    horse_ids: np.ndarray
+    horse_names: list[str]
+    probability: np.ndarray  # NaN where no prediction
+    won: np.ndarray  # finish_position == 1
+    agf: np.ndarray  # NaN where missing
+
+
+@dataclass
+class RaceMetrics:
+    """Per-race scoring arrays produced by :func:`score_races`.
+
+    ``winner_rank`` is 0 when the winner had no prediction;
+    ``agf_correct`` is -1 when no entry had an AGF; ``roi_payout`` is
+    the flat-100 TL top-pick payout (0 on a loss).
+    """
+
+    evaluated: np.ndarray
+    num_horses: np.ndarray
+    winner_row: np.ndarray
+    winner_prob: np.ndarray
+    winner_rank: np.ndarray
+    brier: np.ndarray
+    agf_correct: np.ndarray
+    roi_payout: np.ndarray
+
+
+def race_evaluations(
+    rows: EvaluationRows, metrics: RaceMetrics,
+) -> list[RaceEvaluation]:
+    """:class:`RaceEvaluation` for every evaluated race in ``rows``."""
+    return [
+        RaceEvaluation(
+            race_id=int(rows.race_ids[r]),
+            track=rows.tracks[r],
+            date=rows.dates[r],
+            race_number=int(rows.race_numbers[r]),
+            num_horses=int(metrics.num_horses[r]),
+            winner_name=rows.horse_names[metrics.winner_row[r]],
+            winner_predicted_prob=_none_if_nan(metrics.winner_prob[r]),
+            winner_predicted_rank=(
+                int(metrics.winner_rank[r]) if metrics.winner_rank[r] > 0 else None
+            ),
+            top1_correct=bool(metrics.winner_rank[r] == 1),
+            top3_correct=bool(0 < metrics.winner_rank[r] <= 3),
+            agf_leader_correct=(
+                bool(metrics.agf_correct[r]) if metrics.agf_correct[r] >= 0 else None
+            ),
         )
-        predicted = [
-            (float(e.predicted_probability) / 100.0, e.finish_position == 1)
-            for e in entries if e.predicted_probability is not None
-        ]
-        if not predicted:
-            continue
-        total += sum((p - (1.0 if won else 0.0)) ** 2 for p, won in predicted)
-        count += 1
-    return total / count if count else 0.0
-
-
-def _simulate_roi(
-    session: Session, evaluations: list[RaceEvaluation],
-) -> float:
-    """Simulate flat 100 TL bets on the model's top pick.
-
-    Prefers AGF-implied odds (a rough TJK market proxy) when available
-    and falls back to model-implied odds.  Result is fractional ROI:
-    0.0 = break-even, 0.15 = +15%, -0.20 = -20%.
+        for r in np.nonzero(metrics.evaluated)[0]
+    ]
+
+
+def load_evaluation_rows(
+    session: Session,
+    *,
+    cutoff_date: date_type | None = None,
+    to_date: date_type | None = None,
+    model_version: str | None = None,
+) -> EvaluationRows:
+    """Fetch every resulted race in the window with one query.
+
+    Probabilities come from the live ``predicted_probability`` slot, or
+    with ``model_version`` from that version's latest audit
+    :class:`Prediction` per entry.
     """
-    total_bet = 0.0
-    total_payout = 0.0
-    for ev in evaluations:
-        bet = 100.0
-        total_bet += bet
-        if not ev.top1_correct:
-            continue
-
-        entries = (
-            session.query(RaceEntry).filter(RaceEntry.race_id == ev.race_id).all()
+    if model_version is None:
+        probability = RaceEntry.predicted_probability
+    else:
+        latest = (
+            session.query(
+                Prediction.race_entry_id.label("race_entry_id"),
+                func.max(Prediction.id).label("prediction_id"),
+            )
+            .filter(Prediction.model_version == model_version)
+            .group_by(Prediction.race_entry_id)
+            .subquery()
         )
-        top_pick = max(
-            (e for e in entries if e.predicted_probability is not None),
-            key=lambda e: float(e.predicted_probability),
-            default=None,
+        probability = Prediction.probability
+    q = (
+        session.query(
+            Race.id, Race.date, Race.race_number, Track.name,
+            RaceEntry.horse_id, Horse.name,
+            probability, RaceEntry.finish_position,
+            RaceEntry.agf,
         )
-        if top_pick is None:
-            continue
-        # Prefer AGF-implied payout.
-        if top_pick.agf is not None and float(top_pick.agf) > 0:
-            implied_prob = float(top_pick.agf) / 100.0
-        elif top_pick.predicted_probability is not None and float(top_pick.predicted_probability) > 0:
-            implied_prob = float(top_pick.predicted_probability) / 100.0
-        else:
-            continue
-        total_payout += bet / implied_prob
+        .select_from(Race)
+        .outerjoin(Track, Track.id == Race.track_id)
+        .outerjoin(RaceEntry, RaceEntry.race_id == Race.id)
+        .outerjoin(Horse, Horse.id == RaceEntry.horse_id)
+        .filter(Race.status == RaceStatus.resulted)
+    )
+    if model_version is not None:
+        q = q.outerjoin(
+            latest, latest.c.race_entry_id == RaceEntry.id,
+        ).outerjoin(Prediction, Prediction.id == latest.c.prediction_id)
+    if cutoff_date is not None:
+        q = q.filter(Race.date >= cutoff_date)
+    if to_date is not None:
+        q = q.filter(Race.date <= to_date)
+    q = q.order_by(
+        Race.date.desc(), Race.race_number.desc(), Race.id, RaceEntry.id,
+    )
+
+    race_ids: list[int] = []
+    dates: list[date_type] = []
+    race_numbers: list[int] = []
+    tracks: list[str] = []
+    race_index: list[int] = []
+    horse_ids: list[int] = []
+    horse_names: list[str] = []
+    probability: list[float] = []
+    won: list[bool] = []
+    agf: list[float] = []
+    for (race_id, day, number, track, horse_id, horse_name, prob, finish,
+         agf_value) in q:
+        if not race_ids or race_ids[-1] != race_id:
+            race_ids.append(race_id)
+            dates.append(day)
+            race_numbers.append(number)
+            tracks.append(track or "?")
+        if horse_id is None:
+            continue  # race without entries
+        race_index.append(len(race_ids) - 1)
+        horse_ids.append(horse_id)
+        horse_names.append(horse_name or "?")
+        probability.append(float(prob) if prob is not None else math.nan)
+        won.append(finish == 1)
+        agf.append(float(agf_value) if agf_value is not None else math.nan)
+
+    return EvaluationRows(
+        race_ids=np.array(race_ids, dtype=np.int64),
+        dates=dates,
+        race_numbers=np.array(race_numbers, dtype=np.int64),
+        tracks=tracks,
+        race_index=np.array(race_index, dtype=np.int64),
+        horse_ids=np.array(horse_ids, dtype=np.int64),
+        horse_names=horse_names,
+        probability=np.array(probability, dtype=np.float64),
+        won=np.array(won, dtype=bool),
+        agf=np.array(agf, dtype=np.float64),
+    )
 
-    return (total_payout - total_bet) / total_bet if total_bet > 0 else 0.0
+
+def score_races(rows: EvaluationRows) -> RaceMetrics:
+    """Score every race in ``rows`` at once with grouped array ops."""
+    n_races = len(rows.race_ids)
+    race = rows.race_index
+    prob = rows.probability
+    predicted = ~np.isnan(prob)
+    row = np.arange(len(race))
+
+    num_horses = np.bincount(race, minlength=n_races)
+    num_predicted = np.bincount(race, weights=predicted, minlength=n_races)
+
+    # Winner = first finisher-1 row of each race.
+    winner_row = np.full(n_races, -1, dtype=np.int64)
+    win_races, first = np.unique(race[rows.won], return_index=True)
+    winner_row[win_races] = row[rows.won][first]
+    has_winner = winner_row >= 0
+    evaluated = has_winner & (num_predicted > 0)
+
+    winner_prob = np.full(n_races, np.nan)
+    winner_prob[has_winner] = prob[winner_row[has_winner]]
+
+    # Winner's rank among predicted entries, ties broken by entry order
+    # (a stable descending sort): 1 + rows strictly ahead + equal rows
+    # listed earlier.
+    wp = winner_prob[race]
+    ahead = predicted & ((prob > wp) | ((prob == wp) & (row < winner_row[race])))
+    winner_rank = np.bincount(race, weights=ahead, minlength=n_races) + 1
+    winner_rank = np.where(np.isnan(winner_prob), 0, winner_rank).astype(np.int64)
+
+    outcome = rows.won.astype(np.float64)
+    brier = np.bincount(
+        race[predicted],
+        weights=(prob[predicted] / 100.0 - outcome[predicted]) ** 2,
+        minlength=n_races,
+    )
+
+    # AGF leader (first max in entry order) vs the winner.
+    agf_leader = _first_argmax(race, rows.agf, n_races)
+    agf_correct = np.full(n_races, -1, dtype=np.int64)
+    known = agf_leader >= 0
+    agf_correct[known] = (agf_leader[known] == winner_row[known]).astype(np.int64)
+
+    # ROI payout for a top-pick win: 100 / implied probability.
+    top_pick = _first_argmax(race, prob, n_races)
+    roi_payout = np.zeros(n_races)
+    hit = (winner_rank == 1) & (top_pick >= 0)
+    pick = top_pick[hit]
+    pick_agf = rows.agf[pick]
+    pick_prob = prob[pick]
+    implied = np.where(
+        pick_agf > 0, pick_agf, np.where(pick_prob > 0, pick_prob, np.nan),
+    ) / 100.0
+    roi_payout[hit] = np.nan_to_num(100.0 / implied, nan=0.0)
+
+    return RaceMetrics(
+        evaluated=evaluated,
+        num_horses=num_horses,
+        winner_row=winner_row,
+        winner_prob=winner_prob,
+        winner_rank=winner_rank,
+        brier=brier,
+        agf_correct=agf_correct,
+        roi_payout=roi_payout,
+    )
+
+
+def _first_argmax(race: np.ndarray, values: np.ndarray, n_races: int) -> np.ndarray:
+    """Row of each race's first maximum (NaN ignored); -1 if none."""
+    out = np.full(n_races, -1, dtype=np.int64)
+    present = ~np.isnan(values)
+    if not present.any():
+        return out
+    best = np.full(n_races, -np.inf)
+    np.maximum.at(best, race[present], values[present])
+    is_best = present & (values == best[race])
+    rows = np.nonzero(is_best)[0]
+    races, first = np.unique(race[rows], return_index=True)
+    out[races] = rows[first]
+    return out
+
+
+def _none_if_nan(value: float) -> float | None:
+    return None if math.isnan(value) else float(value)
 
 
 def _compute_calibration(
-    session: Session,
-    evaluations: list[RaceEvaluation],
+    rows: EvaluationRows,
+    metrics: RaceMetrics,
     num_bins: int = 10,
 ) -> list[CalibrationBucket]:
     """Reliability diagram: bucket predictions, compare mean pred to actual."""
-    race_ids = [ev.race_id for ev in evaluations]
-    if not race_ids:
+    mask = ~np.isnan(rows.probability) & metrics.evaluated[rows.race_index]
+    if not mask.any():
         return []
-
-    entries = (
-        session.query(RaceEntry)
-        .filter(
-            RaceEntry.race_id.in_(race_ids),
-            RaceEntry.predicted_probability.isnot(None),
-        )
-        .all()
-    )
+    prob = rows.probability[mask]
+    won = rows.won[mask]
 
     bin_width = 100.0 / num_bins
-    bins: list[list[tuple[float, bool]]] = [[] for _ in range(num_bins)]
-    for e in entries:
-        prob = float(e.predicted_probability)
-        # Clamp to [0, 100) so bin index stays in range.
-        idx = min(int(prob / bin_width), num_bins - 1)
-        bins[idx].append((prob, e.finish_position == 1))
+    # Clamp to [0, 100) so bin index stays in range.
+    idx = np.clip((prob / bin_width).astype(np.int64), 0, num_bins - 1)
+    counts = np.bincount(idx, minlength=num_bins)
+    pred_sums = np.bincount(idx, weights=prob, minlength=num_bins)
+    win_counts = np.bincount(idx, weights=won, minlength=num_bins)
 
     out: list[CalibrationBucket] = []
-    for i, bucket in enumerate(bins):
-        if not bucket:
-            continue
+    for i in np.nonzero(counts)[0]:
         lower = i * bin_width
-        upper = lower + bin_width
-        mean_pred = sum(p for p, _ in bucket) / len(bucket)
-        actual = sum(1 for _, won in bucket if won) / len(bucket) * 100.0
         out.append(
             CalibrationBucket(
                 lower=lower,
-                upper=upper,
-                count=len(bucket),
-                mean_predicted=mean_pred,
-                actual_win_rate=actual,
+                upper=lower + bin_width,
+                count=int(counts[i]),
+                mean_predicted=float(pred_sums[i] / counts[i]),
+                actual_win_rate=float(win_counts[i] / counts[i] * 100.0),
             )
         )
     return out
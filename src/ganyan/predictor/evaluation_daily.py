@@ -0,0 +1,339 @@
+"""Maintenance and roll-up for the :class:`EvaluationDaily` metrics table.
+
+:func:`~ganyan.predictor.evaluate.evaluate_all` rescored every resulted
+race on each ``/history`` view, so the page got slower as the archive
+grew.  The table keeps per-day additive sums instead — hit counts, rank
+sums, log-loss / Brier sums and fine calibration bins — and the summary
+for any date window is rebuilt from those sums.
+
+Lifecycle:
+
+- :func:`rebuild_evaluation_daily` recomputes the table from
+  ``race_entries`` and ``predictions`` (``ganyan db rebuild-eval-metrics``).
+  Until it has run once the table is empty and readers fall back to
+  :func:`~ganyan.predictor.evaluate.evaluate_all`.
+- :func:`refresh_evaluation_daily` rescores whole dates and replaces
+  their rows.  Every write path that marks races resulted
+  (:func:`~ganyan.scraper.backfill.store_historical_race`,
+  :func:`~ganyan.scraper.backfill.update_race_results`) records the
+  race date with :func:`~ganyan.db.evaluation_dirty.mark_evaluation_dirty`;
+  the CLI, web and scheduler callers of those paths call
+  :func:`refresh_dirty_evaluation_daily` once the run has stored its
+  races, so re-polling is a no-op.
+
+Re-predicting a race after it resulted changes the live slot without
+touching the table; rebuild to pick that up.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date as date_type
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ganyan.db.evaluation_dirty import take_dirty_evaluation_dates
+from ganyan.db.models import EvaluationDaily, Prediction, Race, RaceEntry, RaceStatus
+from ganyan.predictor.evaluate import (
+    CalibrationBucket,
+    EvaluationRows,
+    EvaluationSummary,
+    RaceMetrics,
+    load_evaluation_rows,
+    score_races,
+)
+
+
+# ``model_version`` of the rows scoring ``RaceEntry.predicted_probability``.
+LIVE_MODEL_VERSION = ""
+
+# Number of 1-point calibration bins stored per row; the roll-up can
+# re-bucket into any count that divides it.
+CALIBRATION_RESOLUTION = 100
+
+# ``session.info`` key caching whether the table has been built.
+_BUILT_KEY = "evaluation_daily_built"
+
+
+def daily_sums(rows: EvaluationRows, metrics: RaceMetrics) -> list[dict]:
+    """Per-date :class:`EvaluationDaily` column values for scored ``rows``."""
+    if len(rows.race_ids) == 0:
+        return []
+    days, day_of_race = np.unique(
+        np.array(rows.dates, dtype=object), return_inverse=True,
+    )
+    n_days = len(days)
+    ev = metrics.evaluated
+    rank = metrics.winner_rank
+    prob = metrics.winner_prob
+    has_prob = ev & ~np.isnan(prob)
+    positive = has_prob & (np.nan_to_num(prob) > 0)
+    ranked = ev & (rank > 0)
+    agf_known = ev & (metrics.agf_correct >= 0)
+
+    def _per_day(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(day_of_race, weights=weights, minlength=n_days)
+
+    # -log(p / 100) of the winner; 0 where it had no positive probability.
+    winner_log_loss = -np.log(np.where(positive, prob, 100.0) / 100.0)
+    columns = {
+        "races": _per_day(ev),
+        "skipped": _per_day(~ev),
+        "top1_hits": _per_day(ev & (rank == 1)),
+        "top3_hits": _per_day(ranked & (rank <= 3)),
+        "ranked_races": _per_day(ranked),
+        "rank_sum": _per_day(np.where(ranked, rank, 0)),
+        "prob_races": _per_day(has_prob),
+        "prob_sum": _per_day(np.where(has_prob, np.nan_to_num(prob), 0.0)),
+        "log_loss_races": _per_day(positive),
+        "log_loss_sum": _per_day(winner_log_loss),
+        "brier_sum": _per_day(np.where(ev, metrics.brier, 0.0)),
+        "random_top1_sum": _per_day(
+            np.where(ev, 1.0 / np.maximum(metrics.num_horses, 1), 0.0),
+        ),
+        "agf_races": _per_day(agf_known),
+        "agf_hits": _per_day(agf_known & (metrics.agf_correct == 1)),
+        "roi_payout_sum": _per_day(np.where(ev, metrics.roi_payout, 0.0)),
+    }
+
+    # Calibration over predicted entries of evaluated races.
+    mask = ~np.isnan(rows.probability) & ev[rows.race_index]
+    entry_prob = rows.probability[mask]
+    fine = np.clip(
+        (entry_prob / (100.0 / CALIBRATION_RESOLUTION)).astype(np.int64),
+        0, CALIBRATION_RESOLUTION - 1,
+    )
+    key = day_of_race[rows.race_index[mask]] * CALIBRATION_RESOLUTION + fine
+    size = n_days * CALIBRATION_RESOLUTION
+    shape = (n_days, CALIBRATION_RESOLUTION)
+    counts = np.bincount(key, minlength=size).reshape(shape)
+    prob_sums = np.bincount(key, weights=entry_prob, minlength=size).reshape(shape)
+    wins = np.bincount(key, weights=rows.won[mask], minlength=size).reshape(shape)
+
+    out: list[dict] = []
+    for i, day in enumerate(days):
+        row = {"date": day}
+        for name, values in columns.items():
+            if name.endswith("_sum") and name != "rank_sum":
+                row[name] = float(values[i])
+            else:
+                row[name] = int(values[i])
+        row["calibration_counts"] = counts[i].tolist()
+        row["calibration_prob_sums"] = prob_sums[i].tolist()
+        row["calibration_wins"] = wins[i].astype(np.int64).tolist()
+        out.append(row)
+    return out
+
+
+def _score_window(
+    session: Session,
+    model_version: str,
+    *,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+    dates: set[date_type] | None = None,
+) -> list[dict]:
+    rows = load_evaluation_rows(
+        session,
+        cutoff_date=from_date,
+        to_date=to_date,
+        model_version=None if model_version == LIVE_MODEL_VERSION else model_version,
+    )
+    out = []
+    for values in daily_sums(rows, score_races(rows)):
+        if dates is not None and values["date"] not in dates:
+            continue
+        # Version rows only exist where that version scored something;
+        # the live row also records days that were skipped entirely.
+        if values["races"] == 0 and (
+            model_version != LIVE_MODEL_VERSION or values["skipped"] == 0
+        ):
+            continue
+        values["model_version"] = model_version
+        out.append(values)
+    return out
+
+
+def _model_versions(
+    session: Session, dates: set[date_type] | None = None,
+) -> list[str]:
+    """Audit model versions with predictions on resulted races."""
+    q = (
+        session.query(Prediction.model_version)
+        .join(RaceEntry, RaceEntry.id == Prediction.race_entry_id)
+        .join(Race, Race.id == RaceEntry.race_id)
+        .filter(Race.status == RaceStatus.resulted)
+    )
+    if dates is not None:
+        q = q.filter(Race.date.in_(dates))
+    return sorted(
+        {v for (v,) in q.distinct() if v and v != LIVE_MODEL_VERSION},
+    )
+
+
+def rebuild_evaluation_daily(session: Session) -> int:
+    """Recompute the whole table.  Returns rows written; caller commits."""
+    session.query(EvaluationDaily).delete(synchronize_session=False)
+    rows: list[dict] = []
+    for version in [LIVE_MODEL_VERSION, *_model_versions(session)]:
+        rows.extend(_score_window(session, version))
+    if rows:
+        session.execute(insert(EvaluationDaily), rows)
+    session.info.pop(_BUILT_KEY, None)
+    return len(rows)
+
+
+def refresh_evaluation_daily(
+    session: Session, dates: Iterable[date_type],
+) -> int:
+    """Rescore ``dates`` and replace their rows.  Returns rows written.
+
+    No-op until :func:`rebuild_evaluation_daily` has run — a table
+    holding only recent days would under-count every window.
+    """
+    dates = set(dates)
+    if not dates or not evaluation_daily_built(session):
+        return 0
+    session.query(EvaluationDaily).filter(
+        EvaluationDaily.date.in_(dates),
+    ).delete(synchronize_session=False)
+    rows: list[dict] = []
+    for version in [LIVE_MODEL_VERSION, *_model_versions(session, dates)]:
+        rows.extend(_score_window(
+            session, version,
+            from_date=min(dates), to_date=max(dates), dates=dates,
+        ))
+    if rows:
+        session.execute(insert(EvaluationDaily), rows)
+    session.flush()
+    return len(rows)
+
+
+def refresh_dirty_evaluation_daily(session: Session) -> int:
+    """Rescore every date marked dirty in ``session``; caller commits."""
+    return refresh_evaluation_daily(session, take_dirty_evaluation_dates(session))
+
+
+def evaluation_daily_built(session: Session) -> bool:
+    """True once :func:`rebuild_evaluation_daily` has populated the table."""
+    if session.info.get(_BUILT_KEY):
+        return True
+    exists = session.query(EvaluationDaily.id).limit(1).first()
+    if exists is not None:
+        session.info[_BUILT_KEY] = True
+        return True
+    return False
+
+
+def summarize_evaluation_daily(
+    session: Session,
+    *,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+    model_version: str = LIVE_MODEL_VERSION,
+    num_calibration_bins: int = 10,
+) -> EvaluationSummary | None:
+    """Roll stored day rows up into an :class:`EvaluationSummary`.
+
+    Matches :func:`~ganyan.predictor.evaluate.evaluate_all` over the
+    same window; cost depends on the number of days in the window, not
+    on how many races or entries they hold.  Returns ``None`` when the
+    table hasn't been built, so callers can fall back to a full scan.
+    """
+    if CALIBRATION_RESOLUTION % num_calibration_bins:
+        raise ValueError(
+            f"num_calibration_bins must divide {CALIBRATION_RESOLUTION}, "
+            f"got {num_calibration_bins}"
+        )
+    if not evaluation_daily_built(session):
+        return None
+
+    q = session.query(EvaluationDaily).filter(
+        EvaluationDaily.model_version == model_version,
+    )
+    if from_date is not None:
+        q = q.filter(EvaluationDaily.date >= from_date)
+    if to_date is not None:
+        q = q.filter(EvaluationDaily.date <= to_date)
+    days = q.all()
+
+    def _total(name: str) -> float:
+        return sum(getattr(d, name) for d in days)
+
+    total = int(_total("races"))
+    skipped = int(_total("skipped"))
+    if total == 0:
+        return EvaluationSummary(
+            total_races=0,
+            top1_accuracy=0.0,
+            top3_accuracy=0.0,
+            avg_winner_rank=0.0,
+            avg_winner_probability=0.0,
+            log_loss=0.0,
+            brier_score=0.0,
+            random_baseline_top1=0.0,
+            agf_baseline_top1=None,
+            roi_simulation=0.0,
+            calibration=[],
+            cutoff_date=from_date,
+            skipped_unpredicted=skipped,
+        )
+
+    ranked = _total("ranked_races")
+    prob_races = _total("prob_races")
+    log_loss_races = _total("log_loss_races")
+    agf_races = _total("agf_races")
+    return EvaluationSummary(
+        total_races=total,
+        top1_accuracy=_total("top1_hits") / total * 100.0,
+        top3_accuracy=_total("top3_hits") / total * 100.0,
+        avg_winner_rank=_total("rank_sum") / ranked if ranked else 0.0,
+        avg_winner_probability=(
+            _total("prob_sum") / prob_races if prob_races else 0.0
+        ),
+        log_loss=(
+            _total("log_loss_sum") / log_loss_races if log_loss_races else 0.0
+        ),
+        brier_score=_total("brier_sum") / total,
+        random_baseline_top1=_total("random_top1_sum") / total * 100.0,
+        agf_baseline_top1=(
+            _total("agf_hits") / agf_races * 100.0 if agf_races else None
+        ),
+        roi_simulation=(_total("roi_payout_sum") - 100.0 * total) / (100.0 * total),
+        calibration=_rollup_calibration(days, num_calibration_bins),
+        cutoff_date=from_date,
+        skipped_unpredicted=skipped,
+    )
+
+
+def _rollup_calibration(
+    days: list[EvaluationDaily], num_bins: int,
+) -> list[CalibrationBucket]:
+    width = CALIBRATION_RESOLUTION // num_bins
+
+    def _coarse(column: str) -> np.ndarray:
+        fine = np.zeros(CALIBRATION_RESOLUTION)
+        for d in days:
+            fine += np.asarray(getattr(d, column), dtype=np.float64)
+        return fine.reshape(num_bins, width).sum(axis=1)
+
+    counts = _coarse("calibration_counts")
+    pred_sums = _coarse("calibration_prob_sums")
+    win_counts = _coarse("calibration_wins")
+
+    bin_width = 100.0 / num_bins
+    out: list[CalibrationBucket] = []
+    for i in np.nonzero(counts)[0]:
+        lower = i * bin_width
+        out.append(
+            CalibrationBucket(
+                lower=lower,
+                upper=lower + bin_width,
+                count=int(counts[i]),
+                mean_predicted=float(pred_sums[i] / counts[i]),
+                actual_win_rate=float(win_counts[i] / counts[i] * 100.0),
+            )
+        )
+    return out
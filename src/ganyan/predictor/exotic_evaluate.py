@@ -11,22 +11,36 @@ This module replays resulted races and computes:
 - Per-pool breakdown.
 
 Use via :func:`evaluate_pool` or the ``ganyan exotics-backtest`` CLI.
+With ``model_version`` set, probabilities are replayed from the
+``predictions`` audit table (see :mod:`ganyan.predictor.replay`)
+instead of re-running the predictor on every race.
 """
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date as date_type
 from typing import Callable, Iterable
 
+import numpy as np
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from ganyan.db import get_session
 from ganyan.db.models import Race, RaceEntry, RaceStatus
 from ganyan.predictor.bayesian import BayesianPredictor
+from ganyan.predictor.bootstrap import (
+    DEFAULT_CONFIDENCE, DEFAULT_REPLICATES, RoiInterval, bootstrap_roi,
+)
 from ganyan.predictor.exotics import (
     Combo, dortlu_probabilities, ganyan_probabilities,
-    ikili_probabilities, sirali_ikili_probabilities, uclu_probabilities,
+    ikili_probabilities, sirali_ikili_probabilities, top_n_combos,
+    uclu_probabilities,
 )
+from ganyan.predictor.prob_matrix import ProbabilityMatrix
+from ganyan.predictor.replay import StoredPredictor
 
 
 # Which race-level payout column corresponds to which pool.
@@ -67,6 +81,15 @@ class PoolResult:
     total_payout_tl: float = 0.0
     misses_without_payout: int = 0  # races where our combo won but payout is NULL
     per_race: list[dict] = field(default_factory=list)
+    # Per bet race, in replay order, with its position among all
+    # ``replayed`` races of the window.
+    race_stakes: list[float] = field(default_factory=list, repr=False)
+    race_payouts: list[float] = field(default_factory=list, repr=False)
+    race_index: list[int] = field(default_factory=list, repr=False)
+    # Resulted races in the window, bet or not — the bootstrap's
+    # resampling unit, as in :func:`~ganyan.predictor.sweep.sweep`.
+    replayed: int = 0
+    roi_ci: RoiInterval | None = None
 
     @property
     def hit_rate(self) -> float:
@@ -89,6 +112,7 @@ class PoolResult:
             "payout_tl": round(self.total_payout_tl, 2),
             "roi_pct": round(self.roi * 100.0, 2),
             "skipped_missing_payout": self.misses_without_payout,
+            **(self.roi_ci.as_dict() if self.roi_ci is not None else {}),
         }
 
 
@@ -118,6 +142,26 @@ def _combo_matches(
     return our.horses[0] == actual[0]
 
 
+def _resolve_predictor(
+    session: Session,
+    predictor_factory: Callable[[Session], object] | None,
+    model_version: str | None,
+    live_fallback: bool,
+    from_date: date_type | None,
+    to_date: date_type | None,
+) -> object:
+    predictor_factory = predictor_factory or (lambda s: BayesianPredictor(s))
+    if model_version is None:
+        return predictor_factory(session)
+    return StoredPredictor(
+        session,
+        model_version,
+        from_date=from_date,
+        to_date=to_date,
+        fallback=predictor_factory(session) if live_fallback else None,
+    )
+
+
 def evaluate_pool(
     session: Session,
     pool: str,
@@ -128,6 +172,8 @@ def evaluate_pool(
     predictor_factory: Callable[[Session], object] | None = None,
     ticket_stake_tl: float = 100.0,
     detail: bool = False,
+    model_version: str | None = None,
+    live_fallback: bool = True,
 ) -> PoolResult:
     """Replay resulted races for ``pool`` and score our top-N strategy.
 
@@ -146,15 +192,20 @@ def evaluate_pool(
         Flat stake per ticket.  Race-level stake is ``top_n *
         ticket_stake_tl``; only races where the pool published a payout
         participate in the stake total.
+    model_version:
+        Replay this version's stored predictions instead of calling the
+        predictor.  With ``live_fallback`` the predictor still scores
+        races that have no stored rows; without it they are skipped.
     """
     if pool not in _COMBO_FUNCS:
         raise ValueError(f"unknown pool: {pool!r}")
 
-    predictor_factory = predictor_factory or (lambda s: BayesianPredictor(s))
-    predictor = predictor_factory(session)
+    predictor = _resolve_predictor(
+        session, predictor_factory, model_version, live_fallback,
+        from_date, to_date,
+    )
 
     payout_col = _PAYOUT_COLUMN[pool]
-    combo_func = _COMBO_FUNCS[pool]
 
     q = (
         session.query(Race)
@@ -167,6 +218,7 @@ def evaluate_pool(
 
     result = PoolResult(pool=pool, top_n=top_n)
     for race in q.order_by(Race.date.asc(), Race.race_number.asc()).all():
+        result.replayed += 1
         entries = list(race.entries)
         if len(entries) < _COMBO_SIZE[pool]:
             continue
@@ -178,7 +230,7 @@ def evaluate_pool(
         if not preds:
             continue
         win_probs = {p.horse_id: p.probability / 100.0 for p in preds}
-        combos = combo_func(win_probs)[:top_n]
+        combos = top_n_combos(pool, win_probs, top_n)
         if not combos:
             continue
 
@@ -194,11 +246,16 @@ def evaluate_pool(
 
         result.races += 1
         result.total_stake_tl += stake
+        race_payout = 0.0
         if hit:
             result.hits += 1
             # Payout column is TL per 1 TL ticket on the winning combo.
             # We bought one winning ticket out of our top_n.
-            result.total_payout_tl += float(payout) * ticket_stake_tl
+            race_payout = float(payout) * ticket_stake_tl
+            result.total_payout_tl += race_payout
+        result.race_stakes.append(stake)
+        result.race_payouts.append(race_payout)
+        result.race_index.append(result.replayed - 1)
 
         if detail:
             result.per_race.append({
@@ -222,18 +279,25 @@ def evaluate_all_pools(
     to_date: date_type | None = None,
     predictor_factory: Callable[[Session], object] | None = None,
     ticket_stake_tl: float = 100.0,
+    model_version: str | None = None,
+    live_fallback: bool = True,
+    detail: bool = False,
 ) -> list[PoolResult]:
     """Cartesian product of pools × top-N values with shared predictions.
 
     Calling :func:`evaluate_pool` repeatedly re-runs inference; with
     ~1.7k resulted races and 16 pool×top_n cells that's hours of work.
     This variant iterates races once, runs the predictor once, and
-    scores every strategy off the cached probabilities.
+    scores every strategy off the cached probabilities.  Pass
+    ``model_version`` to skip inference entirely for races already
+    scored by that version (see :func:`evaluate_pool`).
     """
     pools = list(pools)
     top_ns = sorted(set(top_ns))
-    predictor_factory = predictor_factory or (lambda s: BayesianPredictor(s))
-    predictor = predictor_factory(session)
+    predictor = _resolve_predictor(
+        session, predictor_factory, model_version, live_fallback,
+        from_date, to_date,
+    )
 
     results: dict[tuple[str, int], PoolResult] = {
         (p, n): PoolResult(pool=p, top_n=n)
@@ -249,9 +313,10 @@ def evaluate_all_pools(
     if to_date is not None:
         q = q.filter(Race.date <= to_date)
 
-    max_top_n = max(top_ns)
-
-    for race in q.order_by(Race.date.asc(), Race.race_number.asc()).all():
+    races = q.order_by(Race.date.asc(), Race.race_number.asc()).all()
+    for result in results.values():
+        result.replayed = len(races)
+    for index, race in enumerate(races):
         entries = list(race.entries)
         if not entries:
             continue
@@ -270,25 +335,250 @@ def evaluate_all_pools(
                 continue
             payout = getattr(race, _PAYOUT_COLUMN[pool])
 
-            # Rank once, slice for each top_n.
-            combos_full = _COMBO_FUNCS[pool](win_probs)[:max_top_n]
-            if not combos_full:
-                continue
+            _score_top_ns(
+                results, pool, top_ns, win_probs, actual, payout,
+                ticket_stake_tl, index,
+                {"race_id": race.id, "date": race.date.isoformat()}
+                if detail else None,
+            )
 
-            for top_n in top_ns:
-                combos = combos_full[:top_n]
-                hit = any(_combo_matches(c, actual, pool) for c in combos)
-                result = results[(pool, top_n)]
+    return [results[(p, n)] for p in pools for n in top_ns]
 
-                if hit and payout is None:
-                    result.misses_without_payout += 1
-                    continue
 
-                result.races += 1
-                stake = ticket_stake_tl * top_n
-                result.total_stake_tl += stake
-                if hit:
-                    result.hits += 1
-                    result.total_payout_tl += float(payout) * ticket_stake_tl
+def evaluate_all_pools_parallel(
+    pools: Iterable[str] = ("ganyan", "ikili", "sirali_ikili", "uclu"),
+    top_ns: Iterable[int] = (1, 3, 6, 10),
+    *,
+    database_url: str | None = None,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+    predictor_factory: Callable[[Session], object] | None = None,
+    ticket_stake_tl: float = 100.0,
+    model_version: str | None = None,
+    live_fallback: bool = True,
+    detail: bool = False,
+    workers: int | None = None,
+) -> list[PoolResult]:
+    """:func:`evaluate_all_pools` sharded by date over a process pool.
+
+    The window's race dates are cut into contiguous shards of roughly
+    equal race count; each worker opens its own engine and session,
+    builds its own predictor with ``predictor_factory`` — which must
+    therefore be picklable, e.g. a module-level function or a
+    :func:`functools.partial` of one — and scores its shard.  Shard results are merged in date order by
+    :func:`merge_pool_results`, so totals and ``per_race`` rows come out
+    the same for a given shard plan however the workers are scheduled.
+    """
+    pools = tuple(pools)
+    top_ns = tuple(sorted(set(top_ns)))
+    workers = workers or os.cpu_count() or 1
+
+    session = get_session(database_url)
+    try:
+        shards = _date_shards(session, from_date, to_date, workers * 4)
+    finally:
+        session.close()
+
+    tasks = [
+        (
+            database_url, pools, top_ns, start, end, predictor_factory,
+            ticket_stake_tl, model_version, live_fallback, detail,
+        )
+        for start, end in shards
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_evaluate_shard, tasks))
+    else:
+        parts = [_evaluate_shard(task) for task in tasks]
+    if not parts:
+        return [PoolResult(pool=p, top_n=n) for p in pools for n in top_ns]
+    return merge_pool_results(parts)
+
+
+def merge_pool_results(parts: Iterable[list[PoolResult]]) -> list[PoolResult]:
+    """Sum per-shard results cell by cell, keeping the first shard's order.
+
+    ``per_race`` rows are concatenated in shard order; pass shards in
+    date order to get the same rows a serial run would.
+    """
+    merged: dict[tuple[str, int], PoolResult] = {}
+    for results in parts:
+        for r in results:
+            total = merged.setdefault(
+                (r.pool, r.top_n), PoolResult(pool=r.pool, top_n=r.top_n),
+            )
+            total.races += r.races
+            total.hits += r.hits
+            total.total_stake_tl += r.total_stake_tl
+            total.total_payout_tl += r.total_payout_tl
+            total.misses_without_payout += r.misses_without_payout
+            total.per_race.extend(r.per_race)
+            total.race_stakes.extend(r.race_stakes)
+            total.race_payouts.extend(r.race_payouts)
+            total.race_index.extend(i + total.replayed for i in r.race_index)
+            total.replayed += r.replayed
+    return list(merged.values())
+
+
+def attach_roi_intervals(
+    results: Iterable[PoolResult],
+    *,
+    replicates: int = DEFAULT_REPLICATES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> None:
+    """Set ``roi_ci`` on each result from a race-level bootstrap.
+
+    Resamples every replayed race, with zero stake and payout for the
+    races a strategy passed on, so bands match the sweep's.
+    """
+    for r in results:
+        stakes = np.zeros(r.replayed)
+        payouts = np.zeros_like(stakes)
+        stakes[r.race_index] = r.race_stakes
+        payouts[r.race_index] = r.race_payouts
+        r.roi_ci = bootstrap_roi(
+            stakes, payouts,
+            replicates=replicates, confidence=confidence, seed=seed,
+        )
+
+
+def _date_shards(
+    session: Session,
+    from_date: date_type | None,
+    to_date: date_type | None,
+    n_shards: int,
+) -> list[tuple[date_type, date_type]]:
+    """Contiguous ``(first, last)`` date ranges with balanced race counts."""
+    q = (
+        session.query(Race.date, func.count(Race.id))
+        .filter(Race.status == RaceStatus.resulted)
+    )
+    if from_date is not None:
+        q = q.filter(Race.date >= from_date)
+    if to_date is not None:
+        q = q.filter(Race.date <= to_date)
+    counts = q.group_by(Race.date).order_by(Race.date).all()
+    if not counts:
+        return []
+
+    target = sum(c for _, c in counts) / max(n_shards, 1)
+    shards: list[tuple[date_type, date_type]] = []
+    start, running = counts[0][0], 0
+    for i, (day, count) in enumerate(counts):
+        running += count
+        if running >= target or i == len(counts) - 1:
+            shards.append((start, day))
+            running = 0
+            if i + 1 < len(counts):
+                start = counts[i + 1][0]
+    return shards
+
+
+def _evaluate_shard(args: tuple) -> list[PoolResult]:
+    (database_url, pools, top_ns, start, end, predictor_factory,
+     ticket_stake_tl, model_version, live_fallback, detail) = args
+    session = get_session(database_url)
+    try:
+        return evaluate_all_pools(
+            session,
+            pools=pools,
+            top_ns=top_ns,
+            from_date=start,
+            to_date=end,
+            predictor_factory=predictor_factory,
+            ticket_stake_tl=ticket_stake_tl,
+            model_version=model_version,
+            live_fallback=live_fallback,
+            detail=detail,
+        )
+    finally:
+        session.close()
+
+
+def evaluate_matrix_pools(
+    matrix: ProbabilityMatrix,
+    pools: Iterable[str] = ("ganyan", "ikili", "sirali_ikili", "uclu"),
+    top_ns: Iterable[int] = (1, 3, 6, 10),
+    *,
+    ticket_stake_tl: float = 100.0,
+) -> list[PoolResult]:
+    """:func:`evaluate_all_pools` over a cached probability matrix.
 
+    No database or predictor involved: probabilities, finish order and
+    payouts all come from ``matrix`` (see
+    :mod:`ganyan.predictor.prob_matrix`), so re-running with other
+    pools, top-N values or stakes only redoes the combo ranking.
+    """
+    pools = list(pools)
+    top_ns = sorted(set(top_ns))
+    results: dict[tuple[str, int], PoolResult] = {
+        (p, n): PoolResult(pool=p, top_n=n)
+        for p in pools for n in top_ns
+    }
+    for result in results.values():
+        result.replayed = len(matrix)
+    for i in np.nonzero(matrix.predicted)[0]:
+        win_probs = matrix.win_probs(i)
+        for pool in pools:
+            actual = matrix.winning_combo(i, _COMBO_SIZE[pool])
+            if actual is None:
+                continue
+            _score_top_ns(
+                results, pool, top_ns, win_probs, actual,
+                matrix.payout(i, pool), ticket_stake_tl, int(i),
+            )
     return [results[(p, n)] for p in pools for n in top_ns]
+
+
+def _score_top_ns(
+    results: dict[tuple[str, int], PoolResult],
+    pool: str,
+    top_ns: list[int],
+    win_probs: dict[int, float],
+    actual: tuple[int, ...],
+    payout: float | None,
+    ticket_stake_tl: float,
+    race_index: int,
+    detail: dict | None = None,
+) -> None:
+    """Score one race's ``pool`` bets for every top-N value.
+
+    ``race_index`` is the race's replay position in the window;
+    ``detail`` (race id / date) turns on per-race rows in ``per_race``.
+    """
+    # Rank once, slice for each top_n.
+    combos_full = top_n_combos(pool, win_probs, max(top_ns))
+    if not combos_full:
+        return
+
+    for top_n in top_ns:
+        combos = combos_full[:top_n]
+        hit = any(_combo_matches(c, actual, pool) for c in combos)
+        result = results[(pool, top_n)]
+
+        if hit and payout is None:
+            result.misses_without_payout += 1
+            continue
+
+        result.races += 1
+        stake = ticket_stake_tl * top_n
+        result.total_stake_tl += stake
+        race_payout = 0.0
+        if hit:
+            result.hits += 1
+            race_payout = float(payout) * ticket_stake_tl
+            result.total_payout_tl += race_payout
+        result.race_stakes.append(stake)
+        result.race_payouts.append(race_payout)
+        result.race_index.append(race_index)
+
+        if detail is not None:
+            result.per_race.append({
+                **detail,
+                "hit": hit,
+                "actual": list(actual),
+                "our_top": [list(c.horses) for c in combos],
+                "payout_tl": float(payout) if payout is not None else None,
+            })
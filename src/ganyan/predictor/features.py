@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import date as date_type
 
 import numpy as np
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 
+from ganyan.db.career_stats import lookup_career_counts, lookup_career_counts_many
 from ganyan.db.models import Race, RaceEntry, RaceStatus
 
 
@@ -155,9 +157,16 @@ def compute_jockey_win_rate(
     Returns a value in ``[0, 1]`` where 0.1 is the population baseline.
     ``before_date`` enforces temporal integrity — never look at races
     that happened on or after the race being predicted.
+
+    Reads the :class:`~ganyan.db.models.CareerStat` ledger when it has
+    been built (one indexed row); otherwise counts ``race_entries``.
+    The trainer / sire / sire×surface rates below do the same.
     """
     if not jockey:
         return None
+    counts = lookup_career_counts(session, "jockey", jockey, before_date=before_date)
+    if counts is not None:
+        return _rate_from_counts(counts)
     return _smoothed_person_win_rate(
         session, RaceEntry.jockey, jockey, before_date,
     )
@@ -176,6 +185,9 @@ def compute_sire_win_rate(
     """
     if not sire:
         return None
+    counts = lookup_career_counts(session, "sire", sire, before_date=before_date)
+    if counts is not None:
+        return _rate_from_counts(counts)
     from ganyan.db.models import Horse
 
     base = (
@@ -215,6 +227,11 @@ def compute_sire_surface_rate(
     """
     if not sire or not surface:
         return None
+    counts = lookup_career_counts(
+        session, "sire", sire, surface, before_date=before_date,
+    )
+    if counts is not None:
+        return _rate_from_counts(counts)
     from ganyan.db.models import Horse
 
     base = (
@@ -249,38 +266,21 @@ def compute_trainer_win_rate(
 ) -> float | None:
     """Smoothed trainer win rate over historical resulted races.
 
-    Trainer is stored on :class:`Horse` (a snapshot of the *current*
-    trainer).  This currently reflects that: a horse is credited to its
-    present trainer across all historical runs.  Good enough for a
-    first-pass feature; accuracy improves when we add a trainer-history
-    table.
+    Runs are credited to ``RaceEntry.trainer`` — the trainer on that
+    race's card — so a horse that changes yards doesn't carry its old
+    results to the new trainer.  The ledger, the batched path and the
+    training frame attribute the same way.
     """
     if not trainer:
         return None
-    from ganyan.db.models import Horse  # local import to avoid cycle
-
-    base = (
-        session.query(RaceEntry)
-        .join(Horse, Horse.id == RaceEntry.horse_id)
-        .join(Race, Race.id == RaceEntry.race_id)
-        .filter(
-            Horse.trainer == trainer,
-            Race.status == RaceStatus.resulted,
-            RaceEntry.finish_position.isnot(None),
-        )
+    counts = lookup_career_counts(
+        session, "trainer", trainer, before_date=before_date,
+    )
+    if counts is not None:
+        return _rate_from_counts(counts)
+    return _smoothed_person_win_rate(
+        session, RaceEntry.trainer, trainer, before_date,
     )
-    if before_date is not None:
-        base = base.filter(Race.date < before_date)
-
-    runs = base.with_entities(func.count(RaceEntry.id)).scalar() or 0
-    if runs == 0:
-        return None
-    wins = (
-        base.filter(RaceEntry.finish_position == 1)
-        .with_entities(func.count(RaceEntry.id))
-        .scalar()
-    ) or 0
-    return _bayesian_smoothed_rate(wins, runs)
 
 
 def _smoothed_person_win_rate(
@@ -462,6 +462,17 @@ def _bayesian_smoothed_rate(wins: int, runs: int) -> float:
     return float((wins + alpha) / (runs + alpha + beta))
 
 
+def bayesian_smoothed_rates(wins, runs):
+    """Array form of :func:`_bayesian_smoothed_rate`; NaN where ``runs == 0``.
+
+    Accepts NumPy arrays or pandas Series (aligned on index).
+    """
+    alpha = _WINRATE_PRIOR_MEAN * _WINRATE_PRIOR_WEIGHT
+    beta = (1.0 - _WINRATE_PRIOR_MEAN) * _WINRATE_PRIOR_WEIGHT
+    rates = (wins + alpha) / (runs + alpha + beta)
+    return np.where(np.asarray(runs) > 0, rates, np.nan)
+
+
 def compute_gate_bias(
     gate_number: int | None,
     distance_meters: int | None,
@@ -609,3 +620,283 @@ def extract_features(
                 session, horse_id, equipment, race_date,
             )
     return features
+
+
+# --- Batched history features ---------------------------------------------
+#
+# ``extract_features`` resolves each history-derived signal with its own
+# COUNT / LIMIT-1 queries — ~14 round trips per runner.  For inference
+# over a whole race or a day's card we resolve the same signals for
+# every runner at once: per distinct race date, four grouped COUNT
+# queries (jockey, trainer, sire, sire×surface) — or, once the career
+# ledger is built, grouped ledger lookups — plus one query pulling
+# the runners' resulted history, which is folded in Python into
+# surface affinity and the previous-race signals.  Results are
+# identical to the per-runner ``compute_*`` functions.
+
+HISTORY_FEATURE_FIELDS: tuple[str, ...] = (
+    "jockey_win_rate",
+    "trainer_win_rate",
+    "sire_win_rate",
+    "sire_surface_rate",
+    "surface_affinity",
+    "track_affinity",
+    "surface_switch",
+    "distance_delta_m",
+    "equipment_changed",
+)
+
+
+@dataclass
+class HistoryRequest:
+    """One runner whose history-derived features should be resolved."""
+
+    horse_id: int | None
+    race_date: date_type | None
+    jockey: str | None = None
+    trainer: str | None = None
+    sire: str | None = None
+    surface: str | None = None
+    distance_meters: int | None = None
+    equipment: str | None = None
+
+
+def compute_history_features_batch(
+    session: Session,
+    requests: Sequence[HistoryRequest],
+    distance_band: int = 200,
+) -> list[dict[str, float | None]]:
+    """Resolve every history feature for ``requests`` in grouped queries.
+
+    Returns one dict per request (same order), keyed by
+    :data:`HISTORY_FEATURE_FIELDS`.  The statement count depends only on
+    the number of distinct ``race_date`` values (and, with the ledger
+    built, surfaces) — a single race or a whole day's card costs about
+    five queries.
+    """
+    from ganyan.db.models import Horse
+
+    results: list[dict[str, float | None]] = [
+        dict.fromkeys(HISTORY_FEATURE_FIELDS) for _ in requests
+    ]
+    by_date: dict[date_type | None, list[int]] = {}
+    for i, req in enumerate(requests):
+        by_date.setdefault(req.race_date, []).append(i)
+
+    for before_date, indices in by_date.items():
+        group = [requests[i] for i in indices]
+        jockeys = {r.jockey for r in group if r.jockey}
+        trainers = {r.trainer for r in group if r.trainer}
+        sires = {r.sire for r in group if r.sire}
+        surfaces = {r.surface for r in group if r.sire and r.surface}
+        horse_ids = {r.horse_id for r in group if r.horse_id is not None}
+
+        jockey_counts = _ledger_counts(
+            session, "jockey", jockeys, before_date,
+        ) if jockeys else {}
+        if jockey_counts is None:
+            jockey_counts = _grouped_win_counts(
+                session, [RaceEntry.jockey],
+                [RaceEntry.jockey.in_(jockeys)], before_date,
+            )
+        trainer_counts = _ledger_counts(
+            session, "trainer", trainers, before_date,
+        ) if trainers else {}
+        if trainer_counts is None:
+            trainer_counts = _grouped_win_counts(
+                session, [RaceEntry.trainer],
+                [RaceEntry.trainer.in_(trainers)], before_date,
+            )
+        sire_counts = _ledger_counts(
+            session, "sire", sires, before_date,
+        ) if sires else {}
+        if sire_counts is None:
+            sire_counts = _grouped_win_counts(
+                session, [Horse.sire],
+                [Horse.sire.in_(sires)], before_date, join_horse=True,
+            )
+        sire_surface_counts = _ledger_counts(
+            session, "sire", sires, before_date, surfaces,
+        ) if sires and surfaces else {}
+        if sire_surface_counts is None:
+            sire_surface_counts = _grouped_win_counts(
+                session, [Horse.sire, Race.surface],
+                [Horse.sire.in_(sires), Race.surface.in_(surfaces)],
+                before_date, join_horse=True,
+            )
+        history = _horse_history(session, horse_ids, before_date)
+
+        for i, req in zip(indices, group):
+            out = results[i]
+            if req.jockey:
+                out["jockey_win_rate"] = _rate_from_counts(
+                    jockey_counts.get((req.jockey,)),
+                )
+            if req.trainer:
+                out["trainer_win_rate"] = _rate_from_counts(
+                    trainer_counts.get((req.trainer,)),
+                )
+            if req.sire:
+                out["sire_win_rate"] = _rate_from_counts(
+                    sire_counts.get((req.sire,)),
+                )
+                if req.surface:
+                    out["sire_surface_rate"] = _rate_from_counts(
+                        sire_surface_counts.get((req.sire, req.surface)),
+                    )
+            if req.horse_id is None:
+                continue
+            _fold_horse_history(
+                out, req, history.get(req.horse_id, []), distance_band,
+            )
+    return results
+
+
+def _grouped_win_counts(
+    session: Session,
+    key_columns: list,
+    filters: list,
+    before_date: date_type | None,
+    *,
+    join_horse: bool = False,
+) -> dict[tuple, tuple[int, int]]:
+    """Internal: ``{key: (runs, wins)}`` over resulted, finished entries."""
+    from ganyan.db.models import Horse
+
+    q = (
+        session.query(
+            *key_columns,
+            func.count(RaceEntry.id),
+            func.sum(case((RaceEntry.finish_position == 1, 1), else_=0)),
+        )
+        .select_from(RaceEntry)
+        .join(Race, Race.id == RaceEntry.race_id)
+    )
+    if join_horse:
+        q = q.join(Horse, Horse.id == RaceEntry.horse_id)
+    q = q.filter(
+        *filters,
+        Race.status == RaceStatus.resulted,
+        RaceEntry.finish_position.isnot(None),
+    )
+    if before_date is not None:
+        q = q.filter(Race.date < before_date)
+    n_keys = len(key_columns)
+    return {
+        tuple(row[:n_keys]): (int(row[n_keys] or 0), int(row[n_keys + 1] or 0))
+        for row in q.group_by(*key_columns).all()
+    }
+
+
+def _ledger_counts(
+    session: Session,
+    kind: str,
+    names: set[str],
+    before_date: date_type | None,
+    surfaces: set[str] | None = None,
+) -> dict[tuple, tuple[int, int]] | None:
+    """Internal: :func:`_grouped_win_counts`-shaped counts from the ledger.
+
+    Keyed ``(name,)``, or ``(name, surface)`` when ``surfaces`` is given.
+    ``None`` when the ledger for ``kind`` isn't built.
+    """
+    if surfaces is None:
+        found = lookup_career_counts_many(
+            session, kind, names, before_date=before_date,
+        )
+        return None if found is None else {(n,): c for n, c in found.items()}
+    counts: dict[tuple, tuple[int, int]] = {}
+    for surface in surfaces:
+        found = lookup_career_counts_many(
+            session, kind, names, surface, before_date=before_date,
+        )
+        if found is None:
+            return None
+        counts.update({(n, surface): c for n, c in found.items()})
+    return counts
+
+
+def _rate_from_counts(counts: tuple[int, int] | None) -> float | None:
+    if counts is None or counts[0] == 0:
+        return None
+    runs, wins = counts
+    return _bayesian_smoothed_rate(wins, runs)
+
+
+def _horse_history(
+    session: Session,
+    horse_ids: set[int],
+    before_date: date_type | None,
+) -> dict[int, list[tuple]]:
+    """Internal: resulted runs per horse, most recent first.
+
+    Each tuple is ``(surface, distance_meters, equipment, finish_position)``.
+    """
+    if not horse_ids:
+        return {}
+    q = (
+        session.query(
+            RaceEntry.horse_id,
+            Race.surface,
+            Race.distance_meters,
+            RaceEntry.equipment,
+            RaceEntry.finish_position,
+        )
+        .join(Race, Race.id == RaceEntry.race_id)
+        .filter(
+            RaceEntry.horse_id.in_(horse_ids),
+            Race.status == RaceStatus.resulted,
+        )
+    )
+    if before_date is not None:
+        q = q.filter(Race.date < before_date)
+    history: dict[int, list[tuple]] = {}
+    for horse_id, *run in q.order_by(RaceEntry.horse_id, Race.date.desc()).all():
+        history.setdefault(horse_id, []).append(tuple(run))
+    return history
+
+
+def _fold_horse_history(
+    out: dict[str, float | None],
+    req: HistoryRequest,
+    runs: list[tuple],
+    distance_band: int,
+) -> None:
+    """Internal: fill the horse-level fields of ``out`` from ``runs``.
+
+    Mirrors :func:`compute_surface_affinity`, :func:`compute_surface_switch`,
+    :func:`compute_distance_delta` and :func:`compute_equipment_changed`.
+    """
+    n_runs = n_wins = 0
+    for surface, distance, _equipment, finish in runs:
+        if finish is None:
+            continue
+        if req.surface is not None and surface != req.surface:
+            continue
+        if req.distance_meters is not None and (
+            distance is None
+            or abs(distance - req.distance_meters) > distance_band
+        ):
+            continue
+        n_runs += 1
+        if finish == 1:
+            n_wins += 1
+    if n_runs:
+        out["surface_affinity"] = _bayesian_smoothed_rate(n_wins, n_runs)
+        out["track_affinity"] = out["surface_affinity"]
+
+    if req.race_date is None or not runs:
+        return
+    if req.surface is not None:
+        prev_surface = next((r[0] for r in runs if r[0] is not None), None)
+        if prev_surface is not None:
+            out["surface_switch"] = 1.0 if prev_surface != req.surface else 0.0
+    if req.distance_meters is not None:
+        prev_distance = next((r[1] for r in runs if r[1] is not None), None)
+        if prev_distance is not None:
+            out["distance_delta_m"] = float(req.distance_meters - prev_distance)
+    prev_equipment = runs[0][2]
+    if prev_equipment is not None:
+        norm_prev = prev_equipment.strip() or None
+        norm_curr = (req.equipment or "").strip() or None
+        out["equipment_changed"] = 1.0 if norm_prev != norm_curr else 0.0
@@ -6,19 +6,29 @@ data rather than using hand-picked constants.
 
 Exports:
 - :class:`MLPredictor` — inference-time, same public API as BayesianPredictor
+- :data:`model_registry` / :func:`get_model` — process-wide hot-reloading model cache
 - :func:`train_ranker` — fit a new model from the current DB
 - :func:`build_training_frame` — produce the feature matrix
 """
 
 from ganyan.predictor.ml.features import FEATURE_COLUMNS, build_training_frame
-from ganyan.predictor.ml.predictor import MLPredictor, load_latest_model
+from ganyan.predictor.ml.predictor import (
+    MLPredictor,
+    ModelRegistry,
+    get_model,
+    load_latest_model,
+    model_registry,
+)
 from ganyan.predictor.ml.trainer import TrainingResult, train_ranker
 
 __all__ = [
     "FEATURE_COLUMNS",
     "MLPredictor",
+    "ModelRegistry",
     "TrainingResult",
     "build_training_frame",
+    "get_model",
     "load_latest_model",
+    "model_registry",
     "train_ranker",
 ]
@@ -0,0 +1,293 @@
+"""On-disk training feature store, partitioned by race date.
+
+Every ``ganyan train`` and monthly retrain used to rebuild the same
+:data:`FEATURE_COLUMNS` matrix from the DB.  Features for a race date
+depend only on that day's entries and strictly earlier history, so once
+a date is fully resulted its rows never change — they can be computed
+once and read back from disk.
+
+Layout::
+
+    <root>/<schema_hash>/<YYYY-MM-DD>/features.npy   (n_rows, n_features), column-major
+                                      target.npy     rank_score per row
+                                      groups.npy     race_id per row
+
+``schema_hash`` covers the feature column list, :data:`FEATURE_SCHEMA_VERSION`
+and the frame-builder filters, so changing any of them starts a fresh
+store instead of mixing incompatible partitions.  Arrays are plain
+``.npy`` so they can be opened memory-mapped (``np.load(mmap_mode="r")``);
+the feature matrix is stored Fortran-ordered so each column is a
+contiguous slice.  No dependency beyond NumPy.
+
+Partitions are written only for dates with no race still scheduled
+from today on; a past race that never resulted (cancelled, or its
+results missed) no longer holds its date back.  Backfilling results for
+a date *older* than existing partitions changes the as-of history of
+every later date — clear the store from that date
+(``ganyan features clear --since``) afterwards.  The pedigree crawl
+does this itself via :meth:`FeatureStore.invalidate_horses`: a newly
+learned sire changes ``sire_win_rate`` from the horse's first run on.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+from datetime import date as date_type
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ganyan.db.models import Race, RaceEntry, RaceStatus
+from ganyan.predictor.ml.features import (
+    FEATURE_COLUMNS,
+    GROUP_COLUMN,
+    TARGET_COLUMN,
+    TrainingFrame,
+    build_training_frame,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[3].parent / "data" / "feature_store"
+
+# Bump when a feature's *definition* changes without its column name
+# changing, so stale partitions are not reused.
+FEATURE_SCHEMA_VERSION = 1
+
+
+def feature_schema_hash(
+    *, require_agf: bool = True, min_field_size: int = 3,
+) -> str:
+    """Short, stable hash identifying a feature-matrix layout."""
+    payload = json.dumps(
+        {
+            "columns": FEATURE_COLUMNS,
+            "version": FEATURE_SCHEMA_VERSION,
+            "require_agf": require_agf,
+            "min_field_size": min_field_size,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+class FeatureStore:
+    """Date-partitioned cache of :func:`build_training_frame` output.
+
+    Usage::
+
+        store = FeatureStore()
+        store.sync(session, from_date=start)   # append missing dates
+        frame = store.load(from_date=start)    # memory-mapped read
+
+    or simply ``build_training_frame(session, store=store, ...)``.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        require_agf: bool = True,
+        min_field_size: int = 3,
+    ) -> None:
+        self.require_agf = require_agf
+        self.min_field_size = min_field_size
+        self.schema_hash = feature_schema_hash(
+            require_agf=require_agf, min_field_size=min_field_size,
+        )
+        self.path = (root or DEFAULT_STORE_DIR) / self.schema_hash
+
+    # ------------------------------------------------------------------
+    # Partition bookkeeping
+    # ------------------------------------------------------------------
+
+    def partition_path(self, race_date: date_type) -> Path:
+        return self.path / race_date.isoformat()
+
+    def dates(self) -> list[date_type]:
+        """Race dates with a complete partition on disk, ascending."""
+        if not self.path.exists():
+            return []
+        found = []
+        for child in self.path.iterdir():
+            if not (child / "groups.npy").exists():
+                continue  # half-written partition
+            try:
+                found.append(date_type.fromisoformat(child.name))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def clear(self, since: date_type | None = None) -> int:
+        """Delete partitions on or after ``since`` (all when ``None``)."""
+        removed = 0
+        for d in self.dates():
+            if since is None or d >= since:
+                shutil.rmtree(self.partition_path(d))
+                removed += 1
+        return removed
+
+    def invalidate_horses(self, session: Session, horse_ids: list[int]) -> int:
+        """Drop partitions whose features may involve ``horse_ids``' runs.
+
+        Call after facts about past runs change (a sire filled in by the
+        pedigree crawl): every partition from the horses' earliest race
+        date on is cleared.  Returns the number removed.
+        """
+        if not horse_ids:
+            return 0
+        since = (
+            session.query(func.min(Race.date))
+            .join(RaceEntry, RaceEntry.race_id == Race.id)
+            .filter(RaceEntry.horse_id.in_(horse_ids))
+            .scalar()
+        )
+        if since is None:
+            return 0
+        return self.clear(since=since)
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+
+    def sync(
+        self,
+        session: Session,
+        *,
+        from_date: date_type | None = None,
+        to_date: date_type | None = None,
+        today: date_type | None = None,
+    ) -> int:
+        """Compute and write partitions for dates not yet in the store.
+
+        Returns the number of partitions written.  Missing dates are
+        built in one vectorized pass over their span.  ``today``
+        (default: the current date) is the first day whose scheduled
+        races keep a date open.
+        """
+        missing = sorted(
+            set(self._complete_dates(
+                session, from_date, to_date, today or date_type.today(),
+            ))
+            - set(self.dates())
+        )
+        if not missing:
+            return 0
+
+        frame = build_training_frame(
+            session,
+            from_date=missing[0],
+            to_date=missing[-1],
+            require_agf=self.require_agf,
+            min_field_size=self.min_field_size,
+            vectorized=True,
+        )
+        positions = frame.race_dates.groupby(frame.race_dates).indices
+        features = frame.features[FEATURE_COLUMNS].to_numpy(dtype="float64")
+        target = frame.target.to_numpy(dtype="int64")
+        groups = frame.groups.to_numpy(dtype="int64")
+        for d in missing:
+            idx = positions.get(d, np.array([], dtype="int64"))
+            self._write_partition(d, features[idx], target[idx], groups[idx])
+        logger.info(
+            "Feature store %s: wrote %d partition(s) %s → %s",
+            self.schema_hash, len(missing), missing[0], missing[-1],
+        )
+        return len(missing)
+
+    def _write_partition(
+        self,
+        race_date: date_type,
+        features: np.ndarray,
+        target: np.ndarray,
+        groups: np.ndarray,
+    ) -> None:
+        part = self.partition_path(race_date)
+        part.mkdir(parents=True, exist_ok=True)
+        np.save(part / "features.npy", np.asfortranarray(features))
+        np.save(part / "target.npy", target)
+        # Written last: its presence marks the partition complete.
+        np.save(part / "groups.npy", groups)
+
+    @staticmethod
+    def _complete_dates(
+        session: Session,
+        from_date: date_type | None,
+        to_date: date_type | None,
+        today: date_type,
+    ) -> list[date_type]:
+        """Dates with resulted races and nothing scheduled from ``today`` on."""
+        q = session.query(Race.date).filter(Race.status == RaceStatus.resulted)
+        pending = session.query(Race.date).filter(
+            Race.status == RaceStatus.scheduled,
+            Race.date >= today,
+        )
+        if from_date is not None:
+            q = q.filter(Race.date >= from_date)
+            pending = pending.filter(Race.date >= from_date)
+        if to_date is not None:
+            q = q.filter(Race.date <= to_date)
+            pending = pending.filter(Race.date <= to_date)
+        open_dates = {d for (d,) in pending.distinct()}
+        return [d for (d,) in q.distinct() if d not in open_dates]
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def load(
+        self,
+        *,
+        from_date: date_type | None = None,
+        to_date: date_type | None = None,
+    ) -> TrainingFrame:
+        """Assemble a :class:`TrainingFrame` from stored partitions.
+
+        Partitions are opened memory-mapped; rows come back grouped by
+        ``race_id`` in the same order :func:`build_training_frame` uses.
+        """
+        feats, targets, groups, dates = [], [], [], []
+        for d in self.dates():
+            if from_date is not None and d < from_date:
+                continue
+            if to_date is not None and d > to_date:
+                continue
+            part = self.partition_path(d)
+            g = np.load(part / "groups.npy", mmap_mode="r")
+            if len(g) == 0:
+                continue
+            feats.append(np.load(part / "features.npy", mmap_mode="r"))
+            targets.append(np.load(part / "target.npy", mmap_mode="r"))
+            groups.append(g)
+            dates.extend([d] * len(g))
+
+        if not groups:
+            return TrainingFrame(
+                features=pd.DataFrame(columns=FEATURE_COLUMNS),
+                target=pd.Series(dtype="int64"),
+                groups=pd.Series(dtype="int64"),
+                race_dates=pd.Series(dtype="object"),
+            )
+
+        all_groups = np.concatenate(groups)
+        # Stable sort on race_id keeps each race's stored row order.
+        order = np.argsort(all_groups, kind="stable")
+        return TrainingFrame(
+            features=pd.DataFrame(
+                np.concatenate(feats)[order], columns=FEATURE_COLUMNS,
+            ),
+            target=pd.Series(
+                np.concatenate(targets)[order], dtype="int64", name=TARGET_COLUMN,
+            ),
+            groups=pd.Series(all_groups[order], dtype="int64", name=GROUP_COLUMN),
+            race_dates=pd.Series(
+                np.array(dates, dtype=object)[order], name="race_date",
+            ),
+        )
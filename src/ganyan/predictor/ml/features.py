@@ -17,18 +17,29 @@ inference (single horse/race → single-row frame).
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import date as date_type
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
-
-from ganyan.db.models import Race, RaceEntry, RaceStatus
-from ganyan.predictor.features import compute_field_pace_density, extract_features
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from ganyan.db.models import Horse, Race, RaceEntry, RaceStatus
+from ganyan.predictor.features import (
+    HistoryRequest,
+    bayesian_smoothed_rates,
+    compute_field_pace_density,
+    compute_history_features_batch,
+    extract_features,
+)
 from ganyan.scraper.parser import parse_eid_to_seconds, parse_last_six
 
+if TYPE_CHECKING:
+    from ganyan.predictor.ml.feature_store import FeatureStore
+
 
 # Engineered + raw columns used as model inputs.  Order is load-bearing:
 # LightGBM models serialize a feature-name list and the predictor uses
@@ -111,6 +122,8 @@ def build_training_frame(
     to_date: date_type | None = None,
     require_agf: bool = True,
     min_field_size: int = 3,
+    vectorized: bool = False,
+    store: FeatureStore | None = None,
 ) -> TrainingFrame:
     """Extract a feature matrix from resulted races in the DB.
 
@@ -125,7 +138,37 @@ def build_training_frame(
     min_field_size:
         Races with fewer resulted entries than this are dropped (too
         sparse for meaningful ranking).
+    vectorized:
+        If ``True``, load the entry history once and compute every as-of
+        history feature with grouped pandas operations instead of
+        per-row queries (see :func:`_build_training_frame_vectorized`).
+        Produces the same frame; cost no longer grows with
+        rows × history.
+    store:
+        Optional :class:`~ganyan.predictor.ml.feature_store.FeatureStore`.
+        Missing race dates in the window are computed and appended, then
+        the frame is read back from the store's partitions.  Only fully
+        resulted dates are stored, so a day with races still scheduled
+        is left out.
     """
+    if store is not None:
+        if (store.require_agf, store.min_field_size) != (require_agf, min_field_size):
+            raise ValueError(
+                "FeatureStore filters (require_agf, min_field_size) "
+                f"{(store.require_agf, store.min_field_size)} don't match "
+                f"the requested {(require_agf, min_field_size)}",
+            )
+        store.sync(session, from_date=from_date, to_date=to_date)
+        return store.load(from_date=from_date, to_date=to_date)
+    if vectorized:
+        return _build_training_frame_vectorized(
+            session,
+            from_date=from_date,
+            to_date=to_date,
+            require_agf=require_agf,
+            min_field_size=min_field_size,
+        )
+
     q = (
         session.query(Race)
         .options(
@@ -171,7 +214,6 @@ def build_training_frame(
             # otherwise produce rank_score < 0 and kill the train job.
             if entry.finish_position > field_size:
                 continue
-            trainer_name = entry.horse.trainer if entry.horse else None
             sire_name = entry.horse.sire if entry.horse else None
             features = extract_features(
                 eid_seconds=parse_eid_to_seconds(entry.eid),
@@ -186,7 +228,7 @@ def build_training_frame(
                 field_avg_s20=field_avg_s20,
                 session=session,
                 jockey=entry.jockey,
-                trainer=trainer_name,
+                trainer=entry.trainer,
                 horse_id=entry.horse_id,
                 gate_number=entry.gate_number,
                 surface=race.surface,
@@ -197,49 +239,14 @@ def build_training_frame(
                 equipment=entry.equipment,
                 field_pace_density=pace_density,
             )
-            rows.append({
+            row = _feature_row(entry, race, features, field_size)
+            row.update({
                 GROUP_COLUMN: race.id,
                 "race_date": race.date,
                 "finish_position": entry.finish_position,
                 "rank_score": field_size - entry.finish_position,
-                # Engineered
-                "speed_figure": features.speed_figure,
-                "form_cycle": features.form_cycle,
-                "weight_delta": features.weight_delta,
-                "rest_fitness": features.rest_fitness,
-                "class_indicator": features.class_indicator,
-                "jockey_win_rate": features.jockey_win_rate,
-                "trainer_win_rate": features.trainer_win_rate,
-                "gate_bias": features.gate_bias,
-                "surface_affinity": features.surface_affinity,
-                "agf_edge": features.agf_edge,
-                "sire_win_rate": features.sire_win_rate,
-                "sire_surface_rate": features.sire_surface_rate,
-                "surface_switch": features.surface_switch,
-                "distance_delta_m": features.distance_delta_m,
-                "equipment_changed": features.equipment_changed,
-                "apprentice_jockey": features.apprentice_jockey,
-                "field_pace_density": features.field_pace_density,
-                "s20_edge": features.s20_edge,
-                # Raw
-                "agf_raw": float(entry.agf) if entry.agf is not None else np.nan,
-                "hp_raw": float(entry.hp) if entry.hp is not None else np.nan,
-                "weight_kg_raw": (
-                    float(entry.weight_kg) if entry.weight_kg is not None else np.nan
-                ),
-                "kgs_raw": int(entry.kgs) if entry.kgs is not None else np.nan,
-                "s20_raw": float(entry.s20) if entry.s20 is not None else np.nan,
-                "gate_number": (
-                    int(entry.gate_number) if entry.gate_number is not None else np.nan
-                ),
-                "age": int(entry.horse.age) if entry.horse and entry.horse.age else np.nan,
-                # Race-level
-                "distance_meters": (
-                    int(race.distance_meters) if race.distance_meters else np.nan
-                ),
-                "field_size": field_size,
-                "surface_is_kum": _surface_encode(race.surface),
             })
+            rows.append(row)
 
     df = pd.DataFrame(rows)
     if df.empty:
@@ -261,92 +268,398 @@ def build_training_frame(
     )
 
 
-def build_race_frame(session: Session, race_id: int) -> pd.DataFrame:
-    """Build an inference-time feature matrix for a single race.
+# Columns pulled by the vectorized training path — one row per entry in
+# a resulted race, across the whole history up to ``to_date``.
+_HISTORY_COLUMNS = [
+    "race_id", "race_date", "race_number", "distance_meters", "surface",
+    "horse_id", "jockey", "trainer", "sire", "age", "gate_number",
+    "weight_kg", "hp", "kgs", "s20", "eid", "agf", "last_six",
+    "equipment", "finish_position",
+]
 
-    Returns a DataFrame with FEATURE_COLUMNS + ``horse_id`` so callers
-    can zip predictions back to entries.
+
+def _build_training_frame_vectorized(
+    session: Session,
+    *,
+    from_date: date_type | None,
+    to_date: date_type | None,
+    require_agf: bool,
+    min_field_size: int,
+) -> TrainingFrame:
+    """Set-based equivalent of :func:`build_training_frame`.
+
+    Pulls every resulted entry up to ``to_date`` in one query, then
+    derives each leak-free history feature as of the race date:
+
+    - jockey / trainer / sire / sire×surface rates: per-(key, date)
+      run and win counts, cumulated per key and shifted by one date so
+      only strictly earlier days count.  Trainers are keyed by
+      ``RaceEntry.trainer``, as in the career ledger and the scans.
+    - surface affinity: the ±200 m band is centred on each race's own
+      distance, so it can't be a fixed group; the horse's history is
+      joined to its rows and filtered instead.
+    - previous surface / distance / equipment: ``merge_asof`` on date
+      per horse, excluding same-day runs.
     """
-    race = session.get(Race, race_id)
-    if race is None or not race.entries:
-        return pd.DataFrame(columns=FEATURE_COLUMNS + ["horse_id"])
-
-    entries = list(race.entries)
-    weights = [float(e.weight_kg) for e in entries if e.weight_kg is not None]
-    hps = [float(e.hp) for e in entries if e.hp is not None]
-    s20s = [float(e.s20) for e in entries if e.s20 is not None]
-    field_avg_weight = sum(weights) / len(weights) if weights else None
-    field_avg_hp = sum(hps) / len(hps) if hps else None
-    field_avg_s20 = sum(s20s) / len(s20s) if s20s else None
-    field_size = len(entries)
-    pace_density = compute_field_pace_density(
-        [parse_last_six(e.last_six) for e in entries]
+    q = (
+        session.query(
+            Race.id, Race.date, Race.race_number, Race.distance_meters,
+            Race.surface, RaceEntry.horse_id, RaceEntry.jockey,
+            RaceEntry.trainer, Horse.sire, Horse.age, RaceEntry.gate_number,
+            RaceEntry.weight_kg, RaceEntry.hp, RaceEntry.kgs, RaceEntry.s20,
+            RaceEntry.eid, RaceEntry.agf, RaceEntry.last_six,
+            RaceEntry.equipment, RaceEntry.finish_position,
+        )
+        .select_from(RaceEntry)
+        .join(Race, Race.id == RaceEntry.race_id)
+        .outerjoin(Horse, Horse.id == RaceEntry.horse_id)
+        .filter(Race.status == RaceStatus.resulted)
+        .order_by(Race.date.asc(), Race.race_number.asc(), RaceEntry.id.asc())
     )
+    if to_date is not None:
+        q = q.filter(Race.date <= to_date)
+    hist = pd.DataFrame(q.all(), columns=_HISTORY_COLUMNS)
+    for col in ("weight_kg", "hp", "s20", "agf"):
+        hist[col] = hist[col].map(lambda v: float(v) if v is not None else np.nan)
+    hist["date_key"] = pd.to_datetime(hist["race_date"])
+    finished = hist[hist["finish_position"].notna()]
+
+    # Training rows: finished entries of in-window races that pass the
+    # field-size / AGF filters.
+    rows = finished
+    if from_date is not None:
+        rows = rows[rows["race_date"] >= from_date]
+    field_size = rows.groupby("race_id")["race_id"].transform("size")
+    keep = field_size >= min_field_size
+    if require_agf:
+        keep &= rows.groupby("race_id")["agf"].transform("count") > 0
+    rows = rows[keep].copy()
+    rows["field_size"] = field_size[keep]
+    if rows.empty:
+        return TrainingFrame(
+            features=pd.DataFrame(columns=FEATURE_COLUMNS),
+            target=pd.Series(dtype="int64"),
+            groups=pd.Series(dtype="int64"),
+            race_dates=pd.Series(dtype="object"),
+        )
 
-    rows: list[dict] = []
-    for entry in entries:
-        trainer_name = entry.horse.trainer if entry.horse else None
-        sire_name = entry.horse.sire if entry.horse else None
+    # Field-level context over the same finished entries.
+    by_race = rows.groupby("race_id")
+    rows["field_avg_weight"] = by_race["weight_kg"].transform("mean")
+    rows["field_avg_hp"] = by_race["hp"].transform("mean")
+    rows["field_avg_s20"] = by_race["s20"].transform("mean")
+    rows["last_six_parsed"] = rows["last_six"].map(parse_last_six)
+    pace = by_race["last_six_parsed"].agg(
+        lambda lists: compute_field_pace_density(list(lists)),
+    )
+    rows["field_pace_density"] = rows["race_id"].map(pace)
+    # Sentinel finish values beyond the field size (see the per-row path).
+    rows = rows[rows["finish_position"] <= rows["field_size"]].copy()
+
+    rows["jockey_win_rate"] = _asof_rate(finished, rows, ["jockey"])
+    rows["trainer_win_rate"] = _asof_rate(finished, rows, ["trainer"])
+    rows["sire_win_rate"] = _asof_rate(finished, rows, ["sire"])
+    rows["sire_surface_rate"] = _asof_rate(finished, rows, ["sire", "surface"])
+    rows["surface_affinity"] = _asof_surface_affinity(finished, rows)
+    _asof_previous_race(hist, rows)
+
+    records: list[dict] = []
+    for r in rows.itertuples(index=False):
         features = extract_features(
-            eid_seconds=parse_eid_to_seconds(entry.eid),
-            distance_meters=race.distance_meters,
-            last_six_parsed=parse_last_six(entry.last_six),
-            weight_kg=float(entry.weight_kg) if entry.weight_kg is not None else None,
-            field_avg_weight=field_avg_weight,
-            kgs=int(entry.kgs) if entry.kgs is not None else None,
-            hp=float(entry.hp) if entry.hp is not None else None,
-            field_avg_hp=field_avg_hp,
-            s20=float(entry.s20) if entry.s20 is not None else None,
-            field_avg_s20=field_avg_s20,
-            session=session,
-            jockey=entry.jockey,
-            trainer=trainer_name,
-            horse_id=entry.horse_id,
-            gate_number=entry.gate_number,
-            surface=race.surface,
-            race_date=race.date,
-            agf=float(entry.agf) if entry.agf is not None else None,
-            field_size=field_size,
-            sire=sire_name,
-            equipment=entry.equipment,
-            field_pace_density=pace_density,
+            eid_seconds=parse_eid_to_seconds(r.eid),
+            distance_meters=_none_if_nan(r.distance_meters),
+            last_six_parsed=r.last_six_parsed,
+            weight_kg=_none_if_nan(r.weight_kg),
+            field_avg_weight=_none_if_nan(r.field_avg_weight),
+            kgs=int(r.kgs) if _none_if_nan(r.kgs) is not None else None,
+            hp=_none_if_nan(r.hp),
+            field_avg_hp=_none_if_nan(r.field_avg_hp),
+            s20=_none_if_nan(r.s20),
+            field_avg_s20=_none_if_nan(r.field_avg_s20),
+            jockey=r.jockey,
+            gate_number=_none_if_nan(r.gate_number),
+            surface=r.surface,
+            agf=_none_if_nan(r.agf),
+            field_size=int(r.field_size),
+            field_pace_density=r.field_pace_density,
         )
-        rows.append({
-            "horse_id": entry.horse_id,
+        records.append({
             "speed_figure": features.speed_figure,
             "form_cycle": features.form_cycle,
             "weight_delta": features.weight_delta,
             "rest_fitness": features.rest_fitness,
             "class_indicator": features.class_indicator,
-            "jockey_win_rate": features.jockey_win_rate,
-            "trainer_win_rate": features.trainer_win_rate,
             "gate_bias": features.gate_bias,
-            "surface_affinity": features.surface_affinity,
             "agf_edge": features.agf_edge,
-            "sire_win_rate": features.sire_win_rate,
-            "sire_surface_rate": features.sire_surface_rate,
-            "surface_switch": features.surface_switch,
-            "distance_delta_m": features.distance_delta_m,
-            "equipment_changed": features.equipment_changed,
             "apprentice_jockey": features.apprentice_jockey,
-            "field_pace_density": features.field_pace_density,
             "s20_edge": features.s20_edge,
-            "agf_raw": float(entry.agf) if entry.agf is not None else np.nan,
-            "hp_raw": float(entry.hp) if entry.hp is not None else np.nan,
-            "weight_kg_raw": (
-                float(entry.weight_kg) if entry.weight_kg is not None else np.nan
-            ),
-            "kgs_raw": int(entry.kgs) if entry.kgs is not None else np.nan,
-            "s20_raw": float(entry.s20) if entry.s20 is not None else np.nan,
-            "gate_number": (
-                int(entry.gate_number) if entry.gate_number is not None else np.nan
-            ),
-            "age": int(entry.horse.age) if entry.horse and entry.horse.age else np.nan,
-            "distance_meters": (
-                int(race.distance_meters) if race.distance_meters else np.nan
-            ),
-            "field_size": field_size,
-            "surface_is_kum": _surface_encode(race.surface),
         })
+    df = pd.concat(
+        [rows.reset_index(drop=True), pd.DataFrame(records)], axis=1,
+    )
+    df["agf_raw"] = df["agf"]
+    df["hp_raw"] = df["hp"]
+    df["weight_kg_raw"] = df["weight_kg"]
+    df["kgs_raw"] = df["kgs"]
+    df["s20_raw"] = df["s20"]
+    df["age"] = df["age"].where(df["age"].fillna(0) != 0)
+    df["distance_meters"] = df["distance_meters"].where(
+        df["distance_meters"].fillna(0) != 0,
+    )
+    df["surface_is_kum"] = df["surface"].map(_surface_encode)
+    df[TARGET_COLUMN] = df["field_size"] - df["finish_position"]
+
+    df = df.sort_values([GROUP_COLUMN, "finish_position"]).reset_index(drop=True)
+    return TrainingFrame(
+        features=df[FEATURE_COLUMNS].astype("float64"),
+        target=df[TARGET_COLUMN].astype("int64"),
+        groups=df[GROUP_COLUMN].astype("int64"),
+        race_dates=df["race_date"],
+    )
+
+
+def _asof_rate(
+    history: pd.DataFrame, rows: pd.DataFrame, keys: list[str],
+) -> np.ndarray:
+    """Smoothed win rate per ``keys`` using only races before each row's date.
+
+    Mirrors the per-row ``compute_*_win_rate`` helpers: empty keys map
+    to ``None`` (NaN) and a key with no prior runs has no rate.
+    """
+    valid = history[keys].notna().all(axis=1) & (history[keys] != "").all(axis=1)
+    daily = (
+        history[valid]
+        .assign(win=lambda d: (d["finish_position"] == 1).astype("int64"))
+        .groupby(keys + ["date_key"], sort=True)
+        .agg(runs=("win", "size"), wins=("win", "sum"))
+    )
+    # Cumulative totals *before* each date: cumsum minus the day itself.
+    grouped = daily.groupby(level=keys, sort=False)
+    prior = pd.DataFrame({
+        "runs": grouped["runs"].cumsum() - daily["runs"],
+        "wins": grouped["wins"].cumsum() - daily["wins"],
+    }).reset_index()
+    merged = rows[keys + ["date_key"]].merge(
+        prior, on=keys + ["date_key"], how="left",
+    )
+    return bayesian_smoothed_rates(
+        merged["wins"].fillna(0).to_numpy(), merged["runs"].fillna(0).to_numpy(),
+    )
+
+
+def _asof_surface_affinity(
+    history: pd.DataFrame, rows: pd.DataFrame, distance_band: int = 200,
+) -> np.ndarray:
+    """Per-row horse win rate on the same surface within ±``distance_band``."""
+    targets = rows[["horse_id", "surface", "distance_meters", "date_key"]].copy()
+    targets["_row"] = np.arange(len(targets))
+    past = history[["horse_id", "surface", "distance_meters", "date_key",
+                    "finish_position"]]
+    pairs = targets.merge(past, on="horse_id", suffixes=("", "_h"))
+    mask = pairs["date_key_h"] < pairs["date_key"]
+    mask &= pairs["surface"].isna() | (pairs["surface_h"] == pairs["surface"])
+    mask &= pairs["distance_meters"].isna() | (
+        (pairs["distance_meters_h"] - pairs["distance_meters"]).abs()
+        <= distance_band
+    )
+    pairs = pairs[mask]
+    runs = pairs.groupby("_row").size().reindex(targets["_row"], fill_value=0)
+    wins = (
+        (pairs["finish_position"] == 1).groupby(pairs["_row"]).sum()
+        .reindex(targets["_row"], fill_value=0)
+    )
+    return bayesian_smoothed_rates(wins.to_numpy(), runs.to_numpy())
+
+
+def _asof_previous_race(history: pd.DataFrame, rows: pd.DataFrame) -> None:
+    """Fill surface_switch / distance_delta_m / equipment_changed in place.
+
+    Each looks at the horse's latest resulted run strictly before the
+    row's date, with the same null rules as the per-row helpers.
+    """
+    order = rows.sort_values("date_key")[["horse_id", "date_key"]]
+
+    def _previous(column: str, require_value: bool) -> pd.Series:
+        past = history[["horse_id", "date_key", column]]
+        if require_value:
+            past = past[past[column].notna()]
+        merged = pd.merge_asof(
+            order.reset_index(),
+            past.sort_values("date_key").rename(columns={column: "_prev"}),
+            on="date_key", by="horse_id", allow_exact_matches=False,
+        )
+        return merged.set_index("index")["_prev"].reindex(rows.index)
 
-    return pd.DataFrame(rows)
+    prev_surface = _previous("surface", require_value=True)
+    has_surface = prev_surface.notna() & rows["surface"].notna()
+    rows["surface_switch"] = np.where(
+        has_surface, (prev_surface != rows["surface"]).astype(float), np.nan,
+    )
+
+    prev_distance = _previous("distance_meters", require_value=True)
+    rows["distance_delta_m"] = (
+        rows["distance_meters"].astype("float64") - prev_distance.astype("float64")
+    )
+
+    prev_equipment = _previous("equipment", require_value=False)
+    norm_prev = prev_equipment.map(_norm_equipment)
+    norm_curr = rows["equipment"].map(_norm_equipment)
+    rows["equipment_changed"] = np.where(
+        prev_equipment.notna(),
+        (norm_prev.fillna("") != norm_curr.fillna("")).astype(float),
+        np.nan,
+    )
+
+
+def _norm_equipment(value) -> str | None:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value.strip() or None
+
+
+def _none_if_nan(value):
+    if value is None:
+        return None
+    try:
+        if math.isnan(value):
+            return None
+    except TypeError:
+        return value
+    return value
+
+
+def build_race_frame(session: Session, race_id: int) -> pd.DataFrame:
+    """Build an inference-time feature matrix for a single race.
+
+    Returns a DataFrame with FEATURE_COLUMNS + ``horse_id`` so callers
+    can zip predictions back to entries.
+    """
+    frame = build_card_frame(session, [race_id])
+    return frame.drop(columns=[GROUP_COLUMN])
+
+
+def build_card_frame(session: Session, race_ids: list[int]) -> pd.DataFrame:
+    """Build an inference-time feature matrix for several races at once.
+
+    History features for every runner on the card are resolved with
+    :func:`~ganyan.predictor.features.compute_history_features_batch`,
+    so the query count no longer scales with the number of horses.
+    Returns FEATURE_COLUMNS + ``race_id`` + ``horse_id``, rows grouped
+    by race in the order of ``race_ids``.
+    """
+    columns = FEATURE_COLUMNS + [GROUP_COLUMN, "horse_id"]
+    if not race_ids:
+        return pd.DataFrame(columns=columns)
+    races_by_id = {
+        race.id: race
+        for race in session.query(Race)
+        .options(selectinload(Race.entries).joinedload(RaceEntry.horse))
+        .filter(Race.id.in_(race_ids))
+        .all()
+    }
+    races = [
+        races_by_id[rid] for rid in dict.fromkeys(race_ids)
+        if rid in races_by_id and races_by_id[rid].entries
+    ]
+    if not races:
+        return pd.DataFrame(columns=columns)
+
+    requests = [
+        HistoryRequest(
+            horse_id=entry.horse_id,
+            race_date=race.date,
+            jockey=entry.jockey,
+            trainer=entry.trainer,
+            sire=entry.horse.sire if entry.horse else None,
+            surface=race.surface,
+            distance_meters=race.distance_meters,
+            equipment=entry.equipment,
+        )
+        for race in races
+        for entry in race.entries
+    ]
+    history = iter(compute_history_features_batch(session, requests))
+
+    rows: list[dict] = []
+    for race in races:
+        entries = list(race.entries)
+        weights = [float(e.weight_kg) for e in entries if e.weight_kg is not None]
+        hps = [float(e.hp) for e in entries if e.hp is not None]
+        s20s = [float(e.s20) for e in entries if e.s20 is not None]
+        field_avg_weight = sum(weights) / len(weights) if weights else None
+        field_avg_hp = sum(hps) / len(hps) if hps else None
+        field_avg_s20 = sum(s20s) / len(s20s) if s20s else None
+        field_size = len(entries)
+        pace_density = compute_field_pace_density(
+            [parse_last_six(e.last_six) for e in entries]
+        )
+
+        for entry in entries:
+            # History-free features here; the history-derived ones come
+            # from the batched lookup above.
+            features = extract_features(
+                eid_seconds=parse_eid_to_seconds(entry.eid),
+                distance_meters=race.distance_meters,
+                last_six_parsed=parse_last_six(entry.last_six),
+                weight_kg=float(entry.weight_kg) if entry.weight_kg is not None else None,
+                field_avg_weight=field_avg_weight,
+                kgs=int(entry.kgs) if entry.kgs is not None else None,
+                hp=float(entry.hp) if entry.hp is not None else None,
+                field_avg_hp=field_avg_hp,
+                s20=float(entry.s20) if entry.s20 is not None else None,
+                field_avg_s20=field_avg_s20,
+                jockey=entry.jockey,
+                gate_number=entry.gate_number,
+                surface=race.surface,
+                agf=float(entry.agf) if entry.agf is not None else None,
+                field_size=field_size,
+                field_pace_density=pace_density,
+            )
+            for name, value in next(history).items():
+                setattr(features, name, value)
+            row = _feature_row(entry, race, features, field_size)
+            row[GROUP_COLUMN] = race.id
+            row["horse_id"] = entry.horse_id
+            rows.append(row)
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _feature_row(entry: RaceEntry, race: Race, features, field_size: int) -> dict:
+    """Flatten engineered features + raw entry values into a frame row."""
+    return {
+        "speed_figure": features.speed_figure,
+        "form_cycle": features.form_cycle,
+        "weight_delta": features.weight_delta,
+        "rest_fitness": features.rest_fitness,
+        "class_indicator": features.class_indicator,
+        "jockey_win_rate": features.jockey_win_rate,
+        "trainer_win_rate": features.trainer_win_rate,
+        "gate_bias": features.gate_bias,
+        "surface_affinity": features.surface_affinity,
+        "agf_edge": features.agf_edge,
+        "sire_win_rate": features.sire_win_rate,
+        "sire_surface_rate": features.sire_surface_rate,
+        "surface_switch": features.surface_switch,
+        "distance_delta_m": features.distance_delta_m,
+        "equipment_changed": features.equipment_changed,
+        "apprentice_jockey": features.apprentice_jockey,
+        "field_pace_density": features.field_pace_density,
+        "s20_edge": features.s20_edge,
+        "agf_raw": float(entry.agf) if entry.agf is not None else np.nan,
+        "hp_raw": float(entry.hp) if entry.hp is not None else np.nan,
+        "weight_kg_raw": (
+            float(entry.weight_kg) if entry.weight_kg is not None else np.nan
+        ),
+        "kgs_raw": int(entry.kgs) if entry.kgs is not None else np.nan,
+        "s20_raw": float(entry.s20) if entry.s20 is not None else np.nan,
+        "gate_number": (
+            int(entry.gate_number) if entry.gate_number is not None else np.nan
+        ),
+        "age": int(entry.horse.age) if entry.horse and entry.horse.age else np.nan,
+        "distance_meters": (
+            int(race.distance_meters) if race.distance_meters else np.nan
+        ),
+        "field_size": field_size,
+        "surface_is_kum": _surface_encode(race.surface),
+    }
@@ -1,24 +1,35 @@
 """Inference-time predictor that mirrors :class:`BayesianPredictor`'s API.
 
-Loads a LightGBM booster from disk, builds the per-race feature matrix
-with :func:`ml.features.build_race_frame`, and converts raw LightGBM
-scores into well-behaved win probabilities via a within-race softmax.
+Loads a LightGBM booster from disk, builds the feature matrix for one
+or many races with :func:`ml.features.build_card_frame`, and converts
+raw LightGBM scores into well-behaved win probabilities via a
+within-race softmax.
+
+Boosters are shared process-wide through :data:`model_registry`, so a
+web request or scheduler job constructing a fresh :class:`MLPredictor`
+doesn't re-parse the model file; the registry reloads only when the
+file on disk actually changes (e.g. after the monthly retrain).
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import math
+import threading
 from dataclasses import dataclass, field
+from datetime import date as date_type, datetime
 from pathlib import Path
 
 import lightgbm as lgb
 import numpy as np
 from sqlalchemy.orm import Session
 
-from ganyan.db.models import Prediction as PredictionRow, Race, RaceEntry
-from ganyan.predictor.bayesian import Prediction
-from ganyan.predictor.ml.features import FEATURE_COLUMNS, build_race_frame
+from ganyan.db.models import Race
+from ganyan.predictor.bayesian import Prediction, save_predictions
+from ganyan.predictor.ml.features import (
+    FEATURE_COLUMNS, GROUP_COLUMN, build_card_frame,
+)
 from ganyan.predictor.ml.trainer import (
     DEFAULT_MODEL_BASENAME, DEFAULT_MODEL_DIR,
 )
@@ -71,6 +82,120 @@ def load_latest_model(
     )
 
 
+@dataclass
+class _RegistryEntry:
+    model: LoadedModel
+    model_path: Path
+    signature: tuple
+    content_hash: str
+    loaded_at: datetime
+
+
+class ModelRegistry:
+    """Thread-safe, process-wide cache of loaded boosters keyed by file.
+
+    :meth:`get` stats ``<name>.txt`` and ``<name>.meta.json`` on every
+    call — microseconds, versus tens of milliseconds to parse the model.
+    When the mtime/size signature moves, the files are hashed and the
+    booster is only re-parsed if the content really changed, so a
+    ``touch`` or an identical re-save keeps the loaded instance.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Path, _RegistryEntry] = {}
+
+    def get(
+        self,
+        model_name: str | None = None,
+        model_dir: Path | None = None,
+    ) -> LoadedModel:
+        """Return the current model for ``model_name``, reloading if stale.
+
+        Raises :class:`FileNotFoundError` like :func:`load_latest_model`.
+        """
+        model_dir = model_dir or DEFAULT_MODEL_DIR
+        model_name = model_name or DEFAULT_MODEL_BASENAME
+        model_path = model_dir / f"{model_name}.txt"
+        meta_path = model_dir / f"{model_name}.meta.json"
+
+        with self._lock:
+            entry = self._entries.get(model_path)
+            signature = _file_signature(model_path, meta_path)
+            if entry is not None and entry.signature == signature:
+                return entry.model
+            if signature[0] is None:
+                # Model removed from disk — drop it and let the loader raise.
+                self._entries.pop(model_path, None)
+                return load_latest_model(model_dir, model_name)
+
+            content_hash = _content_hash(model_path, meta_path)
+            if entry is not None and entry.content_hash == content_hash:
+                entry.signature = signature
+                return entry.model
+
+            model = load_latest_model(model_dir, model_name)
+            self._entries[model_path] = _RegistryEntry(
+                model=model,
+                model_path=model_path,
+                signature=signature,
+                content_hash=content_hash,
+                loaded_at=datetime.utcnow(),
+            )
+            return model
+
+    def status(self) -> list[dict]:
+        """One dict per loaded model, for the ops dashboard."""
+        with self._lock:
+            return [
+                {
+                    "model_name": path.stem,
+                    "model_path": str(path),
+                    "model_version": entry.model.model_version,
+                    "content_hash": entry.content_hash[:12],
+                    "loaded_at": entry.loaded_at,
+                }
+                for path, entry in sorted(self._entries.items())
+            ]
+
+    def clear(self) -> None:
+        """Forget every loaded model (next :meth:`get` re-parses)."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _file_signature(*paths: Path) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _content_hash(*paths: Path) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        if path.exists():
+            digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+model_registry = ModelRegistry()
+
+
+def get_model(
+    model_name: str | None = None,
+    model_dir: Path | None = None,
+) -> LoadedModel:
+    """Shortcut for ``model_registry.get(...)``."""
+    return model_registry.get(model_name, model_dir)
+
+
 class MLPredictor:
     """LightGBM-based predictor with the same public API as BayesianPredictor.
 
@@ -80,8 +205,9 @@ class MLPredictor:
         preds = predictor.predict(race_id)
         preds = predictor.predict_and_save(race_id)
 
-    The loaded model is memoised on the instance; pass ``model=`` to
-    override (useful for unit tests).
+    The model comes from the shared :data:`model_registry` and is
+    memoised on the instance; pass ``model=`` to override (useful for
+    unit tests and for the AGF-free value model).
     """
 
     def __init__(
@@ -95,7 +221,7 @@ class MLPredictor:
     @property
     def model(self) -> LoadedModel:
         if self._model is None:
-            self._model = load_latest_model()
+            self._model = get_model()
         return self._model
 
     # ------------------------------------------------------------------
@@ -104,13 +230,19 @@ class MLPredictor:
 
     def predict(self, race_id: int) -> list[Prediction]:
         """Return a list of :class:`Prediction` sorted by probability desc."""
-        race = self.session.get(Race, race_id)
-        if race is None or not race.entries:
-            return []
+        return self.predict_many([race_id])[race_id]
+
+    def predict_many(self, race_ids: list[int]) -> dict[int, list[Prediction]]:
+        """Predict several races with one feature build and one booster call.
 
-        frame = build_race_frame(self.session, race_id)
+        Returns ``{race_id: predictions}`` in the order of ``race_ids``;
+        races that are missing or have no entries map to ``[]``.
+        """
+        race_ids = list(dict.fromkeys(race_ids))
+        results: dict[int, list[Prediction]] = {rid: [] for rid in race_ids}
+        frame = build_card_frame(self.session, race_ids)
         if frame.empty:
-            return []
+            return results
 
         feature_cols = self.model.feature_columns
         X = frame[feature_cols].astype("float64")
@@ -118,90 +250,96 @@ class MLPredictor:
 
         # Within-race softmax.  LightGBM's rank scores are
         # unnormalised log-preferences; exponentiating and normalising
-        # is the standard way to turn them into a probability simplex.
-        probs = _softmax(raw_scores)
-
-        # Map back to entries so we can get horse.name.
-        entries_by_id = {e.horse_id: e for e in race.entries}
-        predictions: list[Prediction] = []
-        for i, row in frame.iterrows():
-            horse_id = int(row["horse_id"])
-            entry = entries_by_id.get(horse_id)
+        # per race is the standard way to turn them into a probability
+        # simplex.
+        groups = frame[GROUP_COLUMN].to_numpy(dtype="int64")
+        probs = _grouped_softmax(raw_scores, groups)
+        confidences = _grouped_confidence(probs, groups)
+
+        values = X.to_numpy()
+        horse_ids = frame["horse_id"].to_numpy(dtype="int64")
+        # build_card_frame loaded every race + entry into the session,
+        # so these lookups hit the identity map rather than the DB.
+        entries_by_key = {
+            (rid, e.horse_id): e
+            for rid in results
+            if (race := self.session.get(Race, rid)) is not None
+            for e in race.entries
+        }
+        for i in range(len(frame)):
+            race_id, horse_id = int(groups[i]), int(horse_ids[i])
+            entry = entries_by_key.get((race_id, horse_id))
             if entry is None:
                 continue
             factors = {
-                col: float(row[col])
-                for col in feature_cols
-                if col in row and row[col] is not None and not _isnan(row[col])
+                col: float(v)
+                for col, v in zip(feature_cols, values[i])
+                if not math.isnan(v)
             }
-            predictions.append(
+            results[race_id].append(
                 Prediction(
                     horse_id=horse_id,
                     horse_name=entry.horse.name if entry.horse else "?",
                     probability=float(probs[i] * 100.0),
-                    confidence=_confidence(probs, i),
+                    confidence=float(confidences[i]),
                     contributing_factors=factors,
                 )
             )
 
-        predictions.sort(key=lambda p: p.probability, reverse=True)
-        return predictions
+        for preds in results.values():
+            preds.sort(key=lambda p: p.probability, reverse=True)
+        return results
+
+    def predict_date(self, race_date: date_type) -> dict[int, list[Prediction]]:
+        """:meth:`predict_many` over every race on ``race_date``."""
+        race_ids = [
+            rid for (rid,) in self.session.query(Race.id)
+            .filter(Race.date == race_date)
+            .order_by(Race.race_number)
+        ]
+        return self.predict_many(race_ids)
 
     def predict_and_save(self, race_id: int) -> list[Prediction]:
         """Run :meth:`predict` and persist to both RaceEntry and Prediction."""
-        preds = self.predict(race_id)
-        entries = {
-            (e.race_id, e.horse_id): e
-            for e in self.session.query(RaceEntry)
-            .filter(RaceEntry.race_id == race_id)
-            .all()
-        }
-        version = self.model.model_version
-        for p in preds:
-            entry = entries.get((race_id, p.horse_id))
-            if entry is None:
-                continue
-            entry.predicted_probability = p.probability
-            self.session.add(
-                PredictionRow(
-                    race_entry_id=entry.id,
-                    model_version=version,
-                    probability=p.probability,
-                    confidence=p.confidence,
-                    factors=p.contributing_factors,
-                )
-            )
-        return preds
+        return self.predict_and_save_many([race_id])[race_id]
+
+    def predict_and_save_many(
+        self, race_ids: list[int],
+    ) -> dict[int, list[Prediction]]:
+        """Run :meth:`predict_many` and persist every race's predictions.
+
+        Written in one batch via :func:`~ganyan.predictor.bayesian.save_predictions`.
+        """
+        results = self.predict_many(race_ids)
+        save_predictions(self.session, results, self.model.model_version)
+        return results
 
 
-def _softmax(x: np.ndarray) -> np.ndarray:
-    """Numerically-stable softmax (subtracts max before exp)."""
+def _grouped_softmax(x: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Numerically-stable softmax within each group (subtracts group max)."""
     if len(x) == 0:
         return x
-    shifted = x - np.max(x)
-    exps = np.exp(shifted)
-    return exps / exps.sum()
+    _, codes = np.unique(groups, return_inverse=True)
+    maxes = np.full(codes.max() + 1, -np.inf)
+    np.maximum.at(maxes, codes, x)
+    exps = np.exp(x - maxes[codes])
+    return exps / np.bincount(codes, weights=exps)[codes]
 
 
-def _confidence(probs: np.ndarray, idx: int) -> float:
-    """Heuristic confidence — how far above uniform is this pick?
+def _grouped_confidence(probs: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Heuristic confidence — how far above uniform is each pick?
 
-    Confidence = min(1, (p - uniform) / (p_max - uniform)) clamped to
-    [0, 1].  A horse at the softmax maximum scores 1.0; a horse right
-    at uniform scores 0.0.
+    Confidence = (p - uniform) / (p_max - uniform) within the horse's
+    race, clamped to [0, 1].  A horse at its race's softmax maximum
+    scores 1.0; a horse right at uniform scores 0.0.
     """
     if len(probs) == 0:
-        return 0.0
-    uniform = 1.0 / len(probs)
-    p_max = float(probs.max())
-    if p_max <= uniform:
-        return 0.0
-    score = (float(probs[idx]) - uniform) / (p_max - uniform)
-    return max(0.0, min(1.0, score))
-
-
-def _isnan(x) -> bool:
-    try:
-        return math.isnan(x)
-    except (TypeError, ValueError):
-        return False
+        return probs
+    _, codes = np.unique(groups, return_inverse=True)
+    uniform = 1.0 / np.bincount(codes)[codes]
+    p_max = np.zeros(codes.max() + 1)
+    np.maximum.at(p_max, codes, probs)
+    spread = p_max[codes] - uniform
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(spread > 0, (probs - uniform) / spread, 0.0)
+    return np.clip(score, 0.0, 1.0)
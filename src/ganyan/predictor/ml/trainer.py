@@ -7,6 +7,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import date as date_type
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import lightgbm as lgb
 import numpy as np
@@ -20,6 +21,9 @@ from ganyan.predictor.ml.features import (
     build_training_frame,
 )
 
+if TYPE_CHECKING:
+    from ganyan.predictor.ml.feature_store import FeatureStore
+
 
 logger = logging.getLogger(__name__)
 
@@ -164,6 +168,8 @@ def train_ranker(
     model_name: str | None = None,
     params: dict | None = None,
     exclude_features: list[str] | None = None,
+    vectorized: bool = False,
+    feature_store: FeatureStore | None = None,
 ) -> TrainingResult:
     """Fit a LightGBM LambdaRank model on resulted races.
 
@@ -179,6 +185,13 @@ def train_ranker(
         Maximum training rounds.  Early stopping may terminate sooner.
     params:
         LightGBM parameter overrides merged over the defaults.
+    vectorized:
+        Build the training frame with the set-based as-of path instead
+        of per-row history queries (same features, much faster on long
+        histories).
+    feature_store:
+        Read (and incrementally extend) the training matrix from this
+        date-partitioned store instead of recomputing it.
 
     The trained booster is saved to ``<model_dir>/<name>.txt`` with a
     JSON sidecar (``<name>.meta.json``) capturing the feature column
@@ -190,7 +203,8 @@ def train_ranker(
     model_name = model_name or DEFAULT_MODEL_BASENAME
 
     frame = build_training_frame(
-        session, from_date=from_date, to_date=to_date,
+        session, from_date=from_date, to_date=to_date, vectorized=vectorized,
+        store=feature_store,
     )
     if frame.features.empty:
         raise RuntimeError(
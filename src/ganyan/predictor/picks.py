@@ -12,23 +12,27 @@ row each (idempotent — the ``(race_id, strategy)`` unique constraint
 prevents duplicates; re-running simply no-ops).
 
 ``grade_race()`` fills in ``hit``, ``payout_tl``, ``net_tl`` using the
-scraped finish positions and TJK payouts, once the race is resulted.
+scraped finish positions and TJK payouts, once the race is resulted;
+``grade_all_pending()`` does the same for every resulted race in one
+batch.
 """
 
 from __future__ import annotations
 
 import itertools
 import logging
-from datetime import datetime
+import threading
+from datetime import date as date_type, datetime, timedelta
 from typing import Iterable
 
+from sqlalchemy import case, func, update
 from sqlalchemy.orm import Session
 
 from ganyan.db.models import Pick, Race, RaceEntry, RaceStatus
-from ganyan.predictor.exotics import (
-    Combo, ganyan_probabilities, sirali_ikili_probabilities,
-    uclu_probabilities,
+from ganyan.predictor.bootstrap import (
+    DEFAULT_CONFIDENCE, DEFAULT_REPLICATES, RoiInterval, bootstrap_roi,
 )
+from ganyan.predictor.exotics import RaceExoticModel
 
 
 logger = logging.getLogger(__name__)
@@ -76,7 +80,10 @@ def generate_picks_for_race(
     # AGF favourites) but long-run losing due to takeout.  Useful for
     # comparison and for psychological feedback ("did we pick the
     # winner?") that exotic-pool ROI alone doesn't give.
-    gan = ganyan_probabilities(win_probs)
+    # One Harville model serves every strategy below.
+    model = RaceExoticModel(win_probs)
+
+    gan = model.top("ganyan", 1)
     if gan and "ganyan_top1" not in existing:
         top = gan[0]
         added.append(_make_pick(
@@ -90,7 +97,7 @@ def generate_picks_for_race(
         ))
 
     # uclu_top1
-    uclu = uclu_probabilities(win_probs)
+    uclu = model.top("uclu", 1)
     if uclu and len(win_probs) >= 3 and "uclu_top1" not in existing:
         top = uclu[0]
         added.append(_make_pick(
@@ -106,11 +113,7 @@ def generate_picks_for_race(
     # uclu_box6 — the same top-3 horses, all 6 orderings = 6 tickets
     if uclu and len(win_probs) >= 3 and "uclu_box6" not in existing:
         base = list(uclu[0].horses)
-        top3_set = set(base)
-        any_order_prob = sum(
-            c.probability for c in uclu_probabilities(win_probs)
-            if set(c.horses) == top3_set
-        )
+        any_order_prob = model.box_probability(uclu[0].horses)
         added.append(_make_pick(
             race_id=race_id,
             strategy="uclu_box6",
@@ -122,7 +125,7 @@ def generate_picks_for_race(
         ))
 
     # sirali_ikili_top1
-    si = sirali_ikili_probabilities(win_probs)
+    si = model.top("sirali_ikili", 1)
     if si and len(win_probs) >= 2 and "sirali_ikili_top1" not in existing:
         top = si[0]
         added.append(_make_pick(
@@ -199,73 +202,147 @@ def _strategy_payout_tl(strategy: str, race: Race) -> float | None:
     return float(v) if v is not None else None
 
 
-def grade_race(session: Session, race_id: int) -> int:
-    """Grade every ungraded pick for ``race_id``.  Returns count graded."""
-    race = session.get(Race, race_id)
-    if race is None or race.status != RaceStatus.resulted:
-        return 0
-    entries = list(race.entries)
-    actual = _actual_top3(entries)
-    if actual is None:
-        return 0
+def _grade_values(
+    strategy: str, combination: list[int], stake_tl: float,
+    actual: tuple[int, ...], payout_per_tl: float | None,
+) -> dict | None:
+    """``hit`` / ``payout_tl`` / ``net_tl`` for one pick, or None to skip."""
+    hit = _strategy_hit(strategy, combination, actual)
+    if hit is None:
+        return None
+    # Skip grading when TJK didn't publish a payout for this pool:
+    # the bet literally could not have been placed, so it doesn't
+    # belong in the strategy's P&L ledger.  Leave graded=False so
+    # a later scrape that fills the payout still triggers grading.
+    if payout_per_tl is None:
+        return None
+    if hit:
+        # One winning ticket out of ``ticket_count``; rest lost.
+        winning_ticket_payout = payout_per_tl * STAKE_PER_TICKET_TL
+        return {
+            "hit": True,
+            "payout_tl": round(winning_ticket_payout, 2),
+            "net_tl": round(winning_ticket_payout - stake_tl, 2),
+        }
+    return {"hit": False, "payout_tl": 0.0, "net_tl": -stake_tl}
+
+
+def _grade_pending(session: Session, race_id: int | None = None) -> int:
+    """Grade ungraded picks of resulted races, optionally just one race.
 
-    picks = (
-        session.query(Pick)
-        .filter(Pick.race_id == race_id, Pick.graded == False)  # noqa: E712
-        .all()
+    Two reads — pending picks joined with their race's payouts, then
+    the placed finishers of those races — and a single executemany
+    ``UPDATE`` keyed on pick id, however many races are pending.
+    """
+    pending = (
+        session.query(
+            Pick.id, Pick.race_id, Pick.strategy, Pick.combination,
+            Pick.stake_tl, Race.ganyan_payout_tl,
+            Race.sirali_ikili_payout_tl, Race.uclu_payout_tl,
+        )
+        .join(Race, Race.id == Pick.race_id)
+        .filter(
+            Pick.graded == False,  # noqa: E712
+            Race.status == RaceStatus.resulted,
+        )
     )
+    if race_id is not None:
+        pending = pending.filter(Pick.race_id == race_id)
+    rows = pending.all()
+    if not rows:
+        return 0
+
+    pending_races = pending.with_entities(Pick.race_id).distinct().subquery()
+    placed: dict[int, list] = {}
+    for entry in (
+        session.query(
+            RaceEntry.race_id, RaceEntry.horse_id, RaceEntry.finish_position,
+        )
+        .filter(
+            RaceEntry.race_id.in_(session.query(pending_races.c.race_id)),
+            RaceEntry.finish_position.in_((1, 2, 3)),
+        )
+        .order_by(RaceEntry.race_id, RaceEntry.id)
+    ):
+        placed.setdefault(entry.race_id, []).append(entry)
+    actual_for = {r: _actual_top3(entries) for r, entries in placed.items()}
+
     now = datetime.now()
-    graded = 0
-    for pick in picks:
-        hit = _strategy_hit(pick.strategy, pick.combination, actual)
-        if hit is None:
+    updates: list[dict] = []
+    for row in rows:
+        actual = actual_for.get(row.race_id)
+        if actual is None:
             continue
-
-        payout_per_tl = _strategy_payout_tl(pick.strategy, race)
-        # Skip grading when TJK didn't publish a payout for this pool:
-        # the bet literally could not have been placed, so it doesn't
-        # belong in the strategy's P&L ledger.  Leave graded=False so
-        # a later scrape that fills the payout still triggers grading.
-        if payout_per_tl is None:
+        values = _grade_values(
+            row.strategy, row.combination, float(row.stake_tl), actual,
+            _strategy_payout_tl(row.strategy, row),
+        )
+        if values is None:
             continue
+        updates.append({
+            "id": row.id, "graded": True, "graded_at": now, **values,
+        })
 
-        pick.hit = hit
-        pick.graded = True
-        pick.graded_at = now
-        if hit:
-            # One winning ticket out of ``ticket_count``; rest lost.
-            winning_ticket_payout = payout_per_tl * STAKE_PER_TICKET_TL
-            pick.payout_tl = round(winning_ticket_payout, 2)
-            pick.net_tl = round(winning_ticket_payout - float(pick.stake_tl), 2)
-        else:
-            pick.payout_tl = 0.0
-            pick.net_tl = -float(pick.stake_tl)
-        graded += 1
+    if updates:
+        session.execute(update(Pick), updates)
+        # Bulk UPDATE by primary key bypasses already-loaded instances.
+        graded_ids = {u["id"] for u in updates}
+        for obj in list(session.identity_map.values()):
+            if isinstance(obj, Pick) and obj.id in graded_ids:
+                session.expire(obj)
+    return len(updates)
 
-    if graded:
-        session.flush()
-    return graded
+
+def grade_race(session: Session, race_id: int) -> int:
+    """Grade every ungraded pick for ``race_id``.  Returns count graded."""
+    return _grade_pending(session, race_id)
 
 
 def grade_all_pending(session: Session) -> int:
-    """Grade every ungraded pick whose race has resulted.  Returns count."""
-    q = (
-        session.query(Pick.race_id)
-        .join(Race, Race.id == Pick.race_id)
-        .filter(
-            Pick.graded == False,  # noqa: E712
-            Race.status == RaceStatus.resulted,
-        )
-        .distinct()
+    """Grade every ungraded pick whose race has resulted.  Returns count.
+
+    After a backfill or a missed poll window this can be thousands of
+    races; they are graded in one batch rather than race by race.
+    """
+    return _grade_pending(session)
+
+
+def _graded_picks_filter(q, *, strategy: str | None, since):
+    q = q.filter(Pick.graded == True)  # noqa: E712
+    if strategy:
+        q = q.filter(Pick.strategy == strategy)
+    if since is not None:
+        q = q.filter(Pick.generated_at >= since)
+    return q
+
+
+def _ledger_aggregates():
+    """Column expressions summed by the ledger roll-ups."""
+    return (
+        func.count(Pick.id),
+        func.sum(case((Pick.hit == True, 1), else_=0)),  # noqa: E712
+        func.sum(Pick.stake_tl),
+        func.sum(func.coalesce(Pick.payout_tl, 0)),
+        func.sum(func.coalesce(Pick.net_tl, 0)),
     )
-    total = 0
-    for (race_id,) in q.all():
-        total += grade_race(session, race_id)
-    return total
+
+
+def _ledger_row(n, hits, stake, payout, net) -> dict:
+    row = {
+        "n": int(n or 0),
+        "hits": int(hits or 0),
+        "stake_tl": float(stake or 0),
+        "payout_tl": float(payout or 0),
+        "net_tl": float(net or 0),
+    }
+    row["hit_rate_pct"] = (row["hits"] / row["n"]) * 100 if row["n"] else 0
+    row["roi_pct"] = (row["net_tl"] / row["stake_tl"]) * 100 if row["stake_tl"] else 0
+    return row
 
 
 def strategy_summary(
     session: Session, *, strategy: str | None = None, since=None,
+    intervals: bool = False,
 ) -> dict:
     """Aggregate ROI per strategy over graded picks.
 
@@ -275,28 +352,146 @@ def strategy_summary(
           "uclu_top1": {n, hits, stake_tl, payout_tl, net_tl, roi_pct, hit_rate_pct},
           ...
         }
-    """
-    q = session.query(Pick).filter(Pick.graded == True)  # noqa: E712
-    if strategy:
-        q = q.filter(Pick.strategy == strategy)
-    if since is not None:
-        q = q.filter(Pick.generated_at >= since)
 
-    agg: dict[str, dict] = {}
-    for p in q.all():
-        row = agg.setdefault(p.strategy, {
-            "n": 0, "hits": 0, "stake_tl": 0.0, "payout_tl": 0.0, "net_tl": 0.0,
-        })
-        row["n"] += 1
-        row["stake_tl"] += float(p.stake_tl)
-        if p.hit:
-            row["hits"] += 1
-        if p.payout_tl is not None:
-            row["payout_tl"] += float(p.payout_tl)
-        if p.net_tl is not None:
-            row["net_tl"] += float(p.net_tl)
-
-    for row in agg.values():
-        row["hit_rate_pct"] = (row["hits"] / row["n"]) * 100 if row["n"] else 0
-        row["roi_pct"] = (row["net_tl"] / row["stake_tl"]) * 100 if row["stake_tl"] else 0
+    One ``GROUP BY strategy`` query served from the
+    ``(graded, strategy, generated_at)`` index — only the aggregates
+    leave the database, so cost doesn't grow with the ledger.
+
+    With ``intervals`` each row also carries the bootstrap band from
+    :func:`strategy_roi_intervals` (``roi_ci_low_pct``,
+    ``roi_ci_high_pct``, ``p_roi_positive``).
+    """
+    q = _graded_picks_filter(
+        session.query(Pick.strategy, *_ledger_aggregates()),
+        strategy=strategy, since=since,
+    ).group_by(Pick.strategy)
+    agg = {name: _ledger_row(*totals) for name, *totals in q}
+
+    if intervals:
+        for key, interval in strategy_roi_intervals(
+            session, strategy=strategy, since=since,
+        ).items():
+            if key in agg:
+                agg[key].update(interval.as_dict())
     return agg
+
+
+EQUITY_BUCKETS = ("day", "week", "month")
+
+
+def _bucket_start(day: date_type, bucket: str) -> date_type:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def strategy_equity_curve(
+    session: Session, *, bucket: str = "week", strategy: str | None = None,
+    since=None,
+) -> dict[str, list[dict]]:
+    """Per-strategy P&L per time bucket plus the running (cumulative) net.
+
+    Returns ``{strategy: [{period, n, hits, stake_tl, payout_tl,
+    net_tl, roi_pct, hit_rate_pct, cum_net_tl, cum_roi_pct}, ...]}`` in
+    period order.  The database groups by (strategy, day); days are
+    folded into ``bucket`` (``day`` / ``week`` / ``month``, weeks
+    starting Monday) here, so no dialect-specific date truncation is
+    needed and only one row per strategy-day is transferred.
+    """
+    if bucket not in EQUITY_BUCKETS:
+        raise ValueError(
+            f"bucket must be one of {', '.join(EQUITY_BUCKETS)}, got {bucket!r}"
+        )
+    day = func.date(Pick.generated_at)
+    q = _graded_picks_filter(
+        session.query(Pick.strategy, day, *_ledger_aggregates()),
+        strategy=strategy, since=since,
+    ).group_by(Pick.strategy, day).order_by(Pick.strategy, day)
+
+    totals: dict[str, dict[date_type, list[float]]] = {}
+    for name, raw_day, *values in q:
+        # SQLite returns DATE() as an ISO string.
+        if isinstance(raw_day, str):
+            raw_day = date_type.fromisoformat(raw_day)
+        period = _bucket_start(raw_day, bucket)
+        acc = totals.setdefault(name, {}).setdefault(period, [0.0] * 5)
+        for i, v in enumerate(values):
+            acc[i] += float(v or 0)
+
+    curves: dict[str, list[dict]] = {}
+    for name, periods in totals.items():
+        cum_stake = cum_net = 0.0
+        points = []
+        for period in sorted(periods):
+            row = _ledger_row(*periods[period])
+            cum_stake += row["stake_tl"]
+            cum_net += row["net_tl"]
+            row["period"] = period.isoformat()
+            row["cum_net_tl"] = cum_net
+            row["cum_roi_pct"] = cum_net / cum_stake * 100 if cum_stake else 0
+            points.append(row)
+        curves[name] = points
+    return curves
+
+
+# Bootstrap results keyed by query + ledger fingerprint; see below.
+# Flask serves ``/picks`` from several threads, hence the lock.
+_INTERVAL_CACHE: dict[tuple, dict[str, RoiInterval]] = {}
+_INTERVAL_CACHE_SIZE = 32
+_INTERVAL_CACHE_LOCK = threading.Lock()
+
+
+def strategy_roi_intervals(
+    session: Session,
+    *,
+    strategy: str | None = None,
+    since=None,
+    replicates: int = DEFAULT_REPLICATES,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> dict[str, RoiInterval]:
+    """Bootstrap ROI band per strategy over graded picks.
+
+    Each pick is one race for its strategy, so resampling picks is
+    race-level resampling.  Results are cached per process and keyed on
+    a cheap fingerprint of the graded ledger (row count, newest id,
+    total net), so ``/picks`` only pays for the bootstrap after new
+    picks are graded.
+    """
+    q = _graded_picks_filter(
+        session.query(Pick), strategy=strategy, since=since,
+    )
+
+    fingerprint = q.with_entities(
+        func.count(Pick.id), func.max(Pick.id), func.sum(Pick.net_tl),
+    ).one()
+    key = (
+        strategy, since, replicates, confidence,
+        tuple(str(v) for v in fingerprint),
+    )
+    with _INTERVAL_CACHE_LOCK:
+        cached = _INTERVAL_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    stakes: dict[str, list[float]] = {}
+    payouts: dict[str, list[float]] = {}
+    for name, stake, payout in q.with_entities(
+        Pick.strategy, Pick.stake_tl, Pick.payout_tl,
+    ).order_by(Pick.id):
+        stakes.setdefault(name, []).append(float(stake))
+        payouts.setdefault(name, []).append(float(payout or 0.0))
+    result = {
+        name: bootstrap_roi(
+            stakes[name], payouts[name],
+            replicates=replicates, confidence=confidence,
+        )
+        for name in stakes
+    }
+
+    with _INTERVAL_CACHE_LOCK:
+        if key not in _INTERVAL_CACHE and len(_INTERVAL_CACHE) >= _INTERVAL_CACHE_SIZE:
+            _INTERVAL_CACHE.pop(next(iter(_INTERVAL_CACHE)))
+        # A concurrent request may have finished the same bootstrap first.
+        return _INTERVAL_CACHE.setdefault(key, result)
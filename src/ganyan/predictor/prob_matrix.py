@@ -0,0 +1,280 @@
+"""On-disk probability matrices for back-test and strategy sweeps.
+
+Every ``exotics-backtest`` run used to recompute model probabilities for
+each race before touching a single payout.  A probability matrix
+materialises, once per model version and date window, everything those
+sweeps read:
+
+    <root>/<model_version>/<from>_<to>/race_ids.npy      (R,)
+                                       dates.npy         (R,) datetime64[D]
+                                       race_numbers.npy  (R,)
+                                       n_runners.npy     (R,)
+                                       horse_ids.npy     (R, W)  -1 padding
+                                       prob.npy          (R, W)  win prob 0-1, NaN = none
+                                       finish.npy        (R, W)  0 = no finish
+                                       agf.npy           (R, W)  percent, NaN = none
+                                       payouts.npy       (R, 5)  TL per 1 TL, NaN = none
+                                       meta.json
+
+Races are resulted races in date / race-number order; runners keep
+entry (id) order and are padded to the widest field ``W``.  Payout
+columns follow :data:`MATRIX_POOLS`.  Arrays are plain ``.npy`` opened
+memory-mapped, so reloading a multi-year window is free and a sweep is
+pure array math.  ``meta.json`` is written last and marks the artifact
+complete.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date as date_type, datetime
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ganyan.db.models import Race, RaceEntry, RaceStatus
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATRIX_DIR = Path(__file__).resolve().parents[2].parent / "data" / "prob_matrix"
+
+# Payout column order of ``payouts.npy``.
+MATRIX_POOLS: tuple[str, ...] = (
+    "ganyan", "ikili", "sirali_ikili", "uclu", "dortlu",
+)
+
+_ARRAYS = (
+    "race_ids", "dates", "race_numbers", "n_runners",
+    "horse_ids", "prob", "finish", "agf", "payouts",
+)
+
+
+@dataclass
+class ProbabilityMatrix:
+    """Padded race × runner arrays for one model version and window."""
+
+    race_ids: np.ndarray
+    dates: np.ndarray
+    race_numbers: np.ndarray
+    n_runners: np.ndarray
+    horse_ids: np.ndarray
+    prob: np.ndarray
+    finish: np.ndarray
+    agf: np.ndarray
+    payouts: np.ndarray
+    meta: dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.race_ids)
+
+    @property
+    def predicted(self) -> np.ndarray:
+        """Races with at least one predicted runner."""
+        return (~np.isnan(self.prob)).any(axis=1)
+
+    def win_probs(self, i: int) -> dict[int, float]:
+        """``{horse_id: win probability}`` of race ``i``'s predicted runners."""
+        present = ~np.isnan(self.prob[i])
+        return dict(zip(
+            self.horse_ids[i][present].tolist(), self.prob[i][present].tolist(),
+        ))
+
+    def winning_combo(self, i: int, size: int) -> tuple[int, ...] | None:
+        """First ``size`` finishers of race ``i`` by horse id, or None."""
+        finish = self.finish[i]
+        finishers = np.nonzero(finish > 0)[0]
+        if len(finishers) < size:
+            return None
+        order = finishers[np.argsort(finish[finishers], kind="stable")]
+        return tuple(self.horse_ids[i][order[:size]].tolist())
+
+    def payout(self, i: int, pool: str) -> float | None:
+        value = self.payouts[i, MATRIX_POOLS.index(pool)]
+        return None if np.isnan(value) else float(value)
+
+    def covers(
+        self, from_date: date_type | None, to_date: date_type | None,
+    ) -> bool:
+        """True when the build window includes the given bounds.
+
+        An omitted bound means "wherever the matrix ends".
+        """
+        built_from = self.meta.get("from_date")
+        built_to = self.meta.get("to_date")
+        if from_date is not None and built_from is not None and (
+            from_date < date_type.fromisoformat(built_from)
+        ):
+            return False
+        if to_date is not None and built_to is not None and (
+            to_date > date_type.fromisoformat(built_to)
+        ):
+            return False
+        return True
+
+    def window(
+        self,
+        from_date: date_type | None = None,
+        to_date: date_type | None = None,
+    ) -> ProbabilityMatrix:
+        """The races dated within ``[from_date, to_date]``.
+
+        Races are in date order, so this is a slice: memory-mapped
+        arrays stay mapped.
+        """
+        lo = 0 if from_date is None else int(np.searchsorted(
+            self.dates, np.datetime64(from_date, "D"), side="left",
+        ))
+        hi = len(self) if to_date is None else int(np.searchsorted(
+            self.dates, np.datetime64(to_date, "D"), side="right",
+        ))
+        rows = slice(lo, max(lo, hi))
+        meta = dict(self.meta)
+        if from_date is not None:
+            meta["from_date"] = from_date.isoformat()
+        if to_date is not None:
+            meta["to_date"] = to_date.isoformat()
+        meta["races"] = rows.stop - rows.start
+        return ProbabilityMatrix(
+            **{name: getattr(self, name)[rows] for name in _ARRAYS}, meta=meta,
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> Path:
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        # Written last: its presence marks the artifact complete.
+        (path / "meta.json").write_text(json.dumps(self.meta, indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: Path, *, mmap: bool = True) -> "ProbabilityMatrix":
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No probability matrix at {path}")
+        mode = "r" if mmap else None
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mode)
+            for name in _ARRAYS
+        }
+        return cls(**arrays, meta=json.loads(meta_path.read_text()))
+
+
+def matrix_path(
+    model_version: str,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+    root: Path | None = None,
+) -> Path:
+    """Artifact directory for ``model_version`` over a date window."""
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", model_version)
+    window = (
+        f"{from_date.isoformat() if from_date else 'start'}_"
+        f"{to_date.isoformat() if to_date else 'end'}"
+    )
+    return (root or DEFAULT_MATRIX_DIR) / safe / window
+
+
+def build_probability_matrix(
+    session: Session,
+    predictor: object,
+    *,
+    model_version: str,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+) -> ProbabilityMatrix:
+    """Score resulted races in the window and pack them into arrays.
+
+    ``predictor`` is anything with ``predict`` (and optionally
+    ``predict_many``) — normally a
+    :class:`~ganyan.predictor.replay.StoredPredictor` so stored rows are
+    reused and only missing races are re-predicted.
+    """
+    q = (
+        session.query(
+            Race.id, Race.date, Race.race_number,
+            Race.ganyan_payout_tl, Race.ikili_payout_tl,
+            Race.sirali_ikili_payout_tl, Race.uclu_payout_tl,
+            Race.dortlu_payout_tl,
+            RaceEntry.horse_id, RaceEntry.finish_position, RaceEntry.agf,
+        )
+        .select_from(Race)
+        .join(RaceEntry, RaceEntry.race_id == Race.id)
+        .filter(Race.status == RaceStatus.resulted)
+    )
+    if from_date is not None:
+        q = q.filter(Race.date >= from_date)
+    if to_date is not None:
+        q = q.filter(Race.date <= to_date)
+    q = q.order_by(Race.date, Race.race_number, Race.id, RaceEntry.id)
+
+    races: list[tuple] = []
+    runners: list[list[tuple]] = []
+    for (race_id, day, number, *payouts, horse_id, finish, agf) in q:
+        if not races or races[-1][0] != race_id:
+            races.append((race_id, day, number, payouts))
+            runners.append([])
+        runners[-1].append((horse_id, finish, agf))
+
+    n_races = len(races)
+    width = max((len(r) for r in runners), default=0)
+    horse_ids = np.full((n_races, width), -1, dtype=np.int64)
+    prob = np.full((n_races, width), np.nan)
+    finish = np.zeros((n_races, width), dtype=np.int16)
+    agf = np.full((n_races, width), np.nan)
+    payouts = np.full((n_races, len(MATRIX_POOLS)), np.nan)
+
+    race_ids = [r[0] for r in races]
+    if hasattr(predictor, "predict_many"):
+        predictions = predictor.predict_many(race_ids)
+    else:
+        predictions = {r: predictor.predict(r) for r in race_ids}
+
+    for i, ((_, _, _, race_payouts), field_) in enumerate(zip(races, runners)):
+        for j, (horse_id, position, agf_value) in enumerate(field_):
+            horse_ids[i, j] = horse_id
+            finish[i, j] = position or 0
+            if agf_value is not None:
+                agf[i, j] = float(agf_value)
+        for k, value in enumerate(race_payouts):
+            if value is not None:
+                payouts[i, k] = float(value)
+        column = {h: j for j, h in enumerate(horse_ids[i, :len(field_)].tolist())}
+        for p in predictions.get(race_ids[i], []):
+            j = column.get(p.horse_id)
+            if j is not None:
+                prob[i, j] = p.probability / 100.0
+
+    matrix = ProbabilityMatrix(
+        race_ids=np.array(race_ids, dtype=np.int64),
+        dates=np.array([r[1] for r in races], dtype="datetime64[D]"),
+        race_numbers=np.array([r[2] for r in races], dtype=np.int64),
+        n_runners=np.array([len(f) for f in runners], dtype=np.int64),
+        horse_ids=horse_ids,
+        prob=prob,
+        finish=finish,
+        agf=agf,
+        payouts=payouts,
+        meta={
+            "model_version": model_version,
+            "from_date": from_date.isoformat() if from_date else None,
+            "to_date": to_date.isoformat() if to_date else None,
+            "races": n_races,
+            "replayed": getattr(predictor, "replayed", None),
+            "live": getattr(predictor, "live", None),
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+        },
+    )
+    logger.info(
+        "Probability matrix %s: %d races × %d runners", model_version,
+        n_races, width,
+    )
+    return matrix
@@ -0,0 +1,132 @@
+"""Replay stored predictions instead of re-running a predictor.
+
+Back-tests used to call ``predictor.predict(race.id)`` for every
+resulted race, redoing feature extraction and inference for races the
+live pipeline already scored and audited in the ``predictions`` table.
+:class:`StoredPredictor` answers the same ``predict`` / ``predict_many``
+calls from that table for one ``model_version``: the whole window is
+read with a single query up front, and only races with no stored rows
+are handed to an optional live ``fallback`` predictor.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date as date_type
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ganyan.db.models import Horse, Prediction as PredictionRow, Race, RaceEntry
+from ganyan.predictor.bayesian import Prediction
+
+
+class StoredPredictor:
+    """Predictor-shaped view of one model version's audit rows.
+
+    Each entry contributes its latest stored prediction for
+    ``model_version``; races are returned sorted by probability
+    descending, like the live predictors.  ``replayed`` / ``live`` count
+    how each served race was answered.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        model_version: str,
+        *,
+        from_date: date_type | None = None,
+        to_date: date_type | None = None,
+        fallback: object | None = None,
+    ) -> None:
+        self.session = session
+        self.model_version = model_version
+        self.fallback = fallback
+        self.replayed = 0
+        self.live = 0
+        self._stored = load_stored_predictions(
+            session, model_version, from_date=from_date, to_date=to_date,
+        )
+
+    def __contains__(self, race_id: int) -> bool:
+        return race_id in self._stored
+
+    def predict(self, race_id: int) -> list[Prediction]:
+        stored = self._stored.get(race_id)
+        if stored is not None:
+            self.replayed += 1
+            return list(stored)
+        if self.fallback is None:
+            return []
+        self.live += 1
+        return self.fallback.predict(race_id)
+
+    def predict_many(self, race_ids: Iterable[int]) -> dict[int, list[Prediction]]:
+        race_ids = list(race_ids)
+        results: dict[int, list[Prediction]] = {}
+        missing: list[int] = []
+        for race_id in race_ids:
+            stored = self._stored.get(race_id)
+            if stored is not None:
+                results[race_id] = list(stored)
+            else:
+                missing.append(race_id)
+        self.replayed += len(results)
+        if missing and self.fallback is not None:
+            self.live += len(missing)
+            if hasattr(self.fallback, "predict_many"):
+                results.update(self.fallback.predict_many(missing))
+            else:
+                for race_id in missing:
+                    results[race_id] = self.fallback.predict(race_id)
+        return {r: results[r] for r in race_ids if r in results}
+
+
+def load_stored_predictions(
+    session: Session,
+    model_version: str,
+    *,
+    from_date: date_type | None = None,
+    to_date: date_type | None = None,
+) -> dict[int, list[Prediction]]:
+    """``{race_id: predictions}`` from the audit table, one query.
+
+    ``contributing_factors`` is left empty — the JSON blobs are the bulk
+    of each row and no replay consumer reads them.
+    """
+    latest = (
+        session.query(func.max(PredictionRow.id).label("prediction_id"))
+        .filter(PredictionRow.model_version == model_version)
+        .group_by(PredictionRow.race_entry_id)
+        .subquery()
+    )
+    q = (
+        session.query(
+            RaceEntry.race_id, RaceEntry.horse_id, Horse.name,
+            PredictionRow.probability, PredictionRow.confidence,
+        )
+        .select_from(PredictionRow)
+        .join(latest, latest.c.prediction_id == PredictionRow.id)
+        .join(RaceEntry, RaceEntry.id == PredictionRow.race_entry_id)
+        .join(Race, Race.id == RaceEntry.race_id)
+        .outerjoin(Horse, Horse.id == RaceEntry.horse_id)
+    )
+    if from_date is not None:
+        q = q.filter(Race.date >= from_date)
+    if to_date is not None:
+        q = q.filter(Race.date <= to_date)
+
+    stored: dict[int, list[Prediction]] = defaultdict(list)
+    for race_id, horse_id, name, prob, confidence in q.order_by(
+        RaceEntry.race_id, RaceEntry.id,
+    ):
+        stored[race_id].append(Prediction(
+            horse_id=horse_id,
+            horse_name=name or "?",
+            probability=float(prob),
+            confidence=float(confidence) if confidence is not None else 0.0,
+        ))
+    for predictions in stored.values():
+        predictions.sort(key=lambda p: p.probability, reverse=True)
+    return dict(stored)
@@ -0,0 +1,409 @@
+"""Grid sweeps of betting strategies over a cached probability matrix.
+
+:func:`~ganyan.predictor.exotic_evaluate.evaluate_all_pools` scores one
+stake rule at a time in a Python loop over races × pools × top-N, and
+the ``value-picks`` threshold / ``--min-agf`` could only be explored by
+re-running the CLI.  :func:`sweep` scores a whole grid at once from a
+:class:`~ganyan.predictor.prob_matrix.ProbabilityMatrix`:
+
+- **top_n** — the ``n`` most probable combinations of a pool, keeping
+  only tickets whose model probability clears the floor.
+- **box** — every combination of the ``b`` highest-rated runners.
+- **value** — win bets on runners whose model probability beats the
+  AGF-implied one by ``edge`` (relative), with ``agf >= min_agf`` and
+  ``prob >= floor``.
+
+Per race, only the combo ranking for the largest top-N needs Harville
+math; it is sharded over a process pool for large windows.  Everything
+after that — hits, stakes, payouts, drawdown, monthly P&L — is array
+arithmetic over (cells × races) matrices.
+
+A winning ticket whose pool published no payout is skipped rather than
+counted as a loss, as in the exotic back-test.  Unlike the back-test,
+stake is charged per ticket actually bought, so a top-10 on a field
+with fewer than ten combinations costs less.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+
+from ganyan.predictor.bootstrap import RoiInterval, bootstrap_roi_many
+from ganyan.predictor.exotics import POOL_SHAPES, top_n_combos
+from ganyan.predictor.prob_matrix import MATRIX_POOLS, ProbabilityMatrix
+
+
+# Races per worker task when ranking combos in a process pool.
+_CHUNK_RACES = 250
+
+
+@dataclass
+class SweepGrid:
+    """Strategy parameters to cross.  Empty axes switch a family off."""
+
+    pools: tuple[str, ...] = ("ganyan", "ikili", "sirali_ikili", "uclu")
+    top_ns: tuple[int, ...] = (1, 3, 6, 10)
+    box_sizes: tuple[int, ...] = ()
+    edges: tuple[float, ...] = ()
+    min_agfs: tuple[float, ...] = (2.0,)
+    prob_floors: tuple[float, ...] = (0.0,)
+
+
+@dataclass
+class SweepCell:
+    """Result of one strategy over the matrix window."""
+
+    kind: str  # top_n / box / value
+    pool: str
+    top_n: int | None = None
+    box: int | None = None
+    edge: float | None = None
+    min_agf: float | None = None
+    prob_floor: float = 0.0
+    races: int = 0  # races with at least one ticket
+    tickets: int = 0
+    hits: int = 0  # races where a ticket won
+    stake_tl: float = 0.0
+    payout_tl: float = 0.0
+    skipped_missing_payout: int = 0
+    max_drawdown_tl: float = 0.0
+    monthly_pnl: dict[str, float] = field(default_factory=dict)
+    roi_ci: RoiInterval | None = None
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits / self.races) * 100.0 if self.races else 0.0
+
+    @property
+    def roi(self) -> float:
+        if self.stake_tl <= 0:
+            return 0.0
+        return (self.payout_tl - self.stake_tl) / self.stake_tl
+
+    def summary_row(self) -> dict:
+        return {
+            "kind": self.kind,
+            "pool": self.pool,
+            "top_n": self.top_n,
+            "box": self.box,
+            "edge": self.edge,
+            "min_agf": self.min_agf,
+            "prob_floor": self.prob_floor,
+            "races": self.races,
+            "tickets": self.tickets,
+            "hits": self.hits,
+            "hit_rate_pct": round(self.hit_rate, 2),
+            "stake_tl": round(self.stake_tl, 2),
+            "payout_tl": round(self.payout_tl, 2),
+            "roi_pct": round(self.roi * 100.0, 2),
+            "max_drawdown_tl": round(self.max_drawdown_tl, 2),
+            "skipped_missing_payout": self.skipped_missing_payout,
+            "monthly_pnl": {
+                m: round(v, 2) for m, v in self.monthly_pnl.items()
+            },
+            **(self.roi_ci.as_dict() if self.roi_ci is not None else {}),
+        }
+
+
+def sweep(
+    matrix: ProbabilityMatrix,
+    grid: SweepGrid,
+    *,
+    ticket_stake_tl: float = 100.0,
+    workers: int = 1,
+    bootstrap: int = 0,
+) -> list[SweepCell]:
+    """Score every cell of ``grid`` over ``matrix``.
+
+    ``workers > 1`` ranks combos in a process pool; the result is the
+    same either way.  ``bootstrap`` > 0 attaches a ROI interval from
+    that many race-level replicates, shared across cells.
+    """
+    unknown = [p for p in grid.pools if p not in POOL_SHAPES]
+    if unknown:
+        raise ValueError(f"Unknown pool(s): {unknown}")
+
+    winners = _winning_columns(matrix)
+    cells: list[SweepCell] = []
+    outcomes: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+
+    if grid.top_ns:
+        ranks = _rank_combos(matrix, grid.pools, max(grid.top_ns), workers)
+        for pool in grid.pools:
+            rank, top_probs = ranks[pool]
+            for n, floor in itertools.product(grid.top_ns, grid.prob_floors):
+                tickets = (top_probs[:, :n] >= floor).sum(axis=1)
+                hit = (rank > 0) & (rank <= tickets)
+                cells.append(SweepCell(
+                    kind="top_n", pool=pool, top_n=n, prob_floor=floor,
+                ))
+                outcomes.append(_pool_outcome(matrix, pool, tickets, hit))
+
+    if grid.box_sizes:
+        order_rank = _runner_ranks(matrix)
+        n_predicted = (~np.isnan(matrix.prob)).sum(axis=1)
+        for pool in grid.pools:
+            k, ordered = POOL_SHAPES[pool]
+            if k not in winners:
+                continue  # no race in the window has k runners
+            cols, valid = winners[k]
+            actual_rank = np.take_along_axis(order_rank, cols, axis=1)
+            worst = actual_rank.max(axis=1)
+            for b in grid.box_sizes:
+                size = np.minimum(b, n_predicted)
+                per_size = np.array(
+                    [_box_tickets(s, k, ordered) for s in range(b + 1)],
+                    dtype=np.int64,
+                )
+                tickets = per_size[size]
+                hit = valid & (worst < size) & (tickets > 0)
+                cells.append(SweepCell(kind="box", pool=pool, box=b))
+                outcomes.append(_pool_outcome(matrix, pool, tickets, hit))
+
+    if grid.edges:
+        for edge, min_agf, floor in itertools.product(
+            grid.edges, grid.min_agfs, grid.prob_floors,
+        ):
+            cells.append(SweepCell(
+                kind="value", pool="ganyan", edge=edge, min_agf=min_agf,
+                prob_floor=floor,
+            ))
+            outcomes.append(_value_outcome(matrix, edge, min_agf, floor))
+
+    if not cells:
+        return []
+    _fill_metrics(matrix, cells, outcomes, ticket_stake_tl, bootstrap)
+    return cells
+
+
+# ---------------------------------------------------------------------------
+# Per-race outcomes
+# ---------------------------------------------------------------------------
+
+
+def _winning_columns(
+    matrix: ProbabilityMatrix,
+) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """Runner columns of the first k finishers, per combo size k.
+
+    Mirrors :meth:`ProbabilityMatrix.winning_combo`: finishers sorted by
+    position with entry order breaking dead heats.
+    """
+    finish = np.asarray(matrix.finish, dtype=np.int64)
+    big = np.iinfo(np.int64).max
+    key = np.where(finish > 0, finish, big)
+    order = np.argsort(key, axis=1, kind="stable")
+    n_finishers = (finish > 0).sum(axis=1)
+    return {
+        k: (order[:, :k], n_finishers >= k)
+        for k in sorted({shape[0] for shape in POOL_SHAPES.values()})
+        if k <= finish.shape[1]
+    }
+
+
+def _runner_ranks(matrix: ProbabilityMatrix) -> np.ndarray:
+    """0-based model rank of each runner (unpredicted runners last)."""
+    prob = np.nan_to_num(np.asarray(matrix.prob), nan=-1.0)
+    order = np.argsort(-prob, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(
+        ranks, order, np.arange(order.shape[1])[None, :], axis=1,
+    )
+    return np.where(np.isnan(matrix.prob), order.shape[1], ranks)
+
+
+def _box_tickets(size: int, k: int, ordered: bool) -> int:
+    if size < k:
+        return 0
+    if ordered:
+        return math.perm(size, k)
+    return math.comb(size, k)
+
+
+def _pool_outcome(
+    matrix: ProbabilityMatrix,
+    pool: str,
+    tickets: np.ndarray,
+    hit: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """``(tickets, hit, payout_per_tl, skipped)`` for one exotic cell."""
+    payout = np.asarray(matrix.payouts[:, MATRIX_POOLS.index(pool)])
+    k = POOL_SHAPES[pool][0]
+    eligible = matrix.predicted & ((matrix.finish > 0).sum(axis=1) >= k)
+    tickets = np.where(eligible, tickets, 0)
+    hit = hit & eligible & (tickets > 0)
+    skipped = hit & np.isnan(payout)
+    tickets = np.where(skipped, 0, tickets)
+    hit = hit & ~skipped
+    return tickets, hit, np.where(hit, payout, 0.0), skipped
+
+
+def _value_outcome(
+    matrix: ProbabilityMatrix, edge: float, min_agf: float, floor: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Win bets on runners clearing the AGF edge rule."""
+    prob = np.asarray(matrix.prob)
+    agf = np.asarray(matrix.agf)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        runner_edge = (prob * 100.0 - agf) / agf
+        bet = (agf >= min_agf) & (agf > 0) & (runner_edge >= edge) & (prob >= floor)
+    won = bet & (matrix.finish == 1)
+    payout = np.asarray(matrix.payouts[:, MATRIX_POOLS.index("ganyan")])
+    # Winning bets without a published payout are dropped.
+    missing = won & np.isnan(payout)[:, None]
+    tickets = (bet & ~missing).sum(axis=1)
+    wins = (won & ~missing).sum(axis=1)
+    hit = wins > 0
+    return (
+        tickets, hit, np.where(hit, payout, 0.0) * wins, missing.any(axis=1),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Combo ranking (process pool)
+# ---------------------------------------------------------------------------
+
+
+def _rank_combos(
+    matrix: ProbabilityMatrix,
+    pools: Iterable[str],
+    max_n: int,
+    workers: int,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Per pool: winning combo's rank in the top ``max_n`` (0 = outside)
+    and the top ``max_n`` combo probabilities (-1 where a race has fewer
+    combinations, so padding never clears a floor)."""
+    pools = tuple(pools)
+    bounds = [
+        (start, min(start + _CHUNK_RACES, len(matrix)))
+        for start in range(0, len(matrix), _CHUNK_RACES)
+    ]
+    chunks = [
+        (_slice(matrix, start, stop), pools, max_n) for start, stop in bounds
+    ]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_rank_chunk, chunks))
+    else:
+        parts = [_rank_chunk(chunk) for chunk in chunks]
+
+    out: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for pool in pools:
+        if parts:
+            out[pool] = (
+                np.concatenate([p[pool][0] for p in parts]),
+                np.concatenate([p[pool][1] for p in parts]),
+            )
+        else:
+            out[pool] = (
+                np.zeros(0, dtype=np.int64), np.full((0, max_n), -1.0),
+            )
+    return out
+
+
+def _slice(matrix: ProbabilityMatrix, start: int, stop: int) -> dict:
+    return {
+        "horse_ids": np.asarray(matrix.horse_ids[start:stop]),
+        "prob": np.asarray(matrix.prob[start:stop]),
+        "finish": np.asarray(matrix.finish[start:stop]),
+    }
+
+
+def _rank_chunk(
+    args: tuple[dict, tuple[str, ...], int],
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    arrays, pools, max_n = args
+    horse_ids, prob, finish = arrays["horse_ids"], arrays["prob"], arrays["finish"]
+    n_races = len(horse_ids)
+    out = {
+        pool: (
+            np.zeros(n_races, dtype=np.int64), np.full((n_races, max_n), -1.0),
+        )
+        for pool in pools
+    }
+    for i in range(n_races):
+        present = ~np.isnan(prob[i])
+        if not present.any():
+            continue
+        win_probs = dict(zip(
+            horse_ids[i][present].tolist(), prob[i][present].tolist(),
+        ))
+        finishers = np.nonzero(finish[i] > 0)[0]
+        order = finishers[np.argsort(finish[i][finishers], kind="stable")]
+        for pool in pools:
+            k, ordered = POOL_SHAPES[pool]
+            if len(order) < k:
+                continue
+            actual = tuple(horse_ids[i][order[:k]].tolist())
+            if not ordered:
+                actual = tuple(sorted(actual))
+            rank, top_probs = out[pool]
+            for r, combo in enumerate(top_n_combos(pool, win_probs, max_n)):
+                top_probs[i, r] = combo.probability
+                horses = combo.horses if ordered else tuple(sorted(combo.horses))
+                if rank[i] == 0 and horses == actual:
+                    rank[i] = r + 1
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+def _fill_metrics(
+    matrix: ProbabilityMatrix,
+    cells: list[SweepCell],
+    outcomes: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+    ticket_stake_tl: float,
+    bootstrap: int = 0,
+) -> None:
+    """Aggregate (cells × races) outcome matrices into each cell."""
+    tickets = np.stack([o[0] for o in outcomes]).astype(np.float64)
+    hit = np.stack([o[1] for o in outcomes])
+    payout_per_tl = np.stack([o[2] for o in outcomes])
+    skipped = np.stack([o[3] for o in outcomes])
+
+    stake = tickets * ticket_stake_tl
+    payout = payout_per_tl * ticket_stake_tl
+    pnl = payout - stake
+
+    # Drawdown over the chronological P&L curve, starting from 0.
+    equity = np.cumsum(pnl, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+    drawdown = (peak - equity).max(axis=1) if equity.shape[1] else np.zeros(len(cells))
+
+    months = np.asarray(matrix.dates).astype("datetime64[M]")
+    labels, month_index = np.unique(months, return_inverse=True)
+    monthly = np.zeros((len(cells), len(labels)))
+    np.add.at(monthly, (slice(None), month_index), pnl)
+    traded = np.zeros((len(cells), len(labels)), dtype=bool)
+    np.logical_or.at(traded, (slice(None), month_index), tickets > 0)
+
+    intervals = (
+        bootstrap_roi_many(stake, payout, replicates=bootstrap)
+        if bootstrap > 0 else None
+    )
+
+    label_strs = [str(m) for m in labels]
+    for c, cell in enumerate(cells):
+        bet = tickets[c] > 0
+        cell.races = int(bet.sum())
+        cell.tickets = int(tickets[c].sum())
+        cell.hits = int((hit[c] & bet).sum())
+        cell.stake_tl = float(stake[c].sum())
+        cell.payout_tl = float(payout[c].sum())
+        cell.skipped_missing_payout = int(skipped[c].sum())
+        cell.max_drawdown_tl = float(drawdown[c])
+        cell.monthly_pnl = {
+            label_strs[m]: float(monthly[c, m])
+            for m in np.nonzero(traded[c])[0]
+        }
+        if intervals is not None:
+            cell.roi_ci = intervals[c]
@@ -1,7 +1,7 @@
 """APScheduler-based job runner for Ganyan.
 
 Exposes :func:`build_scheduler` which returns a configured
-:class:`BackgroundScheduler` with the four jobs the system needs to run
+:class:`BackgroundScheduler` with the jobs the system needs to run
 itself without human intervention:
 
 1. **Morning card pull** — every day 08:30 Europe/Istanbul: scrape
@@ -14,6 +14,9 @@ itself without human intervention:
 4. **Monthly model retrain** — first of the month 03:30: run
    ``train_ranker`` on the rolling 90-day window for both the main and
    value models.
+5. **Weekly raw-HTML prune** — Sunday 02:30, only when
+   ``raw_html_archive`` is on: drop archived pages older than
+   ``raw_html_keep_days``.
 
 The scheduler runs in the same process as the Flask app by default
 (:class:`BackgroundScheduler`) — one process, one lifecycle.  Can be
@@ -57,7 +60,7 @@ def _job_morning_card(settings: Settings) -> None:
     """
     from ganyan.db import get_session
     from ganyan.db.models import Race, RaceEntry
-    from ganyan.scraper import TJKClient, parse_race_card
+    from ganyan.scraper import TJKClient, archive_from_settings, parse_race_card
     from ganyan.scraper.backfill import log_scrape, store_race_card
     from ganyan.db.models import ScrapeStatus
     from ganyan.predictor.ml import MLPredictor
@@ -72,6 +75,8 @@ def _job_morning_card(settings: Settings) -> None:
         try:
             async with TJKClient(
                 base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as client:
                 raw = await client.get_race_card(today)
                 for card in raw:
@@ -108,9 +113,22 @@ def _job_morning_card(settings: Settings) -> None:
             .having(func.count(RaceEntry.id) >= 3)
             .all()
         )
+        # One feature build + booster call for the whole card; fall
+        # back to per-race prediction so one bad race can't sink the rest.
+        try:
+            predictor.predict_and_save_many([race.id for race in races])
+            session.commit()
+            predicted = True
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "scheduler: batch prediction failed; falling back per race",
+            )
+            session.rollback()
+            predicted = False
         for race in races:
             try:
-                predictor.predict_and_save(race.id)
+                if not predicted:
+                    predictor.predict_and_save(race.id)
                 picks = generate_picks_for_race(session, race.id)
                 picks_created += len(picks)
                 session.commit()
@@ -125,35 +143,77 @@ def _job_morning_card(settings: Settings) -> None:
     )
 
 
+def _store_polled_results(session, poll, cache) -> int:
+    """Apply ``poll``'s cards and commit; returns the races updated.
+
+    The response cache already counts every fetched page as seen, so a
+    track whose cards didn't all land — no stored card yet, or a failed
+    write — is forgotten and comes back as "changed" on the next poll.
+    """
+    from ganyan.scraper import parse_race_card
+    from ganyan.scraper.backfill import update_race_results
+
+    updated = 0
+    unstored: set[str] = set()
+    try:
+        for raw in poll.cards:
+            race = update_race_results(session, parse_race_card(raw))
+            if race is None:
+                unstored.add(raw.track_name)
+            else:
+                updated += 1
+        session.commit()
+    except Exception:
+        session.rollback()
+        unstored.update(poll.changed)
+        raise
+    finally:
+        for track in unstored:
+            if track in poll.keys:
+                cache.forget(poll.keys[track])
+    return updated
+
+
 def _job_results_poll(settings: Settings) -> None:
-    """Pull today's results — keeps the DB current throughout the day."""
+    """Pull today's results — keeps the DB current throughout the day.
+
+    Tracks whose races have all resulted are no longer fetched, and
+    pages unchanged since the previous poll (per the process-wide
+    response cache) are neither re-parsed nor re-written.
+    """
     from ganyan.db import get_session
-    from ganyan.scraper import TJKClient, parse_race_card
-    from ganyan.scraper.backfill import update_race_results
+    from ganyan.db.evaluation_dirty import take_dirty_evaluation_dates
+    from ganyan.scraper import TJKClient, archive_from_settings, response_cache
+    from ganyan.scraper.backfill import get_finished_tracks_on
 
     today = date.today()
     logger.info("scheduler: results-poll starting for %s", today)
 
-    async def _scrape() -> int:
+    async def _scrape() -> tuple[int, set[date]]:
         session = get_session()
-        updated = 0
         try:
+            finished = get_finished_tracks_on(session, today)
             async with TJKClient(
                 base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
+                response_cache=response_cache(),
             ) as client:
-                raw_cards = await client.get_race_results(today)
-                for raw in raw_cards:
-                    parsed = parse_race_card(raw)
-                    race = update_race_results(session, parsed)
-                    if race is not None:
-                        updated += 1
-                session.commit()
+                poll = await client.poll_race_results(today, skip_tracks=finished)
+                updated = _store_polled_results(session, poll, response_cache())
+                dirty = take_dirty_evaluation_dates(session)
+            logger.info(
+                "scheduler: results-poll tracks: %d changed, %d unchanged, "
+                "%d finished, %d failed",
+                len(poll.changed), len(poll.unchanged),
+                len(poll.skipped), len(poll.failed),
+            )
         finally:
             session.close()
-        return updated
+        return updated, dirty
 
     try:
-        n = asyncio.run(_scrape())
+        n, dirty_dates = asyncio.run(_scrape())
     except Exception:  # noqa: BLE001
         logger.exception("scheduler: results-poll failed")
         return
@@ -173,6 +233,20 @@ def _job_results_poll(settings: Settings) -> None:
     finally:
         session.close()
 
+    # Rescore the /history metrics rows of the days just updated.
+    if dirty_dates:
+        session = get_session()
+        try:
+            from ganyan.predictor.evaluation_daily import refresh_evaluation_daily
+
+            refresh_evaluation_daily(session, dirty_dates)
+            session.commit()
+        except Exception:  # noqa: BLE001
+            logger.exception("scheduler: evaluation metrics refresh failed")
+            session.rollback()
+        finally:
+            session.close()
+
     logger.info(
         "scheduler: results-poll done (%d races updated, %d picks graded)",
         n, graded,
@@ -182,6 +256,8 @@ def _job_results_poll(settings: Settings) -> None:
 def _job_pedigree_refresh(settings: Settings) -> None:
     """Fetch pedigree for horses that gained a tjk_at_id this week."""
     from ganyan.db import get_session
+    from ganyan.predictor.ml.feature_store import FeatureStore
+    from ganyan.scraper import archive_from_settings
     from ganyan.scraper.horse_crawler import HorseCrawler
 
     logger.info("scheduler: pedigree-refresh starting")
@@ -193,8 +269,14 @@ def _job_pedigree_refresh(settings: Settings) -> None:
                 session,
                 base_url=settings.tjk_base_url,
                 delay=0.3, concurrency=5,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as crawler:
-                return await crawler.crawl_missing_profiles()
+                updated = await crawler.crawl_missing_profiles()
+            # The crawl recounts the sire ledger itself; stored training
+            # features of the horses' past runs are stale now.
+            FeatureStore().invalidate_horses(session, crawler.sired_horse_ids)
+            return updated
         finally:
             session.close()
 
@@ -210,8 +292,10 @@ def _job_monthly_retrain(settings: Settings) -> None:
     """Retrain main + value models on rolling 90-day window."""
     from ganyan.db import get_session
     from ganyan.predictor.ml import train_ranker
+    from ganyan.predictor.ml.feature_store import FeatureStore
 
     start = date.today() - timedelta(days=90)
+    store = FeatureStore()
     logger.info("scheduler: monthly-retrain starting (window from %s)", start)
 
     session = get_session()
@@ -220,6 +304,7 @@ def _job_monthly_retrain(settings: Settings) -> None:
         try:
             train_ranker(
                 session, from_date=start, model_name="lightgbm_ranker",
+                vectorized=True, feature_store=store,
             )
         except Exception:  # noqa: BLE001
             logger.exception("scheduler: main retrain failed")
@@ -229,6 +314,7 @@ def _job_monthly_retrain(settings: Settings) -> None:
                 session, from_date=start,
                 exclude_features=["agf_edge", "agf_raw"],
                 model_name="lightgbm_value",
+                vectorized=True, feature_store=store,
             )
         except Exception:  # noqa: BLE001
             logger.exception("scheduler: value retrain failed")
@@ -238,13 +324,24 @@ def _job_monthly_retrain(settings: Settings) -> None:
     logger.info("scheduler: monthly-retrain done")
 
 
+def _job_archive_prune(settings: Settings) -> None:
+    """Apply ``raw_html_keep_days`` to the raw HTML archive."""
+    from ganyan.scraper.raw_archive import prune_from_settings
+
+    lines, bodies = prune_from_settings(settings)
+    logger.info(
+        "scheduler: archive-prune removed %d index line(s), %d page body(ies)",
+        lines, bodies,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Scheduler assembly
 # ---------------------------------------------------------------------------
 
 
 def _add_jobs(scheduler, settings: Settings) -> None:
-    """Register the four jobs with the given scheduler."""
+    """Register the jobs with the given scheduler."""
     scheduler.add_job(
         _job_morning_card,
         CronTrigger(hour=8, minute=30, timezone=_TZ),
@@ -288,6 +385,16 @@ def _add_jobs(scheduler, settings: Settings) -> None:
         replace_existing=True,
         max_instances=1,
     )
+    if settings.raw_html_archive:
+        scheduler.add_job(
+            _job_archive_prune,
+            CronTrigger(day_of_week="sun", hour=2, minute=30, timezone=_TZ),
+            args=[settings],
+            id="archive_prune",
+            name="Weekly raw-HTML archive prune",
+            replace_existing=True,
+            max_instances=1,
+        )
 
 
 def build_scheduler(
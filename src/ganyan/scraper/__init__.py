@@ -7,13 +7,35 @@ from ganyan.scraper.parser import (
     RawRaceCard,
     parse_race_card,
 )
-from ganyan.scraper.tjk_api import TJKClient
+from ganyan.scraper.rate_limit import (
+    AdaptiveConcurrency,
+    TokenBucket,
+    rate_controller,
+    rate_controller_status,
+)
+from ganyan.scraper.raw_archive import RawHtmlArchive, archive_from_settings
+from ganyan.scraper.response_cache import (
+    ResponseCache,
+    response_cache,
+    response_cache_status,
+)
+from ganyan.scraper.tjk_api import ResultsPoll, TJKClient
 
 __all__ = [
+    "AdaptiveConcurrency",
     "ParsedHorseEntry",
     "ParsedRaceCard",
     "RawHorseEntry",
+    "RawHtmlArchive",
     "RawRaceCard",
+    "ResponseCache",
+    "ResultsPoll",
     "TJKClient",
+    "TokenBucket",
+    "archive_from_settings",
     "parse_race_card",
+    "rate_controller",
+    "rate_controller_status",
+    "response_cache",
+    "response_cache_status",
 ]
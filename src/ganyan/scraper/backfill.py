@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import deque
 from datetime import date, timedelta
+from typing import Awaitable, Callable
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
+from ganyan.db.career_stats import refresh_career_stats
+from ganyan.db.evaluation_dirty import mark_evaluation_dirty
 from ganyan.db.models import (
     Horse,
     Race,
@@ -69,7 +74,7 @@ def get_or_create_horse(session: Session, name: str, **kwargs) -> Horse:
 
 
 _ENTRY_REFRESH_FIELDS = (
-    "gate_number", "jockey", "weight_kg", "hp", "kgs",
+    "gate_number", "jockey", "trainer", "weight_kg", "hp", "kgs",
     "s20", "eid", "gny", "agf", "last_six", "equipment",
 )
 
@@ -188,6 +193,7 @@ def store_race_card(session: Session, parsed: ParsedRaceCard) -> Race:
             horse_id=horse.id,
             gate_number=h.gate_number,
             jockey=h.jockey,
+            trainer=h.trainer or horse.trainer,
             weight_kg=h.weight_kg,
             hp=h.hp,
             kgs=h.kgs,
@@ -304,6 +310,7 @@ def store_historical_race(session: Session, parsed: ParsedRaceCard) -> Race:
             horse_id=horse.id,
             gate_number=h.gate_number,
             jockey=h.jockey,
+            trainer=h.trainer or horse.trainer,
             weight_kg=h.weight_kg,
             hp=h.hp,
             kgs=h.kgs,
@@ -319,6 +326,8 @@ def store_historical_race(session: Session, parsed: ParsedRaceCard) -> Race:
         session.add(entry)
 
     session.flush()
+    refresh_career_stats(session, race)
+    mark_evaluation_dirty(session, race.date)
     return race
 
 
@@ -380,6 +389,8 @@ def update_race_results(session: Session, parsed: ParsedRaceCard) -> Race | None
 
     race.status = RaceStatus.resulted
     session.flush()
+    refresh_career_stats(session, race)
+    mark_evaluation_dirty(session, race.date)
     return race
 
 
@@ -425,6 +436,24 @@ def get_successful_tracks_on(session: Session, scrape_date: date) -> set[str]:
     return {row[0] for row in rows if row[0] != _ALL_TRACKS_SENTINEL}
 
 
+def get_finished_tracks_on(session: Session, race_date: date) -> set[str]:
+    """Tracks with races on ``race_date`` and none of them still scheduled.
+
+    The results poller stops re-fetching these: once the last race has
+    resulted, the page has nothing new to say.
+    """
+    scheduled = case((Race.status == RaceStatus.scheduled, 1), else_=0)
+    rows = (
+        session.query(Track.name)
+        .join(Race, Race.track_id == Track.id)
+        .filter(Race.date == race_date)
+        .group_by(Track.name)
+        .having(func.sum(scheduled) == 0)
+        .all()
+    )
+    return {row[0] for row in rows}
+
+
 def log_scrape(
     session: Session,
     scrape_date: date,
@@ -457,6 +486,14 @@ class BackfillManager:
 
     Processes dates in reverse chronological order and skips dates that
     have already been successfully scraped.
+
+    Per-date walks (:meth:`backfill`, :meth:`backfill_full_results`) can
+    keep ``date_concurrency`` dates in flight.  Fetches then overlap,
+    but every request still waits on the client's shared
+    :class:`~ganyan.scraper.rate_limit.TokenBucket`, so TJK sees the
+    same request rate, only without idle gaps.  Results are written in
+    date order by this manager alone — the session is never touched
+    concurrently.
     """
 
     def __init__(self, session: Session, tjk_client) -> None:
@@ -469,6 +506,7 @@ class BackfillManager:
         to_date: date | None = None,
         *,
         rescrape: bool = False,
+        date_concurrency: int = 1,
     ) -> None:
         """Scrape race cards for a date range, newest first.
 
@@ -482,20 +520,21 @@ class BackfillManager:
             If ``True``, re-scrape even dates already marked complete in
             :class:`ScrapeLog`.  If ``False`` (default), skip any date
             with an ``ALL`` success marker.
+        date_concurrency:
+            Dates fetched at once.  Above 1 the client must carry a
+            ``rate_limiter``.
         """
         if to_date is None:
             to_date = date.today()
 
         already_scraped = set() if rescrape else get_scraped_dates(self.session)
-
-        # Build list of dates in reverse chronological order
-        current = to_date
-        while current >= from_date:
-            if current not in already_scraped:
-                await self._scrape_date(current)
-            else:
-                logger.debug("Skipping already-scraped date %s", current)
-            current -= timedelta(days=1)
+        await self._walk_dates(
+            self._pending_dates(from_date, to_date, already_scraped),
+            fetch=self._fetch_cards,
+            store=store_race_card,
+            date_concurrency=date_concurrency,
+            pause_between_dates=False,
+        )
 
     async def _scrape_date(self, scrape_date: date) -> None:
         """Fetch and store all race cards for a single date.
@@ -505,61 +544,13 @@ class BackfillManager:
         :func:`get_scraped_dates` can distinguish fully- from partially-
         scraped days and retry the partials.
         """
-        logger.info("Scraping %s", scrape_date)
-
-        # Use the failure-aware variant when available so we can log the
-        # specific tracks that did not return cards.
-        getter = getattr(
-            self.tjk_client, "get_race_card_with_failures", None,
+        await self._walk_dates(
+            [scrape_date],
+            fetch=self._fetch_cards,
+            store=store_race_card,
+            date_concurrency=1,
+            pause_between_dates=False,
         )
-        try:
-            if getter is not None:
-                raw_cards, failed_tracks = await getter(scrape_date)
-            else:
-                raw_cards = await self.tjk_client.get_race_card(scrape_date)
-                failed_tracks = []
-        except Exception as exc:
-            logger.exception("Failed to fetch race card for %s", scrape_date)
-            log_scrape(
-                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
-                ScrapeStatus.failed, error_message=str(exc),
-            )
-            self.session.commit()
-            return
-
-        if not raw_cards and not failed_tracks:
-            log_scrape(
-                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
-                ScrapeStatus.skipped,
-            )
-            self.session.commit()
-            return
-
-        from ganyan.scraper.parser import parse_race_card
-
-        for raw in raw_cards:
-            parsed = parse_race_card(raw)
-            store_race_card(self.session, parsed)
-            log_scrape(
-                self.session, scrape_date, parsed.track_name,
-                ScrapeStatus.success,
-            )
-
-        for track_name in failed_tracks:
-            log_scrape(
-                self.session, scrape_date, track_name,
-                ScrapeStatus.failed,
-                error_message="empty response or HTTP error",
-            )
-
-        # Only mark the whole date done when no tracks failed.
-        if not failed_tracks:
-            log_scrape(
-                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
-                ScrapeStatus.success,
-            )
-
-        self.session.commit()
 
     async def backfill_full_results(
         self,
@@ -567,6 +558,7 @@ class BackfillManager:
         to_date: date,
         *,
         rescrape: bool = False,
+        date_concurrency: int = 1,
     ) -> int:
         """Backfill full historical race fields via the daily results page.
 
@@ -585,6 +577,9 @@ class BackfillManager:
             If ``True``, re-scrape even dates already marked complete in
             :class:`ScrapeLog`.  If ``False`` (default), skips any date
             with an ``ALL`` success marker.
+        date_concurrency:
+            Dates fetched at once.  Above 1 the client must carry a
+            ``rate_limiter``.
 
         Returns
         -------
@@ -594,80 +589,168 @@ class BackfillManager:
         if from_date > to_date:
             return 0
 
-        from ganyan.scraper.parser import parse_race_card
-
         already_done = set() if rescrape else get_scraped_dates(self.session)
-        total_stored = 0
+        total_stored = await self._walk_dates(
+            self._pending_dates(from_date, to_date, already_done),
+            fetch=self._fetch_results,
+            store=store_historical_race,
+            date_concurrency=date_concurrency,
+            pause_between_dates=True,
+        )
+        logger.info(
+            "Full-field results backfill complete: %d races stored", total_stored,
+        )
+        return total_stored
 
+    # ------------------------------------------------------------------
+    # Per-date pipeline
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pending_dates(
+        from_date: date, to_date: date, done: set[date],
+    ) -> list[date]:
+        """Dates from ``to_date`` down to ``from_date`` not in ``done``."""
+        dates: list[date] = []
         current = to_date
         while current >= from_date:
-            if current in already_done:
-                logger.debug("Skipping already-complete date %s", current)
-                current -= timedelta(days=1)
-                continue
+            if current in done:
+                logger.debug("Skipping already-scraped date %s", current)
+            else:
+                dates.append(current)
+            current -= timedelta(days=1)
+        return dates
+
+    async def _fetch_cards(self, scrape_date: date) -> tuple[list, list[str]]:
+        # Use the failure-aware variant when available so we can log the
+        # specific tracks that did not return cards.
+        getter = getattr(self.tjk_client, "get_race_card_with_failures", None)
+        if getter is not None:
+            return await getter(scrape_date)
+        return await self.tjk_client.get_race_card(scrape_date), []
+
+    async def _fetch_results(self, scrape_date: date) -> tuple[list, list[str]]:
+        getter = getattr(
+            self.tjk_client, "get_race_results_with_failures", None,
+        )
+        if getter is not None:
+            return await getter(scrape_date)
+        return await self.tjk_client.get_race_results(scrape_date), []
 
-            logger.info("Full-field results backfill: %s", current)
-            getter = getattr(
-                self.tjk_client, "get_race_results_with_failures", None,
+    async def _walk_dates(
+        self,
+        dates: list[date],
+        *,
+        fetch: Callable[[date], Awaitable[tuple[list, list[str]]]],
+        store: Callable[[Session, ParsedRaceCard], Race],
+        date_concurrency: int,
+        pause_between_dates: bool,
+    ) -> int:
+        """Fetch ``dates`` (up to ``date_concurrency`` ahead), store in order.
+
+        Returns the number of race cards stored.
+        """
+        rate_limiter = getattr(self.tjk_client, "rate_limiter", None)
+        if date_concurrency > 1 and rate_limiter is None:
+            raise ValueError(
+                "date_concurrency > 1 needs a TJK client with a rate_limiter"
             )
-            try:
-                if getter is not None:
-                    raw_cards, failed_tracks = await getter(current)
-                else:
-                    raw_cards = await self.tjk_client.get_race_results(current)
-                    failed_tracks = []
-            except Exception as exc:
-                logger.exception("Full-field results failed for %s", current)
-                log_scrape(
-                    self.session, current, _ALL_TRACKS_SENTINEL,
-                    ScrapeStatus.failed, error_message=str(exc),
-                )
-                self.session.commit()
-                current -= timedelta(days=1)
-                continue
+        delay = getattr(self.tjk_client, "delay", 0)
 
-            if not raw_cards and not failed_tracks:
-                log_scrape(
-                    self.session, current, _ALL_TRACKS_SENTINEL,
-                    ScrapeStatus.skipped,
-                )
-                self.session.commit()
-                current -= timedelta(days=1)
-                continue
+        async def _fetch(scrape_date: date):
+            logger.info("Scraping %s", scrape_date)
+            return await fetch(scrape_date)
 
-            for raw in raw_cards:
-                parsed = parse_race_card(raw)
-                store_historical_race(self.session, parsed)
-                log_scrape(
-                    self.session, current, parsed.track_name,
-                    ScrapeStatus.success,
-                )
-                total_stored += 1
+        pending = iter(dates)
+        in_flight: deque[tuple[date, asyncio.Task]] = deque()
 
-            for track_name in failed_tracks:
-                log_scrape(
-                    self.session, current, track_name,
-                    ScrapeStatus.failed,
-                    error_message="empty response or HTTP error",
+        def _launch() -> None:
+            scrape_date = next(pending, None)
+            if scrape_date is not None:
+                in_flight.append(
+                    (scrape_date, asyncio.ensure_future(_fetch(scrape_date))),
                 )
 
-            if not failed_tracks:
-                log_scrape(
-                    self.session, current, _ALL_TRACKS_SENTINEL,
-                    ScrapeStatus.success,
-                )
+        total_stored = 0
+        try:
+            for _ in range(max(1, date_concurrency)):
+                _launch()
+            while in_flight:
+                scrape_date, task = in_flight.popleft()
+                try:
+                    fetched = await task
+                except Exception as exc:  # noqa: BLE001
+                    fetched = exc
+                total_stored += self._write_date(scrape_date, fetched, store)
+                # Rate-limit between date fetches unless the bucket does.
+                if pause_between_dates and rate_limiter is None and delay > 0:
+                    await asyncio.sleep(delay)
+                _launch()
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+        return total_stored
+
+    def _write_date(
+        self,
+        scrape_date: date,
+        fetched: tuple[list, list[str]] | BaseException,
+        store: Callable[[Session, ParsedRaceCard], Race],
+    ) -> int:
+        """Store one date's fetch outcome and its scrape-log rows.
+
+        Writes per-track success rows and, only if every discovered track
+        succeeded, a single ``track=ALL`` completion marker so that
+        :func:`get_scraped_dates` can distinguish fully- from partially-
+        scraped days and retry the partials.  Commits; returns the number
+        of race cards stored.
+        """
+        if isinstance(fetched, BaseException):
+            logger.error(
+                "Failed to fetch races for %s", scrape_date, exc_info=fetched,
+            )
+            log_scrape(
+                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
+                ScrapeStatus.failed, error_message=str(fetched),
+            )
             self.session.commit()
+            return 0
 
-            # Rate-limit between date fetches.
-            if self.tjk_client.delay > 0:
-                await asyncio.sleep(self.tjk_client.delay)
+        raw_cards, failed_tracks = fetched
+        if not raw_cards and not failed_tracks:
+            log_scrape(
+                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
+                ScrapeStatus.skipped,
+            )
+            self.session.commit()
+            return 0
 
-            current -= timedelta(days=1)
+        from ganyan.scraper.parser import parse_race_card
 
-        logger.info(
-            "Full-field results backfill complete: %d races stored", total_stored,
-        )
-        return total_stored
+        for raw in raw_cards:
+            parsed = parse_race_card(raw)
+            store(self.session, parsed)
+            log_scrape(
+                self.session, scrape_date, parsed.track_name,
+                ScrapeStatus.success,
+            )
+
+        for track_name in failed_tracks:
+            log_scrape(
+                self.session, scrape_date, track_name,
+                ScrapeStatus.failed,
+                error_message="empty response or HTTP error",
+            )
+
+        # Only mark the whole date done when no tracks failed.
+        if not failed_tracks:
+            log_scrape(
+                self.session, scrape_date, _ALL_TRACKS_SENTINEL,
+                ScrapeStatus.success,
+            )
+
+        self.session.commit()
+        return len(raw_cards)
 
     async def backfill_historical(
         self,
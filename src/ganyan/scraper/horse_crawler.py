@@ -20,10 +20,14 @@ from dataclasses import dataclass
 from datetime import date as date_type, datetime
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 from sqlalchemy.orm import Session
 
+from ganyan.db.career_stats import sync_career_names
 from ganyan.db.models import Horse
+from ganyan.scraper.html_parsing import make_soup, parse_off_loop, resolve_html_parser
+from ganyan.scraper.rate_limit import AdaptiveConcurrency, rate_controller
+from ganyan.scraper.raw_archive import RawHtmlArchive
 
 
 logger = logging.getLogger(__name__)
@@ -58,13 +62,15 @@ def _parse_birth_date(text: str) -> date_type | None:
         return None
 
 
-def _parse_kunye(html: str, at_id: int) -> HorseProfile | None:
+def _parse_kunye(
+    html: str, at_id: int, parser: str | None = None,
+) -> HorseProfile | None:
     """Extract pedigree fields from a detail-page HTML string.
 
     Returns ``None`` when the kunye block isn't present (e.g. page
     redirected to a "horse not found" stub).
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html, parser)
     kunye = soup.select_one(_KUNYE_SELECTOR)
     if kunye is None:
         return None
@@ -106,11 +112,25 @@ class HorseCrawler:
         delay: float = 0.5,
         concurrency: int = 5,
         timeout: float = 30.0,
+        adaptive: bool = False,
+        controller: AdaptiveConcurrency | None = None,
+        html_parser: str | None = None,
+        archive: RawHtmlArchive | None = None,
     ) -> None:
         self.session = session
         self.base_url = base_url.rstrip("/")
         self.delay = delay
+        self.html_parser = resolve_html_parser(html_parser)
+        self.archive = archive
         self.concurrency = max(1, concurrency)
+        # Horses whose sire this crawler filled in; their past runs now
+        # count towards that sire (callers refresh derived caches).
+        self.sired_horse_ids: list[int] = []
+        # ``adaptive=True`` shares tjk.org's AIMD controller with
+        # TJKClient; its limit then replaces ``concurrency``.
+        if controller is None and adaptive:
+            controller = rate_controller(self.base_url)
+        self.controller = controller
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             headers={
@@ -138,13 +158,17 @@ class HorseCrawler:
         self, horses: list[Horse],
     ) -> int:
         """Crawl the given horses.  Returns the count persisted."""
-        semaphore = asyncio.Semaphore(self.concurrency)
+        semaphore = asyncio.Semaphore(
+            self.controller.maximum if self.controller is not None
+            else self.concurrency
+        )
         results = await asyncio.gather(
             *(self._crawl_one(h, semaphore) for h in horses if h.tjk_at_id is not None),
             return_exceptions=True,
         )
 
         stored = 0
+        new_sires: set[str] = set()
         for h, outcome in zip(
             [h for h in horses if h.tjk_at_id is not None], results,
         ):
@@ -156,9 +180,15 @@ class HorseCrawler:
                 continue
             if outcome is None:
                 continue
+            if outcome.sire and not h.sire:
+                new_sires.add(outcome.sire)
+                self.sired_horse_ids.append(h.id)
             self._apply_profile(h, outcome)
             stored += 1
 
+        # Past runs of these horses now count towards their sires.
+        self.session.flush()
+        sync_career_names(self.session, "sire", new_sires)
         self.session.commit()
         return stored
 
@@ -191,14 +221,9 @@ class HorseCrawler:
         self, horse: Horse, semaphore: asyncio.Semaphore,
     ) -> HorseProfile | None:
         async with semaphore:
+            params = {"1": "1", "QueryParameter_AtId": str(horse.tjk_at_id)}
             try:
-                resp = await self._client.get(
-                    _DETAIL_PATH,
-                    params={
-                        "1": "1",
-                        "QueryParameter_AtId": str(horse.tjk_at_id),
-                    },
-                )
+                resp = await self._get(_DETAIL_PATH, params=params)
                 resp.raise_for_status()
             except httpx.HTTPError as exc:
                 logger.warning(
@@ -209,7 +234,27 @@ class HorseCrawler:
             finally:
                 if self.delay > 0:
                     await asyncio.sleep(self.delay)
-            return _parse_kunye(resp.text, int(horse.tjk_at_id))
+            if self.archive is not None:
+                try:
+                    await parse_off_loop(
+                        self.archive.put, "horse_detail", "GET", _DETAIL_PATH,
+                        params, resp.text, meta={"at_id": int(horse.tjk_at_id)},
+                    )
+                except OSError:
+                    logger.warning(
+                        "Could not archive detail page for at_id=%s",
+                        horse.tjk_at_id, exc_info=True,
+                    )
+            return await parse_off_loop(
+                _parse_kunye, resp.text, int(horse.tjk_at_id), self.html_parser,
+            )
+
+    async def _get(self, url: str, **kwargs: object) -> httpx.Response:
+        if self.controller is None:
+            return await self._client.get(url, **kwargs)
+        return await self.controller.call(
+            lambda: self._client.get(url, **kwargs),
+        )
 
     def _apply_profile(self, horse: Horse, profile: HorseProfile) -> None:
         """Merge a parsed :class:`HorseProfile` onto the ORM object."""
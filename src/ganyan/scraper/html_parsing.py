@@ -0,0 +1,70 @@
+"""HTML parser backend selection and off-loop parsing for the scrapers.
+
+Building a BeautifulSoup tree and walking a TJK results page is
+CPU-bound and used to run directly on the event loop, so every other
+in-flight city request stalled while one page was parsed.  Scrapers now
+hand parsing to :func:`parse_off_loop`, which runs it on a small shared
+thread pool while the loop keeps servicing sockets.
+
+The tree builder is pluggable: :data:`DEFAULT_HTML_PARSER` is ``lxml``
+when it is installed (``pip install ganyan[fast]``) — its C parser is
+several times faster and releases the GIL while parsing, so pool
+threads overlap for real — and the stdlib ``html.parser`` otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from importlib.util import find_spec
+from typing import Callable, TypeVar
+
+from bs4 import BeautifulSoup
+
+
+T = TypeVar("T")
+
+HTML_PARSERS = ("lxml", "html.parser")
+DEFAULT_HTML_PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
+
+_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def resolve_html_parser(parser: str | None) -> str:
+    """Validate ``parser`` (None = :data:`DEFAULT_HTML_PARSER`)."""
+    if parser is None:
+        return DEFAULT_HTML_PARSER
+    if parser not in HTML_PARSERS:
+        raise ValueError(
+            f"html parser must be one of {', '.join(HTML_PARSERS)}, got {parser!r}"
+        )
+    if parser == "lxml" and find_spec("lxml") is None:
+        raise ValueError("html parser 'lxml' requested but lxml is not installed")
+    return parser
+
+
+def make_soup(html: str, parser: str | None = None) -> BeautifulSoup:
+    return BeautifulSoup(html, parser or DEFAULT_HTML_PARSER)
+
+
+def _parse_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_PARSE_WORKERS, thread_name_prefix="ganyan-parse",
+            )
+        return _executor
+
+
+async def parse_off_loop(fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+    """Run the parsing callable ``fn`` on the shared parse pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _parse_executor(), partial(fn, *args, **kwargs),
+    )
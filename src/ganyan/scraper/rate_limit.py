@@ -0,0 +1,322 @@
+"""Shared request-rate limiting for TJK scrapes.
+
+Each fetch path used to pace itself with its own ``asyncio.sleep(delay)``
+— after every city, between historical pages, between backfill dates —
+so the real request rate depended on how many of those loops happened
+to be running.  A :class:`TokenBucket` replaces that with one explicit
+budget: every HTTP request takes a token, tokens refill at ``rate`` per
+second, and up to ``burst`` can be spent back to back.  Hand the same
+bucket to every client that talks to TJK and the combined rate stays
+bounded however many dates or cities are in flight.
+
+:class:`AdaptiveConcurrency` bounds how many requests are in flight
+instead of how often they start, and tunes that bound itself
+(additive-increase / multiplicative-decrease): each healthy, fast
+response nudges the limit up by ``1 / limit`` — about one slot per
+round of responses — and a 429, 5xx, timeout or connection error
+halves it, at most once per round so a burst of failures from one wave
+counts once.  :func:`rate_controller` hands out one process-wide
+controller per host, so :class:`~ganyan.scraper.tjk_api.TJKClient` and
+:class:`~ganyan.scraper.horse_crawler.HorseCrawler` share what they
+learn about tjk.org; :func:`rate_controller_status` feeds ``/ops``.
+Clients only use it when built with ``adaptive=True``; their fan-out
+is then bounded by the controller's limit — which grows up to
+``maximum`` while responses stay healthy — instead of their fixed
+``city_concurrency`` / ``concurrency``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+
+class TokenBucket:
+    """Async token bucket: at most ``rate`` acquisitions per second.
+
+    Waiters are served one at a time in arrival order.  ``rate`` may be
+    changed on a live bucket; the new rate applies from the next refill.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waited_s = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for and take one token."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1.0:
+                wait = (1.0 - self._tokens) / self.rate
+                self.waited_s += wait
+                await self._sleep(wait)
+                self._refill()
+            self._tokens -= 1.0
+            self.acquired += 1
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent requests to one host.
+
+    Thread-safe and not bound to an event loop: the scheduler runs each
+    scrape job under its own ``asyncio.run``, and all of them share the
+    host's controller.  A waiter parks on a future of its own loop; a
+    release (or a limit increase) wakes as many waiters, in arrival
+    order, as there are free slots via ``call_soon_threadsafe``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int = 5,
+        minimum: int = 1,
+        maximum: int = 16,
+        latency_target_s: float = 2.0,
+        backoff: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError(
+                f"need 1 <= minimum <= initial <= maximum, got "
+                f"{minimum}/{initial}/{maximum}"
+            )
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target_s = latency_target_s
+        self.backoff = backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = (
+            deque()
+        )
+        self._last_decrease = float("-inf")
+        # Counters for /ops.
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.successes = 0
+        self.slow = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.transport_errors = 0
+        self.decreases = 0
+        self.latency_ewma_s: float | None = None
+        self.last_decrease_at: datetime | None = None
+        self.last_decrease_reason: str | None = None
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns the request's start time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+                    self.requests += 1
+                    return self._clock()
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        # Already woken: hand the wake-up on.
+                        self._wake_locked()
+                raise
+
+    def _wake_locked(self) -> None:
+        """Wake one waiter per free slot (caller holds ``_lock``)."""
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            loop, future = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:  # that waiter's loop has closed
+                continue
+            free -= 1
+
+    def release(
+        self,
+        started: float,
+        *,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Free the slot taken at ``started`` and adapt to the outcome."""
+        now = self._clock()
+        latency = now - started
+        with self._lock:
+            try:
+                self._adapt_locked(started, now, latency, status, error)
+            finally:
+                self._wake_locked()
+
+    def _adapt_locked(
+        self,
+        started: float,
+        now: float,
+        latency: float,
+        status: int | None,
+        error: BaseException | None,
+    ) -> None:
+        self._in_flight -= 1
+        reason = None
+        if isinstance(error, httpx.TransportError):
+            self.transport_errors += 1
+            reason = type(error).__name__
+        elif error is not None:
+            return
+        elif status == 429:
+            self.throttled += 1
+            reason = "429"
+        elif status is not None and status >= 500:
+            self.server_errors += 1
+            reason = str(status)
+        elif status is not None and status >= 400:
+            return
+
+        if reason is not None:
+            # Halve once per round: only requests sent after the
+            # last cut can trigger the next one.
+            if started >= self._last_decrease:
+                self._limit = max(float(self.minimum), self._limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+                self.last_decrease_at = datetime.utcnow()
+                self.last_decrease_reason = reason
+            return
+
+        self.successes += 1
+        self.latency_ewma_s = (
+            latency if self.latency_ewma_s is None
+            else 0.8 * self.latency_ewma_s + 0.2 * latency
+        )
+        if latency > self.latency_target_s:
+            self.slow += 1
+            return
+        self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+
+    async def call(
+        self, send: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Run one request inside a slot, feeding its outcome back."""
+        started = await self.acquire()
+        try:
+            response = await send()
+        except BaseException as exc:
+            self.release(started, error=exc)
+            raise
+        self.release(started, status=response.status_code)
+        return response
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": self.limit,
+                "limit_exact": round(self._limit, 2),
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                "successes": self.successes,
+                "slow": self.slow,
+                "throttled": self.throttled,
+                "server_errors": self.server_errors,
+                "transport_errors": self.transport_errors,
+                "decreases": self.decreases,
+                "latency_ewma_ms": (
+                    round(self.latency_ewma_s * 1000.0, 1)
+                    if self.latency_ewma_s is not None else None
+                ),
+                "last_decrease_at": self.last_decrease_at,
+                "last_decrease_reason": self.last_decrease_reason,
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_CONTROLLERS: dict[str, AdaptiveConcurrency] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def rate_controller(base_url: str, **kwargs: object) -> AdaptiveConcurrency:
+    """Process-wide controller for ``base_url``'s host.
+
+    ``kwargs`` only apply when the controller is first created.
+    """
+    host = urlsplit(base_url).netloc or base_url
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(host)
+        if controller is None:
+            controller = AdaptiveConcurrency(host, **kwargs)
+            _CONTROLLERS[host] = controller
+        return controller
+
+
+def reset_rate_controllers() -> None:
+    """Forget every host controller (tests, or after a config change)."""
+    with _CONTROLLERS_LOCK:
+        _CONTROLLERS.clear()
+
+
+def rate_controller_status() -> list[dict]:
+    """One dict per host controller, for the ops dashboard."""
+    with _CONTROLLERS_LOCK:
+        controllers = sorted(_CONTROLLERS.items())
+    return [c.status() for _, c in controllers]
@@ -0,0 +1,282 @@
+"""Content-addressed archive of raw TJK responses.
+
+Scrapes used to keep only what the parsers extracted, so fixing a parser
+bug (a missed payout pool, a mis-split horse name) meant re-fetching
+months of pages from tjk.org.  With an archive attached, every program,
+results, city and horse-detail response is kept gzip-compressed on disk
+and ``ganyan reparse`` can rebuild the tables from it with no network.
+
+Layout under ``root``::
+
+    objects/ab/abcdef….html.gz   response bodies, named by sha256 of the body
+    index/2026-04-05.jsonl       one line per fetch on that race date
+    index/undated.jsonl          fetches with no race date (horse pages)
+
+Each index line is an :class:`ArchiveEntry`.  Its ``key`` hashes the
+request — method, endpoint path, sorted params and race date — so a
+page re-fetched later (the results poller hits the same city every few
+minutes) gets a new line under the same key, and :meth:`entries`
+returns only the newest one.  Identical bodies are stored once.
+
+The archive grows with every changed page, so :meth:`RawHtmlArchive.prune`
+drops index days (and undated lines) older than a cutoff plus any body
+no longer referenced; the scheduler runs it weekly with
+``raw_html_keep_days``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parents[2].parent / "data" / "raw_html"
+
+ARCHIVE_KINDS = (
+    "program_day",
+    "program_city",
+    "results_day",
+    "results_city",
+    "historical_query",
+    "horse_detail",
+)
+
+_UNDATED = "undated"
+
+# Unreferenced bodies younger than this survive a prune: a concurrent
+# put may have written (or re-used) the body but not its index line yet.
+_PRUNE_GRACE_S = 24 * 3600
+
+
+def request_key(
+    method: str, url: str, params: dict | None, race_date: date | None,
+) -> str:
+    """Stable sha256 of one request (params order-insensitive)."""
+    canonical = json.dumps(
+        [
+            method.upper(),
+            url,
+            sorted((str(k), str(v)) for k, v in (params or {}).items()),
+            race_date.isoformat() if race_date is not None else None,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """One archived fetch."""
+
+    key: str
+    digest: str
+    kind: str
+    method: str
+    url: str
+    params: dict[str, str]
+    race_date: date | None
+    fetched_at: datetime
+    meta: dict = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        row = asdict(self)
+        row["race_date"] = self.race_date.isoformat() if self.race_date else None
+        row["fetched_at"] = self.fetched_at.isoformat()
+        return json.dumps(row, ensure_ascii=False, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, line: str) -> ArchiveEntry:
+        row = json.loads(line)
+        row["race_date"] = (
+            date.fromisoformat(row["race_date"]) if row["race_date"] else None
+        )
+        row["fetched_at"] = datetime.fromisoformat(row["fetched_at"])
+        return cls(**row)
+
+
+class RawHtmlArchive:
+    """Gzip, content-addressed store of raw response bodies.
+
+    Safe to share between threads; :meth:`put` does blocking disk I/O,
+    so async callers run it off the event loop.
+    """
+
+    def __init__(
+        self, root: Path | str = DEFAULT_ARCHIVE_DIR, *, compresslevel: int = 6,
+    ) -> None:
+        self.root = Path(root)
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.html.gz"
+
+    def _index_path(self, race_date: date | None) -> Path:
+        name = race_date.isoformat() if race_date is not None else _UNDATED
+        return self.root / "index" / f"{name}.jsonl"
+
+    def put(
+        self,
+        kind: str,
+        method: str,
+        url: str,
+        params: dict | None,
+        body: str,
+        *,
+        race_date: date | None = None,
+        meta: dict | None = None,
+    ) -> ArchiveEntry:
+        """Store ``body`` and index it under the request's key."""
+        if kind not in ARCHIVE_KINDS:
+            raise ValueError(
+                f"archive kind must be one of {', '.join(ARCHIVE_KINDS)}, got {kind!r}"
+            )
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.object_path(digest)
+        if path.exists():
+            # Freshen the mtime so a concurrent prune keeps the body.
+            os.utime(path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a crash never leaves a truncated blob
+            # under a valid digest.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(gzip.compress(raw, self.compresslevel, mtime=0))
+            os.replace(tmp, path)
+
+        clean_params = {str(k): str(v) for k, v in (params or {}).items()}
+        entry = ArchiveEntry(
+            key=request_key(method, url, clean_params, race_date),
+            digest=digest,
+            kind=kind,
+            method=method.upper(),
+            url=url,
+            params=clean_params,
+            race_date=race_date,
+            fetched_at=datetime.utcnow(),
+            meta=dict(meta or {}),
+        )
+        index = self._index_path(race_date)
+        with self._lock:
+            index.parent.mkdir(parents=True, exist_ok=True)
+            with index.open("a", encoding="utf-8") as fh:
+                fh.write(entry.to_json() + "\n")
+        return entry
+
+    def read(self, entry: ArchiveEntry | str) -> str:
+        """Decompressed body of ``entry`` (or of a body digest)."""
+        digest = entry.digest if isinstance(entry, ArchiveEntry) else entry
+        return gzip.decompress(self.object_path(digest).read_bytes()).decode("utf-8")
+
+    def entries(
+        self,
+        *,
+        kind: str | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> list[ArchiveEntry]:
+        """Newest entry per request key, in race-date then fetch order.
+
+        A date filter excludes undated entries.
+        """
+        index_dir = self.root / "index"
+        if not index_dir.is_dir():
+            return []
+        dated = from_date is not None or to_date is not None
+        latest: dict[str, ArchiveEntry] = {}
+        for path in sorted(index_dir.glob("*.jsonl")):
+            if path.stem == _UNDATED:
+                if dated:
+                    continue
+            else:
+                day = date.fromisoformat(path.stem)
+                if from_date is not None and day < from_date:
+                    continue
+                if to_date is not None and day > to_date:
+                    continue
+            with path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if not line.strip():
+                        continue
+                    entry = ArchiveEntry.from_json(line)
+                    if kind is not None and entry.kind != kind:
+                        continue
+                    seen = latest.get(entry.key)
+                    if seen is None or entry.fetched_at >= seen.fetched_at:
+                        latest[entry.key] = entry
+        return sorted(
+            latest.values(),
+            key=lambda e: (e.race_date or date.min, e.fetched_at),
+        )
+
+
+    def prune(self, before: date) -> tuple[int, int]:
+        """Forget fetches made for (or, undated, on) days before ``before``.
+
+        Removes whole index days older than ``before``, drops older
+        lines from the undated index, then deletes bodies no remaining
+        line references.  Returns ``(index_lines_removed, bodies_removed)``.
+        """
+        index_dir = self.root / "index"
+        if not index_dir.is_dir():
+            return 0, 0
+        lines_removed = 0
+        referenced: set[str] = set()
+        with self._lock:
+            for path in sorted(index_dir.glob("*.jsonl")):
+                with path.open(encoding="utf-8") as fh:
+                    entries = [
+                        ArchiveEntry.from_json(line) for line in fh if line.strip()
+                    ]
+                if path.stem == _UNDATED:
+                    keep = [e for e in entries if e.fetched_at.date() >= before]
+                elif date.fromisoformat(path.stem) < before:
+                    keep = []
+                else:
+                    keep = entries
+                lines_removed += len(entries) - len(keep)
+                if not keep:
+                    path.unlink()
+                elif len(keep) < len(entries):
+                    fd, tmp = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+                    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                        fh.writelines(e.to_json() + "\n" for e in keep)
+                    os.replace(tmp, path)
+                referenced.update(e.digest for e in keep)
+
+        bodies_removed = 0
+        fresh_after = time.time() - _PRUNE_GRACE_S
+        for path in (self.root / "objects").glob("*/*.html.gz"):
+            digest = path.name.split(".", 1)[0]
+            if digest in referenced or path.stat().st_mtime > fresh_after:
+                continue
+            path.unlink()
+            bodies_removed += 1
+        return lines_removed, bodies_removed
+
+
+def archive_from_settings(settings) -> RawHtmlArchive | None:
+    """The configured archive, or None when ``raw_html_archive`` is off."""
+    if not settings.raw_html_archive:
+        return None
+    return RawHtmlArchive(settings.raw_html_dir or DEFAULT_ARCHIVE_DIR)
+
+
+def prune_from_settings(settings, today: date | None = None) -> tuple[int, int]:
+    """Apply ``raw_html_keep_days`` to the configured archive."""
+    archive = archive_from_settings(settings)
+    if archive is None:
+        return 0, 0
+    today = today or date.today()
+    return archive.prune(today - timedelta(days=settings.raw_html_keep_days))
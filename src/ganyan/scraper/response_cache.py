@@ -0,0 +1,141 @@
+"""Conditional, cached GETs for pages that are polled repeatedly.
+
+The results poller re-reads every city's results page every 20 minutes
+through race hours, long after most cards have finished.  A
+:class:`ResponseCache` remembers, per request, the last body's sha256,
+its ``ETag`` / ``Last-Modified`` validators and what the body parsed
+to.  :class:`~ganyan.scraper.tjk_api.TJKClient` sends the validators
+back as ``If-None-Match`` / ``If-Modified-Since``; a ``304`` — or a
+``200`` whose body hashes the same — counts as unchanged, and the
+cached parse is reused instead of rebuilding the soup.
+
+The scheduler opens a fresh client (under a fresh ``asyncio.run``) for
+every poll, so :func:`response_cache` hands out one process-wide,
+thread-safe cache; :func:`response_cache_status` feeds ``/ops``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import httpx
+
+
+@dataclass
+class CachedResponse:
+    digest: str
+    text: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: datetime
+    parsed: object = None
+
+
+class ResponseCache:
+    """LRU of the last response per request key (see ``request_key``)."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        # Counters for /ops.
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Conditional-request headers for ``key`` (empty when uncached)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def update(
+        self, key: str, response: httpx.Response,
+    ) -> tuple[CachedResponse, bool] | None:
+        """Fold ``response`` into the cache; returns ``(entry, changed)``.
+
+        Returns None for a ``304`` on a key that is no longer cached
+        (evicted after its validators were sent): there is no body to
+        serve, and the caller must re-fetch without validators.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if response.status_code == 304:
+                if entry is None:
+                    return None
+                self.not_modified += 1
+                entry.fetched_at = datetime.utcnow()
+                self._entries.move_to_end(key)
+                return entry, False
+
+            text = response.text
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            changed = entry is None or entry.digest != digest
+            entry = CachedResponse(
+                digest=digest,
+                text=text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                fetched_at=datetime.utcnow(),
+                parsed=None if changed else entry.parsed,
+            )
+            if changed:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry, changed
+
+    def forget(self, key: str) -> None:
+        """Drop ``key`` so its next fetch is unconditional and "changed"."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "not_modified": self.not_modified,
+                "unchanged": self.unchanged,
+                "changed": self.changed,
+            }
+
+
+_CACHE: ResponseCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def response_cache() -> ResponseCache:
+    """The process-wide cache shared by every polling client."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ResponseCache()
+        return _CACHE
+
+
+def response_cache_status() -> dict | None:
+    """Cache counters for the ops dashboard; None before first use."""
+    with _CACHE_LOCK:
+        cache = _CACHE
+    return cache.status() if cache is not None else None
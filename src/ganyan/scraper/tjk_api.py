@@ -10,13 +10,19 @@ import asyncio
 import logging
 import re
 from collections import defaultdict
+from collections.abc import Collection
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Awaitable, Callable, TypeVar
 
 import httpx
 from bs4 import BeautifulSoup, Tag
 
-from ganyan.scraper.parser import RawHorseEntry, RawRaceCard
+from ganyan.scraper.html_parsing import make_soup, parse_off_loop, resolve_html_parser
+from ganyan.scraper.parser import RawHorseEntry, RawRaceCard, normalize_track_name
+from ganyan.scraper.rate_limit import AdaptiveConcurrency, TokenBucket, rate_controller
+from ganyan.scraper.raw_archive import RawHtmlArchive, request_key
+from ganyan.scraper.response_cache import CachedResponse, ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -537,6 +543,29 @@ def _format_date(d: date) -> str:
 # ---------------------------------------------------------------------------
 
 
+@dataclass
+class ResultsPoll:
+    """Per-track outcome of :meth:`TJKClient.poll_race_results`."""
+
+    cards: list[RawRaceCard] = field(default_factory=list)  # changed tracks only
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    # Response-cache key per changed track.  The cache counts a page as
+    # seen once fetched; callers that fail to store a track's cards
+    # ``ResponseCache.forget`` its key so the next poll returns them.
+    keys: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Page:
+    text: str
+    changed: bool
+    cached: CachedResponse | None = None
+    key: str | None = None
+
+
 class TJKClient:
     """Async HTTP client for the Turkish Jockey Club website.
 
@@ -553,9 +582,31 @@ class TJKClient:
         max_retries: int | None = None,
         backoff_base: float | None = None,
         city_concurrency: int = 5,
+        rate_limiter: TokenBucket | None = None,
+        adaptive: bool = False,
+        controller: AdaptiveConcurrency | None = None,
+        html_parser: str | None = None,
+        archive: RawHtmlArchive | None = None,
+        response_cache: ResponseCache | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.delay = delay
+        # BeautifulSoup tree builder; pages are parsed off the event loop.
+        self.html_parser = resolve_html_parser(html_parser)
+        # When set, every page body is kept for offline ``ganyan reparse``.
+        self.archive = archive
+        # When set, day and city pages are fetched conditionally and
+        # unchanged bodies reuse their cached parse.
+        self.response_cache = response_cache
+        # When set, every request takes a token from this (possibly
+        # shared) bucket and the per-loop ``delay`` sleeps are skipped.
+        self.rate_limiter = rate_limiter
+        # With ``adaptive=True`` in-flight requests are bounded by the
+        # host's shared AIMD controller, which replaces
+        # ``city_concurrency`` as the cap on concurrent city fetches.
+        if controller is None and adaptive:
+            controller = rate_controller(self.base_url)
+        self.controller = controller
         # Read module defaults at construction time so tests can monkeypatch.
         self.max_retries = (
             max_retries if max_retries is not None else _DEFAULT_MAX_RETRIES
@@ -593,6 +644,46 @@ class TJKClient:
             backoff_base=self.backoff_base,
         )
 
+    async def _request(
+        self, method: str, url: str, **kwargs: object,
+    ) -> httpx.Response:
+        """Issue one HTTP request, waiting on the rate limiter if any."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if self.controller is None:
+            return await self._client.request(method, url, **kwargs)
+        return await self.controller.call(
+            lambda: self._client.request(method, url, **kwargs),
+        )
+
+    async def _archive(
+        self,
+        kind: str,
+        method: str,
+        url: str,
+        params: dict,
+        resp: httpx.Response,
+        *,
+        race_date: date | None = None,
+        **meta: object,
+    ) -> None:
+        """Keep ``resp``'s body in the raw archive, if one is attached."""
+        if self.archive is None:
+            return
+        try:
+            await parse_off_loop(
+                self.archive.put, kind, method, url, params, resp.text,
+                race_date=race_date, meta=meta,
+            )
+        except OSError:
+            # A full disk must not fail the scrape itself.
+            logger.warning("Could not archive %s page %s", kind, url, exc_info=True)
+
+    async def _pause(self) -> None:
+        """Fixed ``delay`` between requests, unless a rate limiter paces them."""
+        if self.rate_limiter is None and self.delay > 0:
+            await asyncio.sleep(self.delay)
+
     async def __aenter__(self) -> TJKClient:
         return self
 
@@ -655,6 +746,43 @@ class TJKClient:
             is_results=True,
         )
 
+    async def poll_race_results(
+        self,
+        race_date: date,
+        *,
+        skip_tracks: Collection[str] = (),
+    ) -> ResultsPoll:
+        """Re-fetch results, reporting which tracks' pages changed.
+
+        Tracks in ``skip_tracks`` — stored names, as produced by
+        :func:`~ganyan.scraper.parser.normalize_track_name` — are not
+        requested at all.  Only cards
+        from changed pages are returned; with a ``response_cache`` that
+        is every page whose body differs from the previous poll (the
+        first poll in a process sees every page as changed).
+        """
+        outcomes = await self._fetch_tracks(
+            page_url=_RESULTS_PAGE,
+            city_url=_RESULTS_CITY,
+            race_date=race_date,
+            is_results=True,
+            skip_tracks=frozenset(skip_tracks),
+        )
+        poll = ResultsPoll()
+        for track_name, cards, changed, key in outcomes:
+            if changed is None:
+                poll.skipped.append(track_name)
+            elif not cards:
+                poll.failed.append(track_name)
+            elif changed:
+                poll.changed.append(track_name)
+                poll.cards.extend(cards)
+                if key is not None:
+                    poll.keys[track_name] = key
+            else:
+                poll.unchanged.append(track_name)
+        return poll
+
     async def fetch_historical_results(
         self,
         from_date: date,
@@ -680,44 +808,44 @@ class TJKClient:
         all_rows: list[dict] = []
 
         # --- Page 1 (uses /Query/Data/ endpoint) ---
+        page1_data = {
+            "QueryParameter_Tarih": from_str,
+            "QueryParameter_Tarih_Start": from_str,
+            "QueryParameter_Tarih_End": to_str,
+            "PageNumber": "1",
+        }
+
         async def _fetch_page1() -> httpx.Response:
-            r = await self._client.post(
-                _QUERY_DATA,
-                data={
-                    "QueryParameter_Tarih": from_str,
-                    "QueryParameter_Tarih_Start": from_str,
-                    "QueryParameter_Tarih_End": to_str,
-                    "PageNumber": "1",
-                },
-            )
+            r = await self._request("POST", _QUERY_DATA, data=page1_data)
             r.raise_for_status()
             return r
 
         resp = await self._retry(_fetch_page1, "historical-query page 1")
         if resp is None:
             return []
+        await self._archive(
+            "historical_query", "POST", _QUERY_DATA, page1_data, resp,
+            race_date=from_date, to_date=to_date.isoformat(),
+        )
 
-        rows, has_more = self._parse_query_page(resp.text)
+        rows, has_more = await parse_off_loop(self._parse_query_page, resp.text)
         all_rows.extend(rows)
         page = 2
 
         # --- Subsequent pages (uses /Query/DataRows/ endpoint) ---
         while has_more and page <= _MAX_HISTORICAL_PAGES:
-            if self.delay > 0:
-                await asyncio.sleep(self.delay)
+            await self._pause()
 
             current_page = page  # bind for closure
+            page_data = {
+                "QueryParameter_Tarih_Start": from_str,
+                "QueryParameter_Tarih_End": to_str,
+                "PageNumber": str(current_page),
+                "Sort": "Tarih desc, Sehir asc, KosuSirasi asc",
+            }
 
             async def _fetch_pageN() -> httpx.Response:
-                r = await self._client.post(
-                    _QUERY_DATA_ROWS,
-                    data={
-                        "QueryParameter_Tarih_Start": from_str,
-                        "QueryParameter_Tarih_End": to_str,
-                        "PageNumber": str(current_page),
-                        "Sort": "Tarih desc, Sehir asc, KosuSirasi asc",
-                    },
-                )
+                r = await self._request("POST", _QUERY_DATA_ROWS, data=page_data)
                 r.raise_for_status()
                 return r
 
@@ -726,8 +854,14 @@ class TJKClient:
             )
             if resp is None:
                 break
+            await self._archive(
+                "historical_query", "POST", _QUERY_DATA_ROWS, page_data, resp,
+                race_date=from_date, to_date=to_date.isoformat(),
+            )
 
-            rows, has_more = self._parse_query_page(resp.text)
+            rows, has_more = await parse_off_loop(
+                self._parse_query_page, resp.text,
+            )
             if not rows:
                 break
             all_rows.extend(rows)
@@ -758,7 +892,7 @@ class TJKClient:
 
         Returns (list_of_row_dicts, has_more_pages).
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, self.html_parser)
         data_rows = [
             row
             for row in soup.select("tr")
@@ -864,79 +998,110 @@ class TJKClient:
         or empty responses — callers can use it to log partial-scrape state
         and retry later.
         """
-        date_str = _format_date(race_date)
+        outcomes = await self._fetch_tracks(
+            page_url, city_url, race_date, is_results,
+        )
+        all_cards: list[RawRaceCard] = []
+        failed_tracks: list[str] = []
+        for track_name, cards, _changed, _key in outcomes:
+            if not cards:
+                failed_tracks.append(track_name)
+            all_cards.extend(cards)
 
-        async def _fetch_main() -> httpx.Response:
-            r = await self._client.get(
-                page_url, params={"QueryParameter_Tarih": date_str},
-            )
-            r.raise_for_status()
-            return r
+        return all_cards, failed_tracks
 
-        resp = await self._retry(_fetch_main, f"main-page {page_url}")
-        if resp is None:
-            return [], []
+    async def _fetch_tracks(
+        self,
+        page_url: str,
+        city_url: str,
+        race_date: date,
+        is_results: bool,
+        skip_tracks: frozenset[str] = frozenset(),
+    ) -> list[tuple[str, list[RawRaceCard], bool | None, str | None]]:
+        """``(track_name, cards, changed, cache_key)`` per domestic track.
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        tabs = soup.select(_SEL_TRACK_TABS)
-        if not tabs:
-            logger.warning("No track tabs found on %s for %s", page_url, date_str)
-            return [], []
+        ``changed`` is None for tracks whose normalized name is in
+        ``skip_tracks``; those are not fetched.  ``cache_key`` is None
+        without a response cache.  An empty list means the day page itself failed.
+        """
+        date_str = _format_date(race_date)
+        main_params = {"QueryParameter_Tarih": date_str}
 
-        # Collect Turkish domestic tracks (filter out international tracks)
-        domestic_tracks = []
-        for tab in tabs:
-            href = tab.get("href", "")
-            sehir_id = tab.get("data-sehir-id", "")
-            text = tab.get_text(strip=True)
-            # Extract track name from tab text, removing the "(N. Y.G.)" suffix
-            track_name = re.sub(r"\s*\(\d+\.\s*Y\.G\.\)\s*$", "", text).strip()
-            # Only include known Turkish domestic tracks
-            try:
-                sid = int(sehir_id)
-            except (ValueError, TypeError):
-                continue
-            if sid not in _DOMESTIC_SEHIR_IDS:
-                continue
-            domestic_tracks.append((track_name, sehir_id, href))
+        page = await self._get_page(
+            "results_day" if is_results else "program_day",
+            page_url, main_params, f"main-page {page_url}", race_date=race_date,
+        )
+        if page is None:
+            return []
+
+        domestic_tracks = await self._parse_page(page, self._parse_track_tabs)
+        if domestic_tracks is None:
+            logger.warning("No track tabs found on %s for %s", page_url, date_str)
+            return []
 
         # Fetch cities concurrently with a semaphore to keep load modest.
         # Same total request count as sequential but compressed in time
         # — TJK sees N parallel requests to distinct paths instead of
         # one-at-a-time with 2s gaps.  Speedup is roughly
         # ``self.city_concurrency`` × for a full 10-city date.
-        semaphore = asyncio.Semaphore(self.city_concurrency)
+        # Under a controller its adaptive limit does the bounding.
+        semaphore = asyncio.Semaphore(
+            self.controller.maximum if self.controller is not None
+            else self.city_concurrency
+        )
 
         async def _fetch_one(
             track_name: str, sehir_id: str,
-        ) -> tuple[str, list[RawRaceCard]]:
+        ) -> tuple[str, list[RawRaceCard], bool | None, str | None]:
+            if normalize_track_name(track_name) in skip_tracks:
+                return track_name, [], None, None
             async with semaphore:
-                cards = await self._fetch_city_races(
+                cards, changed, key = await self._fetch_city_races(
                     city_url=city_url,
                     sehir_id=sehir_id,
                     track_name=track_name,
                     race_date=race_date,
                     is_results=is_results,
                 )
-                if self.delay > 0:
-                    # Small post-request stagger so we don't burst the
-                    # next wave of concurrent requests immediately.
-                    await asyncio.sleep(self.delay)
-                return track_name, cards
+                # Small post-request stagger so we don't burst the
+                # next wave of concurrent requests immediately.
+                await self._pause()
+                return track_name, cards, changed, key
 
-        results = await asyncio.gather(
+        return list(await asyncio.gather(
             *(_fetch_one(name, sid) for name, sid, _ in domestic_tracks),
             return_exceptions=False,
-        )
+        ))
 
-        all_cards: list[RawRaceCard] = []
-        failed_tracks: list[str] = []
-        for track_name, cards in results:
-            if not cards:
-                failed_tracks.append(track_name)
-            all_cards.extend(cards)
+    def _parse_track_tabs(
+        self, html: str,
+    ) -> list[tuple[str, str, str]] | None:
+        """``(track_name, sehir_id, href)`` of domestic tracks on a day page.
 
-        return all_cards, failed_tracks
+        Returns None when the page has no track tabs at all.
+        """
+        soup = make_soup(html, self.html_parser)
+        tabs = soup.select(_SEL_TRACK_TABS)
+        if not tabs:
+            return None
+
+        # Collect Turkish domestic tracks (filter out international tracks)
+        domestic_tracks = []
+        for tab in tabs:
+            href = tab.get("href", "")
+            sehir_id = tab.get("data-sehir-id", "")
+            text = tab.get_text(strip=True)
+            # Extract track name from tab text, removing the "(N. Y.G.)" suffix
+            track_name = re.sub(r"\s*\(\d+\.\s*Y\.G\.\)\s*$", "", text).strip()
+            # Only include known Turkish domestic tracks
+            try:
+                sid = int(sehir_id)
+            except (ValueError, TypeError):
+                continue
+            if sid not in _DOMESTIC_SEHIR_IDS:
+                continue
+            domestic_tracks.append((track_name, sehir_id, href))
+        return domestic_tracks
 
     async def _fetch_city_races(
         self,
@@ -945,33 +1110,103 @@ class TJKClient:
         track_name: str,
         race_date: date,
         is_results: bool,
-    ) -> list[RawRaceCard]:
-        """Fetch and parse races for a single track/city."""
-        date_str = _format_date(race_date)
+    ) -> tuple[list[RawRaceCard], bool, str | None]:
+        """Fetch and parse races for a single track/city.
 
-        async def _fetch_city() -> httpx.Response:
-            r = await self._client.get(
-                city_url,
-                params={
-                    "SehirId": sehir_id,
-                    "QueryParameter_Tarih": date_str,
-                    "SehirAdi": track_name,
-                },
-            )
-            r.raise_for_status()
-            return r
+        Returns ``(cards, changed, cache_key)``; ``changed`` is False
+        when the response cache saw the same page last time.
+        """
+        city_params = {
+            "SehirId": sehir_id,
+            "QueryParameter_Tarih": _format_date(race_date),
+            "SehirAdi": track_name,
+        }
+        page = await self._get_page(
+            "results_city" if is_results else "program_city",
+            city_url, city_params, f"city {track_name} (SehirId={sehir_id})",
+            race_date=race_date, track_name=track_name, sehir_id=sehir_id,
+        )
+        if page is None:
+            return [], True, None
 
-        resp = await self._retry(
-            _fetch_city, f"city {track_name} (SehirId={sehir_id})",
+        cards = await self._parse_page(
+            page, self._parse_city_page, track_name, race_date, is_results,
         )
-        if resp is None:
-            return []
+        return list(cards), page.changed, page.key
+
+    async def _get_page(
+        self,
+        kind: str,
+        url: str,
+        params: dict,
+        label: str,
+        *,
+        race_date: date,
+        **meta: object,
+    ) -> _Page | None:
+        """GET a day or city page, conditionally when a cache is attached.
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        return self._parse_city_html(soup, track_name, race_date, is_results)
+        New bodies are archived; None after the retries are exhausted.
+        """
+        key = request_key("GET", url, params, None)
+        headers = (
+            self.response_cache.validators(key)
+            if self.response_cache is not None else {}
+        )
 
+        async def _fetch() -> httpx.Response:
+            r = await self._request("GET", url, params=params, headers=headers)
+            if r.status_code != 304:  # answer to our validators, not a redirect
+                r.raise_for_status()
+            return r
+
+        resp = await self._retry(_fetch, label)
+        if resp is None:
+            return None
+        if self.response_cache is None:
+            page = _Page(resp.text, changed=True)
+        else:
+            folded = self.response_cache.update(key, resp)
+            if folded is None:
+                # 304, but the cached body was evicted after the
+                # validators went out: fetch the page whole.
+                headers = {}
+                resp = await self._retry(_fetch, label)
+                if resp is None:
+                    return None
+                folded = self.response_cache.update(key, resp)
+                if folded is None:
+                    logger.error("%s: 304 to an unconditional request", label)
+                    return None
+            cached, changed = folded
+            page = _Page(cached.text, changed=changed, cached=cached, key=key)
+        if page.changed:
+            await self._archive(
+                kind, "GET", url, params, resp, race_date=race_date, **meta,
+            )
+        return page
+
+    async def _parse_page(
+        self, page: _Page, parse: Callable[..., T], *args: object,
+    ) -> T:
+        """``parse(page.text, *args)`` off the loop, reusing a cached parse."""
+        if page.cached is not None and page.cached.parsed is not None:
+            return page.cached.parsed
+        parsed = await parse_off_loop(parse, page.text, *args)
+        if page.cached is not None:
+            page.cached.parsed = parsed
+        return parsed
+
+    def _parse_city_page(
+        self, html: str, track_name: str, race_date: date, is_results: bool,
+    ) -> list[RawRaceCard]:
+        return parse_city_page(
+            html, track_name, race_date, is_results, self.html_parser,
+        )
+
+    @classmethod
     def _parse_city_html(
-        self,
+        cls,
         soup: BeautifulSoup,
         track_name: str,
         race_date: date,
@@ -1049,7 +1284,7 @@ class TJKClient:
             horses: list[RawHorseEntry] = []
 
             for row in rows:
-                horse = self._parse_horse_row(row, is_results)
+                horse = cls._parse_horse_row(row, is_results)
                 if horse and horse.name:
                     horses.append(horse)
 
@@ -1076,13 +1311,15 @@ class TJKClient:
 
         return cards
 
-    def _parse_horse_row(self, row: Tag, is_results: bool) -> RawHorseEntry | None:
+    @classmethod
+    def _parse_horse_row(cls, row: Tag, is_results: bool) -> RawHorseEntry | None:
         """Parse a single <tr> into a RawHorseEntry."""
         if is_results:
-            return self._parse_result_row(row)
-        return self._parse_program_row(row)
+            return cls._parse_result_row(row)
+        return cls._parse_program_row(row)
 
-    def _parse_program_row(self, row: Tag) -> RawHorseEntry | None:
+    @staticmethod
+    def _parse_program_row(row: Tag) -> RawHorseEntry | None:
         """Parse a horse row from the race program table."""
         name_cell = row.select_one(_P_NAME)
         name = _extract_horse_name_program(name_cell)
@@ -1112,7 +1349,8 @@ class TJKClient:
             equipment=_extract_equipment(name_cell),
         )
 
-    def _parse_result_row(self, row: Tag) -> RawHorseEntry | None:
+    @staticmethod
+    def _parse_result_row(row: Tag) -> RawHorseEntry | None:
         """Parse a horse row from the race results table."""
         name_cell = row.select_one(_R_NAME)
         name = _extract_horse_name_results(name_cell)
@@ -1138,3 +1376,19 @@ class TJKClient:
             tjk_at_id=_extract_at_id(name_cell),
             equipment=_extract_equipment(name_cell),
         )
+
+
+def parse_city_page(
+    html: str,
+    track_name: str,
+    race_date: date,
+    is_results: bool,
+    html_parser: str | None = None,
+) -> list[RawRaceCard]:
+    """Parse one city program/results page without a client.
+
+    Used by :class:`TJKClient` and by ``ganyan reparse``, which replays
+    archived pages in worker processes.
+    """
+    soup = make_soup(html, html_parser)
+    return TJKClient._parse_city_html(soup, track_name, race_date, is_results)
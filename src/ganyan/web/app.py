@@ -115,7 +115,8 @@ def _start_launch_refresh(settings: Settings, lookback_days: int) -> None:
         import asyncio
 
         from ganyan.db import get_session
-        from ganyan.scraper import TJKClient
+        from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+        from ganyan.scraper import TJKClient, archive_from_settings
         from ganyan.scraper.backfill import BackfillManager
 
         today = date.today()
@@ -127,11 +128,15 @@ def _start_launch_refresh(settings: Settings, lookback_days: int) -> None:
                 async with TJKClient(
                     base_url=settings.tjk_base_url,
                     delay=settings.scrape_delay,
+                    archive=archive_from_settings(settings),
+                    adaptive=settings.scrape_adaptive,
                 ) as client:
                     manager = BackfillManager(session, client)
                     stored = await manager.backfill_full_results(
                         from_date=start, to_date=today,
                     )
+                    refresh_dirty_evaluation_daily(session)
+                    session.commit()
                     logger.info(
                         "Launch refresh: %d race(s) stored (%s -> %s)",
                         stored, start, today,
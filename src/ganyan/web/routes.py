@@ -8,6 +8,7 @@ from flask import (
     Blueprint,
     abort,
     current_app,
+    flash,
     jsonify,
     render_template,
     request,
@@ -33,6 +34,17 @@ def _wants_json() -> bool:
     return best == "application/json"
 
 
+def _parse_date_arg(name: str) -> date | None:
+    """``YYYY-MM-DD`` query argument, or None when absent.
+
+    Raises ValueError on a malformed value.
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
 # ---------------------------------------------------------------------------
 # GET / — Dashboard
 # ---------------------------------------------------------------------------
@@ -126,18 +138,15 @@ def predict_race(race_id: int):
             abort(404)
 
         from ganyan.predictor.ml import MLPredictor
-        from ganyan.predictor.exotics import (
-            ikili_probabilities, sirali_ikili_probabilities,
-            uclu_probabilities,
-        )
 
         predictor = MLPredictor(session)
         predictions = predictor.predict(race_id)
 
+        exotic_model = _race_exotic_model(predictions)
         recommendations = _build_bet_recommendations(
-            race, predictions, ikili_probabilities,
-            sirali_ikili_probabilities, uclu_probabilities,
+            race, predictions, exotic_model,
         )
+        place_pct = _place_percentages(exotic_model)
 
         if _wants_json():
             return jsonify(
@@ -148,6 +157,9 @@ def predict_race(race_id: int):
                             "horse_id": p.horse_id,
                             "horse_name": p.horse_name,
                             "probability": round(p.probability, 2),
+                            "place_probability": round(
+                                place_pct.get(p.horse_id, 0.0), 2,
+                            ),
                             "confidence": round(p.confidence, 2),
                             "contributing_factors": p.contributing_factors,
                         }
@@ -162,11 +174,26 @@ def predict_race(race_id: int):
             race=race,
             predictions=predictions,
             recommendations=recommendations,
+            place_pct=place_pct,
         )
     finally:
         session.close()
 
 
+def _race_exotic_model(predictions):
+    """Shared Harville state for a race's predictions (negatives clipped)."""
+    from ganyan.predictor.exotics import RaceExoticModel
+
+    return RaceExoticModel(
+        {p.horse_id: max(p.probability, 0) / 100.0 for p in predictions},
+    )
+
+
+def _place_percentages(exotic_model, top_k: int = 2) -> dict[int, float]:
+    """Harville P(top ``top_k``) per horse, in percent, for the race table."""
+    return {h: v * 100.0 for h, v in exotic_model.plase(top_k).items()}
+
+
 # Typical Turkish parimutuel takeouts (rough, varies by pool/track).
 _TAKEOUT = {
     "ganyan": 0.18,
@@ -176,9 +203,7 @@ _TAKEOUT = {
 }
 
 
-def _build_bet_recommendations(
-    race, predictions, ikili_fn, sirali_fn, uclu_fn,
-) -> list[dict]:
+def _build_bet_recommendations(race, predictions, exotic_model) -> list[dict]:
     """Build the per-race betting suggestions shown on /races/<id>/predict.
 
     Only surfaces strategies that are **backtest-positive or plausibly
@@ -194,21 +219,19 @@ def _build_bet_recommendations(
     whole reason Üçlü top-1 is profitable is that the market mis-prices
     the favorite-ordered trifecta, so market-derived EV systematically
     understates the real edge.
+
+    ``exotic_model`` is the race's :class:`RaceExoticModel` (see
+    :func:`_race_exotic_model`), shared with the place column.
     """
     if not predictions:
         return []
-    # Our model's win probabilities (0..1), normalised.
-    mp = {p.horse_id: max(p.probability, 0) / 100.0 for p in predictions}
-    total = sum(mp.values())
-    if total > 0:
-        mp = {h: v / total for h, v in mp.items()}
 
     name_for = {p.horse_id: p.horse_name for p in predictions}
 
     recs: list[dict] = []
 
     # --- Üçlü top-1 (the edge) ---
-    our_uclu = uclu_fn(mp)[:1]
+    our_uclu = exotic_model.top("uclu", 1)
     if our_uclu and len(predictions) >= 3:
         our_top = our_uclu[0]
         recs.append({
@@ -227,10 +250,7 @@ def _build_bet_recommendations(
         })
 
         # --- Üçlü box-6 (same horses, all 6 orderings) ---
-        top3_set = set(our_top.horses)
-        prob_any_order = sum(
-            c.probability for c in uclu_fn(mp) if set(c.horses) == top3_set
-        )
+        prob_any_order = exotic_model.box_probability(our_top.horses)
         recs.append({
             "title": "Üçlü — Kutu 6 (düşük varyans)",
             "subtitle": "Backtest: ~16% hit rate, +112% ROI long-run",
@@ -245,7 +265,7 @@ def _build_bet_recommendations(
         })
 
     # --- Sıralı İkili top-1 (break-even indicator) ---
-    our_si = sirali_fn(mp)[:1] if len(predictions) >= 2 else []
+    our_si = exotic_model.top("sirali_ikili", 1)
     if our_si:
         top = our_si[0]
         recs.append({
@@ -271,21 +291,75 @@ def _build_bet_recommendations(
 
 @bp.route("/history")
 def history():
-    from ganyan.predictor.evaluate import evaluate_all
+    """Accuracy summary plus the most recent per-race evaluations.
+
+    The summary is rolled up from the per-day ``evaluation_daily`` table
+    (optionally windowed with ``?from=`` / ``?to=`` and scoped to an
+    audit ``?model=`` version), falling back to a full scan until that
+    table has been built.  Per-race rows cover only the latest races.
+    """
+    from ganyan.predictor.evaluate import (
+        evaluate_all,
+        load_evaluation_rows,
+        race_evaluations,
+        score_races,
+    )
+    from ganyan.predictor.evaluation_daily import (
+        LIVE_MODEL_VERSION,
+        summarize_evaluation_daily,
+    )
+
+    try:
+        from_date = _parse_date_arg("from")
+        to_date = _parse_date_arg("to")
+    except ValueError:
+        if _wants_json():
+            return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
+        # A mistyped link still gets the page, unwindowed.
+        flash("Geçersiz tarih biçimi (YYYY-MM-DD); tüm yarışlar gösteriliyor.")
+        from_date = to_date = None
+    model_version = request.args.get("model") or LIVE_MODEL_VERSION
 
     session = _get_session()
     try:
-        summary, evaluations = evaluate_all(session)
+        summary = summarize_evaluation_daily(
+            session,
+            from_date=from_date,
+            to_date=to_date,
+            model_version=model_version,
+        )
+        if summary is None:
+            summary, _ = evaluate_all(
+                session,
+                cutoff_date=from_date,
+                to_date=to_date,
+                model_version=model_version or None,
+            )
 
         # Also fetch the full race list for any races without predictions.
+        race_query = session.query(Race).filter(Race.status == RaceStatus.resulted)
+        if from_date is not None:
+            race_query = race_query.filter(Race.date >= from_date)
+        if to_date is not None:
+            race_query = race_query.filter(Race.date <= to_date)
         resulted_races = (
-            session.query(Race)
-            .filter(Race.status == RaceStatus.resulted)
+            race_query
             .order_by(Race.date.desc(), Race.race_number.desc())
             .limit(50)
             .all()
         )
 
+        # Per-race rows only for the days those races span.
+        evaluations = []
+        if resulted_races:
+            rows = load_evaluation_rows(
+                session,
+                cutoff_date=resulted_races[-1].date,
+                to_date=resulted_races[0].date,
+                model_version=model_version or None,
+            )
+            evaluations = race_evaluations(rows, score_races(rows))
+
         if _wants_json():
             return jsonify(
                 {
@@ -353,7 +427,7 @@ def scrape_today():
 
     from ganyan.config import get_settings
     from ganyan.db.models import ScrapeStatus
-    from ganyan.scraper import TJKClient, parse_race_card
+    from ganyan.scraper import TJKClient, archive_from_settings, parse_race_card
     from ganyan.scraper.backfill import log_scrape, store_race_card
 
     settings = get_settings()
@@ -363,7 +437,9 @@ def scrape_today():
 
         async def _do_scrape():
             async with TJKClient(
-                base_url=settings.tjk_base_url, delay=settings.scrape_delay
+                base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as client:
                 raw_cards = await client.get_race_card(date.today())
                 return raw_cards
@@ -442,10 +518,8 @@ def predict_today():
             )
 
         predictor = MLPredictor(session)
-        count = 0
-        for race in today_races:
-            predictor.predict_and_save(race.id)
-            count += 1
+        predictor.predict_and_save_many([race.id for race in today_races])
+        count = len(today_races)
         session.commit()
 
         msg = f"{count} yarış için tahmin kaydedildi."
@@ -488,7 +562,8 @@ def scrape_history():
     import asyncio
 
     from ganyan.config import get_settings
-    from ganyan.scraper import TJKClient
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+    from ganyan.scraper import TJKClient, archive_from_settings
     from ganyan.scraper.backfill import BackfillManager
 
     settings = get_settings()
@@ -520,12 +595,16 @@ def scrape_history():
 
         async def _do_history():
             async with TJKClient(
-                base_url=settings.tjk_base_url, delay=settings.scrape_delay
+                base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as client:
                 manager = BackfillManager(session, client)
                 return await manager.backfill_historical(from_date, to_date)
 
         count = asyncio.run(_do_history())
+        refresh_dirty_evaluation_daily(session)
+        session.commit()
 
         msg = f"{count} gecmis yaris kaydi yuklendi ({from_date} -> {to_date})."
         if _wants_json():
@@ -573,7 +652,8 @@ def scrape_results():
     import asyncio
 
     from ganyan.config import get_settings
-    from ganyan.scraper import TJKClient, parse_race_card
+    from ganyan.predictor.evaluation_daily import refresh_dirty_evaluation_daily
+    from ganyan.scraper import TJKClient, archive_from_settings, parse_race_card
     from ganyan.scraper.backfill import update_race_results
 
     settings = get_settings()
@@ -583,7 +663,9 @@ def scrape_results():
 
         async def _do_scrape():
             async with TJKClient(
-                base_url=settings.tjk_base_url, delay=settings.scrape_delay
+                base_url=settings.tjk_base_url, delay=settings.scrape_delay,
+                archive=archive_from_settings(settings),
+                adaptive=settings.scrape_adaptive,
             ) as client:
                 return await client.get_race_results(date.today())
 
@@ -603,6 +685,7 @@ def scrape_results():
             result = update_race_results(session, parsed)
             if result:
                 updated += 1
+        refresh_dirty_evaluation_daily(session)
         session.commit()
 
         msg = f"{updated} yarış sonucu güncellendi."
@@ -657,6 +740,9 @@ _FRESHNESS_BUDGET = {
 def ops_dashboard():
     """Show recent scheduled-job runs + data-freshness health."""
     from ganyan.db.models import JobRun, Prediction, Race, RaceEntry
+    from ganyan.predictor.ml import model_registry
+    from ganyan.scraper.rate_limit import rate_controller_status
+    from ganyan.scraper.response_cache import response_cache_status
     from sqlalchemy import desc, func
 
     session = _get_session()
@@ -697,6 +783,9 @@ def ops_dashboard():
         health = _compute_health(
             last_scrape, last_result_date, last_prediction_at, failure_count_24h,
         )
+        models = model_registry.status()
+        scrape_controllers = rate_controller_status()
+        scrape_cache = response_cache_status()
 
         if _wants_json():
             return jsonify({
@@ -709,6 +798,21 @@ def ops_dashboard():
                     last_prediction_at.isoformat() if last_prediction_at else None
                 ),
                 "failure_count_24h": failure_count_24h,
+                "models": [
+                    {**m, "loaded_at": m["loaded_at"].isoformat()}
+                    for m in models
+                ],
+                "scrape_controllers": [
+                    {
+                        **c,
+                        "last_decrease_at": (
+                            c["last_decrease_at"].isoformat()
+                            if c["last_decrease_at"] else None
+                        ),
+                    }
+                    for c in scrape_controllers
+                ],
+                "scrape_cache": scrape_cache,
                 "jobs": [
                     {
                         "job_id": jid,
@@ -740,6 +844,9 @@ def ops_dashboard():
             last_result_date=last_result_date,
             last_prediction_at=last_prediction_at,
             failure_count_24h=failure_count_24h,
+            models=models,
+            scrape_controllers=scrape_controllers,
+            scrape_cache=scrape_cache,
         )
     finally:
         session.close()
@@ -818,10 +925,7 @@ def live_sheet():
     fill in outcomes as results come in.
     """
     from ganyan.db.models import Race, RaceEntry, RaceStatus
-    from ganyan.predictor.exotics import (
-        ganyan_probabilities, ikili_probabilities,
-        sirali_ikili_probabilities, uclu_probabilities,
-    )
+    from ganyan.predictor.exotics import RaceExoticModel
 
     target_str = request.args.get("date")
     try:
@@ -869,11 +973,10 @@ def live_sheet():
                 })
                 continue
 
+            exotic_model = RaceExoticModel(win_probs)
             picks = {
-                "ganyan": ganyan_probabilities(win_probs)[:1],
-                "ikili": ikili_probabilities(win_probs)[:1] if len(win_probs) >= 2 else [],
-                "sirali_ikili": sirali_ikili_probabilities(win_probs)[:1] if len(win_probs) >= 2 else [],
-                "uclu": uclu_probabilities(win_probs)[:1] if len(win_probs) >= 3 else [],
+                pool: exotic_model.top(pool, 1)
+                for pool in ("ganyan", "ikili", "sirali_ikili", "uclu")
             }
 
             winners = sorted(
@@ -964,13 +1067,27 @@ def picks_dashboard():
     with the system's own live track record.
     """
     from ganyan.db.models import Pick, Race, Track
-    from ganyan.predictor.picks import strategy_summary
+    from ganyan.predictor.picks import (
+        EQUITY_BUCKETS,
+        strategy_equity_curve,
+        strategy_summary,
+    )
     from sqlalchemy import desc
     from sqlalchemy.orm import joinedload
 
+    bucket = request.args.get("bucket", "week")
+    if bucket not in EQUITY_BUCKETS:
+        error = f"bucket must be one of {', '.join(EQUITY_BUCKETS)}, got {bucket!r}"
+        if _wants_json():
+            return jsonify({"error": error}), 400
+        # A mistyped link still gets the page, on the default bucket.
+        flash(f"Geçersiz dönem {bucket!r}; haftalık gösteriliyor.")
+        bucket = "week"
+
     session = _get_session()
     try:
-        summary = strategy_summary(session)
+        summary = strategy_summary(session, intervals=True)
+        equity = strategy_equity_curve(session, bucket=bucket)
 
         # Show the 60 most recent races with all their strategies
         # grouped together.  Ordering by generated_at alone made the
@@ -1015,6 +1132,7 @@ def picks_dashboard():
         if _wants_json():
             return jsonify({
                 "summary": summary,
+                "equity": equity,
                 "recent_picks": [
                     {
                         "id": p.id,
@@ -1038,6 +1156,8 @@ def picks_dashboard():
         return render_template(
             "picks.html",
             summary=summary,
+            equity=equity,
+            bucket=bucket,
             recent_picks=recent_picks,
             races=races,
         )
@@ -1,5 +1,9 @@
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
 from ganyan.config import Settings
+from ganyan.db.models import Base
 
 
 @pytest.fixture(autouse=True)
@@ -17,6 +21,15 @@ def _fast_tjk_retries(monkeypatch):
     )
 
 
+@pytest.fixture
+def db_session():
+    """Session on a fresh in-memory SQLite database with every table."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
 @pytest.fixture
 def settings():
     return Settings(
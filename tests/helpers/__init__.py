@@ -0,0 +1 @@
+"""Seed data and page fixtures shared by several test modules."""
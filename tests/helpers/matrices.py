@@ -0,0 +1,40 @@
+"""Synthetic probability matrices shared by the sweep and bootstrap tests."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from ganyan.predictor.prob_matrix import ProbabilityMatrix
+
+
+def random_matrix(n_races=40, width=7, seed=0):
+    """Seeded random matrix with one unpredicted and one unpaid race."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(4, width + 1, n_races)
+    horse_ids = np.full((n_races, width), -1, dtype=np.int64)
+    prob = np.full((n_races, width), np.nan)
+    finish = np.zeros((n_races, width), dtype=np.int16)
+    agf = np.full((n_races, width), np.nan)
+    for i, n in enumerate(sizes):
+        horse_ids[i, :n] = 100 * i + np.arange(n)
+        p = rng.dirichlet(np.ones(n))
+        prob[i, :n] = p
+        finish[i, :n] = rng.permutation(n) + 1
+        agf[i, :n] = np.clip(p * 100 * rng.uniform(0.5, 1.5, n), 1, None)
+    prob[3] = np.nan  # unpredicted race
+    payouts = rng.uniform(2, 500, (n_races, 5))
+    payouts[5, :] = np.nan  # no payouts published
+    dates = [date(2026, 1, 1) + timedelta(days=int(d)) for d in range(0, 3 * n_races, 3)]
+    return ProbabilityMatrix(
+        race_ids=np.arange(n_races, dtype=np.int64),
+        dates=np.array(dates, dtype="datetime64[D]"),
+        race_numbers=np.ones(n_races, dtype=np.int64),
+        n_runners=sizes.astype(np.int64),
+        horse_ids=horse_ids,
+        prob=prob,
+        finish=finish,
+        agf=agf,
+        payouts=payouts,
+    )
@@ -0,0 +1,143 @@
+"""DB seed helpers shared by the predictor tests."""
+
+from __future__ import annotations
+
+import random
+from datetime import date
+
+from ganyan.db.models import Horse, Race, RaceEntry, RaceStatus, Track
+
+
+def create_track(session, name="Istanbul"):
+    track = Track(name=name, city=name)
+    session.add(track)
+    session.flush()
+    return track
+
+
+def create_race(session, track, *, race_number=1, status=RaceStatus.resulted):
+    race = Race(
+        track_id=track.id,
+        date=date(2026, 4, 5),
+        race_number=race_number,
+        distance_meters=1400,
+        surface="cim",
+        status=status,
+    )
+    session.add(race)
+    session.flush()
+    return race
+
+
+def add_entry(
+    session, race, horse_name, *,
+    finish_position=None, predicted_probability=None,
+    weight_kg=57.0, hp=85.0, kgs=21, eid="1.30.45", last_six="1 3 2 4 1 2",
+):
+    horse = Horse(name=horse_name, age=4)
+    session.add(horse)
+    session.flush()
+    entry = RaceEntry(
+        race_id=race.id,
+        horse_id=horse.id,
+        gate_number=1,
+        jockey=f"Jockey {horse_name}",
+        weight_kg=weight_kg,
+        hp=hp,
+        kgs=kgs,
+        eid=eid,
+        last_six=last_six,
+        finish_position=finish_position,
+        predicted_probability=predicted_probability,
+    )
+    session.add(entry)
+    session.flush()
+    return entry
+
+
+def seed_exotic_races(session):
+    """Six resulted 5-runner races with AGF and every exotic payout."""
+    rng = random.Random(4)
+    track = create_track(session)
+    races = []
+    for number in range(1, 7):
+        race = create_race(session, track, race_number=number)
+        finishes = list(range(1, 6))
+        rng.shuffle(finishes)
+        for i, finish in enumerate(finishes):
+            entry = add_entry(
+                session, race, f"H{number}-{i}", finish_position=finish,
+                hp=rng.uniform(60, 95), kgs=rng.randint(7, 60),
+            )
+            entry.agf = rng.uniform(3, 40)
+        race.ganyan_payout_tl = 3.5
+        race.ikili_payout_tl = 12.0
+        race.uclu_payout_tl = 80.0
+        races.append(race)
+    session.commit()
+    return races
+
+
+def seed_race(
+    session, *, race_date, race_number, track_name, entries, surface="kum",
+    distance=1400,
+):
+    """Seed a resulted race with the given (name, agf, finish_pos) tuples."""
+    track = session.query(Track).filter_by(name=track_name).first()
+    if track is None:
+        track = Track(name=track_name)
+        session.add(track)
+        session.flush()
+    race = Race(
+        track_id=track.id, date=race_date, race_number=race_number,
+        distance_meters=distance, surface=surface, status=RaceStatus.resulted,
+    )
+    session.add(race)
+    session.flush()
+    for i, (name, agf, finish_pos) in enumerate(entries, start=1):
+        horse = session.query(Horse).filter_by(name=name).first()
+        if horse is None:
+            horse = Horse(name=name, age=4, trainer=f"Tr{i}")
+            session.add(horse)
+            session.flush()
+        session.add(RaceEntry(
+            race_id=race.id, horse_id=horse.id,
+            gate_number=i, jockey=f"J{i}", trainer=horse.trainer,
+            agf=agf, hp=80.0 + i, weight_kg=57.0,
+            finish_position=finish_pos,
+        ))
+    session.flush()
+    return race
+
+
+def seed_many(session, n_races: int = 25):
+    """Create enough races that the trainer has a meaningful train/test split.
+
+    Each race has 6 horses; the horse with the highest AGF wins ~70% of
+    the time (deterministic pattern based on race number parity) so the
+    model has real signal to learn.
+    """
+    horse_pool = [f"H{k}" for k in range(1, 13)]
+    for r in range(n_races):
+        # Sample six distinct horses for each race.
+        offset = r % 7
+        horses_this_race = horse_pool[offset:offset + 6]
+        # AGF sums to 100.
+        agfs = [40, 25, 15, 10, 6, 4]
+        if r % 3 == 0:
+            # Favourite wins.
+            finish = [1, 2, 3, 4, 5, 6]
+        elif r % 3 == 1:
+            # Second favourite wins.
+            finish = [2, 1, 3, 4, 5, 6]
+        else:
+            # Third wins (upset).
+            finish = [3, 2, 1, 4, 5, 6]
+        seed_race(
+            session,
+            race_date=date(2026, 3, 1 + (r // 10)).replace(day=1 + (r % 10)),
+            race_number=r + 1,
+            track_name="TestTrack",
+            entries=list(zip(horses_this_race, agfs, finish)),
+        )
+    session.commit()
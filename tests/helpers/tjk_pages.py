@@ -0,0 +1,245 @@
+"""Realistic TJK page fixtures, derived from live TJK HTML (2026-04)."""
+
+# Main page HTML: contains track tabs that the client uses to discover cities
+MAIN_PAGE_HTML = """
+<html><body>
+<ul class="gunluk-tabs">
+  <li><a href="/TR/YarisSever/Info/Sehir/GunlukYarisProgrami?SehirId=1&amp;QueryParameter_Tarih=05%2F04%2F2026&amp;SehirAdi=Adana&amp;Era=tomorrow"
+         data-sehir-id="1">Adana  (41. Y.G.)</a></li>
+  <li><a href="/TR/YarisSever/Info/Sehir/GunlukYarisProgrami?SehirId=3&amp;QueryParameter_Tarih=05%2F04%2F2026&amp;SehirAdi=Istanbul&amp;Era=tomorrow"
+         data-sehir-id="3">İstanbul  (27. Y.G.)</a></li>
+</ul>
+<div class="gunluk-panes">
+  <div class="program">
+    <input type="hidden" id="DataHash" value="abc123"/>
+  </div>
+</div>
+</body></html>
+"""
+
+# City-level program HTML: one race with two horses
+CITY_PROGRAM_HTML = """
+<div class="races-panes">
+  <div>
+    <div class="race-details">
+      <h3 class="race-no">
+        <a id="anc224092">1.                        Koşu:14.00</a>
+      </h3>
+      <h3 class="race-config">
+        <a class="aciklamaFancy" onclick="BultenAciklama(this)" title="Koşu kazanmamış...">Maiden/DHÖW</a>
+        , 4 Yaşlı Araplar,
+
+        58 kg,
+                    1400
+
+        Kum,E.İ.D. :1.34.68
+      </h3>
+    </div>
+    <table class="tablesorter">
+      <thead>
+        <tr>
+          <th class="formaHeader">Forma</th>
+          <th class="aciklamaFancy">N</th>
+          <th>At İsmi</th>
+          <th class="aciklamaFancy">Yaş</th>
+          <th>Orijin(Baba - Anne)</th>
+          <th>Sıklet</th>
+          <th>Jokey</th>
+          <th>Sahip</th>
+          <th>Antrenör</th>
+          <th class="aciklamaFancy">St</th>
+          <th class="aciklamaFancy">HP</th>
+          <th>Son 6 Y.</th>
+          <th class="aciklamaFancy">KGS</th>
+          <th class="aciklamaFancy">s20</th>
+          <th class="aciklamaFancy">En İyi D.</th>
+          <th>Gny</th>
+          <th class="aciklamaFancy">AGF</th>
+          <th class="aciklamaFancy">İdm</th>
+        </tr>
+      </thead>
+      <tbody>
+        <tr>
+          <td class="gunluk-GunlukYarisProgrami-FormaKodu"></td>
+          <td class="gunluk-GunlukYarisProgrami-SiraId">1</td>
+          <td class="gunluk-GunlukYarisProgrami-AtAdi">
+            <a href="../../Query/ConnectedPage/AtKosuBilgileri?QueryParameter_AtId=105109" target="_blank">
+              ALTUNÇURA<span title=""></span>
+            </a>
+            <sup class="tooltipp"><span class="aciklamaFancy" id="aciklamaFancyShrt">KG</span><a class="tooltiptextt">Kapalı gözlük.</a></sup>
+          </td>
+          <td class="gunluk-GunlukYarisProgrami-Yas">4y a  a</td>
+          <td class="gunluk-GunlukYarisProgrami-Baba">AYABAKAN-BEYAZ KELEBEK/BİLGİN</td>
+          <td class="gunluk-GunlukYarisProgrami-Kilo">55</td>
+          <td class="gunluk-GunlukYarisProgrami-JokeAdi">
+            <a href="../../Query/Page/JokeyIstatistikleri?QueryParameter_JokeyId=3100" target="_blank" title="MEHMET ÇELİK">M.ÇELİK</a>
+            <sup class="tooltipp" id="Apranti"><span class="aciklamaFancy">AP</span><a class="tooltiptextt">Apranti</a></sup>
+          </td>
+          <td class="gunluk-GunlukYarisProgrami-SahipAdi"><a href="#">AHMET BABACAN</a></td>
+          <td class="gunluk-GunlukYarisProgrami-AntronorAdi"><a href="#">M.TEK</a></td>
+          <td class="gunluk-GunlukYarisProgrami-StartId">2</td>
+          <td class="gunluk-GunlukYarisProgrami-Hc">7</td>
+          <td class="gunluk-GunlukYarisProgrami-Son6Yaris">
+            <font color="#996633"><b>6</b></font><font color="#996633"><b>0</b></font><font color="#009900"><b>0</b></font>
+          </td>
+          <td class="gunluk-GunlukYarisProgrami-KGS">22</td>
+          <td class="gunluk-GunlukYarisProgrami-s20">17</td>
+          <td class="gunluk-GunlukYarisProgrami-DERECE">
+            <div class="tooltipp">
+              <span id="aciklamaFancyDrc" style="cursor: help;">1.51.55</span>
+              <a class="tooltiptextt" id="tlltptxtDrc">Bu derece Adana'da yapılmıştır.</a>
+            </div>
+          </td>
+          <td class="gunluk-GunlukYarisProgrami-Gny"><span>3,50</span></td>
+          <td class="gunluk-GunlukYarisProgrami-AGFORAN"><span>%25(1)</span></td>
+          <td class="gunluk-GunlukYarisProgrami-idmanpistiFLG"></td>
+        </tr>
+        <tr>
+          <td class="gunluk-GunlukYarisProgrami-FormaKodu"></td>
+          <td class="gunluk-GunlukYarisProgrami-SiraId">2</td>
+          <td class="gunluk-GunlukYarisProgrami-AtAdi">
+            <a href="../../Query/ConnectedPage/AtKosuBilgileri?QueryParameter_AtId=105110" target="_blank">
+              STORM RIDER<span title=""></span>
+            </a>
+          </td>
+          <td class="gunluk-GunlukYarisProgrami-Yas">3y d  d</td>
+          <td class="gunluk-GunlukYarisProgrami-Baba">KLIMT (USA)-DAYDAY/DEHERE (USA)</td>
+          <td class="gunluk-GunlukYarisProgrami-Kilo">57,5</td>
+          <td class="gunluk-GunlukYarisProgrami-JokeAdi"><a href="#">E.ATLAMAZ</a></td>
+          <td class="gunluk-GunlukYarisProgrami-SahipAdi"><a href="#">ALİ YILMAZ</a></td>
+          <td class="gunluk-GunlukYarisProgrami-AntronorAdi"><a href="#">İ.AKKILIÇ</a></td>
+          <td class="gunluk-GunlukYarisProgrami-StartId">5DS</td>
+          <td class="gunluk-GunlukYarisProgrami-Hc">62</td>
+          <td class="gunluk-GunlukYarisProgrami-Son6Yaris">13-4124</td>
+          <td class="gunluk-GunlukYarisProgrami-KGS">33</td>
+          <td class="gunluk-GunlukYarisProgrami-s20">18</td>
+          <td class="gunluk-GunlukYarisProgrami-DERECE"></td>
+          <td class="gunluk-GunlukYarisProgrami-Gny"><span></span></td>
+          <td class="gunluk-GunlukYarisProgrami-AGFORAN"><span>-</span></td>
+          <td class="gunluk-GunlukYarisProgrami-idmanpistiFLG"></td>
+        </tr>
+      </tbody>
+    </table>
+  </div>
+</div>
+"""
+
+# City-level results HTML: one race with two horses (finish order)
+CITY_RESULTS_HTML = """
+<div class="races-panes">
+  <div>
+    <div class="race-details">
+      <h3 class="race-no">
+        <a id="anc223532">1.                        Koşu:14.00</a>
+      </h3>
+      <h3 class="race-config">
+        <a class="aciklamaFancy">Handikap 15/Dişi /H2</a>
+        , 3 Yaşlı İngilizler,
+
+
+                    1500
+
+        Kum,E.İ.D. :1.31.83
+      </h3>
+    </div>
+    <table class="tablesorter">
+      <thead>
+        <tr>
+          <th class="formaHeader">Forma</th>
+          <th>S</th>
+          <th>At İsmi</th>
+          <th class="aciklamaFancy">Yaş</th>
+          <th>Orijin(Baba - Anne)</th>
+          <th>Sıklet</th>
+          <th>Jokey</th>
+          <th>Sahip</th>
+          <th>Antrenörü</th>
+          <th>Derece</th>
+          <th>Gny</th>
+          <th class="aciklamaFancy">AGF</th>
+          <th class="aciklamaFancy">St</th>
+          <th>Fark</th>
+          <th class="aciklamaFancy">G. Çık.</th>
+          <th class="aciklamaFancy">HP</th>
+        </tr>
+      </thead>
+      <tbody>
+        <tr>
+          <td class="gunluk-GunlukYarisSonuclari-FormaKodu"></td>
+          <td class="gunluk-GunlukYarisSonuclari-SONUCNO">1</td>
+          <td class="gunluk-GunlukYarisSonuclari-AtAdi3">
+            <a href="../../Query/ConnectedPage/AtKosuBilgileri?QueryParameter_AtId=105109" target="_blank">
+              FORTHCOMING QUEEN(3)
+            </a>
+            <sup class="tooltipp"><span class="aciklamaFancy" id="aciklamaFancyShrt">KG</span></sup>
+          </td>
+          <td class="gunluk-GunlukYarisSonuclari-Yas">3y d  d</td>
+          <td class="gunluk-GunlukYarisSonuclari-Baba">MENDIP (USA)-EPONA/EAGLE EYED (USA)</td>
+          <td class="gunluk-GunlukYarisSonuclari-Kilo">57,5</td>
+          <td class="gunluk-GunlukYarisSonuclari-JokeAdi">
+            <a href="#">ER.CANKILIC</a>
+            <sup class="tooltipp" id="Apranti"><span class="aciklamaFancy">AP</span><a class="tooltiptextt">Apranti</a></sup>
+          </td>
+          <td class="gunluk-GunlukYarisSonuclari-SahipAdi"><a href="#">TAYRAL TUTUMLU</a></td>
+          <td class="gunluk-GunlukYarisSonuclari-AntronorAdi"><a href="#">Ş.AYDEMİR</a></td>
+          <td class="gunluk-GunlukYarisSonuclari-Derece">1.36.69</td>
+          <td class="gunluk-GunlukYarisSonuclari-Gny">3,40</td>
+          <td class="gunluk-GunlukYarisSonuclari-AGFORAN">%17(2)</td>
+          <td class="gunluk-GunlukYarisSonuclari-StartId">8</td>
+          <td class="gunluk-GunlukYarisSonuclari-Fark">5 Boy</td>
+          <td class="gunluk-GunlukYarisSonuclari-GecCikis"></td>
+          <td class="gunluk-GunlukYarisSonuclari-Hc">52</td>
+        </tr>
+        <tr>
+          <td class="gunluk-GunlukYarisSonuclari-FormaKodu"></td>
+          <td class="gunluk-GunlukYarisSonuclari-SONUCNO">2</td>
+          <td class="gunluk-GunlukYarisSonuclari-AtAdi3">
+            <a href="../../Query/ConnectedPage/AtKosuBilgileri?QueryParameter_AtId=105110" target="_blank">
+              KARDAHA(2)
+            </a>
+          </td>
+          <td class="gunluk-GunlukYarisSonuclari-Yas">3y d  a</td>
+          <td class="gunluk-GunlukYarisSonuclari-Baba">ABJAR ACADEMY-FAIRY TALE/MOUNTAIN CAT (USA)</td>
+          <td class="gunluk-GunlukYarisSonuclari-Kilo">63</td>
+          <td class="gunluk-GunlukYarisSonuclari-JokeAdi"><a href="#">M.AKYAVUZ</a></td>
+          <td class="gunluk-GunlukYarisSonuclari-SahipAdi"><a href="#">F.SEDAT DAĞYUDAN</a></td>
+          <td class="gunluk-GunlukYarisSonuclari-AntronorAdi"><a href="#">M.KORKMAZ</a></td>
+          <td class="gunluk-GunlukYarisSonuclari-Derece">1.37.61</td>
+          <td class="gunluk-GunlukYarisSonuclari-Gny">5,10</td>
+          <td class="gunluk-GunlukYarisSonuclari-AGFORAN">%12(3)</td>
+          <td class="gunluk-GunlukYarisSonuclari-StartId">7</td>
+          <td class="gunluk-GunlukYarisSonuclari-Fark">1 Boy</td>
+          <td class="gunluk-GunlukYarisSonuclari-GecCikis"></td>
+          <td class="gunluk-GunlukYarisSonuclari-Hc">75</td>
+        </tr>
+      </tbody>
+    </table>
+  </div>
+</div>
+"""
+
+# Results main page (same structure, different endpoint)
+MAIN_RESULTS_PAGE_HTML = """
+<html><body>
+<ul class="gunluk-tabs">
+  <li><a href="/TR/YarisSever/Info/Sehir/GunlukYarisSonuclari?SehirId=1&amp;QueryParameter_Tarih=04%2F04%2F2026&amp;SehirAdi=Adana&amp;Era=today"
+         data-sehir-id="1">Adana  (40. Y.G.)</a></li>
+</ul>
+<div class="gunluk-panes">
+  <div class="program">
+    <input type="hidden" id="DataHash" value="xyz789"/>
+  </div>
+</div>
+</body></html>
+"""
+
+# Empty page (no races for date)
+EMPTY_PAGE_HTML = """
+<html><body>
+<ul class="gunluk-tabs">
+</ul>
+<div class="gunluk-panes">
+  <div class="program"></div>
+</div>
+</body></html>
+"""
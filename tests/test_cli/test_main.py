@@ -38,3 +38,10 @@ def test_db_help():
     result = runner.invoke(app, ["db", "--help"])
     assert result.exit_code == 0
     assert "init" in result.output
+    assert "rebuild-career-stats" in result.output
+
+
+def test_prob_matrix_help():
+    result = runner.invoke(app, ["prob-matrix", "build", "--help"])
+    assert result.exit_code == 0
+    assert "--version" in result.output
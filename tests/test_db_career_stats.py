@@ -0,0 +1,235 @@
+"""Tests for the incremental career-stats ledger."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ganyan.db.career_stats import (
+    ledger_built,
+    lookup_career_counts,
+    lookup_career_counts_many,
+    rebuild_career_stats,
+    sync_career_names,
+)
+from ganyan.db.models import Base, CareerStat, Horse
+from ganyan.predictor.features import (
+    HISTORY_FEATURE_FIELDS,
+    HistoryRequest,
+    compute_history_features_batch,
+    compute_jockey_win_rate,
+    compute_sire_surface_rate,
+    compute_sire_win_rate,
+    compute_trainer_win_rate,
+)
+from ganyan.scraper.backfill import store_historical_race
+from ganyan.scraper.parser import RawHorseEntry, RawRaceCard, parse_race_card
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _store(session, race_date, race_number, surface, runners):
+    """Store a resulted race; ``runners`` = (horse, jockey, trainer, finish)."""
+    raw = RawRaceCard(
+        track_name="İstanbul", date=race_date, race_number=race_number,
+        distance_meters=1400, surface=surface,
+        horses=[
+            RawHorseEntry(name=h, jockey=j, trainer=t, finish_position=f)
+            for (h, j, t, f) in runners
+        ],
+    )
+    return store_historical_race(session, parse_race_card(raw))
+
+
+def _seed(session):
+    _store(session, date(2026, 1, 1), 1, "Kum",
+           [("H1", "A", "T1", 1), ("H2", "B", "T2", 2), ("H3", "A", "T2", 3)])
+    _store(session, date(2026, 1, 1), 2, "Çim",
+           [("H4", "B", "T1", 1), ("H5", "A", "T2", 2)])
+    _store(session, date(2026, 1, 8), 1, "Kum",
+           [("H2", "A", "T2", 1), ("H1", "B", "T1", 2)])
+    for horse in session.query(Horse).all():
+        horse.sire = "S1" if horse.name in {"H1", "H2", "H4"} else "S2"
+    session.commit()
+
+
+def _snapshot(session):
+    return sorted(
+        (r.kind, r.name, r.surface, r.date, r.day_runs, r.day_wins,
+         r.runs, r.wins)
+        for r in session.query(CareerStat).all()
+    )
+
+
+def _all_rates(session, before_date):
+    return [
+        compute_jockey_win_rate(session, "A", before_date),
+        compute_jockey_win_rate(session, "B", before_date),
+        compute_trainer_win_rate(session, "T1", before_date),
+        compute_trainer_win_rate(session, "T2", before_date),
+        compute_sire_win_rate(session, "S1", before_date),
+        compute_sire_surface_rate(session, "S1", "kum", before_date),
+        compute_sire_surface_rate(session, "S2", "çim", before_date),
+    ]
+
+
+DATES = [date(2026, 1, 1), date(2026, 1, 5), date(2026, 1, 8), date(2026, 2, 1), None]
+
+
+def test_ledger_rates_match_scan(db_session):
+    _seed(db_session)
+    assert not ledger_built(db_session, "jockey")
+    scanned = {d: _all_rates(db_session, d) for d in DATES}
+
+    assert rebuild_career_stats(db_session) > 0
+    db_session.commit()
+    assert ledger_built(db_session, "jockey")
+    for d in DATES:
+        assert _all_rates(db_session, d) == pytest.approx(scanned[d]), d
+
+
+def test_lookup_returns_none_until_built(db_session):
+    _seed(db_session)
+    assert lookup_career_counts(db_session, "jockey", "A") is None
+    rebuild_career_stats(db_session)
+    # A: 4 finished runs, 2 wins across both dates.
+    assert lookup_career_counts(db_session, "jockey", "A") == (4, 2)
+    assert lookup_career_counts(
+        db_session, "jockey", "A", before_date=date(2026, 1, 8),
+    ) == (3, 1)
+
+
+def test_incremental_refresh_matches_rebuild(db_session):
+    _seed(db_session)
+    rebuild_career_stats(db_session)
+    db_session.commit()
+
+    # Later result, then a back-dated one that must shift later rows.
+    _store(db_session, date(2026, 1, 15), 1, "Çim",
+           [("H5", "B", "T2", 1), ("H3", "A", "T2", 2)])
+    _store(db_session, date(2026, 1, 4), 1, "Kum",
+           [("H1", "A", "T1", 1), ("H4", "B", "T1", 2)])
+    # Re-storing the same results must not double count.
+    _store(db_session, date(2026, 1, 4), 1, "Kum",
+           [("H1", "A", "T1", 1), ("H4", "B", "T1", 2)])
+    db_session.commit()
+
+    incremental = _snapshot(db_session)
+    rebuild_career_stats(db_session)
+    db_session.commit()
+    assert incremental == _snapshot(db_session)
+
+
+def test_trainer_change_keeps_past_runs_with_their_trainer(db_session):
+    _seed(db_session)
+    rebuild_career_stats(db_session)
+    db_session.commit()
+
+    # H1 moves from T1 to T9 and wins its first race for the new yard.
+    _store(db_session, date(2026, 1, 15), 1, "Kum",
+           [("H1", "A", "T9", 1), ("H5", "B", "T2", 2)])
+    db_session.commit()
+    h1 = db_session.query(Horse).filter_by(name="H1").one()
+    assert h1.trainer == "T9"
+    assert sorted(e.trainer for e in h1.entries) == ["T1", "T1", "T9"]
+
+    # Ledger, refreshed incrementally, agrees with a rebuild and with
+    # the scan — all credit T1 with H1's earlier runs.
+    assert lookup_career_counts(db_session, "trainer", "T1") == (3, 2)
+    assert lookup_career_counts(db_session, "trainer", "T9") == (1, 1)
+    incremental = _snapshot(db_session)
+    ledger = {d: _all_rates(db_session, d) for d in DATES}
+    rebuild_career_stats(db_session)
+    assert _snapshot(db_session) == incremental
+    db_session.query(CareerStat).delete()
+    db_session.info.clear()
+    assert not ledger_built(db_session, "trainer")
+    for d in DATES:
+        assert _all_rates(db_session, d) == pytest.approx(ledger[d]), d
+
+
+def test_lookup_many_matches_single_lookups(db_session):
+    _seed(db_session)
+    assert lookup_career_counts_many(db_session, "jockey", {"A"}) is None
+    rebuild_career_stats(db_session)
+    for d in DATES:
+        many = lookup_career_counts_many(
+            db_session, "sire", {"S1", "S2", "S9"}, "kum", before_date=d,
+        )
+        single = {
+            name: lookup_career_counts(db_session, "sire", name, "kum", d)
+            for name in ("S1", "S2", "S9")
+        }
+        assert many == {k: v for k, v in single.items() if v != (0, 0)}, d
+
+
+def test_batched_features_read_the_ledger(db_session, monkeypatch):
+    _seed(db_session)
+    requests = [
+        HistoryRequest(horse_id=None, race_date=d, jockey=j, trainer=t,
+                       sire=s, surface=surface)
+        for d in DATES
+        for (j, t, s, surface) in [("A", "T1", "S1", "kum"),
+                                   ("B", "T2", "S2", "çim"),
+                                   ("C", "T9", "S9", "kum")]
+    ]
+    scanned = compute_history_features_batch(db_session, requests)
+    rebuild_career_stats(db_session)
+    db_session.commit()
+
+    def _no_scan(*args, **kwargs):
+        raise AssertionError("batched path scanned race_entries")
+
+    monkeypatch.setattr(
+        "ganyan.predictor.features._grouped_win_counts", _no_scan,
+    )
+    from_ledger = compute_history_features_batch(db_session, requests)
+    for req, got, want in zip(requests, from_ledger, scanned):
+        for name in HISTORY_FEATURE_FIELDS:
+            assert got[name] == pytest.approx(want[name]), (req, name)
+
+
+def test_sync_recounts_a_sire_filled_in_later(db_session):
+    _seed(db_session)
+    _store(db_session, date(2026, 1, 8), 2, "Kum",
+           [("H6", "A", "T1", 1), ("H7", "B", "T2", 2)])
+    rebuild_career_stats(db_session)
+    db_session.commit()
+
+    # The pedigree crawl learns H6's sire after its win was counted.
+    db_session.query(Horse).filter_by(name="H6").one().sire = "S2"
+    db_session.flush()
+    assert sync_career_names(db_session, "sire", {"S2"}) > 0
+    synced = _snapshot(db_session)
+    rebuild_career_stats(db_session)
+    assert _snapshot(db_session) == synced
+    assert lookup_career_counts(db_session, "sire", "S2") == (3, 1)
+
+
+def test_restore_with_a_renamed_jockey_moves_the_run(db_session):
+    _seed(db_session)
+    rebuild_career_stats(db_session)
+    db_session.commit()
+
+    _store(db_session, date(2026, 1, 15), 1, "Kum",
+           [("H1", "A", "T1", 1), ("H2", "B", "T9", 2)])
+    db_session.commit()
+    assert lookup_career_counts(db_session, "jockey", "A") == (5, 3)
+    # The corrected card rides H1 with C, and H2 back with T2.
+    _store(db_session, date(2026, 1, 15), 1, "Kum",
+           [("H1", "C", "T1", 1), ("H2", "B", "T2", 2)])
+    db_session.commit()
+
+    assert lookup_career_counts(db_session, "jockey", "A") == (4, 2)
+    assert lookup_career_counts(db_session, "jockey", "C") == (1, 1)
+    assert lookup_career_counts(db_session, "trainer", "T9") == (0, 0)
+    incremental = _snapshot(db_session)
+    rebuild_career_stats(db_session)
+    assert _snapshot(db_session) == incremental
@@ -3,8 +3,13 @@ from datetime import date
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from ganyan.db.models import Base, Track, Race, Horse, RaceEntry, RaceStatus
-from ganyan.predictor.bayesian import BayesianPredictor, Prediction
+from ganyan.db.models import (
+    Base, Track, Race, Horse, RaceEntry, RaceStatus,
+    Prediction as PredictionRow,
+)
+from ganyan.predictor.bayesian import (
+    MODEL_VERSION, BayesianPredictor, Prediction, save_predictions,
+)
 
 
 @pytest.fixture
@@ -102,3 +107,26 @@ def test_predict_empty_race(db_session):
     predictor = BayesianPredictor(db_session)
     predictions = predictor.predict(race.id)
     assert predictions == []
+
+
+def test_save_predictions_bulk_writes_audit_rows(db_session, race_with_entries):
+    predictor = BayesianPredictor(db_session)
+    results = predictor.predict_many([race_with_entries, 999])
+    entries = db_session.query(RaceEntry).all()  # loaded before the write
+
+    assert save_predictions(db_session, results, MODEL_VERSION) == 4
+    # Already-loaded entries see the new value without a refresh.
+    by_horse = {p.horse_id: p.probability for p in results[race_with_entries]}
+    for entry in entries:
+        assert entry.predicted_probability == pytest.approx(by_horse[entry.horse_id])
+    db_session.commit()
+
+    rows = db_session.query(PredictionRow).all()
+    assert len(rows) == 4
+    assert {r.model_version for r in rows} == {MODEL_VERSION}
+    assert all(isinstance(r.factors, dict) and r.factors for r in rows)
+
+    # Re-predicting appends a second run instead of overwriting.
+    predictor.predict_and_save_many([race_with_entries])
+    db_session.commit()
+    assert db_session.query(PredictionRow).count() == 8
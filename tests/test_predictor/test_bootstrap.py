@@ -0,0 +1,119 @@
+"""Tests for bootstrap ROI confidence bands."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ganyan.db.models import Pick
+from ganyan.predictor import picks as picks_module
+from ganyan.predictor.bootstrap import bootstrap_roi, bootstrap_roi_many
+from ganyan.predictor.exotic_evaluate import attach_roi_intervals, evaluate_matrix_pools
+from ganyan.predictor.picks import strategy_roi_intervals, strategy_summary
+from ganyan.predictor.sweep import SweepGrid, sweep
+
+from tests.helpers.matrices import random_matrix
+from tests.helpers.seed import create_race, create_track
+
+
+def _ledger(n=300, hit_rate=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    stakes = np.full(n, 6.0)
+    payouts = np.where(rng.random(n) < hit_rate, rng.uniform(50, 400, n), 0.0)
+    return stakes, payouts
+
+
+def test_interval_brackets_point_roi():
+    stakes, payouts = _ledger()
+    ci = bootstrap_roi(stakes, payouts, replicates=1000)
+    assert ci.roi == pytest.approx(payouts.sum() / stakes.sum() - 1.0)
+    assert ci.lower <= ci.roi <= ci.upper
+    assert 0.0 <= ci.p_positive <= 1.0
+    assert ci.races == len(stakes)
+
+
+def test_many_matches_single_rows_with_shared_seed():
+    rows = [_ledger(seed=s) for s in range(3)]
+    stakes = np.stack([r[0] for r in rows])
+    payouts = np.stack([r[1] for r in rows])
+    many = bootstrap_roi_many(stakes, payouts, replicates=500, seed=7)
+    for (s, p), got in zip(rows, many):
+        single = bootstrap_roi(s, p, replicates=500, seed=7)
+        assert got.lower == pytest.approx(single.lower)
+        assert got.upper == pytest.approx(single.upper)
+        assert got.p_positive == pytest.approx(single.p_positive)
+
+
+def test_chunked_draws_keep_point_and_spread(monkeypatch):
+    stakes, payouts = _ledger(n=50)
+    whole = bootstrap_roi(stakes, payouts, replicates=300, seed=3)
+    monkeypatch.setattr("ganyan.predictor.bootstrap._CHUNK_CELLS", 50 * 7)
+    chunked = bootstrap_roi(stakes, payouts, replicates=300, seed=3)
+    # Different chunking changes the draw order, not the distribution.
+    assert chunked.roi == whole.roi
+    assert abs(chunked.p_positive - whole.p_positive) < 0.2
+
+
+def test_no_races_collapses_to_point():
+    ci = bootstrap_roi([], [], replicates=100)
+    assert (ci.roi, ci.lower, ci.upper, ci.replicates) == (0.0, 0.0, 0.0, 0)
+
+
+def test_backtest_and_sweep_intervals_agree():
+    matrix = random_matrix()
+    results = evaluate_matrix_pools(matrix, pools=("ganyan", "uclu"), top_ns=(1, 2))
+    attach_roi_intervals(results, replicates=400)
+    cells = sweep(
+        matrix, SweepGrid(pools=("ganyan", "uclu"), top_ns=(1, 2)),
+        bootstrap=400,
+    )
+    for result, cell in zip(results, cells):
+        assert result.roi_ci is not None and cell.roi_ci is not None
+        assert result.roi_ci.roi == pytest.approx(result.roi)
+        assert cell.roi_ci.roi == pytest.approx(result.roi)
+        # Both resample every race of the window, skipped ones included.
+        assert result.roi_ci.races == cell.roi_ci.races == len(matrix)
+        assert result.roi_ci.lower == pytest.approx(cell.roi_ci.lower)
+        assert result.roi_ci.upper == pytest.approx(cell.roi_ci.upper)
+        assert result.roi_ci.p_positive == pytest.approx(cell.roi_ci.p_positive)
+        assert "roi_ci_low_pct" in result.summary_row()
+        assert "roi_ci_low_pct" in cell.summary_row()
+
+
+def test_strategy_intervals_cached_until_ledger_changes(db_session, monkeypatch):
+    track = create_track(db_session)
+    stakes, payouts = _ledger(n=40, hit_rate=0.2)
+    for i, (stake, payout) in enumerate(zip(stakes, payouts)):
+        race = create_race(db_session, track, race_number=i + 1)
+        db_session.add(Pick(
+            race_id=race.id, strategy="uclu_top1", combination=[1, 2, 3],
+            stake_tl=stake, generated_at=datetime(2026, 1, 1),
+            graded=True, hit=payout > 0, payout_tl=payout,
+            net_tl=payout - stake,
+        ))
+    db_session.commit()
+    monkeypatch.setattr(picks_module, "_INTERVAL_CACHE", {})
+
+    calls = []
+    real = picks_module.bootstrap_roi
+
+    def _counting(*args, **kwargs):
+        calls.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(picks_module, "bootstrap_roi", _counting)
+    first = strategy_roi_intervals(db_session, replicates=200)
+    again = strategy_roi_intervals(db_session, replicates=200)
+    assert again is first and len(calls) == 1
+
+    summary = strategy_summary(db_session, intervals=True)
+    row = summary["uclu_top1"]
+    assert row["roi_ci_low_pct"] <= row["roi_pct"] <= row["roi_ci_high_pct"]
+
+    seen = len(calls)
+    db_session.query(Pick).first().net_tl = 999
+    db_session.commit()
+    strategy_roi_intervals(db_session, replicates=200)
+    assert len(calls) == seen + 1
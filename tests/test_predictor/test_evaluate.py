@@ -4,10 +4,8 @@ import math
 
 import pytest
 from datetime import date
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
 
-from ganyan.db.models import Base, Track, Race, Horse, RaceEntry, RaceStatus
+from ganyan.db.models import Race, RaceEntry, RaceStatus
 from ganyan.predictor.bayesian import BayesianPredictor
 from ganyan.predictor.evaluate import (
     RaceEvaluation,
@@ -16,60 +14,7 @@ from ganyan.predictor.evaluate import (
     evaluate_all,
 )
 
-
-@pytest.fixture
-def db_session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
-def _create_track(session, name="Istanbul"):
-    track = Track(name=name, city=name)
-    session.add(track)
-    session.flush()
-    return track
-
-
-def _create_race(session, track, *, race_number=1, status=RaceStatus.resulted):
-    race = Race(
-        track_id=track.id,
-        date=date(2026, 4, 5),
-        race_number=race_number,
-        distance_meters=1400,
-        surface="cim",
-        status=status,
-    )
-    session.add(race)
-    session.flush()
-    return race
-
-
-def _add_entry(
-    session, race, horse_name, *,
-    finish_position=None, predicted_probability=None,
-    weight_kg=57.0, hp=85.0, kgs=21, eid="1.30.45", last_six="1 3 2 4 1 2",
-):
-    horse = Horse(name=horse_name, age=4)
-    session.add(horse)
-    session.flush()
-    entry = RaceEntry(
-        race_id=race.id,
-        horse_id=horse.id,
-        gate_number=1,
-        jockey=f"Jockey {horse_name}",
-        weight_kg=weight_kg,
-        hp=hp,
-        kgs=kgs,
-        eid=eid,
-        last_six=last_six,
-        finish_position=finish_position,
-        predicted_probability=predicted_probability,
-    )
-    session.add(entry)
-    session.flush()
-    return entry
+from tests.helpers.seed import add_entry, create_race, create_track
 
 
 # -----------------------------------------------------------------------
@@ -79,11 +24,11 @@ def _add_entry(
 
 class TestPredictAndSave:
     def test_saves_probabilities_to_entries(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, status=RaceStatus.scheduled)
-        _add_entry(db_session, race, "Horse A", hp=90.0)
-        _add_entry(db_session, race, "Horse B", hp=80.0)
-        _add_entry(db_session, race, "Horse C", hp=70.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, status=RaceStatus.scheduled)
+        add_entry(db_session, race, "Horse A", hp=90.0)
+        add_entry(db_session, race, "Horse B", hp=80.0)
+        add_entry(db_session, race, "Horse C", hp=70.0)
         db_session.commit()
 
         predictor = BayesianPredictor(db_session)
@@ -101,10 +46,10 @@ class TestPredictAndSave:
             assert float(entry.predicted_probability) > 0
 
     def test_probabilities_match_predictions(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, status=RaceStatus.scheduled)
-        e1 = _add_entry(db_session, race, "Horse X", hp=95.0)
-        e2 = _add_entry(db_session, race, "Horse Y", hp=75.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, status=RaceStatus.scheduled)
+        e1 = add_entry(db_session, race, "Horse X", hp=95.0)
+        e2 = add_entry(db_session, race, "Horse Y", hp=75.0)
         db_session.commit()
 
         predictor = BayesianPredictor(db_session)
@@ -117,8 +62,8 @@ class TestPredictAndSave:
             assert abs(float(entry.predicted_probability) - pred_map[entry.horse_id]) < 0.01
 
     def test_no_entries_returns_empty(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, status=RaceStatus.scheduled)
+        track = create_track(db_session)
+        race = create_race(db_session, track, status=RaceStatus.scheduled)
         db_session.commit()
 
         predictor = BayesianPredictor(db_session)
@@ -133,17 +78,17 @@ class TestPredictAndSave:
 
 class TestEvaluateRace:
     def test_race_with_predictions_and_results(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
-        _add_entry(
+        track = create_track(db_session)
+        race = create_race(db_session, track)
+        add_entry(
             db_session, race, "Winner",
             finish_position=1, predicted_probability=40.0,
         )
-        _add_entry(
+        add_entry(
             db_session, race, "Second",
             finish_position=2, predicted_probability=35.0,
         )
-        _add_entry(
+        add_entry(
             db_session, race, "Third",
             finish_position=3, predicted_probability=25.0,
         )
@@ -160,18 +105,18 @@ class TestEvaluateRace:
         assert ev.num_horses == 3
 
     def test_winner_not_top_pick(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
+        track = create_track(db_session)
+        race = create_race(db_session, track)
         # Winner had lowest predicted probability
-        _add_entry(
+        add_entry(
             db_session, race, "Surprise",
             finish_position=1, predicted_probability=10.0,
         )
-        _add_entry(
+        add_entry(
             db_session, race, "Favorite",
             finish_position=3, predicted_probability=50.0,
         )
-        _add_entry(
+        add_entry(
             db_session, race, "Contender",
             finish_position=2, predicted_probability=40.0,
         )
@@ -184,13 +129,13 @@ class TestEvaluateRace:
         assert ev.top3_correct is True
 
     def test_winner_outside_top3(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
-        _add_entry(db_session, race, "Longshot", finish_position=1, predicted_probability=5.0)
-        _add_entry(db_session, race, "H2", finish_position=2, predicted_probability=35.0)
-        _add_entry(db_session, race, "H3", finish_position=3, predicted_probability=30.0)
-        _add_entry(db_session, race, "H4", finish_position=4, predicted_probability=20.0)
-        _add_entry(db_session, race, "H5", finish_position=5, predicted_probability=10.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track)
+        add_entry(db_session, race, "Longshot", finish_position=1, predicted_probability=5.0)
+        add_entry(db_session, race, "H2", finish_position=2, predicted_probability=35.0)
+        add_entry(db_session, race, "H3", finish_position=3, predicted_probability=30.0)
+        add_entry(db_session, race, "H4", finish_position=4, predicted_probability=20.0)
+        add_entry(db_session, race, "H5", finish_position=5, predicted_probability=10.0)
         db_session.commit()
 
         ev = evaluate_race(db_session, race.id)
@@ -200,18 +145,18 @@ class TestEvaluateRace:
         assert ev.top3_correct is False
 
     def test_no_predictions_returns_none(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
-        _add_entry(db_session, race, "NoPredict", finish_position=1)
+        track = create_track(db_session)
+        race = create_race(db_session, track)
+        add_entry(db_session, race, "NoPredict", finish_position=1)
         db_session.commit()
 
         ev = evaluate_race(db_session, race.id)
         assert ev is None
 
     def test_no_results_returns_none(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, status=RaceStatus.scheduled)
-        _add_entry(db_session, race, "Pending", predicted_probability=50.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, status=RaceStatus.scheduled)
+        add_entry(db_session, race, "Pending", predicted_probability=50.0)
         db_session.commit()
 
         ev = evaluate_race(db_session, race.id)
@@ -219,9 +164,9 @@ class TestEvaluateRace:
 
     def test_no_winner_returns_none(self, db_session):
         """Race resulted but no entry has finish_position=1."""
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
-        _add_entry(
+        track = create_track(db_session)
+        race = create_race(db_session, track)
+        add_entry(
             db_session, race, "DNF",
             finish_position=None, predicted_probability=50.0,
         )
@@ -236,13 +181,13 @@ class TestEvaluateRace:
 
     def test_winner_without_prediction_in_field(self, db_session):
         """Winner exists but their predicted_probability is None, while others have predictions."""
-        track = _create_track(db_session)
-        race = _create_race(db_session, track)
-        _add_entry(
+        track = create_track(db_session)
+        race = create_race(db_session, track)
+        add_entry(
             db_session, race, "UnpredWinner",
             finish_position=1, predicted_probability=None,
         )
-        _add_entry(
+        add_entry(
             db_session, race, "Predicted",
             finish_position=2, predicted_probability=60.0,
         )
@@ -263,18 +208,18 @@ class TestEvaluateRace:
 
 class TestEvaluateAll:
     def test_multiple_races(self, db_session):
-        track = _create_track(db_session)
+        track = create_track(db_session)
         # Race 1: top pick wins
-        race1 = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race1, "R1H1", finish_position=1, predicted_probability=50.0)
-        _add_entry(db_session, race1, "R1H2", finish_position=2, predicted_probability=30.0)
-        _add_entry(db_session, race1, "R1H3", finish_position=3, predicted_probability=20.0)
+        race1 = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race1, "R1H1", finish_position=1, predicted_probability=50.0)
+        add_entry(db_session, race1, "R1H2", finish_position=2, predicted_probability=30.0)
+        add_entry(db_session, race1, "R1H3", finish_position=3, predicted_probability=20.0)
 
         # Race 2: top pick loses
-        race2 = _create_race(db_session, track, race_number=2)
-        _add_entry(db_session, race2, "R2H1", finish_position=1, predicted_probability=20.0)
-        _add_entry(db_session, race2, "R2H2", finish_position=2, predicted_probability=50.0)
-        _add_entry(db_session, race2, "R2H3", finish_position=3, predicted_probability=30.0)
+        race2 = create_race(db_session, track, race_number=2)
+        add_entry(db_session, race2, "R2H1", finish_position=1, predicted_probability=20.0)
+        add_entry(db_session, race2, "R2H2", finish_position=2, predicted_probability=50.0)
+        add_entry(db_session, race2, "R2H3", finish_position=3, predicted_probability=30.0)
         db_session.commit()
 
         summary, evaluations = evaluate_all(db_session)
@@ -284,8 +229,8 @@ class TestEvaluateAll:
         assert summary.top3_accuracy == 100.0  # both in top 3
 
     def test_no_resulted_races(self, db_session):
-        track = _create_track(db_session)
-        _create_race(db_session, track, status=RaceStatus.scheduled)
+        track = create_track(db_session)
+        create_race(db_session, track, status=RaceStatus.scheduled)
         db_session.commit()
 
         summary, evaluations = evaluate_all(db_session)
@@ -301,10 +246,10 @@ class TestEvaluateAll:
         assert evaluations == []
 
     def test_log_loss_calculation(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "H1", finish_position=1, predicted_probability=40.0)
-        _add_entry(db_session, race, "H2", finish_position=2, predicted_probability=60.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "H1", finish_position=1, predicted_probability=40.0)
+        add_entry(db_session, race, "H2", finish_position=2, predicted_probability=60.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
@@ -312,10 +257,10 @@ class TestEvaluateAll:
         assert abs(summary.log_loss - expected_log_loss) < 0.0001
 
     def test_roi_top_pick_wins(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "Fav", finish_position=1, predicted_probability=50.0)
-        _add_entry(db_session, race, "Other", finish_position=2, predicted_probability=50.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "Fav", finish_position=1, predicted_probability=50.0)
+        add_entry(db_session, race, "Other", finish_position=2, predicted_probability=50.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
@@ -323,10 +268,10 @@ class TestEvaluateAll:
         assert abs(summary.roi_simulation - 1.0) < 0.01
 
     def test_roi_top_pick_loses(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "Upset", finish_position=1, predicted_probability=10.0)
-        _add_entry(db_session, race, "Fav", finish_position=2, predicted_probability=90.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "Upset", finish_position=1, predicted_probability=10.0)
+        add_entry(db_session, race, "Fav", finish_position=2, predicted_probability=90.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
@@ -334,33 +279,33 @@ class TestEvaluateAll:
         assert abs(summary.roi_simulation - (-1.0)) < 0.01
 
     def test_avg_winner_rank(self, db_session):
-        track = _create_track(db_session)
+        track = create_track(db_session)
         # Race 1: winner ranked 1st
-        race1 = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race1, "W1", finish_position=1, predicted_probability=60.0)
-        _add_entry(db_session, race1, "L1", finish_position=2, predicted_probability=40.0)
+        race1 = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race1, "W1", finish_position=1, predicted_probability=60.0)
+        add_entry(db_session, race1, "L1", finish_position=2, predicted_probability=40.0)
 
         # Race 2: winner ranked 3rd
-        race2 = _create_race(db_session, track, race_number=2)
-        _add_entry(db_session, race2, "W2", finish_position=1, predicted_probability=10.0)
-        _add_entry(db_session, race2, "X2", finish_position=2, predicted_probability=50.0)
-        _add_entry(db_session, race2, "Y2", finish_position=3, predicted_probability=40.0)
+        race2 = create_race(db_session, track, race_number=2)
+        add_entry(db_session, race2, "W2", finish_position=1, predicted_probability=10.0)
+        add_entry(db_session, race2, "X2", finish_position=2, predicted_probability=50.0)
+        add_entry(db_session, race2, "Y2", finish_position=3, predicted_probability=40.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
         assert abs(summary.avg_winner_rank - 2.0) < 0.01  # (1+3)/2
 
     def test_skips_races_without_predictions(self, db_session):
-        track = _create_track(db_session)
+        track = create_track(db_session)
         # Race with predictions
-        race1 = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race1, "PH1", finish_position=1, predicted_probability=50.0)
-        _add_entry(db_session, race1, "PH2", finish_position=2, predicted_probability=50.0)
+        race1 = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race1, "PH1", finish_position=1, predicted_probability=50.0)
+        add_entry(db_session, race1, "PH2", finish_position=2, predicted_probability=50.0)
 
         # Race without predictions
-        race2 = _create_race(db_session, track, race_number=2)
-        _add_entry(db_session, race2, "NPH1", finish_position=1)
-        _add_entry(db_session, race2, "NPH2", finish_position=2)
+        race2 = create_race(db_session, track, race_number=2)
+        add_entry(db_session, race2, "NPH1", finish_position=1)
+        add_entry(db_session, race2, "NPH2", finish_position=2)
         db_session.commit()
 
         summary, evaluations = evaluate_all(db_session)
@@ -375,7 +320,7 @@ class TestEvaluateAll:
 
 class TestNewMetrics:
     def test_cutoff_filters_older_races(self, db_session):
-        track = _create_track(db_session)
+        track = create_track(db_session)
         old = Race(
             track_id=track.id, date=date(2026, 1, 1), race_number=1,
             distance_meters=1400, surface="Çim", status=RaceStatus.resulted,
@@ -386,10 +331,10 @@ class TestNewMetrics:
         )
         db_session.add_all([old, new])
         db_session.flush()
-        _add_entry(db_session, old, "OldWinner", finish_position=1, predicted_probability=60.0)
-        _add_entry(db_session, old, "OldLoser", finish_position=2, predicted_probability=40.0)
-        _add_entry(db_session, new, "NewWinner", finish_position=1, predicted_probability=55.0)
-        _add_entry(db_session, new, "NewLoser", finish_position=2, predicted_probability=45.0)
+        add_entry(db_session, old, "OldWinner", finish_position=1, predicted_probability=60.0)
+        add_entry(db_session, old, "OldLoser", finish_position=2, predicted_probability=40.0)
+        add_entry(db_session, new, "NewWinner", finish_position=1, predicted_probability=55.0)
+        add_entry(db_session, new, "NewLoser", finish_position=2, predicted_probability=45.0)
         db_session.commit()
 
         summary, evaluations = evaluate_all(db_session, cutoff_date=date(2026, 3, 1))
@@ -399,12 +344,12 @@ class TestNewMetrics:
         assert evaluations[0].date == date(2026, 4, 1)
 
     def test_random_baseline_top1(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "A", finish_position=1, predicted_probability=25.0)
-        _add_entry(db_session, race, "B", finish_position=2, predicted_probability=25.0)
-        _add_entry(db_session, race, "C", finish_position=3, predicted_probability=25.0)
-        _add_entry(db_session, race, "D", finish_position=4, predicted_probability=25.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "A", finish_position=1, predicted_probability=25.0)
+        add_entry(db_session, race, "B", finish_position=2, predicted_probability=25.0)
+        add_entry(db_session, race, "C", finish_position=3, predicted_probability=25.0)
+        add_entry(db_session, race, "D", finish_position=4, predicted_probability=25.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
@@ -412,10 +357,10 @@ class TestNewMetrics:
         assert abs(summary.random_baseline_top1 - 25.0) < 0.01
 
     def test_brier_score_perfect_confident_win(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "A", finish_position=1, predicted_probability=100.0)
-        _add_entry(db_session, race, "B", finish_position=2, predicted_probability=0.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "A", finish_position=1, predicted_probability=100.0)
+        add_entry(db_session, race, "B", finish_position=2, predicted_probability=0.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session)
@@ -423,11 +368,11 @@ class TestNewMetrics:
         assert summary.brier_score == pytest.approx(0.0, abs=1e-6)
 
     def test_calibration_buckets_present(self, db_session):
-        track = _create_track(db_session)
-        race = _create_race(db_session, track, race_number=1)
-        _add_entry(db_session, race, "A", finish_position=1, predicted_probability=70.0)
-        _add_entry(db_session, race, "B", finish_position=2, predicted_probability=20.0)
-        _add_entry(db_session, race, "C", finish_position=3, predicted_probability=10.0)
+        track = create_track(db_session)
+        race = create_race(db_session, track, race_number=1)
+        add_entry(db_session, race, "A", finish_position=1, predicted_probability=70.0)
+        add_entry(db_session, race, "B", finish_position=2, predicted_probability=20.0)
+        add_entry(db_session, race, "C", finish_position=3, predicted_probability=10.0)
         db_session.commit()
 
         summary, _ = evaluate_all(db_session, num_calibration_bins=10)
@@ -435,3 +380,181 @@ class TestNewMetrics:
         # Counts should sum to the number of predicted entries.
         total = sum(b.count for b in summary.calibration)
         assert total == 3
+
+
+class TestSinglePassEvaluation:
+    def test_matches_per_race_evaluation(self, db_session):
+        import random
+
+        rng = random.Random(3)
+        track = create_track(db_session)
+        for number in range(1, 16):
+            race = create_race(db_session, track, race_number=number)
+            size = rng.randint(2, 7)
+            finishes = list(range(1, size + 1))
+            rng.shuffle(finishes)
+            for i, finish in enumerate(finishes):
+                entry = add_entry(
+                    db_session, race, f"H{number}-{i}",
+                    finish_position=None if number == 5 else finish,
+                    # Ties and missing predictions exercise rank edge cases.
+                    predicted_probability=(
+                        None if number == 7 or (i == 0 and number % 4 == 0)
+                        else rng.choice([10.0, 20.0, 20.0, 35.0, 50.0])
+                    ),
+                )
+                entry.agf = rng.choice([None, 5.0, 30.0, 30.0])
+        create_race(db_session, track, race_number=16)  # no entries
+        db_session.commit()
+
+        summary, evaluations = evaluate_all(db_session)
+
+        races = (
+            db_session.query(Race)
+            .order_by(Race.date.desc(), Race.race_number.desc())
+            .all()
+        )
+        expected = [evaluate_race(db_session, r.id) for r in races]
+        expected = [ev for ev in expected if ev is not None]
+        assert evaluations == expected
+        assert summary.skipped_unpredicted == len(races) - len(expected)
+
+        brier, payout = [], 0.0
+        for ev in expected:
+            entries = [
+                e for e in db_session.query(RaceEntry).filter_by(race_id=ev.race_id)
+                if e.predicted_probability is not None
+            ]
+            brier.append(sum(
+                (float(e.predicted_probability) / 100 - (e.finish_position == 1)) ** 2
+                for e in entries
+            ))
+            if ev.top1_correct:
+                top = max(entries, key=lambda e: float(e.predicted_probability))
+                implied = float(top.agf) if top.agf else float(top.predicted_probability)
+                payout += 100.0 / (implied / 100.0)
+        assert summary.brier_score == pytest.approx(sum(brier) / len(brier))
+        stake = 100.0 * len(expected)
+        assert summary.roi_simulation == pytest.approx((payout - stake) / stake)
+        assert sum(b.count for b in summary.calibration) == sum(
+            ev.num_horses for ev in expected
+        ) - sum(
+            1 for ev in expected for e in db_session.query(RaceEntry).filter_by(
+                race_id=ev.race_id,
+            ) if e.predicted_probability is None
+        )
+
+
+class TestEvaluationDaily:
+    @staticmethod
+    def _seed(session, rng, days, start=1):
+        from ganyan.db.models import Prediction
+
+        track = create_track(session, name=f"Track{start}")
+        for d in days:
+            for number in range(1, 4):
+                race = create_race(session, track, race_number=number + 10 * d)
+                race.date = date(2026, 5, d)
+                size = rng.randint(2, 6)
+                finishes = list(range(1, size + 1))
+                rng.shuffle(finishes)
+                for i, finish in enumerate(finishes):
+                    prob = None if number == 3 and d % 2 else rng.choice(
+                        [7.5, 20.0, 20.0, 45.0, 61.0],
+                    )
+                    entry = add_entry(
+                        session, race, f"H{start}-{d}-{number}-{i}",
+                        finish_position=finish, predicted_probability=prob,
+                    )
+                    entry.agf = rng.choice([None, 12.0, 40.0])
+                    if prob is not None:
+                        session.add(Prediction(
+                            race_entry_id=entry.id, model_version="v1",
+                            probability=rng.choice([15.0, 30.0, 55.0]),
+                        ))
+        session.commit()
+
+    @staticmethod
+    def _assert_same(rolled, expected):
+        assert rolled.total_races == expected.total_races
+        assert rolled.skipped_unpredicted == expected.skipped_unpredicted
+        for name in (
+            "top1_accuracy", "top3_accuracy", "avg_winner_rank",
+            "avg_winner_probability", "log_loss", "brier_score",
+            "random_baseline_top1", "agf_baseline_top1", "roi_simulation",
+        ):
+            assert getattr(rolled, name) == pytest.approx(
+                getattr(expected, name),
+            ), name
+        assert [(b.lower, b.count) for b in rolled.calibration] == [
+            (b.lower, b.count) for b in expected.calibration
+        ]
+        for got, want in zip(rolled.calibration, expected.calibration):
+            assert got.mean_predicted == pytest.approx(want.mean_predicted)
+            assert got.actual_win_rate == pytest.approx(want.actual_win_rate)
+
+    def test_rollup_matches_full_evaluation(self, db_session):
+        import random
+
+        from ganyan.predictor.evaluation_daily import (
+            rebuild_evaluation_daily,
+            summarize_evaluation_daily,
+        )
+
+        self._seed(db_session, random.Random(5), days=[1, 2, 3, 4])
+        assert summarize_evaluation_daily(db_session) is None
+
+        assert rebuild_evaluation_daily(db_session) > 0
+        db_session.commit()
+        for window in [
+            {},
+            {"from_date": date(2026, 5, 2)},
+            {"from_date": date(2026, 5, 2), "to_date": date(2026, 5, 3)},
+        ]:
+            expected, _ = evaluate_all(
+                db_session,
+                cutoff_date=window.get("from_date"),
+                to_date=window.get("to_date"),
+            )
+            self._assert_same(
+                summarize_evaluation_daily(db_session, **window), expected,
+            )
+        expected, _ = evaluate_all(db_session, model_version="v1")
+        assert expected.total_races > 0
+        self._assert_same(
+            summarize_evaluation_daily(db_session, model_version="v1"), expected,
+        )
+        with pytest.raises(ValueError):
+            summarize_evaluation_daily(db_session, num_calibration_bins=7)
+
+    def test_refresh_matches_rebuild(self, db_session):
+        import random
+
+        from ganyan.db.models import EvaluationDaily
+        from ganyan.predictor.evaluation_daily import (
+            rebuild_evaluation_daily,
+            refresh_evaluation_daily,
+        )
+
+        rng = random.Random(9)
+        self._seed(db_session, rng, days=[1, 2])
+        rebuild_evaluation_daily(db_session)
+        db_session.commit()
+
+        self._seed(db_session, rng, days=[2, 6], start=2)
+        refresh_evaluation_daily(db_session, [date(2026, 5, 2), date(2026, 5, 6)])
+        # Re-polling the same day changes nothing.
+        refresh_evaluation_daily(db_session, [date(2026, 5, 6)])
+        db_session.commit()
+
+        def _snapshot():
+            return sorted(
+                (r.date, r.model_version, r.races, r.skipped, r.top1_hits,
+                 r.rank_sum, round(r.log_loss_sum, 9), r.calibration_counts)
+                for r in db_session.query(EvaluationDaily).all()
+            )
+
+        incremental = _snapshot()
+        rebuild_evaluation_daily(db_session)
+        db_session.commit()
+        assert incremental == _snapshot()
@@ -4,16 +4,26 @@ All identities here come directly from the Harville (1973) conditional
 model — they must hold for *any* valid probability distribution.
 """
 
+from itertools import combinations, permutations
+
+import numpy as np
 import pytest
 
 from ganyan.predictor.exotics import (
+    RaceExoticModel,
+    _perm_probability,
     cumulative_coverage,
     dortlu_probabilities,
     ganyan_probabilities,
+    harville_tensor,
     ikili_probabilities,
+    ordered_combo_arrays,
     plase_probabilities,
+    plase_vector,
     sirali_ikili_probabilities,
+    top_n_combos,
     uclu_probabilities,
+    unordered_combo_arrays,
 )
 
 
@@ -113,6 +123,22 @@ def test_plase_sorted_descending():
     assert probs == sorted(probs, reverse=True)
 
 
+@pytest.mark.parametrize("top_k", [1, 2, 3])
+def test_plase_vector_matches_permutation_sum(top_k):
+    ids = list(FIELD)
+    expected = {h: 0.0 for h in ids}
+    for perm in permutations(ids, top_k):
+        for h in perm:
+            expected[h] += _perm_probability(perm, FIELD)
+    place = plase_vector(np.array([FIELD[h] for h in ids]), top_k)
+    assert place.tolist() == pytest.approx([expected[h] for h in ids])
+    assert _approx(float(place.sum()), float(top_k))
+
+
+def test_plase_small_field_everyone_places():
+    assert plase_vector(np.array([0.6, 0.4]), 3).tolist() == [1.0, 1.0]
+
+
 def test_plase_rejects_invalid_k():
     with pytest.raises(ValueError):
         plase_probabilities(WIN_PROBS, top_k=0)
@@ -160,3 +186,112 @@ def test_cumulative_coverage_monotone():
     cum = cumulative_coverage(combos)
     assert cum == sorted(cum)  # non-decreasing
     assert _approx(cum[-1], 1.0)  # completes the probability mass
+
+
+# --- Vectorised engine ----------------------------------------------------
+
+
+# Includes a zero-probability horse and two tied horses.
+FIELD = {11: 0.30, 12: 0.20, 13: 0.20, 14: 0.15, 15: 0.10, 16: 0.05, 17: 0.0}
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4])
+def test_ordered_arrays_match_permutation_loop(k):
+    arrays = ordered_combo_arrays(FIELD, k)
+    expected = sorted(
+        ((perm, _perm_probability(perm, FIELD)) for perm in permutations(FIELD, k)),
+        key=lambda t: t[1], reverse=True,
+    )
+    assert [tuple(h) for h in arrays.horses.tolist()] == [h for h, _ in expected]
+    assert arrays.probabilities.tolist() == [p for _, p in expected]
+
+
+def test_unordered_arrays_sum_every_ordering():
+    arrays = unordered_combo_arrays(FIELD, 3)
+    assert len(arrays) == len(list(combinations(FIELD, 3)))
+    for horses, p in zip(arrays.horses.tolist(), arrays.probabilities):
+        expected = sum(
+            _perm_probability(perm, FIELD) for perm in permutations(horses)
+        )
+        assert p == pytest.approx(expected)
+    assert _approx(float(arrays.probabilities.sum()), 1.0)
+
+
+def test_harville_tensor_masks_repeated_horses():
+    tensor = harville_tensor(np.array([0.5, 0.3, 0.2]), 2)
+    assert np.all(np.diag(tensor) == 0.0)
+    assert _approx(float(tensor.sum()), 1.0)
+    assert ordered_combo_arrays({1: 1.0}, 2).horses.shape == (0, 2)
+
+
+# --- Best-first top-N -----------------------------------------------------
+
+
+_FULL = {
+    "ganyan": ganyan_probabilities,
+    "ikili": ikili_probabilities,
+    "sirali_ikili": sirali_ikili_probabilities,
+    "uclu": uclu_probabilities,
+    "dortlu": dortlu_probabilities,
+}
+
+
+@pytest.mark.parametrize("pool", sorted(_FULL))
+@pytest.mark.parametrize("n", [1, 3, 10, 500])
+def test_top_n_combos_matches_full_enumeration(pool, n):
+    # FIELD has ties and a zero-probability horse; n=500 exceeds every
+    # pool, so the zero-probability tail must come back too.
+    assert top_n_combos(pool, FIELD, n) == _FULL[pool](FIELD)[:n]
+
+
+def test_top_n_combos_random_fields():
+    rng = np.random.default_rng(7)
+    for _ in range(30):
+        size = int(rng.integers(4, 17))
+        probs = dict(enumerate(rng.dirichlet(np.ones(size)).tolist()))
+        for pool in ("uclu", "dortlu"):
+            assert top_n_combos(pool, probs, 10) == _FULL[pool](probs)[:10]
+
+
+def test_top_n_combos_rejects_unknown_pool():
+    with pytest.raises(ValueError):
+        top_n_combos("plase", WIN_PROBS, 1)
+    assert top_n_combos("uclu", WIN_PROBS, 0) == []
+
+
+# --- Shared per-race model ------------------------------------------------
+
+
+@pytest.mark.parametrize("pool", sorted(_FULL))
+def test_race_model_matches_pool_functions(pool):
+    model = RaceExoticModel(FIELD)
+    full = _FULL[pool](FIELD)
+    assert model.top(pool, 3) == full[:3]
+    assert model.combo_arrays(pool).to_combos() == full
+    assert model.top(pool, 5) == full[:5]  # served from the memoised sort
+
+
+def test_race_model_box_and_plase_share_levels():
+    model = RaceExoticModel(FIELD)
+    top = model.top("uclu", 1)[0]
+    box = sum(
+        c.probability for c in uclu_probabilities(FIELD)
+        if set(c.horses) == set(top.horses)
+    )
+    assert model.box_probability(top.horses) == pytest.approx(box)
+    assert model.probability(top.horses) == top.probability
+    assert model.probability((11, 11, 12)) == 0.0
+    shallow, deep = model.tensor(2), model.tensor(3)
+
+    place = model.plase(2)
+    expected = plase_vector(model.p, 2)
+    assert list(place.values()) == pytest.approx(expected.tolist())
+    # Plase reads the memoised prefixes rather than re-enumerating.
+    assert model.tensor(2) is shallow and model.tensor(3) is deep
+    assert deep[0].sum() == pytest.approx(1.0)
+
+
+def test_race_model_small_field():
+    model = RaceExoticModel({1: 0.6, 2: 0.4})
+    assert model.top("uclu", 1) == []
+    assert model.plase(3) == {1: 1.0, 2: 1.0}
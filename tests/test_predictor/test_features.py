@@ -18,7 +18,10 @@ from ganyan.predictor.features import (
     compute_gate_bias,
     compute_surface_affinity,
     extract_features,
+    compute_history_features_batch,
+    HistoryRequest,
     HorseFeatures,
+    HISTORY_FEATURE_FIELDS,
 )
 
 
@@ -155,7 +158,7 @@ def _seed_resulted_race(session, track_name, race_date, horses, surface="Kum",
         session.flush()
         session.add(RaceEntry(
             race_id=race.id, horse_id=horse.id,
-            jockey=jockey, finish_position=finish_pos,
+            jockey=jockey, trainer=trainer, finish_position=finish_pos,
         ))
     session.flush()
 
@@ -228,3 +231,46 @@ def test_compute_surface_affinity_matches_surface(db_session):
     )
     assert kum_aff is not None and cim_aff is not None
     assert kum_aff > cim_aff
+
+
+def test_history_features_batch_matches_per_runner(db_session):
+    _seed_resulted_race(db_session, "Bursa", date(2026, 1, 1),
+                        [("H1", "A", "T1", 1), ("H2", "B", "T2", 2)],
+                        surface="Kum", distance=1400)
+    _seed_resulted_race(db_session, "Bursa", date(2026, 1, 5),
+                        [("H1", "B", "T1", 3), ("H2", "A", "T2", 1)],
+                        surface="Çim", distance=1800, race_number=2)
+    _seed_resulted_race(db_session, "Bursa", date(2026, 2, 1),
+                        [("H1", "A", "T1", 2), ("H3", "C", "T3", 1)],
+                        surface="Kum", distance=1500, race_number=3)
+    horses = {h.name: h for h in db_session.query(Horse).all()}
+    horses["H1"].sire = "S1"
+    horses["H2"].sire = "S1"
+    horses["H3"].sire = "S2"
+    for entry in db_session.query(RaceEntry).all():
+        entry.equipment = "KG" if entry.horse.name == "H1" else None
+    db_session.commit()
+
+    requests = [
+        HistoryRequest(horse_id=h.id, race_date=race_date, jockey=jockey,
+                       trainer=h.trainer, sire=h.sire, surface=surface,
+                       distance_meters=distance, equipment=equipment)
+        for h in horses.values()
+        for (race_date, jockey, surface, distance, equipment) in [
+            (date(2026, 1, 5), "A", "Kum", 1400, "KG"),
+            (date(2026, 3, 1), "B", "Çim", 1600, None),
+            (None, "C", None, None, "DB"),
+        ]
+    ]
+    batched = compute_history_features_batch(db_session, requests)
+
+    assert len(batched) == len(requests)
+    for req, got in zip(requests, batched):
+        expected = extract_features(
+            session=db_session, jockey=req.jockey, trainer=req.trainer,
+            horse_id=req.horse_id, surface=req.surface,
+            distance_meters=req.distance_meters, race_date=req.race_date,
+            sire=req.sire, equipment=req.equipment,
+        )
+        for name in HISTORY_FEATURE_FIELDS:
+            assert got[name] == pytest.approx(getattr(expected, name)), name
@@ -0,0 +1,89 @@
+"""Tests for the date-partitioned training feature store."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from ganyan.db.models import Race, RaceStatus
+from ganyan.predictor.ml.feature_store import FeatureStore, feature_schema_hash
+from ganyan.predictor.ml.features import build_training_frame
+
+from tests.helpers.seed import seed_many, seed_race
+
+
+def test_store_round_trip_matches_db_frame(db_session, tmp_path):
+    seed_many(db_session, n_races=12)
+    store = FeatureStore(tmp_path)
+
+    frame = build_training_frame(db_session, store=store)
+    expected = build_training_frame(db_session)
+
+    assert store.dates()  # partitions were written
+    pd.testing.assert_frame_equal(frame.features, expected.features)
+    pd.testing.assert_series_equal(frame.target, expected.target)
+    pd.testing.assert_series_equal(frame.groups, expected.groups)
+    assert list(frame.race_dates) == list(expected.race_dates)
+
+
+def test_sync_is_incremental_and_skips_open_dates(db_session, tmp_path):
+    seed_many(db_session, n_races=5)
+    store = FeatureStore(tmp_path)
+    first = store.sync(db_session)
+    assert first == len(store.dates()) > 0
+    assert store.sync(db_session) == 0
+
+    # A new resulted day is appended; a day with a scheduled race is not.
+    seed_race(
+        db_session, race_date=date(2026, 4, 1), race_number=1,
+        track_name="TestTrack",
+        entries=[("H1", 50, 1), ("H2", 30, 2), ("H3", 20, 3)],
+    )
+    open_race = seed_race(
+        db_session, race_date=date(2026, 4, 2), race_number=1,
+        track_name="TestTrack",
+        entries=[("H1", 50, 1), ("H2", 30, 2), ("H3", 20, 3)],
+    )
+    db_session.add(Race(
+        track_id=open_race.track_id, date=date(2026, 4, 2), race_number=2,
+        status=RaceStatus.scheduled,
+    ))
+    db_session.commit()
+
+    assert store.sync(db_session, today=date(2026, 4, 2)) == 1
+    assert date(2026, 4, 1) in store.dates()
+    assert date(2026, 4, 2) not in store.dates()
+
+    # Once the day is past, a race that never resulted stops blocking it.
+    assert store.sync(db_session, today=date(2026, 4, 3)) == 1
+    assert date(2026, 4, 2) in store.dates()
+
+    assert store.clear(since=date(2026, 4, 1)) == 2
+    assert store.dates()[-1] < date(2026, 4, 1)
+
+
+def test_invalidate_horses_clears_from_their_first_run(db_session, tmp_path):
+    seed_many(db_session, n_races=5)
+    late = seed_race(
+        db_session, race_date=date(2026, 4, 1), race_number=1,
+        track_name="TestTrack",
+        entries=[("NEW1", 50, 1), ("NEW2", 30, 2), ("NEW3", 20, 3)],
+    )
+    db_session.commit()
+    store = FeatureStore(tmp_path)
+    written = store.sync(db_session)
+
+    newcomer = late.entries[0].horse_id
+    assert store.invalidate_horses(db_session, []) == 0
+    assert store.invalidate_horses(db_session, [newcomer]) == 1
+    assert date(2026, 4, 1) not in store.dates()
+    assert len(store.dates()) == written - 1
+
+
+def test_schema_hash_tracks_filters(db_session, tmp_path):
+    assert feature_schema_hash() != feature_schema_hash(min_field_size=4)
+    store = FeatureStore(tmp_path, min_field_size=4)
+    with pytest.raises(ValueError):
+        build_training_frame(db_session, store=store)
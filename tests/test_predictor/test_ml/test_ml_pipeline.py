@@ -4,6 +4,7 @@ Covers:
 - Feature builder returns the expected shape and target.
 - Trainer fits a small model, saves artefacts, reports sensible metrics.
 - MLPredictor loads the trained model and returns well-formed predictions.
+- ModelRegistry reuses a loaded booster until the file content changes.
 """
 
 from __future__ import annotations
@@ -11,18 +12,21 @@ from __future__ import annotations
 from datetime import date
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from ganyan.db.models import (
-    Base, Horse, Race, RaceEntry, RaceStatus, Track,
-)
+from ganyan.db.career_stats import rebuild_career_stats
+from ganyan.db.models import Base, Horse, Race
 from ganyan.predictor.ml import (
     FEATURE_COLUMNS, MLPredictor, build_training_frame, train_ranker,
 )
-from ganyan.predictor.ml.features import build_race_frame
-from ganyan.predictor.ml.predictor import load_latest_model
+from ganyan.predictor.ml.features import build_card_frame, build_race_frame
+from ganyan.predictor.ml.predictor import ModelRegistry, load_latest_model
+
+from tests.helpers.seed import seed_many, seed_race
 
 
 @pytest.fixture
@@ -33,71 +37,6 @@ def db_session():
         yield s
 
 
-def _seed_race(
-    session, *, race_date, race_number, track_name, entries, surface="kum",
-    distance=1400,
-):
-    """Seed a resulted race with the given (name, agf, finish_pos) tuples."""
-    track = session.query(Track).filter_by(name=track_name).first()
-    if track is None:
-        track = Track(name=track_name)
-        session.add(track)
-        session.flush()
-    race = Race(
-        track_id=track.id, date=race_date, race_number=race_number,
-        distance_meters=distance, surface=surface, status=RaceStatus.resulted,
-    )
-    session.add(race)
-    session.flush()
-    for i, (name, agf, finish_pos) in enumerate(entries, start=1):
-        horse = session.query(Horse).filter_by(name=name).first()
-        if horse is None:
-            horse = Horse(name=name, age=4, trainer=f"Tr{i}")
-            session.add(horse)
-            session.flush()
-        session.add(RaceEntry(
-            race_id=race.id, horse_id=horse.id,
-            gate_number=i, jockey=f"J{i}",
-            agf=agf, hp=80.0 + i, weight_kg=57.0,
-            finish_position=finish_pos,
-        ))
-    session.flush()
-    return race
-
-
-def _seed_many(session, n_races: int = 25):
-    """Create enough races that the trainer has a meaningful train/test split.
-
-    Each race has 6 horses; the horse with the highest AGF wins ~70% of
-    the time (deterministic pattern based on race number parity) so the
-    model has real signal to learn.
-    """
-    horse_pool = [f"H{k}" for k in range(1, 13)]
-    for r in range(n_races):
-        # Sample six distinct horses for each race.
-        offset = r % 7
-        horses_this_race = horse_pool[offset:offset + 6]
-        # AGF sums to 100.
-        agfs = [40, 25, 15, 10, 6, 4]
-        if r % 3 == 0:
-            # Favourite wins.
-            finish = [1, 2, 3, 4, 5, 6]
-        elif r % 3 == 1:
-            # Second favourite wins.
-            finish = [2, 1, 3, 4, 5, 6]
-        else:
-            # Third wins (upset).
-            finish = [3, 2, 1, 4, 5, 6]
-        _seed_race(
-            session,
-            race_date=date(2026, 3, 1 + (r // 10)).replace(day=1 + (r % 10)),
-            race_number=r + 1,
-            track_name="TestTrack",
-            entries=list(zip(horses_this_race, agfs, finish)),
-        )
-    session.commit()
-
-
 def test_feature_columns_are_stable():
     """Adding or renaming columns should be a conscious decision."""
     expected_prefix = [
@@ -109,7 +48,7 @@ def test_feature_columns_are_stable():
 
 
 def test_build_training_frame_shape(db_session):
-    _seed_many(db_session, n_races=5)
+    seed_many(db_session, n_races=5)
     frame = build_training_frame(db_session)
     assert not frame.features.empty
     assert list(frame.features.columns) == FEATURE_COLUMNS
@@ -119,8 +58,37 @@ def test_build_training_frame_shape(db_session):
     assert frame.groups.nunique() == 5
 
 
+def test_vectorized_training_frame_matches_per_row(db_session):
+    seed_many(db_session, n_races=20)
+    # Vary the history so every as-of feature has something to resolve.
+    for i, race in enumerate(db_session.query(Race).order_by(Race.id)):
+        race.surface = "kum" if i % 3 else "çim"
+        race.distance_meters = 1200 + 100 * (i % 5)
+        for entry in race.entries:
+            entry.equipment = "KG" if (i + entry.gate_number) % 4 == 0 else None
+            # Horses change yards between races.
+            entry.trainer = f"Tr{(i + entry.gate_number) % 4}"
+    for i, horse in enumerate(db_session.query(Horse).order_by(Horse.id)):
+        horse.sire = f"S{i % 3}" if i % 4 else None
+    db_session.commit()
+
+    windows = ({}, {"from_date": date(2026, 3, 5)})
+    for ledger in (False, True):
+        if ledger:
+            # The per-row path now reads the career ledger.
+            rebuild_career_stats(db_session)
+            db_session.commit()
+        for window in windows:
+            slow = build_training_frame(db_session, **window)
+            fast = build_training_frame(db_session, vectorized=True, **window)
+            pd.testing.assert_frame_equal(fast.features, slow.features)
+            pd.testing.assert_series_equal(fast.target, slow.target)
+            pd.testing.assert_series_equal(fast.groups, slow.groups)
+            assert list(fast.race_dates) == list(slow.race_dates)
+
+
 def test_rank_score_target_is_inverse_of_finish_position(db_session):
-    _seed_many(db_session, n_races=2)
+    seed_many(db_session, n_races=2)
     frame = build_training_frame(db_session)
     # Per race, winners must have the highest target.
     for _race_id, idx in frame.groups.groupby(frame.groups).groups.items():
@@ -129,7 +97,7 @@ def test_rank_score_target_is_inverse_of_finish_position(db_session):
 
 
 def test_build_race_frame_for_inference(db_session):
-    _seed_many(db_session, n_races=3)
+    seed_many(db_session, n_races=3)
     race = db_session.query(Race).first()
     df = build_race_frame(db_session, race.id)
     assert len(df) == 6
@@ -138,8 +106,23 @@ def test_build_race_frame_for_inference(db_session):
         assert col in df.columns
 
 
+def test_build_card_frame_matches_race_frames(db_session):
+    seed_many(db_session, n_races=4)
+    race_ids = [r.id for r in db_session.query(Race).order_by(Race.id).all()]
+    card = build_card_frame(db_session, race_ids)
+    assert len(card) == 24
+    assert list(card["race_id"].drop_duplicates()) == race_ids
+    for race_id in race_ids:
+        single = build_race_frame(db_session, race_id)
+        subset = card[card["race_id"] == race_id].drop(columns=["race_id"])
+        pd.testing.assert_frame_equal(
+            subset.reset_index(drop=True).astype("float64"),
+            single.astype("float64"),
+        )
+
+
 def test_train_ranker_end_to_end(db_session, tmp_path: Path):
-    _seed_many(db_session, n_races=30)
+    seed_many(db_session, n_races=30)
     result = train_ranker(
         db_session,
         holdout_fraction=0.2,
@@ -157,7 +140,7 @@ def test_train_ranker_end_to_end(db_session, tmp_path: Path):
 
 
 def test_ml_predictor_round_trip(db_session, tmp_path: Path, monkeypatch):
-    _seed_many(db_session, n_races=30)
+    seed_many(db_session, n_races=30)
     result = train_ranker(
         db_session,
         holdout_fraction=0.2,
@@ -191,7 +174,7 @@ def test_ml_predictor_round_trip(db_session, tmp_path: Path, monkeypatch):
 def test_ml_predictor_persists_audit_row(db_session, tmp_path: Path, monkeypatch):
     from ganyan.db.models import Prediction as PredictionRow
 
-    _seed_many(db_session, n_races=30)
+    seed_many(db_session, n_races=30)
     train_ranker(
         db_session,
         holdout_fraction=0.2,
@@ -215,3 +198,97 @@ def test_ml_predictor_persists_audit_row(db_session, tmp_path: Path, monkeypatch
     assert after - before == 6
     versions = {row.model_version for row in db_session.query(PredictionRow).all()}
     assert any(v.startswith("lightgbm-lambdarank") for v in versions)
+
+
+def test_model_registry_reloads_only_on_content_change(db_session, tmp_path: Path):
+    import os
+
+    seed_many(db_session, n_races=20)
+    train_ranker(
+        db_session, holdout_fraction=0.2, num_boost_round=10,
+        model_dir=tmp_path, model_name="test_ranker",
+    )
+    registry = ModelRegistry()
+    first = registry.get("test_ranker", tmp_path)
+    assert registry.get("test_ranker", tmp_path) is first
+
+    # Touching the file without changing it keeps the loaded booster.
+    model_path = tmp_path / "test_ranker.txt"
+    st = model_path.stat()
+    os.utime(model_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert registry.get("test_ranker", tmp_path) is first
+
+    # A retrain writing new content triggers a reload.
+    train_ranker(
+        db_session, holdout_fraction=0.2, num_boost_round=20,
+        model_dir=tmp_path, model_name="test_ranker",
+    )
+    second = registry.get("test_ranker", tmp_path)
+    assert second is not first
+
+    status = registry.status()
+    assert [s["model_name"] for s in status] == ["test_ranker"]
+    assert status[0]["model_version"] == second.model_version
+
+    with pytest.raises(FileNotFoundError):
+        registry.get("missing", tmp_path)
+
+
+def _reference_predictions(session, model, race_id):
+    """Score one race on its own: single-race frame, plain softmax."""
+    frame = build_race_frame(session, race_id)
+    scores = model.booster.predict(frame[model.feature_columns].astype("float64"))
+    probs = np.exp(scores - scores.max())
+    probs /= probs.sum()
+    uniform = 1.0 / len(probs)
+    spread = probs.max() - uniform
+    confidence = (
+        np.clip((probs - uniform) / spread, 0.0, 1.0) if spread > 0
+        else np.zeros_like(probs)
+    )
+    return {
+        int(h): (100.0 * p, c)
+        for h, p, c in zip(frame["horse_id"], probs, confidence)
+    }
+
+
+def test_predict_many_matches_single_race_predictions(db_session, tmp_path: Path):
+    seed_many(db_session, n_races=20)
+    train_ranker(
+        db_session, holdout_fraction=0.2, num_boost_round=20,
+        model_dir=tmp_path, model_name="test_ranker",
+    )
+    # Mixed field sizes, so a batch's per-race groups differ in length.
+    small = seed_race(
+        db_session, race_date=date(2026, 4, 1), race_number=1,
+        track_name="OtherTrack",
+        entries=[("H2", 50, None), ("H5", 30, None), ("H9", 20, None)],
+    )
+    db_session.commit()
+    model = load_latest_model(tmp_path, "test_ranker")
+    predictor = MLPredictor(db_session, model=model)
+    race_ids = [
+        r.id for r in db_session.query(Race).order_by(Race.id.desc()).limit(5)
+    ]
+    assert small.id in race_ids
+
+    batched = predictor.predict_many(race_ids + [999_999])
+    assert list(batched) == race_ids + [999_999]
+    assert batched[999_999] == []
+    for rid in race_ids:
+        expected = _reference_predictions(db_session, model, rid)
+        got = batched[rid]
+        assert {p.horse_id for p in got} == set(expected)
+        assert [p.probability for p in got] == sorted(
+            (p.probability for p in got), reverse=True,
+        )
+        for p in got:
+            probability, confidence = expected[p.horse_id]
+            assert p.probability == pytest.approx(probability)
+            assert p.confidence == pytest.approx(confidence)
+        assert sum(p.probability for p in got) == pytest.approx(100.0)
+    assert len(batched[small.id]) == 3
+
+    first = db_session.get(Race, race_ids[0])
+    by_date = predictor.predict_date(first.date)
+    assert first.id in by_date
@@ -0,0 +1,64 @@
+"""Tests for date-sharded exotic back-tests over a process pool."""
+
+from __future__ import annotations
+
+import functools
+
+import pytest
+import typer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ganyan.cli.main import _build_predictor
+from ganyan.db.models import Base
+from ganyan.predictor.exotic_evaluate import (
+    evaluate_all_pools,
+    evaluate_all_pools_parallel,
+)
+
+from tests.helpers.seed import seed_exotic_races
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ganyan.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        races = seed_exotic_races(session)
+        for offset, race in enumerate(races):
+            race.date = race.date.replace(day=1 + offset)
+        session.commit()
+    return url
+
+
+def test_parallel_backtest_merges_like_serial(database_url):
+    with Session(create_engine(database_url)) as session:
+        serial = evaluate_all_pools(session, top_ns=(1, 3), detail=True)
+
+    parallel = evaluate_all_pools_parallel(
+        top_ns=(1, 3), database_url=database_url, detail=True, workers=2,
+    )
+    assert [r.summary_row() for r in parallel] == [r.summary_row() for r in serial]
+    assert [r.per_race for r in parallel] == [r.per_race for r in serial]
+    assert sum(len(r.per_race) for r in parallel) > 0
+
+
+def test_workers_build_predictors_with_the_cli_factory(database_url):
+    with Session(create_engine(database_url)) as session:
+        serial = evaluate_all_pools(
+            session, top_ns=(1,),
+            predictor_factory=functools.partial(_build_predictor, model="bayesian"),
+        )
+
+    parallel = evaluate_all_pools_parallel(
+        top_ns=(1,), database_url=database_url, workers=2,
+        predictor_factory=functools.partial(_build_predictor, model="bayesian"),
+    )
+    assert [r.summary_row() for r in parallel] == [r.summary_row() for r in serial]
+
+    with pytest.raises(typer.BadParameter):
+        evaluate_all_pools_parallel(
+            top_ns=(1,), database_url=database_url, workers=1,
+            predictor_factory=functools.partial(_build_predictor, model="gbm"),
+        )
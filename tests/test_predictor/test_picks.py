@@ -0,0 +1,145 @@
+"""Tests for the picks ledger roll-ups."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from ganyan.db.models import Pick, RaceStatus
+from ganyan.predictor.picks import (
+    grade_all_pending,
+    grade_race,
+    strategy_equity_curve,
+    strategy_summary,
+)
+
+from tests.helpers.seed import add_entry, create_race, create_track
+
+
+def _seed_ledger(session):
+    track = create_track(session)
+    start = datetime(2026, 3, 2, 12)  # a Monday
+    picks = []
+    for i in range(24):
+        race = create_race(session, track, race_number=i + 1)
+        for strategy, stake in (("uclu_top1", 100.0), ("uclu_box6", 600.0)):
+            graded = i < 20
+            hit = graded and i % 5 == 0
+            payout = 900.0 if hit else (0.0 if graded else None)
+            picks.append(Pick(
+                race_id=race.id, strategy=strategy, combination=[1, 2, 3],
+                stake_tl=stake, generated_at=start + timedelta(days=i),
+                graded=graded, hit=hit if graded else None,
+                payout_tl=payout,
+                net_tl=payout - stake if payout is not None else None,
+            ))
+    session.add_all(picks)
+    session.commit()
+    return picks
+
+
+def test_summary_matches_python_totals(db_session):
+    picks = _seed_ledger(db_session)
+    summary = strategy_summary(db_session)
+    for name in ("uclu_top1", "uclu_box6"):
+        rows = [p for p in picks if p.strategy == name and p.graded]
+        got = summary[name]
+        assert got["n"] == len(rows)
+        assert got["hits"] == sum(1 for p in rows if p.hit)
+        assert got["stake_tl"] == pytest.approx(sum(float(p.stake_tl) for p in rows))
+        assert got["net_tl"] == pytest.approx(sum(float(p.net_tl) for p in rows))
+        assert got["roi_pct"] == pytest.approx(got["net_tl"] / got["stake_tl"] * 100)
+
+    since = strategy_summary(db_session, since=datetime(2026, 3, 12))
+    assert since["uclu_top1"]["n"] == 10
+    assert set(strategy_summary(db_session, strategy="uclu_box6")) == {"uclu_box6"}
+
+
+def test_equity_curve_buckets_and_cumulates(db_session):
+    _seed_ledger(db_session)
+    summary = strategy_summary(db_session)
+    days = strategy_equity_curve(db_session, bucket="day")["uclu_top1"]
+    weeks = strategy_equity_curve(db_session, bucket="week")["uclu_top1"]
+    months = strategy_equity_curve(db_session, bucket="month")["uclu_top1"]
+
+    assert len(days) == 20
+    assert [w["period"] for w in weeks][:2] == ["2026-03-02", "2026-03-09"]
+    assert [m["period"] for m in months] == ["2026-03-01"]
+    for curve in (days, weeks, months):
+        assert sum(p["n"] for p in curve) == summary["uclu_top1"]["n"]
+        assert curve[-1]["cum_net_tl"] == pytest.approx(summary["uclu_top1"]["net_tl"])
+        assert curve[-1]["cum_roi_pct"] == pytest.approx(summary["uclu_top1"]["roi_pct"])
+
+    with pytest.raises(ValueError):
+        strategy_equity_curve(db_session, bucket="year")
+
+
+def _seed_pending(session, n_races=12):
+    """Resulted races with one ungraded pick per strategy each."""
+    track = create_track(session)
+    races = []
+    for number in range(1, n_races + 1):
+        status = RaceStatus.scheduled if number == n_races else RaceStatus.resulted
+        race = create_race(session, track, race_number=number, status=status)
+        horses = [
+            add_entry(session, race, f"H{number}-{i}", finish_position=i + 1).horse_id
+            for i in range(5)
+        ]
+        race.ganyan_payout_tl = 2.5
+        race.sirali_ikili_payout_tl = 9.0
+        # Every fourth race has no Üçlü payout published.
+        race.uclu_payout_tl = None if number % 4 == 0 else 120.0
+        # Odd races: the model nailed the top three in order.
+        top = horses[:3] if number % 2 else [horses[1], horses[0], horses[2]]
+        for strategy, combo, stake in (
+            ("ganyan_top1", top[:1], 100),
+            ("sirali_ikili_top1", top[:2], 100),
+            ("uclu_top1", top, 100),
+            ("uclu_box6", top, 600),
+        ):
+            session.add(Pick(
+                race_id=race.id, strategy=strategy, combination=combo,
+                stake_tl=stake,
+            ))
+        races.append(race)
+    session.commit()
+    return races
+
+
+def test_grade_all_pending_grades_in_bulk(db_session):
+    number_of = {r.id: r.race_number for r in _seed_pending(db_session)}
+    statements = []
+    event.listen(
+        db_session.get_bind(), "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    graded = grade_all_pending(db_session)
+    db_session.commit()
+
+    # 11 resulted races; races 4 and 8 have no Üçlü payout.
+    assert graded == 11 * 4 - 2 * 2
+    assert len(statements) <= 3
+
+    picks = {(number_of[p.race_id], p.strategy): p for p in db_session.query(Pick)}
+    hit = picks[(1, "uclu_top1")]
+    assert (hit.graded, hit.hit) == (True, True)
+    assert float(hit.payout_tl) == 12_000.0
+    assert float(hit.net_tl) == 11_900.0
+    box = picks[(2, "uclu_box6")]
+    assert (box.hit, float(box.net_tl)) == (True, 11_400.0)
+    miss = picks[(2, "uclu_top1")]
+    assert (miss.hit, float(miss.payout_tl), float(miss.net_tl)) == (False, 0.0, -100.0)
+    assert picks[(4, "uclu_top1")].graded is False
+    assert picks[(12, "ganyan_top1")].graded is False
+    assert grade_all_pending(db_session) == 0
+
+
+def test_grade_race_only_touches_that_race(db_session):
+    races = _seed_pending(db_session, n_races=3)
+    assert grade_race(db_session, races[0].id) == 4
+    assert grade_race(db_session, races[0].id) == 0
+    assert grade_race(db_session, races[2].id) == 0  # not resulted yet
+    pending = db_session.query(Pick).filter(Pick.graded == False)  # noqa: E712
+    assert {p.race_id for p in pending} == {races[1].id, races[2].id}
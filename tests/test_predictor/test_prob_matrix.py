@@ -0,0 +1,103 @@
+"""Tests for cached probability matrices and matrix back-tests."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from ganyan.cli.main import app
+from ganyan.predictor.bayesian import MODEL_VERSION, BayesianPredictor
+from ganyan.predictor.exotic_evaluate import evaluate_all_pools, evaluate_matrix_pools
+from ganyan.predictor.prob_matrix import (
+    ProbabilityMatrix,
+    build_probability_matrix,
+    matrix_path,
+)
+
+from tests.helpers.seed import seed_exotic_races
+
+
+def _saved_matrix(session, tmp_path, **window):
+    built = build_probability_matrix(
+        session, BayesianPredictor(session), model_version=MODEL_VERSION, **window,
+    )
+    return built.save(matrix_path(MODEL_VERSION, root=tmp_path, **window))
+
+
+def test_probability_matrix_backtest_matches_db(db_session, tmp_path):
+    races = seed_exotic_races(db_session)
+    races[2].ikili_payout_tl = None
+    for entry in races[3].entries:
+        entry.finish_position = None
+    db_session.commit()
+    expected = evaluate_all_pools(db_session, top_ns=(1, 3, 6))
+
+    matrix = ProbabilityMatrix.load(_saved_matrix(db_session, tmp_path))
+    assert isinstance(matrix.prob, np.memmap)
+    assert len(matrix) == len(races)
+    assert matrix.meta["model_version"] == MODEL_VERSION
+
+    got = evaluate_matrix_pools(matrix, top_ns=(1, 3, 6))
+    assert [r.summary_row() for r in got] == [r.summary_row() for r in expected]
+
+
+def test_window_matches_db_backtest_over_the_same_dates(db_session, tmp_path):
+    races = seed_exotic_races(db_session)
+    for offset, race in enumerate(races):
+        race.date = date(2026, 4, 1 + offset)
+    db_session.commit()
+    matrix = ProbabilityMatrix.load(_saved_matrix(db_session, tmp_path))
+
+    window = matrix.window(date(2026, 4, 2), date(2026, 4, 4))
+    assert isinstance(window.prob, np.memmap)
+    assert window.race_ids.tolist() == [r.id for r in races[1:4]]
+    assert window.meta["races"] == 3
+    assert len(matrix.window(date(2026, 5, 1))) == 0
+
+    expected = evaluate_all_pools(
+        db_session, top_ns=(1, 3),
+        from_date=date(2026, 4, 2), to_date=date(2026, 4, 4),
+    )
+    got = evaluate_matrix_pools(window, top_ns=(1, 3))
+    assert [r.summary_row() for r in got] == [r.summary_row() for r in expected]
+
+
+def test_backtest_cli_honours_window_and_rejects_mismatches(db_session, tmp_path):
+    races = seed_exotic_races(db_session)
+    for offset, race in enumerate(races):
+        race.date = date(2026, 4, 1 + offset)
+    db_session.commit()
+    path = _saved_matrix(
+        db_session, tmp_path, from_date=date(2026, 4, 1), to_date=date(2026, 4, 6),
+    )
+    runner = CliRunner()
+    base = ["exotics-backtest", "--matrix", str(path), "--pool", "ganyan",
+            "--top-n", "1", "--json"]
+
+    result = runner.invoke(app, [*base, "--from", "2026-04-05"])
+    assert result.exit_code == 0, result.output
+    (row,) = json.loads(result.output)
+    assert row["races"] == 2
+
+    result = runner.invoke(app, [*base, "--replay", "bayesian-v0"])
+    assert result.exit_code == 2
+    assert "--replay" in result.output
+
+    result = runner.invoke(app, [*base, "--to", "2026-05-01"])
+    assert result.exit_code == 2
+    assert "rebuild" in result.output
+
+
+@pytest.mark.parametrize("replay", [None, MODEL_VERSION])
+def test_backtest_cli_accepts_matching_replay(db_session, tmp_path, replay):
+    seed_exotic_races(db_session)
+    path = _saved_matrix(db_session, tmp_path)
+    args = ["exotics-backtest", "--matrix", str(path), "--json"]
+    if replay is not None:
+        args += ["--replay", replay]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
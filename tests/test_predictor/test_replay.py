@@ -0,0 +1,73 @@
+"""Tests for replaying stored predictions in exotic back-tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from ganyan.predictor.bayesian import MODEL_VERSION, BayesianPredictor
+from ganyan.predictor.exotic_evaluate import evaluate_all_pools
+from ganyan.predictor.replay import StoredPredictor
+
+from tests.helpers.seed import seed_exotic_races
+
+
+class _CountingPredictor(BayesianPredictor):
+    def __init__(self, session):
+        super().__init__(session)
+        self.calls: list[int] = []
+
+    def predict(self, race_id):
+        self.calls.append(race_id)
+        return super().predict(race_id)
+
+
+def test_replay_matches_live_and_falls_back_only_when_missing(db_session):
+    races = seed_exotic_races(db_session)
+    live = evaluate_all_pools(db_session, top_ns=(1, 3))
+
+    # Store predictions for all but the last race.
+    predictor = BayesianPredictor(db_session)
+    for race in races[:-1]:
+        predictor.predict_and_save(race.id)
+    db_session.commit()
+
+    fallback = {}
+
+    def _factory(session):
+        fallback["p"] = _CountingPredictor(session)
+        return fallback["p"]
+
+    replayed = evaluate_all_pools(
+        db_session, top_ns=(1, 3),
+        predictor_factory=_factory, model_version=MODEL_VERSION,
+    )
+    assert [r.summary_row() for r in replayed] == [r.summary_row() for r in live]
+    assert fallback["p"].calls == [races[-1].id]
+
+    skipped = evaluate_all_pools(
+        db_session, top_ns=(1,), pools=("ganyan",),
+        predictor_factory=_factory, model_version=MODEL_VERSION,
+        live_fallback=False,
+    )
+    assert skipped[0].races == len(races) - 1
+
+
+def test_stored_predictor_uses_latest_row_per_entry(db_session):
+    races = seed_exotic_races(db_session)
+    predictor = BayesianPredictor(db_session)
+    predictor.predict_and_save(races[0].id)
+    db_session.commit()
+    for entry in races[0].entries:
+        entry.hp = 50.0
+    latest = predictor.predict_and_save(races[0].id)
+    db_session.commit()
+
+    stored = StoredPredictor(db_session, MODEL_VERSION)
+    assert races[0].id in stored and races[1].id not in stored
+    got = stored.predict(races[0].id)
+    assert [p.horse_id for p in got] == [p.horse_id for p in latest]
+    assert [p.probability for p in got] == pytest.approx(
+        [p.probability for p in latest], abs=1e-3,
+    )
+    assert stored.predict(races[1].id) == []
+    assert stored.predict_many([races[1].id, races[0].id]) == {races[0].id: got}
@@ -0,0 +1,90 @@
+"""Tests for the vectorised strategy sweep."""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+
+from ganyan.predictor import sweep as sweep_module
+from ganyan.predictor.exotic_evaluate import evaluate_matrix_pools
+from ganyan.predictor.sweep import SweepGrid, sweep
+
+from tests.helpers.matrices import random_matrix
+
+
+def test_top_n_cells_match_pool_backtest():
+    matrix = random_matrix()
+    pools = ("ganyan", "ikili", "sirali_ikili", "uclu")
+    cells = sweep(matrix, SweepGrid(pools=pools, top_ns=(1, 2, 3)))
+    expected = evaluate_matrix_pools(matrix, pools=pools, top_ns=(1, 2, 3))
+    for cell, result in zip(cells, expected):
+        assert (cell.pool, cell.top_n) == (result.pool, result.top_n)
+        assert cell.races == result.races
+        assert cell.hits == result.hits
+        assert cell.stake_tl == pytest.approx(result.total_stake_tl)
+        assert cell.payout_tl == pytest.approx(result.total_payout_tl)
+        assert cell.skipped_missing_payout == result.misses_without_payout
+
+
+def test_box_and_value_cells_match_brute_force():
+    matrix = random_matrix(seed=1)
+    grid = SweepGrid(
+        pools=("ikili", "uclu"), top_ns=(), box_sizes=(3,),
+        edges=(0.0, 0.2), min_agfs=(5.0,), prob_floors=(0.1,),
+    )
+    cells = {(c.kind, c.pool, c.edge): c for c in sweep(matrix, grid, ticket_stake_tl=10)}
+
+    for pool, k, ordered in [("ikili", 2, False), ("uclu", 3, True)]:
+        stake = payout = 0.0
+        for i in np.nonzero(matrix.predicted)[0]:
+            actual = matrix.winning_combo(i, k)
+            if actual is None:
+                continue
+            probs = matrix.win_probs(i)
+            top = sorted(probs, key=lambda h: -probs[h])[:3]
+            combos = list(
+                itertools.permutations(top, k) if ordered
+                else itertools.combinations(top, k)
+            )
+            hit = set(actual) <= set(top)
+            if hit and matrix.payout(i, pool) is None:
+                continue
+            stake += 10 * len(combos)
+            payout += 10 * matrix.payout(i, pool) if hit else 0.0
+        cell = cells[("box", pool, None)]
+        assert cell.stake_tl == pytest.approx(stake)
+        assert cell.payout_tl == pytest.approx(payout)
+
+    for edge in (0.0, 0.2):
+        stake = payout = 0.0
+        for i in range(len(matrix)):
+            for j in range(matrix.n_runners[i]):
+                p, a = matrix.prob[i, j], matrix.agf[i, j]
+                if np.isnan(p) or a < 5.0 or p < 0.1 or (p * 100 - a) / a < edge:
+                    continue
+                won = matrix.finish[i, j] == 1
+                if won and matrix.payout(i, "ganyan") is None:
+                    continue
+                stake += 10
+                payout += 10 * matrix.payout(i, "ganyan") if won else 0.0
+        cell = cells[("value", "ganyan", edge)]
+        assert cell.stake_tl == pytest.approx(stake)
+        assert cell.payout_tl == pytest.approx(payout)
+
+
+def test_drawdown_monthly_pnl_and_workers(monkeypatch):
+    matrix = random_matrix(seed=2)
+    grid = SweepGrid(pools=("ganyan", "uclu"), top_ns=(1, 4), prob_floors=(0.0, 0.05))
+    serial = sweep(matrix, grid)
+
+    for cell in serial:
+        assert sum(cell.monthly_pnl.values()) == pytest.approx(
+            cell.payout_tl - cell.stake_tl,
+        )
+        assert cell.max_drawdown_tl >= max(0.0, cell.stake_tl - cell.payout_tl) - 1e-6
+
+    monkeypatch.setattr(sweep_module, "_CHUNK_RACES", 7)
+    parallel = sweep(matrix, grid, workers=2)
+    assert [c.summary_row() for c in parallel] == [c.summary_row() for c in serial]
@@ -10,6 +10,7 @@ from ganyan.scraper.backfill import (
     update_race_results,
     get_or_create_track,
     get_or_create_horse,
+    get_finished_tracks_on,
     get_scraped_dates,
     log_scrape,
     BackfillManager,
@@ -219,6 +220,18 @@ def test_log_scrape_captures_error_message(db_session):
     assert row.error_message == "HTTP 503 Service Unavailable"
 
 
+def test_get_finished_tracks_on(db_session):
+    for track, race_num in (("İstanbul", 1), ("İstanbul", 2), ("Adana", 1)):
+        store_race_card(db_session, parse_race_card(_make_raw_card(track, race_num)))
+    races = {(r.track.name, r.race_number): r for r in db_session.query(Race).all()}
+    races[("İstanbul", 1)].status = RaceStatus.resulted
+    races[("İstanbul", 2)].status = RaceStatus.cancelled
+    db_session.commit()
+
+    assert get_finished_tracks_on(db_session, date(2026, 4, 5)) == {"İstanbul"}
+    assert get_finished_tracks_on(db_session, date(2026, 4, 6)) == set()
+
+
 # --- log_scrape ---
 
 def test_log_scrape(db_session):
@@ -275,3 +288,55 @@ async def test_backfill_processes_reverse_chronological(db_session):
     await mgr.backfill(from_date=date(2026, 4, 1), to_date=date(2026, 4, 3))
 
     assert order == [date(2026, 4, 3), date(2026, 4, 2), date(2026, 4, 1)]
+
+
+@pytest.mark.asyncio
+async def test_backfill_full_results_concurrent_writes_in_date_order(db_session):
+    """Several dates fetch at once, but stores land newest-first, one at a time."""
+    import asyncio
+
+    from ganyan.scraper.rate_limit import TokenBucket
+
+    in_flight = 0
+    peak = 0
+
+    class FakeTJKClient:
+        delay = 0
+        rate_limiter = TokenBucket(1000.0, burst=10)
+
+        async def get_race_results_with_failures(self, race_date):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Older dates answer faster, so completion order is scrambled.
+            await asyncio.sleep(0.001 * race_date.day)
+            await self.rate_limiter.acquire()
+            in_flight -= 1
+            if race_date == date(2026, 4, 2):
+                raise RuntimeError("boom")
+            card = _make_raw_card(race_num=race_date.day)
+            card.date = race_date
+            return [card], []
+
+    mgr = BackfillManager(db_session, FakeTJKClient())
+    stored = await mgr.backfill_full_results(
+        date(2026, 4, 1), date(2026, 4, 8), date_concurrency=3,
+    )
+
+    assert stored == 7
+    assert peak == 3
+    logs = db_session.query(ScrapeLog).filter_by(track="ALL").order_by(ScrapeLog.id).all()
+    assert [log.date.day for log in logs] == [8, 7, 6, 5, 4, 3, 2, 1]
+    assert logs[6].status == ScrapeStatus.failed
+    assert db_session.query(Race).filter_by(status=RaceStatus.resulted).count() == 7
+
+
+@pytest.mark.asyncio
+async def test_concurrent_backfill_requires_rate_limiter(db_session):
+    class FakeTJKClient:
+        async def get_race_card(self, race_date):
+            return []
+
+    mgr = BackfillManager(db_session, FakeTJKClient())
+    with pytest.raises(ValueError):
+        await mgr.backfill(date(2026, 4, 1), date(2026, 4, 3), date_concurrency=2)
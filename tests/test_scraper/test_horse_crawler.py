@@ -8,7 +8,8 @@ import respx
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from ganyan.db.models import Base, Horse
+from ganyan.db.career_stats import lookup_career_counts, rebuild_career_stats
+from ganyan.db.models import Base, Horse, Race, RaceEntry, RaceStatus, Track
 from ganyan.scraper.horse_crawler import (
     HorseCrawler, HorseProfile, _parse_birth_date, _parse_kunye,
 )
@@ -88,6 +89,36 @@ async def test_crawl_populates_horse(db_session):
     assert refreshed.profile_crawled_at is not None
 
 
+@respx.mock
+@pytest.mark.asyncio
+async def test_crawl_credits_past_runs_to_the_new_sire(db_session):
+    track = Track(name="Bursa")
+    db_session.add(track)
+    db_session.flush()
+    race = Race(track_id=track.id, date=date(2026, 1, 1), race_number=1,
+                status=RaceStatus.resulted)
+    winner = Horse(name="ÇELİK ANSELMO", tjk_at_id=109699)
+    sibling = Horse(name="KARDEŞ", sire="GELİBOLU")
+    db_session.add_all([race, winner, sibling])
+    db_session.flush()
+    db_session.add_all([
+        RaceEntry(race_id=race.id, horse_id=winner.id, finish_position=1),
+        RaceEntry(race_id=race.id, horse_id=sibling.id, finish_position=2),
+    ])
+    rebuild_career_stats(db_session)
+    db_session.commit()
+    assert lookup_career_counts(db_session, "sire", "GELİBOLU") == (1, 0)
+
+    respx.get("https://www.tjk.org/TR/YarisSever/Query/ConnectedPage/AtKosuBilgileri").mock(
+        return_value=httpx.Response(200, text=_SAMPLE_PAGE),
+    )
+    async with HorseCrawler(db_session, delay=0, concurrency=1) as crawler:
+        await crawler.crawl_missing_profiles()
+
+    assert lookup_career_counts(db_session, "sire", "GELİBOLU") == (2, 1)
+    assert crawler.sired_horse_ids == [winner.id]
+
+
 @respx.mock
 @pytest.mark.asyncio
 async def test_crawl_skips_horses_without_at_id(db_session):
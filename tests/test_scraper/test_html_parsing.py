@@ -0,0 +1,58 @@
+"""Tests for off-loop HTML parsing and parser backend selection."""
+
+import threading
+from datetime import date
+
+import httpx
+import pytest
+import respx
+
+from ganyan.scraper.html_parsing import (
+    DEFAULT_HTML_PARSER,
+    parse_off_loop,
+    resolve_html_parser,
+)
+from ganyan.scraper import tjk_api
+from ganyan.scraper.tjk_api import TJKClient
+
+from tests.helpers.tjk_pages import CITY_PROGRAM_HTML, MAIN_PAGE_HTML
+
+
+def test_resolve_html_parser():
+    assert resolve_html_parser(None) == DEFAULT_HTML_PARSER
+    assert resolve_html_parser("html.parser") == "html.parser"
+    with pytest.raises(ValueError):
+        resolve_html_parser("html5lib")
+
+
+async def test_parse_off_loop_runs_on_a_worker_thread():
+    loop_thread = threading.get_ident()
+    assert await parse_off_loop(threading.get_ident) != loop_thread
+
+
+@respx.mock
+async def test_city_pages_are_parsed_off_the_event_loop(monkeypatch):
+    base = "https://www.tjk.org"
+    respx.get(
+        f"{base}/TR/YarisSever/Info/Page/GunlukYarisProgrami"
+    ).mock(return_value=httpx.Response(200, text=MAIN_PAGE_HTML))
+    respx.get(
+        f"{base}/TR/YarisSever/Info/Sehir/GunlukYarisProgrami",
+    ).mock(return_value=httpx.Response(200, text=CITY_PROGRAM_HTML))
+
+    parse_threads = []
+    original = tjk_api.parse_city_page
+
+    def _recording(*args, **kwargs):
+        parse_threads.append(threading.get_ident())
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(tjk_api, "parse_city_page", _recording)
+    async with TJKClient(
+        base_url=base, delay=0, adaptive=False, html_parser="html.parser",
+    ) as client:
+        cards = await client.get_race_card(date(2026, 4, 5))
+
+    assert len(cards) == 2
+    assert len(parse_threads) == 2
+    assert threading.get_ident() not in parse_threads
@@ -0,0 +1,246 @@
+"""Tests for the shared TJK request-rate token bucket."""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from ganyan.scraper.rate_limit import TokenBucket
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+async def test_bucket_paces_acquisitions_at_rate():
+    clock = _FakeClock()
+    bucket = TokenBucket(2.0, burst=1, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        await bucket.acquire()
+    # First token is free, the next four each wait half a second.
+    assert clock.now == pytest.approx(2.0)
+    assert bucket.acquired == 5
+    assert bucket.waited_s == pytest.approx(2.0)
+
+
+async def test_burst_spends_saved_tokens_back_to_back():
+    clock = _FakeClock()
+    bucket = TokenBucket(1.0, burst=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        await bucket.acquire()
+    assert clock.sleeps == []
+    await bucket.acquire()
+    assert clock.now == pytest.approx(1.0)
+
+
+async def test_concurrent_waiters_share_one_budget():
+    clock = _FakeClock()
+    bucket = TokenBucket(4.0, clock=clock, sleep=clock.sleep)
+    await asyncio.gather(*(bucket.acquire() for _ in range(9)))
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+# --- AdaptiveConcurrency ---
+
+
+def _controller(**kwargs):
+    from ganyan.scraper.rate_limit import AdaptiveConcurrency
+
+    clock = _FakeClock()
+    return AdaptiveConcurrency("test", clock=clock, **kwargs), clock
+
+
+async def test_healthy_responses_grow_limit_additively():
+    ctl, clock = _controller(initial=2, maximum=4)
+    for _ in range(20):
+        started = await ctl.acquire()
+        clock.now += 0.1
+        ctl.release(started, status=200)
+    assert ctl.limit == 4
+    assert ctl.successes == 20
+
+
+async def test_slow_or_client_error_responses_hold_limit():
+    ctl, clock = _controller(initial=3, latency_target_s=1.0)
+    started = await ctl.acquire()
+    clock.now += 5.0
+    ctl.release(started, status=200)
+    started = await ctl.acquire()
+    ctl.release(started, status=404)
+    assert ctl.limit == 3
+    assert (ctl.slow, ctl.decreases) == (1, 0)
+
+
+async def test_failures_halve_once_per_round():
+    import httpx
+
+    ctl, clock = _controller(initial=8)
+    wave = [await ctl.acquire() for _ in range(4)]
+    clock.now += 0.5
+    ctl.release(wave[0], status=429)
+    ctl.release(wave[1], status=503)
+    ctl.release(wave[2], error=httpx.ReadTimeout("slow"))
+    ctl.release(wave[3], status=200)
+    # One cut for the whole wave.
+    assert ctl.limit == 4
+    assert ctl.decreases == 1
+    assert (ctl.throttled, ctl.server_errors, ctl.transport_errors) == (1, 1, 1)
+
+    started = await ctl.acquire()
+    ctl.release(started, error=httpx.ConnectError("down"))
+    assert ctl.limit == 2
+    assert ctl.status()["last_decrease_reason"] == "ConnectError"
+
+
+async def test_release_wakes_waiters_in_order():
+    ctl, clock = _controller(initial=1)
+    first = await ctl.acquire()
+    order = []
+
+    async def _wait(tag):
+        started = await ctl.acquire()
+        order.append(tag)
+        ctl.release(started, status=200)
+
+    waiters = [asyncio.create_task(_wait(tag)) for tag in "abc"]
+    await asyncio.sleep(0)
+    assert (ctl.in_flight, ctl.waiting) == (1, 3)
+
+    # A cancelled waiter gives up its place without losing a wake-up.
+    waiters[0].cancel()
+    ctl.release(first, status=200)
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert order == ["b", "c"]
+    assert (ctl.in_flight, ctl.waiting) == (0, 0)
+
+
+def test_rate_controller_is_shared_per_host():
+    from ganyan.scraper.horse_crawler import HorseCrawler
+    from ganyan.scraper.rate_limit import (
+        rate_controller, rate_controller_status, reset_rate_controllers,
+    )
+    from ganyan.scraper.tjk_api import TJKClient
+
+    try:
+        client = TJKClient(base_url="https://stub.invalid", delay=0, adaptive=True)
+        crawler = HorseCrawler(
+            None, base_url="https://stub.invalid/", delay=0, adaptive=True,
+        )
+        assert client.controller is crawler.controller
+        assert client.controller is rate_controller("https://stub.invalid")
+        assert "stub.invalid" in {c["name"] for c in rate_controller_status()}
+    finally:
+        reset_rate_controllers()
+    assert rate_controller_status() == []
+    # Adaptive control is opt-in.
+    assert TJKClient(delay=0).controller is None
+    assert HorseCrawler(None, delay=0).controller is None
+
+
+async def _drive_stub(capacity, *, requests=120, initial=4):
+    """Fire requests through a TJKClient at a stub that 429s above ``capacity``."""
+    import httpx
+    import respx
+
+    from ganyan.scraper.rate_limit import AdaptiveConcurrency
+    from ganyan.scraper.tjk_api import TJKClient
+
+    in_flight = 0
+    served_over_capacity = 0
+
+    async def _stub(request):
+        nonlocal in_flight, served_over_capacity
+        in_flight += 1
+        try:
+            await asyncio.sleep(0.002)
+            if in_flight > capacity:
+                served_over_capacity += 1
+                return httpx.Response(429)
+            return httpx.Response(200, text="ok")
+        finally:
+            in_flight -= 1
+
+    ctl = AdaptiveConcurrency("stub", initial=initial, maximum=32)
+    with respx.mock:
+        respx.get("https://stub.invalid/page").mock(side_effect=_stub)
+        async with TJKClient(
+            base_url="https://stub.invalid", delay=0, controller=ctl,
+        ) as client:
+            await asyncio.gather(*(
+                client._request("GET", "/page") for _ in range(requests)
+            ))
+    return ctl, served_over_capacity
+
+
+async def test_stub_server_with_headroom_lets_concurrency_grow():
+    ctl, throttled = await _drive_stub(capacity=100)
+    assert throttled == 0
+    assert ctl.limit > 4
+    assert ctl.peak_in_flight > 4
+
+
+async def test_stub_server_throttling_drives_limit_down():
+    ctl, throttled = await _drive_stub(capacity=2, initial=16)
+    assert throttled > 0
+    assert ctl.decreases >= 2
+    assert ctl.limit <= 4
+
+
+@pytest.mark.parametrize("adaptive", [False, True])
+async def test_fan_out_is_bounded_by_controller_or_configured_concurrency(adaptive):
+    import httpx
+    import respx
+
+    from ganyan.scraper.rate_limit import AdaptiveConcurrency
+    from ganyan.scraper.tjk_api import _DOMESTIC_SEHIR_IDS, TJKClient
+
+    page = '<ul class="gunluk-tabs">{}</ul>'.format("".join(
+        f'<li><a href="#" data-sehir-id="{i}">Şehir {i}</a></li>'
+        for i in sorted(_DOMESTIC_SEHIR_IDS)
+    ))
+    in_flight = peak = 0
+
+    async def _city(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return httpx.Response(200, text="")
+
+    ctl = AdaptiveConcurrency("stub", initial=4, maximum=16) if adaptive else None
+    with respx.mock:
+        respx.get(
+            "https://stub.invalid/TR/YarisSever/Info/Page/GunlukYarisSonuclari",
+        ).mock(return_value=httpx.Response(200, text=page))
+        respx.get(
+            "https://stub.invalid/TR/YarisSever/Info/Sehir/GunlukYarisSonuclari",
+        ).mock(side_effect=_city)
+        async with TJKClient(
+            base_url="https://stub.invalid", delay=0, city_concurrency=3,
+            controller=ctl,
+        ) as client:
+            await client.get_race_results(date(2026, 4, 4))
+
+    if adaptive:
+        # The controller, not city_concurrency, caps the fan-out, and
+        # healthy responses grow it past where it started.
+        assert 4 < peak <= ctl.maximum
+        assert peak == ctl.peak_in_flight
+        assert ctl.waiting == 0
+    else:
+        assert peak == 3
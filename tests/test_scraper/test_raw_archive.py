@@ -0,0 +1,218 @@
+"""Tests for the raw HTML archive and offline reparse."""
+
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+import respx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ganyan.db.models import (
+    Base, EvaluationDaily, Horse, Race, RaceEntry, RaceStatus, Track,
+)
+from ganyan.scraper.backfill import BackfillManager
+from ganyan.scraper.raw_archive import RawHtmlArchive, request_key
+from ganyan.scraper.reparse import reparse_archive
+from ganyan.scraper.tjk_api import TJKClient
+
+from tests.helpers.tjk_pages import CITY_RESULTS_HTML, MAIN_RESULTS_PAGE_HTML
+
+
+BASE = "https://www.tjk.org"
+RESULTS_DATE = date(2026, 4, 4)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _mock_results_day() -> None:
+    respx.get(
+        f"{BASE}/TR/YarisSever/Info/Page/GunlukYarisSonuclari",
+    ).mock(return_value=httpx.Response(200, text=MAIN_RESULTS_PAGE_HTML))
+    respx.get(
+        f"{BASE}/TR/YarisSever/Info/Sehir/GunlukYarisSonuclari",
+    ).mock(return_value=httpx.Response(200, text=CITY_RESULTS_HTML))
+
+
+def _snapshot(session: Session) -> list[tuple]:
+    return sorted(
+        (race.date, race.race_number, race.status, race.ganyan_payout_tl,
+         entry.horse.name, entry.finish_position, entry.agf)
+        for race in session.query(Race).all()
+        for entry in session.query(RaceEntry).filter_by(race_id=race.id)
+    )
+
+
+def test_put_read_round_trip_and_dedupe(tmp_path):
+    archive = RawHtmlArchive(tmp_path)
+    a = archive.put(
+        "results_city", "get", "/city", {"SehirId": "1", "Tarih": "x"}, "<p>İ</p>",
+        race_date=RESULTS_DATE, meta={"track_name": "Adana"},
+    )
+    b = archive.put(
+        "results_city", "GET", "/city", {"SehirId": "2"}, "<p>İ</p>",
+        race_date=RESULTS_DATE,
+    )
+    assert archive.read(a) == "<p>İ</p>"
+    assert a.digest == b.digest and a.key != b.key
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+    # Param order doesn't change the key; the date does.
+    assert a.key == request_key("GET", "/city", {"Tarih": "x", "SehirId": "1"}, RESULTS_DATE)
+    assert a.key != request_key("GET", "/city", {"Tarih": "x", "SehirId": "1"}, None)
+    with pytest.raises(ValueError):
+        archive.put("bogus", "GET", "/", None, "")
+
+
+def test_entries_keep_newest_fetch_per_request(tmp_path):
+    archive = RawHtmlArchive(tmp_path)
+    archive.put("results_city", "GET", "/city", {"SehirId": "1"}, "early",
+                race_date=RESULTS_DATE)
+    archive.put("results_city", "GET", "/city", {"SehirId": "1"}, "final",
+                race_date=RESULTS_DATE)
+    archive.put("results_city", "GET", "/city", {"SehirId": "1"}, "next day",
+                race_date=date(2026, 4, 5))
+    archive.put("horse_detail", "GET", "/horse", {"AtId": "7"}, "kunye")
+
+    day = archive.entries(kind="results_city", from_date=RESULTS_DATE,
+                          to_date=RESULTS_DATE)
+    assert [archive.read(e) for e in day] == ["final"]
+    assert len(archive.entries(kind="results_city")) == 2
+    assert [e.kind for e in archive.entries(kind="horse_detail")] == ["horse_detail"]
+    # Date filters skip undated pages.
+    assert archive.entries(kind="horse_detail", from_date=RESULTS_DATE) == []
+
+
+@respx.mock
+async def test_client_archives_day_and_city_pages(tmp_path):
+    _mock_results_day()
+    archive = RawHtmlArchive(tmp_path)
+    async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                         archive=archive) as client:
+        await client.get_race_results(RESULTS_DATE)
+
+    kinds = sorted(e.kind for e in archive.entries())
+    assert kinds == ["results_city", "results_day"]
+    (city,) = archive.entries(kind="results_city")
+    assert city.race_date == RESULTS_DATE
+    assert city.meta == {"track_name": "Adana", "sehir_id": "1"}
+    assert city.params["QueryParameter_Tarih"] == "04/04/2026"
+    assert archive.read(city) == CITY_RESULTS_HTML
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reparse_rebuilds_what_the_live_scrape_stored(tmp_path, db_session, workers):
+    archive = RawHtmlArchive(tmp_path)
+    live = Session(create_engine("sqlite:///:memory:"))
+    Base.metadata.create_all(live.get_bind())
+
+    async def _scrape() -> None:
+        with respx.mock:
+            _mock_results_day()
+            async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                                 archive=archive) as client:
+                await BackfillManager(live, client).backfill_full_results(
+                    RESULTS_DATE, RESULTS_DATE,
+                )
+
+    asyncio.run(_scrape())
+    expected = _snapshot(live)
+    assert expected and {row[2] for row in expected} == {RaceStatus.resulted}
+
+    offline = db_session
+    stats = reparse_archive(offline, archive, workers=workers)
+    assert stats.pages == 1 and stats.failed_pages == 0
+    assert stats.races == len({(r[0], r[1]) for r in expected})
+    assert _snapshot(offline) == expected
+
+    # Replaying again is idempotent.
+    reparse_archive(offline, archive, workers=workers)
+    assert _snapshot(offline) == expected
+
+
+def test_reparse_marks_its_dates_for_evaluation_refresh(tmp_path, db_session):
+    from ganyan.predictor.evaluation_daily import (
+        rebuild_evaluation_daily,
+        refresh_dirty_evaluation_daily,
+    )
+
+    track = Track(name="Bursa", city="Bursa")
+    db_session.add(track)
+    db_session.flush()
+    race = Race(track_id=track.id, date=date(2026, 3, 1), race_number=1,
+                status=RaceStatus.resulted)
+    horse = Horse(name="SEED")
+    db_session.add_all([race, horse])
+    db_session.flush()
+    db_session.add(RaceEntry(race_id=race.id, horse_id=horse.id,
+                             finish_position=1, predicted_probability=60.0))
+    db_session.commit()
+    rebuild_evaluation_daily(db_session)
+    db_session.commit()
+
+    archive = RawHtmlArchive(tmp_path)
+    archive.put(
+        "results_city", "GET", "/city", {"SehirId": "1"}, CITY_RESULTS_HTML,
+        race_date=RESULTS_DATE, meta={"track_name": "Adana"},
+    )
+    stats = reparse_archive(db_session, archive)
+    # Rescoring is left to the caller; the scraper only marks the dates.
+    assert not db_session.query(EvaluationDaily).filter_by(
+        date=RESULTS_DATE,
+    ).all()
+    refresh_dirty_evaluation_daily(db_session)
+    db_session.commit()
+
+    day = db_session.query(EvaluationDaily).filter_by(date=RESULTS_DATE).one()
+    # Replayed races carry no predictions, so the day is all skipped.
+    assert (day.races, day.skipped) == (0, stats.races)
+    assert db_session.query(EvaluationDaily).filter_by(
+        date=date(2026, 3, 1),
+    ).one().races == 1
+
+
+def test_reparse_counts_unreadable_pages(tmp_path, db_session):
+    archive = RawHtmlArchive(tmp_path)
+    entry = archive.put(
+        "results_city", "GET", "/city", {"SehirId": "1"}, CITY_RESULTS_HTML,
+        race_date=RESULTS_DATE, meta={"track_name": "Adana"},
+    )
+    archive.object_path(entry.digest).unlink()
+    stats = reparse_archive(db_session, archive)
+    assert (stats.pages, stats.races, stats.failed_pages) == (1, 0, 1)
+
+
+def test_prune_drops_old_days_and_unreferenced_bodies(tmp_path, monkeypatch):
+    archive = RawHtmlArchive(tmp_path)
+    old = archive.put("results_city", "GET", "/city", {"SehirId": "1"}, "old",
+                      race_date=date(2025, 1, 1))
+    shared = archive.put("results_city", "GET", "/city", {"SehirId": "2"}, "same",
+                         race_date=date(2025, 1, 1))
+    archive.put("results_city", "GET", "/city", {"SehirId": "2"}, "same",
+                race_date=RESULTS_DATE)
+    kept = archive.put("results_city", "GET", "/city", {"SehirId": "1"}, "new",
+                       race_date=RESULTS_DATE)
+    archive.put("horse_detail", "GET", "/horse", {"AtId": "7"}, "kunye")
+
+    # Within the grace period nothing unreferenced is deleted yet.
+    assert archive.prune(date(2026, 1, 1)) == (2, 0)
+    assert archive.object_path(old.digest).exists()
+
+    monkeypatch.setattr("ganyan.scraper.raw_archive._PRUNE_GRACE_S", -60)
+    assert archive.prune(date(2026, 1, 1)) == (0, 1)
+    assert not archive.object_path(old.digest).exists()
+    assert archive.object_path(shared.digest).exists()
+    assert archive.read(kept) == "new"
+    assert [e.race_date for e in archive.entries(kind="results_city")] == [
+        RESULTS_DATE, RESULTS_DATE,
+    ]
+    # Undated lines go by fetch time.
+    assert len(archive.entries(kind="horse_detail")) == 1
+    assert archive.prune(date(2999, 1, 1))[0] == 3
+    assert archive.entries() == []
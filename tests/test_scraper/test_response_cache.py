@@ -0,0 +1,198 @@
+"""Tests for conditional cached fetches and results polling."""
+
+from datetime import date
+
+import httpx
+import pytest
+import respx
+
+from ganyan.scraper import tjk_api
+from ganyan.scraper.response_cache import ResponseCache
+from ganyan.scraper.tjk_api import TJKClient
+
+from tests.helpers.tjk_pages import CITY_RESULTS_HTML, MAIN_RESULTS_PAGE_HTML
+
+
+BASE = "https://www.tjk.org"
+RESULTS_DATE = date(2026, 4, 4)
+MAIN_URL = f"{BASE}/TR/YarisSever/Info/Page/GunlukYarisSonuclari"
+CITY_URL = f"{BASE}/TR/YarisSever/Info/Sehir/GunlukYarisSonuclari"
+CITY_RESULTS_V2 = CITY_RESULTS_HTML + "<!-- next race resulted -->\n"
+
+
+def _response(text, status=200, **headers):
+    return httpx.Response(status, text=text, headers=headers)
+
+
+def test_cache_tracks_bodies_validators_and_parses():
+    cache = ResponseCache(max_entries=2)
+    entry, changed = cache.update("a", _response("one", ETag='"v1"'))
+    assert changed and cache.validators("a") == {"If-None-Match": '"v1"'}
+    entry.parsed = ["parsed"]
+
+    again, changed = cache.update("a", _response("one"))
+    assert not changed and again.parsed == ["parsed"]
+    assert cache.validators("a") == {}
+
+    _, changed = cache.update("a", _response("", status=304))
+    assert not changed
+
+    fresh, changed = cache.update("a", _response("two"))
+    assert changed and fresh.parsed is None and fresh.text == "two"
+
+    cache.update("b", _response("b"))
+    cache.update("c", _response("c"))
+    assert len(cache) == 2 and cache.validators("a") == {}
+    # A 304 for an evicted key can't be served from the cache.
+    assert cache.update("a", _response("", status=304)) is None
+    assert len(cache) == 2 and cache.validators("a") == {}
+    assert cache.status()["changed"] == 4
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
+
+
+@respx.mock
+async def test_poll_revalidates_and_skips_unchanged_pages(monkeypatch):
+    respx.get(MAIN_URL).mock(return_value=_response(MAIN_RESULTS_PAGE_HTML))
+    city_pages = iter([
+        _response(CITY_RESULTS_HTML, ETag='"r1"'),
+        _response("", status=304),
+        _response(CITY_RESULTS_V2),
+    ])
+    city = respx.get(CITY_URL).mock(side_effect=lambda request: next(city_pages))
+
+    parses = []
+    original = tjk_api.parse_city_page
+
+    def _counting(*args, **kwargs):
+        parses.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(tjk_api, "parse_city_page", _counting)
+    cache = ResponseCache()
+
+    async def _poll():
+        async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                             response_cache=cache) as client:
+            return await client.poll_race_results(RESULTS_DATE)
+
+    first = await _poll()
+    assert first.changed == ["Adana"] and first.cards
+
+    second = await _poll()
+    assert city.calls.last.request.headers["If-None-Match"] == '"r1"'
+    assert (second.changed, second.unchanged, second.cards) == ([], ["Adana"], [])
+    assert len(parses) == 1
+
+    third = await _poll()
+    assert third.changed == ["Adana"] and len(parses) == 2
+
+    # Unchanged pages still serve get_race_results from the cached parse.
+    respx.get(CITY_URL).mock(return_value=_response(CITY_RESULTS_V2))
+    async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                         response_cache=cache) as client:
+        cards = await client.get_race_results(RESULTS_DATE)
+    assert [c.race_number for c in cards] == [c.race_number for c in third.cards]
+    assert len(parses) == 2
+
+
+@respx.mock
+async def test_poll_does_not_fetch_finished_tracks():
+    respx.get(MAIN_URL).mock(return_value=_response(MAIN_RESULTS_PAGE_HTML))
+    city = respx.get(CITY_URL).mock(return_value=_response(CITY_RESULTS_HTML))
+
+    async with TJKClient(base_url=BASE, delay=0, adaptive=False) as client:
+        poll = await client.poll_race_results(RESULTS_DATE, skip_tracks={"Adana"})
+
+    assert poll.skipped == ["Adana"] and poll.cards == []
+    assert not city.called
+
+
+@respx.mock
+async def test_poll_refetches_when_the_cached_body_was_evicted():
+    respx.get(MAIN_URL).mock(return_value=_response(MAIN_RESULTS_PAGE_HTML))
+    cache = ResponseCache()
+
+    def _city(request):
+        if "If-None-Match" in request.headers:
+            # Another poll evicted the entry while this request was out.
+            cache._entries.clear()
+            return _response("", status=304)
+        return _response(CITY_RESULTS_HTML, ETag='"r1"')
+
+    city = respx.get(CITY_URL).mock(side_effect=_city)
+
+    async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                         response_cache=cache) as client:
+        first = await client.poll_race_results(RESULTS_DATE)
+        second = await client.poll_race_results(RESULTS_DATE)
+
+    assert first.changed == ["Adana"]
+    assert second.changed == ["Adana"] and second.failed == []
+    assert [c.race_number for c in second.cards] == [c.race_number for c in first.cards]
+    assert "If-None-Match" not in city.calls.last.request.headers
+
+
+@respx.mock
+async def test_poll_skips_finished_tracks_by_stored_name():
+    respx.get(MAIN_URL).mock(return_value=_response(
+        MAIN_RESULTS_PAGE_HTML.replace(
+            'data-sehir-id="1">Adana', 'data-sehir-id="1">ADANA',
+        ),
+    ))
+    city = respx.get(CITY_URL).mock(return_value=_response(CITY_RESULTS_HTML))
+
+    async with TJKClient(base_url=BASE, delay=0, adaptive=False) as client:
+        poll = await client.poll_race_results(RESULTS_DATE, skip_tracks={"Adana"})
+
+    assert poll.skipped == ["ADANA"]
+    assert not city.called
+
+
+@respx.mock
+@pytest.mark.parametrize("failure", ["write", "no_card"])
+async def test_unstored_results_come_back_on_the_next_poll(monkeypatch, failure):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from ganyan.db.models import Base
+    from ganyan.scheduler import _store_polled_results
+
+    respx.get(MAIN_URL).mock(return_value=_response(MAIN_RESULTS_PAGE_HTML))
+    respx.get(CITY_URL).mock(return_value=_response(CITY_RESULTS_HTML, ETag='"r1"'))
+    cache = ResponseCache()
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+
+    if failure == "write":
+        def _broken(session, parsed):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(
+            "ganyan.scraper.backfill.update_race_results", _broken,
+        )
+
+    async def _poll():
+        async with TJKClient(base_url=BASE, delay=0, adaptive=False,
+                             response_cache=cache) as client:
+            return await client.poll_race_results(RESULTS_DATE)
+
+    first = await _poll()
+    assert first.cards and first.keys.keys() == {"Adana"}
+    if failure == "write":
+        with pytest.raises(RuntimeError):
+            _store_polled_results(session, first, cache)
+    else:
+        # Results landed before the morning card was stored.
+        assert _store_polled_results(session, first, cache) == 0
+
+    second = await _poll()
+    assert second.changed == ["Adana"]
+    assert [c.race_number for c in second.cards] == [
+        c.race_number for c in first.cards
+    ]
+    session.close()
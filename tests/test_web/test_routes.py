@@ -167,3 +167,79 @@ def test_history_with_evaluations(app_with_results):
     assert data["summary"]["top1_accuracy"] == 100.0
     assert len(data["evaluations"]) == 1
     assert data["evaluations"][0]["winner_name"] == "Winner Horse"
+
+
+def test_history_uses_daily_metrics_once_built(app_with_results):
+    from ganyan.predictor.evaluation_daily import rebuild_evaluation_daily
+
+    with app_with_results.config["SESSION_FACTORY"]() as session:
+        rebuild_evaluation_daily(session)
+        session.commit()
+
+    client = app_with_results.test_client()
+    headers = {"Accept": "application/json"}
+    data = client.get("/history", headers=headers).get_json()
+    assert data["summary"]["total_races"] == 1
+    assert data["summary"]["top1_accuracy"] == 100.0
+    assert len(data["evaluations"]) == 1
+
+    data = client.get(
+        "/history?from=2000-01-01&to=2000-01-02", headers=headers,
+    ).get_json()
+    assert data["summary"]["total_races"] == 0
+    assert data["evaluations"] == []
+    assert client.get("/history?from=bad", headers=headers).status_code == 400
+    page = client.get("/history?from=bad")
+    assert page.status_code == 200
+    assert "Geçersiz tarih" in page.get_data(as_text=True)
+
+
+def test_ops_reports_loaded_models(client):
+    resp = client.get("/ops", headers={"Accept": "application/json"})
+    assert resp.status_code == 200
+    assert isinstance(resp.get_json()["models"], list)
+    assert isinstance(resp.get_json()["scrape_controllers"], list)
+    assert "scrape_cache" in resp.get_json()
+    assert client.get("/ops").status_code == 200
+
+
+def test_place_percentages_cover_top_two():
+    from ganyan.predictor.bayesian import Prediction
+    from ganyan.web.routes import _place_percentages, _race_exotic_model
+
+    preds = [
+        Prediction(horse_id=h, horse_name=str(h), probability=p, confidence=0.5)
+        for h, p in [(1, 50.0), (2, 30.0), (3, 20.0)]
+    ]
+    place = _place_percentages(_race_exotic_model(preds))
+    assert sum(place.values()) == pytest.approx(200.0)
+    assert place[1] > place[2] > place[3] > 20.0
+
+
+def test_picks_ledger_reports_equity_curve(app):
+    from datetime import datetime
+
+    from ganyan.db.models import Pick
+
+    with app.config["SESSION_FACTORY"]() as session:
+        race = session.query(Race).first()
+        session.add(Pick(
+            race_id=race.id, strategy="uclu_top1", combination=[1, 2, 3],
+            combination_names=["A", "B", "C"], stake_tl=100,
+            generated_at=datetime(2026, 3, 4, 12), graded=True, hit=True,
+            payout_tl=450, net_tl=350,
+        ))
+        session.commit()
+
+    client = app.test_client()
+    headers = {"Accept": "application/json"}
+    data = client.get("/picks?bucket=month", headers=headers).get_json()
+    assert data["summary"]["uclu_top1"]["net_tl"] == 350
+    assert data["equity"]["uclu_top1"][0]["period"] == "2026-03-01"
+    assert client.get("/picks?bucket=year", headers=headers).status_code == 400
+    assert client.get("/picks").status_code == 200
+
+    # The HTML page falls back to weekly buckets with a notice.
+    page = client.get("/picks?bucket=year")
+    assert page.status_code == 200
+    assert "Geçersiz dönem" in page.get_data(as_text=True)